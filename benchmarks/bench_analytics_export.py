@@ -0,0 +1,100 @@
+"""Benchmark — columnar analytics export of test runs on SQLite.
+
+Compares paging /api/prospect/{id}/runs (one request per prospect, JSON)
+with the record-batch Parquet export of the runs and competitors tables:
+
+    python -m benchmarks.bench_analytics_export --prospects 20000 --runs-per-prospect 50 [--legacy]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert, select
+
+from src.prospecting import analytics
+from src.prospecting.database import SessionLocal, db_list_runs, jloads
+from src.prospecting.models import Base, CampaignDB, ProspectDB, TestRunDB
+
+_MODELS = ["openai", "anthropic", "gemini"]
+
+
+def _populate(engine, prospects: int, runs_per_prospect: int) -> None:
+    start = datetime(2026, 1, 1)
+    campaign_id = str(uuid.uuid4())
+    prospect_ids = [str(uuid.uuid4()) for _ in range(prospects)]
+    with engine.begin() as conn:
+        conn.execute(insert(CampaignDB), [{"campaign_id": campaign_id, "profession": "couvreur", "city": "Lyon"}])
+        conn.execute(insert(ProspectDB), [
+            {"prospect_id": pid, "campaign_id": campaign_id, "name": f"P{i}", "city": "Lyon", "profession": "couvreur"}
+            for i, pid in enumerate(prospect_ids)
+        ])
+    chunk, total = 50_000, prospects * runs_per_prospect
+    for offset in range(0, total, chunk):
+        with engine.begin() as conn:
+            conn.execute(insert(TestRunDB), [
+                {"run_id": str(uuid.uuid4()), "campaign_id": campaign_id, "prospect_id": prospect_ids[i % prospects],
+                 "model": _MODELS[i % 3], "ts": start + timedelta(minutes=i),
+                 "mention_per_query": json.dumps([i % 2 == 0, i % 3 == 0, False, True, i % 5 == 0]),
+                 "mentioned_target": True, "competitors_entities": json.dumps(["alpha", "beta", f"c{i % 50}"])}
+                for i in range(offset, min(offset + chunk, total))
+            ])
+
+
+def _legacy(db) -> int:
+    """Equivalent of paging the runs endpoint: one query + JSON payload per prospect."""
+    rows = 0
+    for pid in db.scalars(select(ProspectDB.prospect_id)).all():
+        payload = [
+            {"run_id": r.run_id, "model": r.model, "ts": r.ts.isoformat(), "mentioned_target": r.mentioned_target,
+             "mention_per_query": jloads(r.mention_per_query), "competitors": jloads(r.competitors_entities)[:5]}
+            for r in db_list_runs(db, pid)
+        ]
+        rows += len(json.loads(json.dumps(payload)))
+        db.expunge_all()
+    return rows
+
+
+def _time(label: str, fn) -> None:
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<28} {(time.perf_counter() - start) * 1000:9.1f} ms  ({result} rows)")
+
+
+def main(prospects: int, runs_per_prospect: int, batch_size: int, legacy: bool) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        start = time.perf_counter()
+        _populate(engine, prospects, runs_per_prospect)
+        print(f"populated {prospects} prospects / {prospects * runs_per_prospect} runs "
+              f"in {time.perf_counter() - start:.1f} s")
+
+        out = Path(tmp_dir) / "export"
+        db = SessionLocal(bind=engine)
+        try:
+            for table in ("runs", "competitors"):
+                _time(f"{table}.parquet", lambda: analytics.write_table(
+                    db, table, out / f"{table}.parquet", batch_size=batch_size, include_archived=False,
+                ))
+            _time("runs.arrow", lambda: analytics.write_table(
+                db, "runs", out / "runs.arrow", "arrow", batch_size=batch_size, include_archived=False,
+            ))
+            if legacy:
+                _time("legacy per-prospect paging", lambda: _legacy(db))
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--prospects", type=int, default=20_000)
+    parser.add_argument("--runs-per-prospect", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=analytics.EXPORT_BATCH)
+    parser.add_argument("--legacy", action="store_true", help="also time per-prospect endpoint-style paging")
+    args = parser.parse_args()
+    main(args.prospects, args.runs_per_prospect, args.batch_size, args.legacy)
@@ -0,0 +1,105 @@
+"""Benchmark — full-text search over stored LLM answers (SQLite FTS5).
+
+Populates the content-addressed answers table (plus its FTS index and refs)
+with synthetic answers naming companies, then times /api/search/answers
+queries with and without filters. --legacy also times the previous approach:
+decompressing every answer and scanning it in Python.
+
+    python -m benchmarks.bench_answer_search --answers 1000000 [--legacy]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, literal_column, select
+
+from src.prospecting.answers import answer_hash
+from src.prospecting.database import SessionLocal, init_db
+from src.prospecting.ia_test import normalize_name
+from src.prospecting.models import AnswerDB, AnswerRefDB
+from src.prospecting.search import _fts, fold, search_answers
+
+_WORDS = ("toiture", "couvreur", "devis", "intervention", "rapide", "avis", "clients", "zinguerie",
+          "charpente", "isolation", "réparation", "urgence", "gouttières", "qualité", "prix")
+_MODELS = ("openai", "anthropic", "gemini")
+
+
+def _answer(rng: random.Random, i: int) -> str:
+    names = [f"Toitures Ément{rng.randrange(5000)}", f"Couvreurs Rhône {rng.randrange(500)}", f"Atelier n{i}"]
+    words = [rng.choice(_WORDS) for _ in range(60)]
+    for name in names:
+        words.insert(rng.randrange(len(words)), name)
+    return "Voici quelques entreprises : " + " ".join(words) + "."
+
+
+def _populate(engine, answers: int, campaigns: int) -> list:
+    """Bulk load: answers + index rows (same folding as store_answers) + one ref per answer."""
+    rng = random.Random(7)
+    campaign_ids = [str(uuid.uuid4()) for _ in range(campaigns)]
+    start = datetime(2026, 1, 1)
+    chunk = 20_000
+    for offset in range(0, answers, chunk):
+        texts = {answer_hash(t): t for t in (_answer(rng, i) for i in range(offset, min(offset + chunk, answers)))}
+        with engine.begin() as conn:
+            conn.execute(insert(AnswerDB), [{"hash": h, "body": t, "entities": "[]"} for h, t in texts.items()])
+            rowids = conn.execute(select(literal_column("rowid"), AnswerDB.hash).where(AnswerDB.hash.in_(texts)))
+            conn.execute(insert(_fts), [{"rowid": rowid, "body": fold(texts[h])} for rowid, h in rowids])
+            conn.execute(insert(AnswerRefDB), [
+                {"run_id": str(uuid.uuid4()), "query_index": 0, "answer_hash": h,
+                 "campaign_id": campaign_ids[(offset + i) % campaigns], "prospect_id": str(uuid.uuid4()),
+                 "model": _MODELS[(offset + i) % 3], "query": "couvreur Lyon", "ts": start + timedelta(minutes=offset + i)}
+                for i, h in enumerate(texts)
+            ])
+    return campaign_ids
+
+
+def _legacy(db, q: str) -> int:
+    """Previous approach: dump every answer and grep it."""
+    needle = f" {normalize_name(q)} "
+    return sum(1 for body in db.scalars(select(AnswerDB.body)) if needle in f" {normalize_name(body)} ")
+
+
+def _time(label: str, fn, repeat: int = 5) -> None:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<36} {best * 1000:9.2f} ms  ({result} hits)")
+
+
+def main(answers: int, campaigns: int, legacy: bool) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+        init_db(engine)
+        start = time.perf_counter()
+        campaign_ids = _populate(engine, answers, campaigns)
+        print(f"populated {answers} answers in {time.perf_counter() - start:.1f} s")
+
+        db = SessionLocal(bind=engine)
+        try:
+            _time("rare name (Atelier n4242)", lambda: len(search_answers(db, "Atelier n4242")))
+            _time("name (Toitures Ement123)", lambda: len(search_answers(db, "toitures ement123")))
+            _time("+ campaign filter", lambda: len(search_answers(db, "toitures ement123", campaign_id=campaign_ids[0])))
+            _time("+ model + since", lambda: len(search_answers(
+                db, "toitures ement123", model="gemini", since=datetime(2026, 3, 1),
+            )))
+            _time("common phrase (couvreurs rhone 7)", lambda: len(search_answers(db, "couvreurs rhône 7")))
+            if legacy:
+                _time("legacy decompress + scan", lambda: _legacy(db, "Atelier n4242"), repeat=1)
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--answers", type=int, default=200_000)
+    parser.add_argument("--campaigns", type=int, default=100)
+    parser.add_argument("--legacy", action="store_true", help="also time a full decompress-and-scan")
+    args = parser.parse_args()
+    main(args.answers, args.campaigns, args.legacy)
@@ -0,0 +1,105 @@
+"""Benchmark — persistence of completed 20-query pro audits.
+
+Compares the legacy path (audit commit + refresh, then one db.add per
+query and a second commit, recommendations not persisted) with
+AuditService._persist_results (one transaction, multi-row INSERTs for
+queries and recommendations).
+
+Requires a PostgreSQL database (DATABASE_URL), e.g. `make docker-up`:
+
+    python -m benchmarks.bench_audit_persistence --audits 200
+"""
+import argparse
+import asyncio
+import time
+
+from src.core.domain.audit_session import AuditResult, AuditSession
+from src.database.models import Audit as AuditModel, Query as QueryModel
+from src.database.session import AsyncSessionLocal, Base, async_engine
+from src.services.audit_service import AuditService
+
+
+def _completed_session(n_queries: int = 20, n_recommendations: int = 4) -> AuditSession:
+    session = AuditSession(company_name="Bench Co", sector="restaurant", plan="pro", status="completed")
+    session.visibility_score = 42.0
+    session.results = [
+        AuditResult(
+            query=f"meilleur restaurant Paris {i}",
+            ai_provider="chatgpt",
+            company_mentioned=i % 4 == 0,
+            position=2 if i % 4 == 0 else None,
+            competitors=["Comp A", "Comp B", "Comp C"],
+            raw_response="Réponse simulée " * 40,
+        )
+        for i in range(n_queries)
+    ]
+    session.metadata["analysis"] = {"competitors": [], "gaps": []}
+    session.metadata["recommendations"] = [
+        {
+            "type": "content",
+            "title": f"Recommandation {i}",
+            "description": "Description",
+            "priority": i + 1,
+            "content": {"format": "HTML", "sections": [{"heading": "À propos", "content": "..." * 50}]},
+            "integration_guide": "# Guide\n" * 30,
+            "estimated_impact": "high",
+        }
+        for i in range(n_recommendations)
+    ]
+    return session
+
+
+async def _new_pending_audit(db) -> AuditModel:
+    audit = AuditModel(company_name="Bench Co", sector="restaurant", plan="pro", status="pending")
+    db.add(audit)
+    await db.commit()
+    await db.refresh(audit)
+    return audit
+
+
+async def _legacy_persist(db, audit: AuditModel, session: AuditSession) -> None:
+    """Pre-bulk behaviour, kept here as the baseline."""
+    audit.status = session.status
+    audit.visibility_score = session.visibility_score
+    audit.results = {"recommendations": session.metadata["recommendations"]}
+    await db.commit()
+    await db.refresh(audit)
+    for result in session.results:
+        db.add(QueryModel(
+            audit_id=audit.id,
+            query_text=result.query,
+            ai_provider=result.ai_provider,
+            ai_response=result.raw_response,
+            company_mentioned=result.company_mentioned,
+            position=result.position,
+            competitors_found=result.competitors,
+        ))
+    await db.commit()
+
+
+async def _bench(label: str, persist, n_audits: int) -> None:
+    session = _completed_session()
+    elapsed = 0.0
+    async with AsyncSessionLocal() as db:
+        for _ in range(n_audits):
+            audit = await _new_pending_audit(db)
+            start = time.perf_counter()
+            await persist(db, audit, session)
+            elapsed += time.perf_counter() - start
+    print(f"{label:<8} {n_audits} audits  {elapsed * 1000 / n_audits:7.2f} ms/audit")
+
+
+async def main(n_audits: int) -> None:
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    await _bench("legacy", _legacy_persist, n_audits)
+    await _bench("bulk", AuditService._persist_results, n_audits)
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--audits", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.audits))
@@ -0,0 +1,98 @@
+"""Benchmark — /api/campaigns listing and campaign status counters on SQLite.
+
+Compares the previous listing (every campaign, len(c.prospects) lazy-loading
+each campaign's prospects) with keyset pages plus one GROUP BY per page:
+
+    python -m benchmarks.bench_campaign_listing --campaigns 1000 --prospects 1000000 [--legacy]
+"""
+import argparse
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, text
+
+from src.prospecting.database import SessionLocal, db_campaign_counts, db_list_campaigns, db_list_campaigns_page
+from src.prospecting.models import Base, CampaignDB, ProspectDB, ProspectStatus
+
+_STATUSES = [s.value for s in ProspectStatus]
+
+
+def _populate(engine, campaigns: int, prospects: int) -> None:
+    start = datetime(2026, 1, 1)
+    campaign_ids = [str(uuid.uuid4()) for _ in range(campaigns)]
+    with engine.begin() as conn:
+        conn.execute(insert(CampaignDB), [
+            {"campaign_id": cid, "profession": "couvreur", "city": f"Ville {i}", "created_at": start + timedelta(minutes=i)}
+            for i, cid in enumerate(campaign_ids)
+        ])
+    chunk = 50_000
+    for offset in range(0, prospects, chunk):
+        with engine.begin() as conn:
+            conn.execute(insert(ProspectDB), [
+                {"prospect_id": str(uuid.uuid4()), "campaign_id": campaign_ids[i % campaigns],
+                 "name": f"P{i}", "city": "Lyon", "profession": "couvreur",
+                 "status": _STATUSES[i % len(_STATUSES)], "eligibility_flag": i % 3 == 0}
+                for i in range(offset, min(offset + chunk, prospects))
+            ])
+
+
+def _legacy(db) -> int:
+    return sum(len(c.prospects) for c in db_list_campaigns(db))
+
+
+def _keyset(db, limit: int) -> int:
+    total, cursor = 0, None
+    while True:
+        campaigns, cursor = db_list_campaigns_page(db, limit, cursor)
+        counts = db_campaign_counts(db, [c.campaign_id for c in campaigns])
+        total += sum(c["total"] for c in counts.values())
+        if cursor is None:
+            return total
+
+
+def _time(label: str, fn) -> None:
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<28} {(time.perf_counter() - start) * 1000:9.1f} ms  ({result} prospects counted)")
+
+
+def main(campaigns: int, prospects: int, limit: int, legacy: bool) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        start = time.perf_counter()
+        _populate(engine, campaigns, prospects)
+        print(f"populated {campaigns} campaigns / {prospects} prospects in {time.perf_counter() - start:.1f} s")
+
+        with engine.connect() as conn:
+            plan = conn.execute(text(
+                "EXPLAIN QUERY PLAN SELECT campaign_id, status, count(*) FROM prospects "
+                "WHERE campaign_id IN ('a', 'b') GROUP BY campaign_id, status"
+            )).all()
+            print("plan:", " | ".join(row[-1] for row in plan))
+
+        db = SessionLocal(bind=engine)
+        try:
+            first = db_list_campaigns_page(db, limit)[0]
+            _time(f"first page ({limit})", lambda: sum(
+                c["total"] for c in db_campaign_counts(db, [c.campaign_id for c in first]).values()
+            ))
+            _time("all pages (keyset)", lambda: _keyset(db, limit))
+            if legacy:
+                db.expunge_all()
+                _time("legacy len(c.prospects)", lambda: _legacy(db))
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--campaigns", type=int, default=1000)
+    parser.add_argument("--prospects", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--legacy", action="store_true", help="also time the ORM listing (loads every prospect)")
+    args = parser.parse_args()
+    main(args.campaigns, args.prospects, args.limit, args.legacy)
@@ -0,0 +1,115 @@
+"""Benchmark — inverted competitor index on SQLite.
+
+Compares "where is competitor X recommended, by which models, how often"
+answered from competitor_index with the previous full scan of the
+competitors_entities JSON of every run, and measures the index upkeep
+cost on run insertion:
+
+    python -m benchmarks.bench_competitor_index --prospects 20000 --runs-per-prospect 10 [--legacy]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, select
+
+from src.prospecting.competitors import competitor_report, index_runs
+from src.prospecting.database import SessionLocal, init_db
+from src.prospecting.ia_test import normalize_name
+from src.prospecting.models import CampaignDB, ProspectDB, TestRunDB
+
+_MODELS = ["openai", "anthropic", "gemini"]
+_CITIES = [f"Ville {i}" for i in range(200)]
+
+
+def _populate(engine, prospects: int, runs_per_prospect: int, index: bool) -> float:
+    """Returns the seconds spent maintaining the index."""
+    start = datetime(2026, 1, 1)
+    campaign_ids = {city: str(uuid.uuid4()) for city in _CITIES}
+    prospect_rows = [
+        {"prospect_id": str(uuid.uuid4()), "campaign_id": campaign_ids[_CITIES[i % len(_CITIES)]],
+         "name": f"P{i}", "city": _CITIES[i % len(_CITIES)], "profession": "couvreur"}
+        for i in range(prospects)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(CampaignDB), [
+            {"campaign_id": cid, "profession": "couvreur", "city": city} for city, cid in campaign_ids.items()
+        ])
+        conn.execute(insert(ProspectDB), prospect_rows)
+
+    indexing, chunk, total = 0.0, 50_000, prospects * runs_per_prospect
+    for offset in range(0, total, chunk):
+        rows = []
+        for i in range(offset, min(offset + chunk, total)):
+            p = prospect_rows[i % prospects]
+            rows.append({
+                "run_id": str(uuid.uuid4()), "campaign_id": p["campaign_id"], "prospect_id": p["prospect_id"],
+                "model": _MODELS[i % 3], "ts": start + timedelta(minutes=i),
+                "competitors_entities": json.dumps([f"Toitures {i % 997}", f"Couverture {i % 89}", "Alpha Toit"]),
+            })
+        with engine.begin() as conn:
+            conn.execute(insert(TestRunDB), rows)
+            if index:
+                started = time.perf_counter()
+                index_runs(conn, [_Row(r) for r in rows])
+                indexing += time.perf_counter() - started
+    return indexing
+
+
+class _Row:
+    def __init__(self, values):
+        self.__dict__.update(values)
+
+
+def _legacy(db, name: str) -> int:
+    """Previous approach: scan every run's competitors_entities."""
+    key = normalize_name(name)
+    by_city: Counter = Counter()
+    rows = db.execute(
+        select(TestRunDB.model, TestRunDB.competitors_entities, ProspectDB.city)
+        .join(ProspectDB, ProspectDB.prospect_id == TestRunDB.prospect_id)
+    )
+    for model, competitors, city in rows:
+        if any(normalize_name(c) == key for c in json.loads(competitors)):
+            by_city[(city, model)] += 1
+    return sum(by_city.values())
+
+
+def _time(label: str, fn) -> None:
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<32} {(time.perf_counter() - start) * 1000:9.1f} ms  ({result} runs)")
+
+
+def main(prospects: int, runs_per_prospect: int, legacy: bool) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+        init_db(engine)
+        start = time.perf_counter()
+        indexing = _populate(engine, prospects, runs_per_prospect, index=True)
+        total = prospects * runs_per_prospect
+        print(f"populated {prospects} prospects / {total} runs in {time.perf_counter() - start:.1f} s "
+              f"(index upkeep {indexing:.1f} s, {indexing / total * 1e6:.0f} µs/run)")
+
+        db = SessionLocal(bind=engine)
+        try:
+            _time("index: Toitures 42", lambda: competitor_report(db, "Toitures 42")["runs"])
+            _time("index: Alpha Toit (every run)", lambda: competitor_report(db, "alpha toit")["runs"])
+            if legacy:
+                _time("legacy scan: Toitures 42", lambda: _legacy(db, "Toitures 42"))
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--prospects", type=int, default=20_000)
+    parser.add_argument("--runs-per-prospect", type=int, default=10)
+    parser.add_argument("--legacy", action="store_true", help="also time the full JSON scan")
+    args = parser.parse_args()
+    main(args.prospects, args.runs_per_prospect, args.legacy)
@@ -0,0 +1,101 @@
+"""Benchmark — CSV prospect import into SQLite.
+
+Compares the previous path (whole upload decoded, load_from_csv list,
+one add/commit/refresh per prospect then a SCHEDULED commit) with the
+streaming importer (batched validation, multi-row INSERT, one commit per
+batch, dedupe index). Uses a throwaway SQLite file:
+
+    python -m benchmarks.bench_csv_import --rows 100000 --legacy-rows 2000 [--trace-memory]
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import create_engine
+
+from src.prospecting.database import SessionLocal, jdumps
+from src.prospecting.models import Base, CampaignDB, ProspectDB, ProspectStatus
+from src.prospecting.prospect_scan import import_csv, load_from_csv
+
+
+def _write_csv(path: str, rows: int) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("name,website,phone,reviews_count,google_ads_active\n")
+        for i in range(rows):
+            # ~1 % de doublons (même nom qu'une ligne précédente)
+            n = i - 1 if i % 100 == 99 else i
+            f.write(f"Couvreur {n} SARL,https://www.couvreur-{n}.fr,04000{i:05d},{i % 300},{'oui' if i % 3 else ''}\n")
+
+
+def _session(tmp_dir: str, name: str):
+    engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, name)}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    db = SessionLocal(bind=engine)
+    campaign = CampaignDB(profession="couvreur", city="Lyon")
+    db.add(campaign)
+    db.commit()
+    return db, campaign
+
+
+def _legacy(db, campaign, path: str) -> int:
+    with open(path, "rb") as f:
+        inputs = load_from_csv(f.read().decode("utf-8"), "Lyon", "couvreur")
+    created = []
+    for inp in inputs:
+        p = ProspectDB(
+            campaign_id=campaign.campaign_id, name=inp.name, city=inp.city, profession=inp.profession,
+            website=inp.website, phone=inp.phone, reviews_count=inp.reviews_count,
+            google_ads_active=inp.google_ads_active, competitors_cited=jdumps([]),
+            status=ProspectStatus.SCANNED.value,
+        )
+        db.add(p)
+        db.commit()
+        db.refresh(p)
+        created.append(p)
+    for p in created:
+        p.status = ProspectStatus.SCHEDULED.value
+    db.commit()
+    return len(created)
+
+
+def _streaming(db, campaign, path: str) -> int:
+    with open(path, "rb") as f:
+        return import_csv(db, f, campaign, "Lyon", "couvreur")["created"]
+
+
+def _bench(label: str, run, tmp_dir: str, rows: int, trace_memory: bool) -> None:
+    path = os.path.join(tmp_dir, f"{label}.csv")
+    _write_csv(path, rows)
+    db, campaign = _session(tmp_dir, f"{label}.db")
+
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    created = run(db, campaign, path)
+    elapsed = time.perf_counter() - start
+    memory = ""
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        memory = f"  peak {peak / 1024 / 1024:6.1f} MiB"
+    db.close()
+
+    print(f"{label:<9} {rows:>7} rows  {created:>7} created  {elapsed:7.2f} s  {rows / elapsed:9.0f} rows/s{memory}")
+
+
+def main(rows: int, legacy_rows: int, trace_memory: bool) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if legacy_rows:
+            _bench("legacy", _legacy, tmp_dir, legacy_rows, trace_memory)
+        _bench("streaming", _streaming, tmp_dir, rows, trace_memory)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--legacy-rows", type=int, default=2000, help="0 to skip (one commit per row is slow)")
+    parser.add_argument("--trace-memory", action="store_true", help="report peak Python allocations (slower)")
+    args = parser.parse_args()
+    main(args.rows, args.legacy_rows, args.trace_memory)
@@ -0,0 +1,90 @@
+"""Benchmark — competitor entity resolution (MinHash / LSH) on SQLite.
+
+Generates N distinct competitors with word-order, plural, legal-suffix and
+accent variants, resolves every spelling incrementally in batches (as
+competitors.index_runs does), then re-resolves already known spellings and
+reports clustering purity against the generated ground truth:
+
+    python -m benchmarks.bench_entity_resolution --entities 20000 --variants 4 [--batch 1000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+
+from sqlalchemy import create_engine
+
+from src.prospecting.database import init_db
+from src.prospecting.ia_test import normalize_name
+from src.prospecting.resolution import resolve_keys
+
+_TRADES  = ["Toitures", "Couverture", "Charpente", "Zinguerie", "Étanchéité", "Isolation", "Ravalement", "Façades"]
+_SUFFIX  = ["", " SARL", " SAS", " & Fils", " EURL"]
+_ACCENTS = str.maketrans("éèàç", "eeac")
+
+
+def _surnames(n: int, rng: random.Random):
+    syllables = ["ma", "ri", "to", "du", "pon", "ber", "nard", "le", "roy", "gar", "cia", "mo", "rel", "fa", "vre"]
+    seen = set()
+    while len(seen) < n:
+        seen.add("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))).capitalize())
+    return sorted(seen)
+
+
+def _variants(trade: str, surname: str, count: int, rng: random.Random):
+    forms = [
+        f"{trade} {surname}", f"{surname} {trade}", f"{trade.rstrip('s')} {surname}",
+        f"{trade} {surname}".translate(_ACCENTS), f"{surname} {trade.upper()}",
+    ]
+    return [f + rng.choice(_SUFFIX) for f in rng.sample(forms, min(count, len(forms)))]
+
+
+def main(entities: int, variants: int, batch: int) -> None:
+    rng   = random.Random(7)
+    truth = {}
+    for i, surname in enumerate(_surnames(entities, rng)):
+        for spelling in _variants(_TRADES[i % len(_TRADES)], surname, variants, rng):
+            key = normalize_name(spelling)
+            if key:
+                truth.setdefault(key, (i, spelling))
+    keys = list(truth)
+    rng.shuffle(keys)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+        init_db(engine)
+        resolved = {}
+        start = time.perf_counter()
+        for offset in range(0, len(keys), batch):
+            with engine.begin() as conn:
+                resolved.update(resolve_keys(conn, {k: truth[k][1] for k in keys[offset:offset + batch]}))
+        elapsed = time.perf_counter() - start
+        print(f"resolved {len(keys)} new spellings of {entities} competitors in {elapsed:.1f} s "
+              f"({elapsed / len(keys) * 1e3:.2f} ms/spelling)")
+
+        start = time.perf_counter()
+        with engine.begin() as conn:
+            for offset in range(0, len(keys), batch):
+                resolve_keys(conn, {k: truth[k][1] for k in keys[offset:offset + batch]})
+        elapsed = time.perf_counter() - start
+        print(f"re-resolved known spellings in {elapsed:.2f} s ({elapsed / len(keys) * 1e6:.0f} µs/spelling)")
+
+    by_entity, by_truth = defaultdict(set), defaultdict(set)
+    for key, entity_id in resolved.items():
+        by_entity[entity_id].add(truth[key][0])
+        by_truth[truth[key][0]].add(entity_id)
+    merged = sum(1 for ids in by_entity.values() if len(ids) > 1)
+    split  = sum(1 for ids in by_truth.values() if len(ids) > 1)
+    print(f"{len(by_entity)} entities found for {len(by_truth)} generated: "
+          f"{merged} merge distinct competitors, {split} competitors split")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entities", type=int, default=20_000)
+    parser.add_argument("--variants", type=int, default=4)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+    main(args.entities, args.variants, args.batch)
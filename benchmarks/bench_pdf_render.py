@@ -0,0 +1,76 @@
+"""Benchmark — guide PDF render throughput.
+
+Renders distinct guides (cold cache) through PDFRenderer with an
+increasing number of worker processes, then downloads the same guides
+again (warm cache, served from disk).
+
+Requires WeasyPrint's system libraries (pango), as in the Docker image:
+
+    python -m benchmarks.bench_pdf_render --guides 24 --workers 1 2 4
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+
+from src.services.pdf_renderer import PDFRenderer, guide_digest
+
+
+def _context(i: int, n_recommendations: int = 6) -> dict:
+    return {
+        "company_name": f"Bench Co {i}",
+        "sector": "restaurant",
+        "location": "Paris",
+        "visibility_score": 42.0,
+        "completed_at": "2026-01-01T00:00:00+00:00",
+        "recommendations": [
+            {
+                "type": "content",
+                "title": f"Recommandation {r}",
+                "description": "Description " * 20,
+                "priority": r % 5 + 1,
+                "estimated_impact": "high",
+                "content": {"format": "HTML", "sections": [{"heading": "À propos", "content": "Contenu " * 80}]},
+                "integration_guide": "# Guide\n" + "1. Étape d'intégration\n" * 15,
+            }
+            for r in range(n_recommendations)
+        ],
+    }
+
+
+async def _bench(workers: int, n_guides: int) -> None:
+    contexts = [_context(i) for i in range(n_guides)]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        renderer = PDFRenderer(cache_dir, workers=workers)
+
+        # Warm the pool so process start-up is not counted
+        await renderer.render(_context(-1))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(renderer.render(c, guide_digest(c)) for c in contexts))
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await asyncio.gather(*(renderer.render(c, guide_digest(c)) for c in contexts))
+        warm = time.perf_counter() - start
+
+        renderer.shutdown()
+
+    print(
+        f"workers={workers:<2} {n_guides} guides  "
+        f"cold {n_guides / cold:6.1f} pdf/s ({cold * 1000 / n_guides:7.1f} ms/pdf)  "
+        f"cached {warm * 1e6 / n_guides:7.1f} µs/pdf"
+    )
+
+
+async def main(n_guides: int, workers: list) -> None:
+    for n in workers:
+        await _bench(n, n_guides)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--guides", type=int, default=24)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+    asyncio.run(main(args.guides, args.workers))
@@ -0,0 +1,124 @@
+"""Benchmark — visibility time series on SQLite.
+
+Six months of scheduled slots (3 days × 3 times a week, 3 models) for N
+prospects. Compares a prospect trend read from the visibility_points
+rollups with re-aggregating the prospect's raw runs, and measures the
+rollup upkeep cost on run insertion:
+
+    python -m benchmarks.bench_trends --prospects 300 --weeks 26 [--legacy]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, select
+
+from src.prospecting import competitors
+from src.prospecting.database import SessionLocal, init_db
+from src.prospecting.ia_test import normalize_name
+from src.prospecting.models import CampaignDB, ProspectDB, TestRunDB
+from src.prospecting.trends import index_runs, periods, prospect_trend
+
+_MODELS = ["openai", "anthropic", "gemini"]
+_SLOTS  = [(2, 7, 0), (2, 11, 0), (2, 18, 30), (4, 7, 0), (4, 11, 0), (4, 18, 30), (6, 7, 0), (6, 11, 0), (6, 18, 30)]
+
+
+class _Row:
+    def __init__(self, values):
+        self.__dict__.update(values)
+
+
+def _populate(engine, prospects: int, weeks: int) -> tuple:
+    """Returns (runs inserted, seconds spent maintaining the rollups)."""
+    rng = random.Random(3)
+    campaign_id = str(uuid.uuid4())
+    ids = [str(uuid.uuid4()) for _ in range(prospects)]
+    with engine.begin() as conn:
+        conn.execute(insert(CampaignDB), [{"campaign_id": campaign_id, "profession": "couvreur", "city": "Lyon"}])
+        conn.execute(insert(ProspectDB), [
+            {"prospect_id": pid, "campaign_id": campaign_id, "name": f"P{i}", "city": "Lyon", "profession": "couvreur"}
+            for i, pid in enumerate(ids)
+        ])
+
+    monday, total, upkeep = datetime(2026, 4, 6), 0, 0.0
+    for week in range(weeks):
+        rows = []
+        for weekday, hour, minute in _SLOTS:
+            ts = monday + timedelta(weeks=week, days=weekday, hours=hour, minutes=minute)
+            for pid in ids:
+                for model in _MODELS:
+                    mentions = [rng.random() < 0.1 for _ in range(5)]
+                    rows.append({
+                        "run_id": str(uuid.uuid4()), "campaign_id": campaign_id, "prospect_id": pid, "model": model,
+                        "ts": ts, "mentioned_target": any(mentions), "mention_per_query": json.dumps(mentions),
+                        "competitors_entities": json.dumps([f"Toitures {rng.randrange(40)}", f"Couverture {rng.randrange(15)}"]),
+                    })
+        with engine.begin() as conn:
+            conn.execute(insert(TestRunDB), rows)
+            started = time.perf_counter()
+            competitors.index_runs(conn, [_Row(r) for r in rows])
+            index_runs(conn, [_Row(r) for r in rows])
+            upkeep += time.perf_counter() - started
+        total += len(rows)
+    return total, upkeep, ids
+
+
+def _legacy(db, prospect_id: str) -> int:
+    """Previous approach: re-aggregate the prospect's raw runs (per week, model, query, competitor)."""
+    weeks = defaultdict(lambda: {"runs": 0, "hits": 0, "models": Counter(), "queries": Counter(), "cited": Counter()})
+    rows = db.execute(
+        select(TestRunDB.ts, TestRunDB.model, TestRunDB.mentioned_target, TestRunDB.mention_per_query,
+               TestRunDB.competitors_entities)
+        .where(TestRunDB.prospect_id == prospect_id)
+    )
+    for ts, model, mentioned, per_query, cited in rows:
+        week = weeks[periods(ts)["week"]]
+        week["runs"] += 1
+        week["hits"] += int(mentioned)
+        week["models"][model] += int(mentioned)
+        week["queries"].update(qi for qi, m in enumerate(json.loads(per_query)) if m)
+        week["cited"].update({normalize_name(c) for c in json.loads(cited)})
+    return len(weeks)
+
+
+def _time(label: str, fn, repeat: int = 20) -> None:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    print(f"{label:<28} {(time.perf_counter() - start) / repeat * 1000:8.2f} ms  ({result} points)")
+
+
+def main(prospects: int, weeks: int, legacy: bool) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+        init_db(engine)
+        start = time.perf_counter()
+        total, upkeep, ids = _populate(engine, prospects, weeks)
+        print(f"populated {prospects} prospects / {total} runs in {time.perf_counter() - start:.1f} s "
+              f"(rollup upkeep {upkeep:.1f} s, {upkeep / total * 1e6:.0f} µs/run incl. competitor index)")
+
+        db = SessionLocal(bind=engine)
+        try:
+            pid = ids[len(ids) // 2]
+            for resolution in ("week", "day", "slot"):
+                _time(f"rollups: {resolution}", lambda r=resolution: len(prospect_trend(db, pid, r)["points"]))
+            if legacy:
+                _time("legacy: raw runs per week", lambda: _legacy(db, pid))
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--prospects", type=int, default=300)
+    parser.add_argument("--weeks", type=int, default=26)
+    parser.add_argument("--legacy", action="store_true", help="also time re-aggregating raw runs")
+    args = parser.parse_args()
+    main(args.prospects, args.weeks, args.legacy)
@@ -0,0 +1,82 @@
+"""HTTP conditional responses (ETag / Last-Modified → 304 Not Modified)."""
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if If-None-Match lists etag (weak comparison, RFC 9110)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def not_modified_since(request: Request, last_modified: datetime) -> bool:
+    """True if If-Modified-Since is at or after last_modified (second precision)."""
+    header = request.headers.get("if-modified-since")
+    if not header:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    return int(last_modified.timestamp()) <= int(since.timestamp())
+
+
+def not_modified(
+    request: Request,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    cache_control: str = "private, max-age=3600",
+) -> Optional[Response]:
+    """
+    304 response if the client's copy is current, else None.
+
+    last_modified must be timezone-aware. If-None-Match takes precedence
+    over If-Modified-Since.
+    """
+    if request.headers.get("if-none-match"):
+        fresh = etag_matches(request, etag)
+    else:
+        fresh = last_modified is not None and not_modified_since(request, last_modified)
+
+    if not fresh:
+        return None
+    return Response(status_code=304, headers=validator_headers(etag, last_modified, cache_control))
+
+
+def validator_headers(
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    cache_control: str = "private, max-age=3600",
+) -> Dict[str, str]:
+    """ETag / Last-Modified / Cache-Control headers."""
+    validators = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        validators["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    return validators
+
+
+def conditional_response(
+    request: Request,
+    body: bytes,
+    media_type: str,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    cache_control: str = "private, max-age=3600",
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """Response with validators, or 304 if the client's copy is current."""
+    cached = not_modified(request, etag, last_modified, cache_control)
+    if cached is not None:
+        return cached
+
+    validators = validator_headers(etag, last_modified, cache_control)
+    return Response(content=body, media_type=media_type, headers={**(headers or {}), **validators})
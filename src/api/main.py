@@ -6,6 +6,7 @@ import os
 
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
@@ -42,16 +43,35 @@ def startup():
     init_db()
     logger.info("Base de données prospecting initialisée (SQLite)")
 
+    from ..prospecting.templates import warm_templates
+    logger.info(f"Templates prospecting compilés ({warm_templates()} variantes)")
+
     # Démarrer le scheduler
     from ..prospecting.scheduler import start_scheduler
     start_scheduler()
     logger.info("Scheduler APScheduler démarré")
 
 
+@app.on_event("startup")
+async def startup_cache():
+    from ..utils.cache import cache
+    await cache.connect()
+
+
 @app.on_event("shutdown")
 def shutdown():
+    from ..prospecting.landing_cache import wait_republished
     from ..prospecting.scheduler import stop_scheduler
     stop_scheduler()
+    wait_republished(timeout=30)
+
+
+@app.on_event("shutdown")
+async def shutdown_cache():
+    from ..utils.cache import cache
+    from ..services.pdf_renderer import pdf_renderer
+    await cache.disconnect()
+    pdf_renderer.shutdown()
 
 
 # ── Routes B2C (existantes) ──
@@ -76,6 +96,12 @@ async def health():
     }
 
 
+@app.get("/metrics")
+def metrics():
+    from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 # ── Routes B2B — Pipeline prospection ──
 from .routes.campaign       import router as campaign_router
 from .routes.ia_test_routes import router as ia_test_router
@@ -89,6 +115,10 @@ app.include_router(scoring_router)
 app.include_router(generate_router)
 app.include_router(admin_router)
 
+# ── Pages statiques publiées (landing + audit READY_TO_SEND) ──
+from ..prospecting.generate import PUBLISHED_DIR
+app.mount("/p", StaticFiles(directory=str(PUBLISHED_DIR), html=True), name="published")
+
 # ── Routes B2C (existantes si disponibles) ──
 try:
     from .routes.audit   import router as audit_router
@@ -1,20 +1,39 @@
 """
 Admin UI — /admin/campaign/{id}
 Guard : ADMIN_TOKEN (header X-Admin-Token ou query param token)
+
+- page paginée (ADMIN_PAGE_SIZE lignes), compteurs par agrégat SQL
+- /admin/campaign/{id}/stream : SSE, deltas de lignes lus dans prospect_events
+  (aucune requête tant que rien ne change) ; la page patche ses lignes en JS
+- formulaires envoyés en fetch (réponse JSON), redirection sans JavaScript
+- /admin/export/{table}.{fmt} : export analytique Parquet / Arrow IPC streamé
 """
+import asyncio
+import json
 import os
+from typing import Dict, List, Optional, Tuple
+
 from fastapi import APIRouter, Depends, HTTPException, Request, Form
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
-from ...prospecting.database import get_db, db_get_campaign, db_list_prospects, jloads
-from ...prospecting.models import ProspectStatus, AssetsInput
-from ...prospecting.assets import set_assets, mark_ready_to_send
+from ...prospecting.database import (
+    SessionLocal, get_db, db_campaign_counts, db_get_campaign, db_list_campaigns_page, jloads,
+)
+from ...prospecting.events import MAX_PAGE, events_since, latest_seq, notifier
+from ...prospecting.models import ProspectDB, ProspectStatus, AssetsInput
+from ...prospecting.assets import set_assets, mark_ready_to_send, promote_ready
 from ...prospecting.generate import landing_url
+from ...prospecting.templates import render
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
 ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "changeme-admin-token")
+PAGE_SIZE   = int(os.getenv("ADMIN_PAGE_SIZE", "50"))
+STREAM_POLL = float(os.getenv("ADMIN_STREAM_POLL", "1.0"))   # secondes entre deux lectures du notifier
+HEARTBEAT   = 15.0
+
+_SCORED_STATES = [ProspectStatus.SCORED.value, ProspectStatus.READY_ASSETS.value, ProspectStatus.READY_TO_SEND.value]
 
 
 def _check_auth(request: Request):
@@ -26,119 +45,136 @@ def _check_auth(request: Request):
         raise HTTPException(401, "Non autorisé — X-Admin-Token invalide")
 
 
-_ADMIN_CSS = """
-<style>
-*{box-sizing:border-box;margin:0;padding:0}
-body{font-family:'Segoe UI',sans-serif;background:#f4f6fb;color:#1a1a2e;padding:30px}
-h1{color:#1a1a2e;margin-bottom:6px;font-size:26px}
-.meta{color:#666;font-size:14px;margin-bottom:30px}
-table{border-collapse:collapse;width:100%;background:#fff;border-radius:10px;overflow:hidden;box-shadow:0 2px 8px rgba(0,0,0,.08)}
-th{background:#1a1a2e;color:#fff;padding:12px 16px;font-size:13px;text-align:left;font-weight:600}
-td{padding:11px 16px;border-bottom:1px solid #edf0f7;font-size:14px;vertical-align:middle}
-tr:hover{background:#f8faff}
-.badge{display:inline-block;padding:3px 10px;border-radius:12px;font-size:11px;font-weight:bold}
-.badge-SCANNED{background:#dde;color:#445}
-.badge-SCHEDULED{background:#ddf;color:#336}
-.badge-TESTING{background:#ffd;color:#663}
-.badge-TESTED{background:#d5f5e3;color:#1e8449}
-.badge-SCORED{background:#e8daef;color:#6c3483}
-.badge-READY_ASSETS{background:#fde8d8;color:#b03a2e}
-.badge-READY_TO_SEND{background:#d0f0d0;color:#196f3d}
-.badge-SENT_MANUAL{background:#ccc;color:#555}
-.score{font-weight:bold;color:#e94560;font-size:18px}
-.eligible{color:#1e8449;font-weight:bold}
-.not-eligible{color:#aaa;font-size:12px}
-form.inline{display:inline}
-input[type=url]{padding:5px 8px;border:1px solid #ccc;border-radius:4px;font-size:13px;width:200px}
-.btn{padding:6px 14px;border:none;border-radius:4px;cursor:pointer;font-size:13px;font-weight:600}
-.btn-primary{background:#1a1a2e;color:#fff}
-.btn-green{background:#27ae60;color:#fff}
-.btn-red{background:#e94560;color:#fff}
-.btn:hover{opacity:.85}
-.stats{display:flex;gap:20px;margin-bottom:30px;flex-wrap:wrap}
-.stat{background:#fff;border-radius:8px;padding:16px 24px;border-left:4px solid #e94560;box-shadow:0 2px 6px rgba(0,0,0,.06)}
-.stat .num{font-size:32px;font-weight:bold;color:#e94560}
-.stat .lbl{font-size:13px;color:#666;margin-top:4px}
-</style>
-"""
+def _campaign_stats(db: Session, campaign_id: str) -> Dict[str, int]:
+    counts = db_campaign_counts(db, [campaign_id])[campaign_id]
+    by_status = counts["by_status"]
+    return {
+        "total":    counts["total"],
+        "eligible": counts["eligible"],
+        "ready":    by_status.get(ProspectStatus.READY_TO_SEND.value, 0),
+        "scored":   sum(by_status.get(s, 0) for s in _SCORED_STATES),
+    }
+
 
-def _build_admin_page(campaign, prospects) -> str:
-    stats = {
-        "total": len(prospects),
-        "eligible": sum(1 for p in prospects if p.eligibility_flag),
-        "ready": sum(1 for p in prospects if p.status == ProspectStatus.READY_TO_SEND.value),
-        "scored": sum(1 for p in prospects if p.status in [ProspectStatus.SCORED.value, ProspectStatus.READY_ASSETS.value, ProspectStatus.READY_TO_SEND.value]),
+def _prospect_row(p: ProspectDB) -> Dict:
+    """Delta de ligne envoyé au navigateur (mêmes champs que le template)."""
+    return {
+        "prospect_id":    p.prospect_id,
+        "status":         p.status,
+        "score":          p.ia_visibility_score,
+        "eligible":       bool(p.eligibility_flag),
+        "competitors":    jloads(p.competitors_cited)[:2],
+        "video_url":      p.video_url or "",
+        "screenshot_url": p.screenshot_url or "",
+        "can_mark_ready": p.status == ProspectStatus.READY_ASSETS.value and bool(p.eligibility_flag),
+        "landing_url":    landing_url(p) if p.eligibility_flag else None,
     }
 
-    rows = ""
-    for p in sorted(prospects, key=lambda x: (x.ia_visibility_score or 0), reverse=True):
-        badge  = f'<span class="badge badge-{p.status}">{p.status}</span>'
-        score  = f'<span class="score">{p.ia_visibility_score:.1f}/10</span>' if p.ia_visibility_score is not None else "—"
-        elig   = '<span class="eligible">✓ EMAIL OK</span>' if p.eligibility_flag else '<span class="not-eligible">✗</span>'
-        comps  = ", ".join(jloads(p.competitors_cited)[:2]) or "—"
-        l_url  = f'<a href="{landing_url(p)}" target="_blank" style="font-size:12px">🔗 landing</a>' if p.eligibility_flag else ""
-
-        # Formulaire assets
-        asset_form = f"""
-        <form method="post" action="/admin/prospect/{p.prospect_id}/assets" class="inline">
-          <input type="url" name="video_url" value="{p.video_url or ''}" placeholder="video_url" required>
-          <input type="url" name="screenshot_url" value="{p.screenshot_url or ''}" placeholder="screenshot_url" required>
-          <button class="btn btn-primary" type="submit">Sauvegarder</button>
-        </form>"""
-
-        # Bouton mark ready
-        if p.status == ProspectStatus.READY_ASSETS.value and p.eligibility_flag:
-            ready_btn = f"""
-            <form method="post" action="/admin/prospect/{p.prospect_id}/mark-ready" class="inline">
-              <button class="btn btn-green" type="submit">▶ READY_TO_SEND</button>
-            </form>"""
-        else:
-            ready_btn = ""
-
-        rows += f"""
-        <tr>
-          <td><strong>{p.name}</strong><br><small style="color:#888">{p.website or '—'}</small></td>
-          <td>{score}</td>
-          <td>{elig}</td>
-          <td>{badge}</td>
-          <td>{comps}</td>
-          <td>{asset_form}</td>
-          <td>{ready_btn} {l_url}</td>
-        </tr>"""
-
-    return f"""<!DOCTYPE html>
-<html lang="fr"><head><meta charset="UTF-8"><title>Admin — {campaign.profession} {campaign.city}</title>
-{_ADMIN_CSS}</head><body>
-<h1>🎯 Campagne — {campaign.profession.title()} à {campaign.city}</h1>
-<p class="meta">ID: {campaign.campaign_id} | Mode: {campaign.mode} | Timezone: {campaign.timezone}</p>
-<div class="stats">
-  <div class="stat"><div class="num">{stats['total']}</div><div class="lbl">Prospects</div></div>
-  <div class="stat"><div class="num">{stats['scored']}</div><div class="lbl">Scorés</div></div>
-  <div class="stat"><div class="num">{stats['eligible']}</div><div class="lbl">Éligibles</div></div>
-  <div class="stat"><div class="num">{stats['ready']}</div><div class="lbl">Ready to Send</div></div>
-</div>
-<table>
-  <tr>
-    <th>Prospect</th><th>Score</th><th>Email OK</th><th>Statut</th>
-    <th>Concurrents</th><th>Assets (video / screenshot)</th><th>Actions</th>
-  </tr>
-  {rows}
-</table>
-<p style="margin-top:20px;font-size:13px;color:#999">
-  <a href="/api/generate/campaign" style="color:#e94560">Générer SendQueue</a> |
-  <a href="/api/campaign/{campaign.campaign_id}/status" style="color:#e94560">API status</a>
-</p>
-</body></html>"""
+
+def _build_admin_page(db: Session, campaign, page: int, token: str = "") -> str:
+    stats = _campaign_stats(db, campaign.campaign_id)
+    pages = max(1, -(-stats["total"] // PAGE_SIZE))
+    page  = min(max(page, 1), pages)
+    prospects = (
+        db.query(ProspectDB)
+        .filter(ProspectDB.campaign_id == campaign.campaign_id)
+        .order_by(ProspectDB.ia_visibility_score.desc().nullslast(), ProspectDB.prospect_id)
+        .offset((page - 1) * PAGE_SIZE)
+        .limit(PAGE_SIZE)
+        .all()
+    )
+
+    return render(
+        "admin/campaign.html",
+        campaign=campaign,
+        prospects=prospects,
+        stats=stats,
+        token=token,
+        page=page,
+        pages=pages,
+        since=latest_seq(db),
+        ready_assets=ProspectStatus.READY_ASSETS.value,
+        landing_url=landing_url,
+    )
+
+
+def _wants_json(request: Request) -> bool:
+    return "application/json" in request.headers.get("accept", "")
+
+
+def _campaign_redirect(request: Request, campaign_id: str) -> RedirectResponse:
+    return RedirectResponse(
+        f"/admin/campaign/{campaign_id}?token={request.query_params.get('token', '')}",
+        status_code=303,
+    )
 
 
 @router.get("/campaign/{campaign_id}", response_class=HTMLResponse)
-def admin_campaign(campaign_id: str, request: Request, db: Session = Depends(get_db)):
+def admin_campaign(campaign_id: str, request: Request, page: int = 1, db: Session = Depends(get_db)):
     _check_auth(request)
     campaign = db_get_campaign(db, campaign_id)
     if not campaign:
         raise HTTPException(404, "Campagne introuvable")
-    prospects = db_list_prospects(db, campaign_id)
-    return HTMLResponse(content=_build_admin_page(campaign, prospects))
+    token = request.query_params.get("token", "")
+    return HTMLResponse(content=_build_admin_page(db, campaign, page, token))
+
+
+# ─────────────────────────── LIVE (SSE) ───────────────────────────
+
+def _campaign_changes(bind, campaign_id: str, cursor: int, latest: int) -> Tuple[int, List[Dict], Dict]:
+    """Lignes modifiées depuis cursor (une lecture du journal + une des prospects concernés)."""
+    db = SessionLocal(bind=bind)
+    try:
+        events = [e for e in events_since(db, cursor, MAX_PAGE, campaign_id) if e.seq <= latest]
+        if len(events) == MAX_PAGE:
+            latest = events[-1].seq          # reste lu au tour suivant
+        if not events:
+            return latest, [], {}
+
+        ids  = list(dict.fromkeys(e.prospect_id for e in events))
+        rows = db.query(ProspectDB).filter(ProspectDB.prospect_id.in_(ids)).all()
+        return latest, [_prospect_row(p) for p in rows], _campaign_stats(db, campaign_id)
+    finally:
+        db.close()
+
+
+def _sse(event: str, data: Dict, event_id: int) -> str:
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _campaign_stream(request: Request, bind, campaign_id: str, cursor: int):
+    yield "retry: 3000\n\n"
+    quiet = 0.0
+    while not await request.is_disconnected():
+        latest = await asyncio.to_thread(notifier.latest, lambda: SessionLocal(bind=bind))
+        if latest > cursor:
+            cursor, rows, stats = await asyncio.to_thread(_campaign_changes, bind, campaign_id, cursor, latest)
+            for row in rows:
+                yield _sse("prospect", row, cursor)
+            if stats:
+                yield _sse("stats", stats, cursor)
+                quiet = 0.0
+        if quiet >= HEARTBEAT:
+            yield ": ping\n\n"
+            quiet = 0.0
+        await asyncio.sleep(STREAM_POLL)
+        quiet += STREAM_POLL
+
+
+@router.get("/campaign/{campaign_id}/stream")
+def admin_campaign_stream(campaign_id: str, request: Request, since: int = 0, db: Session = Depends(get_db)):
+    """Flux SSE des lignes modifiées (reprise via Last-Event-ID)."""
+    _check_auth(request)
+    if not db_get_campaign(db, campaign_id):
+        raise HTTPException(404, "Campagne introuvable")
+
+    last_id = request.headers.get("last-event-id", "")
+    cursor  = int(last_id) if last_id.isdigit() else since
+    return StreamingResponse(
+        _campaign_stream(request, db.get_bind(), campaign_id, cursor),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post("/prospect/{prospect_id}/assets")
@@ -158,11 +194,10 @@ async def admin_set_assets(
     except ValueError as e:
         raise HTTPException(400, str(e))
 
+    if _wants_json(request):
+        return JSONResponse({"prospect": _prospect_row(prospect)})
     # Redirect vers l'admin de la campagne
-    return RedirectResponse(
-        f"/admin/campaign/{prospect.campaign_id}?token={request.query_params.get('token', '')}",
-        status_code=303,
-    )
+    return _campaign_redirect(request, prospect.campaign_id)
 
 
 @router.post("/prospect/{prospect_id}/mark-ready")
@@ -177,24 +212,67 @@ async def admin_mark_ready(
     except ValueError as e:
         raise HTTPException(400, str(e))
 
-    return RedirectResponse(
-        f"/admin/campaign/{prospect.campaign_id}?token={request.query_params.get('token', '')}",
-        status_code=303,
-    )
+    if _wants_json(request):
+        return JSONResponse({"prospect": _prospect_row(prospect)})
+    return _campaign_redirect(request, prospect.campaign_id)
+
+
+@router.post("/campaign/{campaign_id}/mark-ready")
+def admin_mark_ready_campaign(campaign_id: str, request: Request, db: Session = Depends(get_db)):
+    """Tous les READY_ASSETS éligibles avec assets → READY_TO_SEND (un seul UPDATE)."""
+    _check_auth(request)
+    if not db_get_campaign(db, campaign_id):
+        raise HTTPException(404, "Campagne introuvable")
+
+    promoted = promote_ready(db, campaign_id=campaign_id, reason="admin")
+    if _wants_json(request):
+        return JSONResponse({"promoted": promoted})
+    return _campaign_redirect(request, campaign_id)
 
 
 @router.get("/campaigns", response_class=HTMLResponse)
-def admin_list_campaigns(request: Request, db: Session = Depends(get_db)):
+def admin_list_campaigns(request: Request, cursor: Optional[str] = None, db: Session = Depends(get_db)):
     _check_auth(request)
-    from ...prospecting.database import db_list_campaigns
-    campaigns = db_list_campaigns(db)
+    try:
+        campaigns, next_cursor = db_list_campaigns_page(db, PAGE_SIZE, cursor)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
     token = request.query_params.get("token", "")
-    rows = "".join(
-        f'<tr><td><a href="/admin/campaign/{c.campaign_id}?token={token}">{c.profession} — {c.city}</a></td>'
-        f'<td>{c.mode}</td><td>{len(c.prospects)}</td><td>{c.created_at.strftime("%d/%m/%Y")}</td></tr>'
-        for c in campaigns
+    return HTMLResponse(render(
+        "admin/campaigns.html",
+        campaigns=campaigns,
+        counts=db_campaign_counts(db, [c.campaign_id for c in campaigns]),
+        next_cursor=next_cursor,
+        token=token,
+    ))
+
+
+@router.get("/export/{table}.{fmt}")
+def admin_export(
+    table: str,
+    fmt: str,
+    request: Request,
+    campaign_id: Optional[str] = None,
+    include_archived: bool = True,
+    db: Session = Depends(get_db),
+):
+    """Export colonnaire (prospects | runs | competitors), streamé record batch par record batch."""
+    from ...prospecting.analytics import FORMATS, TABLES, stream_table
+
+    _check_auth(request)
+    if table not in TABLES or fmt not in FORMATS:
+        raise HTTPException(404, f"Export inconnu (tables : {', '.join(TABLES)} ; formats : {', '.join(FORMATS)})")
+    if campaign_id and not db_get_campaign(db, campaign_id):
+        raise HTTPException(404, "Campagne introuvable")
+
+    bind = db.get_bind()
+    name = f"{table}_{campaign_id}" if campaign_id else table
+    return StreamingResponse(
+        stream_table(lambda: SessionLocal(bind=bind), table, fmt,
+                     campaign_id=campaign_id, include_archived=include_archived),
+        media_type=FORMATS[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="{name}.{fmt}"',
+            "Cache-Control":       "no-store",
+        },
     )
-    return HTMLResponse(f"""<!DOCTYPE html><html><head>{_ADMIN_CSS}<title>Admin</title></head>
-    <body><h1>Campagnes</h1><table>
-    <tr><th>Campagne</th><th>Mode</th><th>Prospects</th><th>Créée</th></tr>{rows}
-    </table></body></html>""")
@@ -6,6 +6,8 @@ from datetime import datetime
 
 from ...database.session import get_db
 from ...services.audit_service import AuditService
+from ...services.results_cache import results_cache, RESULTS
+from ..http_cache import conditional_response
 from ...core.utils.language_detector import get_browser_language_from_header, normalize_language_code
 from ..schemas import (
     AuditCreateRequest,
@@ -126,24 +128,38 @@ async def get_audit_status(
 @router.get("/{audit_id}/results", response_model=AuditResultsResponse)
 async def get_audit_results(
     audit_id: UUID,
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
     """
     Get complete audit results.
 
     Only available when audit status is 'completed'.
+    Completed results are immutable: they are served from the results
+    cache with a strong ETag (304 on If-None-Match).
     """
-    audit = await AuditService.get_audit(db, audit_id)
+    entry = await results_cache.get(RESULTS, audit_id)
 
-    if not audit:
-        raise HTTPException(status_code=404, detail="Audit not found")
+    if entry is None:
+        audit = await AuditService.get_audit(db, audit_id)
+
+        if not audit:
+            raise HTTPException(status_code=404, detail="Audit not found")
+
+        if audit.status != "completed":
+            raise HTTPException(
+                status_code=400,
+                detail=f"Audit not completed yet (status: {audit.status})"
+            )
+
+        body = serialize_audit_results(audit).model_dump_json().encode("utf-8")
+        entry = await results_cache.put(RESULTS, audit, body, "application/json")
+
+    return conditional_response(request, entry.body, entry.media_type, entry.etag)
 
-    if audit.status != "completed":
-        raise HTTPException(
-            status_code=400,
-            detail=f"Audit not completed yet (status: {audit.status})"
-        )
 
+def serialize_audit_results(audit) -> AuditResultsResponse:
+    """Build the results response of a completed audit."""
     # Extract data from results JSON
     results_data = audit.results or {}
     analysis = results_data.get("analysis", {})
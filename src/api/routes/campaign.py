@@ -2,20 +2,26 @@
 Routes Campagne
 POST /api/campaign/create
 GET  /api/campaign/{id}/status
-GET  /api/campaigns
+GET  /api/campaigns            (toutes ; paginé si ?limit= ou ?cursor= : en-tête X-Next-Cursor)
 POST /api/prospect-scan
 POST /api/prospect-scan/csv   (upload CSV)
+GET  /api/events?since=N      (journal prospect_events, curseur seq)
 """
 import json
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Response
 from sqlalchemy.orm import Session
 
-from ...prospecting.database import get_db, db_get_campaign, db_list_campaigns, jloads
+from ...prospecting.database import get_db, db_campaign_counts, db_get_campaign, db_list_campaigns_page, jloads
+from ...prospecting.events import MAX_PAGE, event_dict, events_since, latest_seq
 from ...prospecting.models import CampaignCreate, ProspectScanInput
-from ...prospecting.prospect_scan import create_campaign, scan_prospects, load_from_csv
+from ...prospecting.prospect_scan import create_campaign, get_or_create_campaign, import_csv, scan_prospects
 
 router = APIRouter(prefix="/api", tags=["Campaign & Prospects"])
 
+CAMPAIGNS_PAGE = 100   # taille de page /api/campaigns quand seul ?cursor= est donné
+
 
 @router.post("/campaign/create")
 def api_create_campaign(data: CampaignCreate, db: Session = Depends(get_db)):
@@ -42,30 +48,44 @@ def api_campaign_status(campaign_id: str, db: Session = Depends(get_db)):
     if not campaign:
         raise HTTPException(404, "Campagne introuvable")
 
-    from ...prospecting.database import db_list_prospects
     from ...prospecting.scheduler import scheduler_status
 
-    prospects = db_list_prospects(db, campaign_id)
-    status_counts = {}
-    for p in prospects:
-        status_counts[p.status] = status_counts.get(p.status, 0) + 1
-
+    counts = db_campaign_counts(db, [campaign_id])[campaign_id]
     return {
         "campaign_id":    campaign.campaign_id,
         "profession":     campaign.profession,
         "city":           campaign.city,
         "mode":           campaign.mode,
         "status":         campaign.status,
-        "total_prospects": len(prospects),
-        "by_status":      status_counts,
-        "eligible":       sum(1 for p in prospects if p.eligibility_flag),
+        "total_prospects": counts["total"],
+        "by_status":      counts["by_status"],
+        "eligible":       counts["eligible"],
         "scheduler":      scheduler_status(),
     }
 
 
 @router.get("/campaigns")
-def api_list_campaigns(db: Session = Depends(get_db)):
-    campaigns = db_list_campaigns(db)
+def api_list_campaigns(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Campagnes (plus récentes d'abord). Sans limit ni cursor : liste complète,
+    comme avant la pagination. Sinon pages de limit (défaut CAMPAIGNS_PAGE),
+    page suivante : ?cursor=<X-Next-Cursor>.
+    """
+    if cursor and limit is None:
+        limit = CAMPAIGNS_PAGE
+    try:
+        campaigns, next_cursor = db_list_campaigns_page(db, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+    counts = db_campaign_counts(db, [c.campaign_id for c in campaigns])
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return [
         {
             "campaign_id": c.campaign_id,
@@ -74,7 +94,7 @@ def api_list_campaigns(db: Session = Depends(get_db)):
             "mode":        c.mode,
             "status":      c.status,
             "created_at":  c.created_at.isoformat(),
-            "prospect_count": len(c.prospects),
+            "prospect_count": counts[c.campaign_id]["total"],
         }
         for c in campaigns
     ]
@@ -108,7 +128,7 @@ def api_prospect_scan(data: ProspectScanInput, db: Session = Depends(get_db)):
 
 
 @router.post("/prospect-scan/csv")
-async def api_prospect_scan_csv(
+def api_prospect_scan_csv(
     city: str,
     profession: str,
     max_prospects: int = 30,
@@ -117,25 +137,44 @@ async def api_prospect_scan_csv(
     db: Session = Depends(get_db),
 ):
     """
-    Import prospects depuis un CSV.
+    Import prospects depuis un CSV (lu en streaming, insertion par lots, doublons ignorés).
     Colonnes : name, website, phone, reviews_count, google_ads_active
     """
-    content = (await file.read()).decode("utf-8")
-    manual = load_from_csv(content, city, profession)
-
-    if not manual:
-        raise HTTPException(400, "CSV vide ou format invalide (colonne 'name' requise)")
-
-    data = ProspectScanInput(
-        city=city,
-        profession=profession,
-        max_prospects=max_prospects,
-        campaign_id=campaign_id,
-        manual_prospects=manual[:max_prospects],
-    )
+    data = ProspectScanInput(city=city, profession=profession, max_prospects=max_prospects, campaign_id=campaign_id)
     try:
-        prospects = scan_prospects(db, data)
+        campaign = get_or_create_campaign(db, data)
     except ValueError as e:
         raise HTTPException(400, str(e))
 
-    return {"created": len(prospects), "campaign_id": prospects[0].campaign_id if prospects else None}
+    report = import_csv(db, file.file, campaign, city, profession, max_prospects=max_prospects)
+
+    empty = not (report["created"] or report["duplicates"])
+    if empty and not campaign_id:
+        db.delete(campaign)   # campagne créée pour cet import
+        db.commit()
+    if report.get("error"):
+        # Lots déjà commités : le détail donne ce qui est en base (created) et ce qui est perdu (failed)
+        raise HTTPException(400, {"message": f"CSV illisible : {report['error']}", **report})
+    if empty:
+        raise HTTPException(400, "CSV vide ou format invalide (colonne 'name' requise)")
+    return report
+
+
+@router.get("/events")
+def api_events(
+    since: int = 0,
+    limit: int = Query(500, ge=1, le=MAX_PAGE),
+    campaign_id: Optional[str] = None,
+    kind: Optional[List[str]] = Query(None),
+    db: Session = Depends(get_db),
+):
+    """
+    Événements prospects de seq > since (créations, transitions, runs).
+    Rappeler avec since=next ; next == latest → consommateur à jour.
+    """
+    events = events_since(db, since, limit, campaign_id, kind)
+    return {
+        "events": [event_dict(e) for e in events],
+        "next":   events[-1].seq if events else since,
+        "latest": latest_seq(db),
+    }
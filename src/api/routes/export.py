@@ -1,57 +1,113 @@
 """Export API routes."""
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import Response, JSONResponse
+import json
+from urllib.parse import quote
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
 from ...database.session import get_db
 from ...services.audit_service import AuditService
+from ...services.mockups_export import mockups_export, mockups_context, mockups_digest
+from ...services.pdf_renderer import pdf_renderer, guide_context, guide_digest
+from ...services.results_cache import results_cache, CachedPayload, GUIDE_PDF, RECOMMENDATIONS_JSON
+from ..http_cache import conditional_response, not_modified, validator_headers
 
 router = APIRouter()
 
 
+async def _completed_audit(db: AsyncSession, audit_id: UUID):
+    """Load a completed audit or raise 404/400."""
+    audit = await AuditService.get_audit(db, audit_id)
+
+    if not audit:
+        raise HTTPException(status_code=404, detail="Audit not found")
+
+    if audit.status != "completed":
+        raise HTTPException(status_code=400, detail="Audit not completed")
+
+    return audit
+
+
+async def _check_paid(
+    db: AsyncSession, kind: str, audit_id: UUID, entry: CachedPayload, detail: str
+) -> CachedPayload:
+    """
+    Refuse freemium payloads. A cached freemium plan may predate a payment
+    handled by another worker: it is checked against the database first.
+    """
+    if entry.plan != "freemium":
+        return entry
+
+    audit = await _completed_audit(db, audit_id)
+    if audit.plan == "freemium":
+        raise HTTPException(status_code=403, detail=detail)
+
+    await results_cache.invalidate(audit.id)
+    return await results_cache.put(kind, audit, entry.body, entry.media_type, entry.headers)
+
+
 @router.get("/{audit_id}/guide.pdf")
 async def export_guide_pdf(
     audit_id: UUID,
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
     """
     Export audit guide as PDF.
 
-    Only available for paid plans (starter, pro).
+    Only available for paid plans (starter, pro). Rendered in the PDF
+    worker pool on first download, then streamed from the disk cache.
+    The guide digest is cached per audit like the JSON export: a 304 or
+    a download of an already rendered guide does not touch the database.
     """
-    audit = await AuditService.get_audit(db, audit_id)
+    entry = await results_cache.get(GUIDE_PDF, audit_id)
+    context = None
+
+    if entry is None:
+        audit = await _completed_audit(db, audit_id)
+        context = guide_context(audit)
+        entry = await results_cache.put(
+            GUIDE_PDF,
+            audit,
+            guide_digest(context).encode("ascii"),
+            "application/pdf",
+            headers={"Content-Disposition": _attachment(f"audit_{audit.company_name}_{audit.id}.pdf")},
+        )
 
-    if not audit:
-        raise HTTPException(status_code=404, detail="Audit not found")
+    entry = await _check_paid(db, GUIDE_PDF, audit_id, entry, "PDF export not available for freemium plan")
 
-    if audit.status != "completed":
-        raise HTTPException(status_code=400, detail="Audit not completed")
+    cached = not_modified(request, entry.etag)
+    if cached is not None:
+        return cached
 
-    if audit.plan == "freemium":
-        raise HTTPException(
-            status_code=403,
-            detail="PDF export not available for freemium plan"
-        )
+    digest = entry.body.decode("ascii")
+    path = pdf_renderer.path_for(digest)
+    if not path.exists():
+        if context is None:
+            context = guide_context(await _completed_audit(db, audit_id))
+        path = await pdf_renderer.render(context, digest)
 
-    # Generate PDF from recommendations
-    # In Phase 5, will use WeasyPrint to generate actual PDF
-    # For now, return placeholder
+    return FileResponse(
+        path,
+        media_type=entry.media_type,
+        headers={**entry.headers, **validator_headers(entry.etag)},
+    )
 
-    pdf_content = generate_pdf_placeholder(audit)
 
-    return Response(
-        content=pdf_content,
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f"attachment; filename=audit_{audit.company_name}_{audit.id}.pdf"
-        }
-    )
+def _attachment(filename: str) -> str:
+    """Content-Disposition of a download (RFC 6266 encoding for non-ASCII names)."""
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
 
 
 @router.get("/{audit_id}/recommendations.json")
 async def export_recommendations_json(
     audit_id: UUID,
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -59,26 +115,30 @@ async def export_recommendations_json(
 
     Available for starter and pro plans.
     """
-    audit = await AuditService.get_audit(db, audit_id)
+    entry = await results_cache.get(RECOMMENDATIONS_JSON, audit_id)
 
-    if not audit:
-        raise HTTPException(status_code=404, detail="Audit not found")
+    if entry is None:
+        audit = await _completed_audit(db, audit_id)
+        body = json.dumps(
+            recommendations_export(audit), ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+        entry = await results_cache.put(RECOMMENDATIONS_JSON, audit, body, "application/json")
 
-    if audit.status != "completed":
-        raise HTTPException(status_code=400, detail="Audit not completed")
+    entry = await _check_paid(
+        db, RECOMMENDATIONS_JSON, audit_id, entry, "JSON export not available for freemium plan"
+    )
+
+    return conditional_response(request, entry.body, entry.media_type, entry.etag)
 
-    if audit.plan == "freemium":
-        raise HTTPException(
-            status_code=403,
-            detail="JSON export not available for freemium plan"
-        )
 
+def recommendations_export(audit) -> dict:
+    """Export payload of a completed audit's recommendations."""
     # Extract recommendations from results
     results_data = audit.results or {}
     recommendations = results_data.get("recommendations", [])
 
     # Format for export
-    export_data = {
+    return {
         "audit_id": str(audit.id),
         "company_name": audit.company_name,
         "sector": audit.sector,
@@ -87,26 +147,20 @@ async def export_recommendations_json(
         "exported_at": audit.completed_at.isoformat() if audit.completed_at else None,
     }
 
-    return JSONResponse(content=export_data)
-
 
 @router.get("/{audit_id}/mockups.zip")
 async def export_mockups_zip(
     audit_id: UUID,
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
     """
     Export HTML mockups as ZIP file.
 
-    Only available for pro plan.
+    Only available for pro plan. The archive is zipped while it is sent,
+    one mockup at a time; generated mockups are cached on disk.
     """
-    audit = await AuditService.get_audit(db, audit_id)
-
-    if not audit:
-        raise HTTPException(status_code=404, detail="Audit not found")
-
-    if audit.status != "completed":
-        raise HTTPException(status_code=400, detail="Audit not completed")
+    audit = await _completed_audit(db, audit_id)
 
     if audit.plan != "pro":
         raise HTTPException(
@@ -114,47 +168,22 @@ async def export_mockups_zip(
             detail="Mockups export only available for pro plan"
         )
 
-    # Generate mockups ZIP
-    # Will be implemented in Phase 5
-    raise HTTPException(
-        status_code=501,
-        detail="Mockups generation not implemented yet (Phase 5)"
-    )
+    context = mockups_context(audit)
+    digest = mockups_digest(context)
+    etag = f'"{digest[:32]}"'
 
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
 
-def generate_pdf_placeholder(audit) -> bytes:
-    """
-    Generate PDF placeholder.
+    # Fixed member timestamps keep the archive bytes stable for the ETag
+    date_time = audit.completed_at.timetuple()[:6] if audit.completed_at else (1980, 1, 1, 0, 0, 0)
 
-    Will be replaced with real PDF generation using WeasyPrint in Phase 5.
-    """
-    # Simple PDF header (placeholder)
-    pdf_header = b"%PDF-1.4\n"
-    pdf_body = f"""
-1 0 obj
-<< /Type /Catalog /Pages 2 0 R >>
-endobj
-2 0 obj
-<< /Type /Pages /Kids [3 0 R] /Count 1 >>
-endobj
-3 0 obj
-<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R >>
-endobj
-4 0 obj
-<< /Length 100 >>
-stream
-BT
-/F1 24 Tf
-100 700 Td
-(AI SEO Audit - {audit.company_name}) Tj
-ET
-endstream
-endobj
-xref
-0 5
-trailer
-<< /Size 5 /Root 1 0 R >>
-%%EOF
-""".encode()
-
-    return pdf_header + pdf_body
+    return StreamingResponse(
+        mockups_export.stream(context, digest, date_time),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": _attachment(f"mockups_{audit.company_name}_{audit.id}.zip"),
+            **validator_headers(etag),
+        },
+    )
@@ -2,13 +2,25 @@
 Routes IA Test
 POST /api/ia-test/run
 GET  /api/prospect/{id}/runs
+GET  /api/prospect/{id}/trend
+GET  /api/run/{run_id}/answers
+GET  /api/ia-test/usage
+GET  /api/search/answers
+GET  /api/competitors/{name}
 """
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
-from ...prospecting.database import get_db, db_get_campaign, db_list_runs, jloads
+from ...prospecting.database import get_db, db_get_campaign, db_list_runs, db_run_answers, jloads
 from ...prospecting.models import IATestRunInput
+from ...prospecting.answers import slot_usage
+from ...prospecting.competitors import REPORT_PROSPECTS, competitor_report
 from ...prospecting.ia_test import run_ia_test_campaign, get_active_models
+from ...prospecting.search import SEARCH_LIMIT, search_answers
+from ...prospecting.trends import TREND_COMPETITORS, prospect_trend
 
 router = APIRouter(prefix="/api", tags=["IA Tests"])
 
@@ -17,12 +29,16 @@ router = APIRouter(prefix="/api", tags=["IA Tests"])
 def api_ia_test_run(
     data: IATestRunInput,
     dry_run: bool = Query(False, description="Simule sans appeler les APIs IA"),
+    shared: bool = Query(False, description="Réutilise les réponses du créneau planifié courant"),
     db: Session = Depends(get_db),
 ):
     """
     Lance 1 run IA sur les prospects SCHEDULED de la campagne.
     dry_run=true : génère les structures sans appels API.
+    shared=true : partage le pool de réponses du créneau courant (re-run d'une campagne recouvrante).
     """
+    from ...prospecting.scheduler import current_slot
+
     campaign = db_get_campaign(db, data.campaign_id)
     if not campaign:
         raise HTTPException(404, "Campagne introuvable")
@@ -36,6 +52,7 @@ def api_ia_test_run(
         data.campaign_id,
         prospect_ids=data.prospect_ids,
         dry_run=dry_run,
+        slot=current_slot() if shared else None,
     )
     return {
         "campaign_id":   data.campaign_id,
@@ -45,15 +62,31 @@ def api_ia_test_run(
     }
 
 
+@router.get("/ia-test/usage")
+def api_ia_test_usage(
+    slot: Optional[str] = Query(None, description="Créneau (ex. 2026-10-21T09:00) ; défaut : 20 derniers"),
+    db: Session = Depends(get_db),
+):
+    """Appels API effectués / évités par le pool de réponses, par créneau et modèle."""
+    return {"slots": slot_usage(db, slot)}
+
+
 @router.get("/prospect/{prospect_id}/runs")
-def api_prospect_runs(prospect_id: str, db: Session = Depends(get_db)):
+def api_prospect_runs(
+    prospect_id: str,
+    include_archived: bool = Query(False, description="Inclut les runs archivés (Parquet)"),
+    db: Session = Depends(get_db),
+):
     """Retourne tous les runs d'un prospect."""
     from ...prospecting.database import db_get_prospect
     prospect = db_get_prospect(db, prospect_id)
     if not prospect:
         raise HTTPException(404, "Prospect introuvable")
 
-    runs = db_list_runs(db, prospect_id)
+    runs = [(r, False) for r in db_list_runs(db, prospect_id)]
+    if include_archived:
+        from ...prospecting.archive import archived_runs
+        runs = [(r, True) for r in archived_runs(prospect.campaign_id, [prospect_id])] + runs
     return {
         "prospect_id": prospect_id,
         "total_runs":  len(runs),
@@ -66,7 +99,66 @@ def api_prospect_runs(prospect_id: str, db: Session = Depends(get_db)):
                 "mention_per_query": jloads(r.mention_per_query),
                 "competitors":     jloads(r.competitors_entities)[:5],
                 "notes":           r.notes,
+                "archived":        archived,
             }
-            for r in runs
+            for r, archived in runs
         ],
     }
+
+
+@router.get("/prospect/{prospect_id}/trend")
+def api_prospect_trend(
+    prospect_id: str,
+    resolution: str = Query("week", pattern="^(slot|day|week)$", description="Créneau, jour ou semaine"),
+    since: Optional[date] = Query(None, description="Périodes à partir de ce jour (inclus)"),
+    competitors: int = Query(TREND_COMPETITORS, ge=0, le=20, description="Concurrents les plus cités détaillés"),
+    db: Session = Depends(get_db),
+):
+    """Évolution de la visibilité IA du prospect et des concurrents cités (cumuls visibility_points)."""
+    from ...prospecting.database import db_get_prospect
+    if not db_get_prospect(db, prospect_id):
+        raise HTTPException(404, "Prospect introuvable")
+    return prospect_trend(db, prospect_id, resolution, since, competitors)
+
+
+@router.get("/run/{run_id}/answers")
+def api_run_answers(run_id: str, db: Session = Depends(get_db)):
+    """Réponses brutes des IA + entités extraites d'un run (chargées à la demande)."""
+    answers = db_run_answers(db, run_id)
+    if answers is None:
+        raise HTTPException(404, "Run introuvable")
+    return {"run_id": run_id, **answers}
+
+
+@router.get("/search/answers")
+def api_search_answers(
+    q: str = Query(..., min_length=2, description="Mot-clé ou nom (phrase ; casse et accents ignorés)"),
+    campaign_id: Optional[str] = Query(None),
+    model: Optional[str] = Query(None, description="openai / anthropic / gemini"),
+    since: Optional[date] = Query(None, description="Runs à partir de ce jour (inclus)"),
+    until: Optional[date] = Query(None, description="Runs jusqu'à ce jour (inclus)"),
+    limit: int = Query(20, ge=1, le=SEARCH_LIMIT),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """Réponses IA stockées contenant q (index FTS5), avec extrait surligné (<mark>)."""
+    results = search_answers(
+        db, q, campaign_id, model,
+        since=datetime.combine(since, time.min) if since else None,
+        until=datetime.combine(until + timedelta(days=1), time.min) if until else None,
+        limit=limit, offset=offset,
+    )
+    return {"q": q, "count": len(results), "results": results}
+
+
+@router.get("/competitors/{name}")
+def api_competitor(
+    name: str,
+    limit: int = Query(REPORT_PROSPECTS, ge=1, le=500, description="Prospects détaillés"),
+    db: Session = Depends(get_db),
+):
+    """Villes, modèles et prospects pour lesquels un concurrent est cité (casse, accents, forme juridique ignorés)."""
+    report = competitor_report(db, name, limit)
+    if report is None:
+        raise HTTPException(404, "Concurrent jamais cité")
+    return report
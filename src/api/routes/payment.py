@@ -7,6 +7,7 @@ import os
 from ...database.session import get_db
 from ...database.models import Payment as PaymentModel, Audit as AuditModel
 from ...services.audit_service import AuditService
+from ...services.results_cache import results_cache
 from ..schemas import PaymentCreateRequest, PaymentCreateResponse
 
 router = APIRouter()
@@ -130,6 +131,9 @@ async def stripe_webhook(
 
                 await db.commit()
 
+                # Cached payloads carry the plan used for export gating
+                await results_cache.invalidate(payment.audit_id)
+
         elif event_type == "charge.refunded":
             # Handle refund
             charge = event_dict.get("data", {}).get("object", {})
@@ -1,6 +1,10 @@
 """Traductions pour les descriptions d'analyse et recommendations."""
 from typing import Dict, List
 
+# Langues disponibles (fr = langue par défaut)
+SUPPORTED_LANGUAGES = ("fr", "en", "es", "de", "it")
+DEFAULT_LANGUAGE = "fr"
+
 # Descriptions des gaps (problèmes de visibilité)
 GAP_DESCRIPTIONS: Dict[str, Dict[str, str]] = {
     "low_mention_rate": {
@@ -113,3 +117,67 @@ def get_recommendation_title(
     """
     titles = RECOMMENDATION_TITLES.get(rec_type, {})
     return titles.get(language.lower(), titles.get("fr", ""))
+
+
+# Libellés des maquettes HTML (plan Pro)
+MOCKUP_LABELS: Dict[str, Dict[str, str]] = {
+    "index_title": {
+        "fr": "Maquettes - {company}",
+        "en": "Mockups - {company}",
+        "es": "Maquetas - {company}",
+        "de": "Entwürfe - {company}",
+        "it": "Bozze - {company}",
+    },
+    "index_heading": {
+        "fr": "Maquettes d'optimisation IA — {company}",
+        "en": "AI optimization mockups — {company}",
+        "es": "Maquetas de optimización IA — {company}",
+        "de": "KI-Optimierungsentwürfe — {company}",
+        "it": "Bozze di ottimizzazione IA — {company}",
+    },
+    "guide_link": {
+        "fr": "Guide d'intégration complet",
+        "en": "Complete integration guide",
+        "es": "Guía de integración completa",
+        "de": "Vollständige Integrationsanleitung",
+        "it": "Guida di integrazione completa",
+    },
+    "priority": {
+        "fr": "Priorité",
+        "en": "Priority",
+        "es": "Prioridad",
+        "de": "Priorität",
+        "it": "Priorità",
+    },
+    "impact": {
+        "fr": "Impact",
+        "en": "Impact",
+        "es": "Impacto",
+        "de": "Wirkung",
+        "it": "Impatto",
+    },
+    "integration": {
+        "fr": "Intégration",
+        "en": "Integration",
+        "es": "Integración",
+        "de": "Integration",
+        "it": "Integrazione",
+    },
+}
+
+
+def get_mockup_label(key: str, language: str = "fr", **format_args) -> str:
+    """
+    Récupère un libellé des maquettes dans la langue spécifiée.
+
+    Args:
+        key: Clé du libellé (index_title, priority, etc.)
+        language: Code langue ISO
+        **format_args: Arguments pour formatter le libellé
+
+    Returns:
+        Libellé dans la langue demandée (français par défaut)
+    """
+    labels = MOCKUP_LABELS.get(key, {})
+    label = labels.get(language.lower(), labels.get(DEFAULT_LANGUAGE, ""))
+    return label.format(**format_args) if format_args else label
@@ -0,0 +1,26 @@
+"""Add audit request hash
+
+Revision ID: 8f3b1c2d4e5a
+Revises: 2c5232ea6ff7
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f3b1c2d4e5a'
+down_revision = '2c5232ea6ff7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('audits', sa.Column('request_hash', sa.String(length=64), nullable=True))
+    op.create_index('ix_audits_request_hash_completed_at', 'audits', ['request_hash', 'completed_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audits_request_hash_completed_at', table_name='audits')
+    op.drop_column('audits', 'request_hash')
@@ -39,6 +39,7 @@ class Audit(Base):
     visibility_score = Column(Float)
     status = Column(String(20), default="pending", nullable=False, index=True)  # pending/running/completed/failed
     results = Column(JSONB, default=dict)
+    request_hash = Column(String(64))  # canonical hash of the request inputs
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     completed_at = Column(DateTime)
 
@@ -51,6 +52,7 @@ class Audit(Base):
     # Indexes
     __table_args__ = (
         Index('ix_audits_status_created_at', 'status', 'created_at'),
+        Index('ix_audits_request_hash_completed_at', 'request_hash', 'completed_at'),
     )
 
     def __repr__(self):
@@ -1,5 +1,9 @@
 """GenerateAgent - Generates optimization recommendations."""
-from typing import List, Dict, Any
+import html
+import json
+import re
+import unicodedata
+from typing import List, Dict, Any, Iterator, Tuple
 from ...core.object import Object, TestResult
 from ...core.domain.competitor_analysis import CompetitorAnalysis
 from ...core.domain.optimization_recommendation import OptimizationRecommendation
@@ -427,3 +431,104 @@ Pour toute question sur ce guide :
 """
 
         return guide
+
+    def generate_mockups(
+        self, recommendations: List[OptimizationRecommendation], company: str
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        Generate HTML mockups (plan Pro), one member at a time.
+
+        Yields (filename, content) pairs: an index page, one mockup page per
+        recommendation and the complete integration guide (Markdown).
+        """
+        from ...core.config.translations import get_mockup_label
+
+        ordered = sorted(recommendations, key=lambda r: r.priority)
+        names = [
+            f"{i:02d}-{_slug(rec.title) or rec.type}.html"
+            for i, rec in enumerate(ordered, 1)
+        ]
+
+        items = "\n".join(
+            f'    <li><a href="{name}">{html.escape(rec.title)}</a> '
+            f"<small>P{rec.priority} · {html.escape(rec.estimated_impact)}</small></li>"
+            for name, rec in zip(names, ordered)
+        )
+        yield "index.html", _mockup_page(
+            get_mockup_label("index_title", self.language, company=company),
+            f"<h1>{html.escape(get_mockup_label('index_heading', self.language, company=company))}</h1>\n"
+            f"<ul>\n{items}\n</ul>\n"
+            f'<p><a href="guide.md">{get_mockup_label("guide_link", self.language)}</a></p>',
+            self.language,
+        )
+
+        for name, rec in zip(names, ordered):
+            yield name, _mockup_page(f"{rec.title} - {company}", self._mockup_body(rec), self.language)
+
+        yield "guide.md", self.generate_guide(ordered, company)
+
+    def _mockup_body(self, rec: OptimizationRecommendation) -> str:
+        """HTML body previewing a recommendation as it would appear on the site."""
+        from ...core.config.translations import get_mockup_label
+
+        content = rec.content or {}
+        priority = get_mockup_label("priority", self.language)
+        impact = get_mockup_label("impact", self.language)
+        parts = [
+            f"<h1>{html.escape(rec.title)}</h1>",
+            f"<p class=\"meta\">{priority} P{rec.priority} · {impact} {html.escape(rec.estimated_impact)}</p>",
+        ]
+        if rec.description:
+            parts.append(f"<p>{html.escape(rec.description)}</p>")
+
+        for section in content.get("sections", []):
+            paragraphs = "".join(
+                f"<p>{html.escape(line)}</p>" for line in section.get("content", "").split("\n") if line.strip()
+            )
+            parts.append(f"<section>\n<h2>{html.escape(section.get('heading', ''))}</h2>\n{paragraphs}\n</section>")
+
+        json_ld = content.get("code") or content.get("data")
+        if json_ld:
+            code = json.dumps(json_ld, ensure_ascii=False, indent=2)
+            # "</" would close the script element early
+            script = code.replace("</", "<\\/")
+            parts.append(f'<script type="application/ld+json">\n{script}\n</script>')
+            parts.append(f"<h2>JSON-LD</h2>\n<pre>{html.escape(code)}</pre>")
+
+        for key in ("guidelines", "checklist", "actions", "recommendations"):
+            if content.get(key):
+                items = "".join(f"<li>{html.escape(item)}</li>" for item in content[key])
+                parts.append(f"<ul class=\"{key}\">{items}</ul>")
+
+        if rec.integration_guide:
+            integration = get_mockup_label("integration", self.language)
+            parts.append(f"<h2>{integration}</h2>\n<pre>{html.escape(rec.integration_guide)}</pre>")
+
+        return "\n".join(parts)
+
+
+def _slug(text: str) -> str:
+    """ASCII file-name slug."""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")[:60]
+
+
+def _mockup_page(title: str, body: str, language: str = "fr") -> str:
+    return f"""<!DOCTYPE html>
+<html lang="{html.escape(language)}">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>{html.escape(title)}</title>
+<style>
+body {{ font-family: system-ui, sans-serif; max-width: 820px; margin: 40px auto; padding: 0 20px; color: #1f2937; line-height: 1.5; }}
+h1 {{ color: #4f46e5; }}
+.meta {{ color: #6b7280; }}
+pre {{ white-space: pre-wrap; background: #f9fafb; border: 1px solid #e5e7eb; padding: 12px; }}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
@@ -0,0 +1,265 @@
+"""
+Module ANALYTICS — export colonnaire (Parquet / Arrow IPC) des prospects et runs
+
+- prospects   : 1 ligne par prospect
+- runs        : 1 ligne par run, mention_per_query aplati en q1_mentioned..q5_mentioned
+- competitors : table longue run × concurrent (rang dans competitors_entities)
+
+Lecture par partitions (yield_per) → 1 record batch par lot : mémoire constante.
+Les runs archivés (archive.py) sont relus lot par lot depuis leur Parquet.
+Usage : python -m src.prospecting.analytics OUT_DIR [--campaign ID] [--format parquet|arrow]
+"""
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..utils.storage import ChunkSink
+from . import archive
+from .models import ProspectDB, TestRunDB
+
+logger = logging.getLogger(__name__)
+
+EXPORT_BATCH = int(os.getenv("ANALYTICS_BATCH", "50000"))   # lignes par record batch
+MAX_QUERIES  = 5
+
+TABLES  = ("prospects", "runs", "competitors")
+FORMATS = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow":   "application/vnd.apache.arrow.stream",
+}
+
+_PROSPECT_COLUMNS = (
+    "prospect_id", "campaign_id", "name", "city", "profession", "website", "reviews_count",
+    "google_ads_active", "ia_visibility_score", "eligibility_flag", "status", "created_at", "updated_at",
+)
+_RUN_COLUMNS = ("run_id", "campaign_id", "prospect_id", "ts", "model", "mentioned_target", "mention_per_query",
+                "competitors_entities")
+
+
+def schema(table: str):
+    import pyarrow as pa
+
+    ts = pa.timestamp("us")
+    if table == "prospects":
+        return pa.schema([
+            ("prospect_id", pa.string()), ("campaign_id", pa.string()), ("name", pa.string()),
+            ("city", pa.string()), ("profession", pa.string()), ("website", pa.string()),
+            ("reviews_count", pa.int32()), ("google_ads_active", pa.bool_()),
+            ("ia_visibility_score", pa.float64()), ("eligibility_flag", pa.bool_()), ("status", pa.string()),
+            ("created_at", ts), ("updated_at", ts), ("competitors_cited", pa.int32()),
+        ])
+    if table == "runs":
+        return pa.schema(
+            [("run_id", pa.string()), ("campaign_id", pa.string()), ("prospect_id", pa.string()),
+             ("ts", ts), ("model", pa.string()), ("mentioned_target", pa.bool_())]
+            + [(f"q{i + 1}_mentioned", pa.bool_()) for i in range(MAX_QUERIES)]
+            + [("competitors", pa.int32()), ("archived", pa.bool_())]
+        )
+    if table == "competitors":
+        return pa.schema([
+            ("run_id", pa.string()), ("campaign_id", pa.string()), ("prospect_id", pa.string()),
+            ("ts", ts), ("model", pa.string()), ("rank", pa.int32()), ("competitor", pa.string()),
+        ])
+    raise ValueError(f"Table inconnue : {table}")
+
+
+# ─────────────────────────── LECTURE PAR LOTS ───────────────────────────
+#
+# SELECT Core (pas d'ORM) lu par partitions yield_per : types Python donnés par les
+# colonnes de la table, dans l'ordre physique (aucun index ne couvre un export
+# complet : pas de tri). Types Arrow ajustés par cast (schema), JSON aplatis en
+# Python avec mémoïsation (valeurs très répétées).
+
+def _json_lists(values: List[Optional[str]]) -> List[list]:
+    """Décode une colonne JSON ; les valeurs répétées ne sont décodées qu'une fois."""
+    decoded: Dict[Optional[str], list] = {}
+    out = []
+    for v in values:
+        lst = decoded.get(v)
+        if lst is None:
+            try:
+                lst = json.loads(v) if v else []
+            except ValueError:
+                lst = []
+            decoded[v] = lst
+        out.append(lst)
+    return out
+
+
+def _db_chunks(db: Session, table, names, campaign_id: Optional[str], batch_size: int) -> Iterator[Dict[str, list]]:
+    """Colonnes d'un lot {nom: [valeurs]}, typées par les métadonnées de la table."""
+    stmt = select(*(table.c[n] for n in names)).execution_options(yield_per=batch_size)
+    if campaign_id:
+        stmt = stmt.where(table.c.campaign_id == campaign_id)
+    result = db.connection().execute(stmt)
+    try:
+        for rows in result.partitions():
+            yield dict(zip(names, (list(col) for col in zip(*rows))))
+    finally:
+        result.close()
+
+
+def _flatten_runs(table: str, chunk: Dict[str, list]) -> Dict[str, list]:
+    """Colonnes d'export d'un lot de runs : q1..q5 + nb concurrents, ou table longue des concurrents."""
+    competitors = _json_lists(chunk.pop("competitors_entities"))
+    mentions    = _json_lists(chunk.pop("mention_per_query"))
+    if table == "runs":
+        for qi in range(MAX_QUERIES):
+            chunk[f"q{qi + 1}_mentioned"] = [m[qi] if qi < len(m) else None for m in mentions]
+        chunk["competitors"] = [len(c) for c in competitors]
+        return chunk
+
+    # table longue : 1 ligne par (run, concurrent)
+    idx  = [i for i, names in enumerate(competitors) for _ in names]
+    long = {c: [chunk[c][i] for i in idx] for c in ("run_id", "campaign_id", "prospect_id", "ts", "model")}
+    long["rank"]       = [rank for names in competitors for rank in range(1, len(names) + 1)]
+    long["competitor"] = [name for names in competitors for name in names]
+    return long
+
+
+def _run_chunks(
+    db: Session, campaign_id: Optional[str], include_archived: bool, batch_size: int,
+) -> Iterator[Dict[str, list]]:
+    """Runs archivés (plus anciens) puis runs en base ; un run présent des deux côtés n'est lu qu'une fois."""
+    seen: set = set()
+    if include_archived and archive.ARCHIVE_DIR.exists():
+        import pyarrow.dataset as ds
+
+        dataset = ds.dataset(str(archive.ARCHIVE_DIR), format="parquet", partitioning=archive._partitioning())
+        expr = ds.field("campaign_id") == campaign_id if campaign_id else None
+        for batch in dataset.to_batches(columns=list(_RUN_COLUMNS), filter=expr, batch_size=batch_size):
+            chunk = {c: batch.column(c).to_pylist() for c in _RUN_COLUMNS}
+            keep  = [i for i, rid in enumerate(chunk["run_id"]) if rid not in seen]
+            seen.update(chunk["run_id"])
+            if len(keep) < len(chunk["run_id"]):
+                chunk = {c: [v[i] for i in keep] for c, v in chunk.items()}
+            yield dict(chunk, archived=[True] * len(keep))
+
+    for chunk in _db_chunks(db, TestRunDB.__table__, _RUN_COLUMNS, campaign_id, batch_size):
+        if seen:
+            keep  = [i for i, rid in enumerate(chunk["run_id"]) if rid not in seen]
+            chunk = {c: [v[i] for i in keep] for c, v in chunk.items()}
+        yield dict(chunk, archived=[False] * len(chunk["run_id"]))
+
+
+def _record_batch(chunk: Dict[str, list], target):
+    import pyarrow as pa
+
+    arrays = []
+    for field in target:
+        arr = pa.array(chunk[field.name])
+        arrays.append(arr if arr.type == field.type else arr.cast(field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=target)
+
+
+def iter_batches(
+    db: Session,
+    table: str,
+    campaign_id: Optional[str] = None,
+    include_archived: bool = True,
+    batch_size: int = EXPORT_BATCH,
+) -> Iterator:
+    """Record batches Arrow d'une table d'export (schema(table))."""
+    target = schema(table)
+
+    if table == "prospects":
+        names = _PROSPECT_COLUMNS + ("competitors_cited",)
+        for chunk in _db_chunks(db, ProspectDB.__table__, names, campaign_id, batch_size):
+            chunk["competitors_cited"] = [len(c) for c in _json_lists(chunk["competitors_cited"])]
+            yield _record_batch(chunk, target)
+        return
+
+    for chunk in _run_chunks(db, campaign_id, include_archived, batch_size):
+        flat = _flatten_runs(table, chunk)
+        if flat["run_id"]:
+            yield _record_batch(flat, target)
+
+
+# ─────────────────────────── ÉCRITURE ───────────────────────────
+
+def _writer(sink, target, fmt: str):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if fmt == "parquet":
+        return pq.ParquetWriter(sink, target, compression="zstd")
+    if fmt == "arrow":
+        return pa.ipc.new_stream(sink, target)
+    raise ValueError(f"Format inconnu : {fmt}")
+
+
+def write_table(db: Session, table: str, path: Path, fmt: str = "parquet", **kwargs) -> int:
+    """Écrit une table d'export dans path. Retourne le nombre de lignes."""
+    rows = 0
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with _writer(str(tmp), schema(table), fmt) as writer:
+        for batch in iter_batches(db, table, **kwargs):
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    os.replace(tmp, path)
+    return rows
+
+
+def export_all(db: Session, out_dir: Path, fmt: str = "parquet", **kwargs) -> Dict[str, Dict]:
+    """Exporte prospects, runs et competitors dans out_dir/{table}.{fmt}."""
+    result = {}
+    for table in TABLES:
+        path = Path(out_dir) / f"{table}.{fmt}"
+        result[table] = {"path": str(path), "rows": write_table(db, table, path, fmt, **kwargs)}
+    logger.info(f"[ANALYTICS] Export {fmt} : " + ", ".join(f"{t}={r['rows']}" for t, r in result.items()))
+    return result
+
+
+def stream_table(
+    session_factory: Callable[[], Session], table: str, fmt: str = "parquet", **kwargs,
+) -> Iterator[bytes]:
+    """Octets d'une table d'export, émis batch par batch (la session est ouverte par le flux)."""
+    db   = session_factory()
+    sink = ChunkSink()
+    try:
+        writer = _writer(sink, schema(table), fmt)
+        for batch in iter_batches(db, table, **kwargs):
+            writer.write_batch(batch)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+        writer.close()
+        yield sink.drain()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from .database import SessionLocal, init_db
+
+    parser = argparse.ArgumentParser(description="Export analytique (prospects, runs, competitors)")
+    parser.add_argument("out_dir", type=Path)
+    parser.add_argument("--campaign", default=None, help="campaign_id (défaut : toute la base)")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="parquet")
+    parser.add_argument("--no-archived", action="store_true", help="ignore les runs archivés")
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    init_db()
+    session = SessionLocal()
+    started = time.perf_counter()
+    try:
+        result = export_all(
+            session, args.out_dir, args.format,
+            campaign_id=args.campaign, include_archived=not args.no_archived, batch_size=args.batch_size,
+        )
+    finally:
+        session.close()
+    for table, info in result.items():
+        print(f"{table:12} {info['rows']:>10} lignes  {info['path']}")
+    print(f"{time.perf_counter() - started:.2f} s")
@@ -0,0 +1,142 @@
+"""
+Module ANSWERS — stockage des réponses IA adressé par contenu
+
+- une réponse = une ligne answers (sha256 du texte), partagée entre runs,
+  prospects et campagnes (temperature basse + mêmes requêtes → textes identiques)
+- l'extraction d'entités est mémoïsée dans la même ligne : jamais deux fois
+  sur le même texte
+- TestRunDB.answer_hashes référence les réponses, dans l'ordre des requêtes
+- answer_refs : occurrences (run, requête) de chaque réponse, index plein texte
+  answers_fts alimenté à l'insertion (voir search.py)
+- pool par créneau (slot_answers) : pendant un même créneau planifié, une
+  requête n'est envoyée qu'une fois par modèle, toutes campagnes confondues
+"""
+import hashlib
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from .database import jdumps, jloads
+from .models import AnswerDB, AnswerRefDB, SlotAnswerDB, TestRunDB
+
+Extractor = Callable[[str], List[Dict]]
+
+
+def answer_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def store_answers(db: Session, texts: List[str], extract: Extractor) -> List[Tuple[str, List[Dict]]]:
+    """
+    Enregistre les réponses absentes et retourne [(hash, entités)] dans l'ordre de texts.
+    extract n'est appelé que pour les textes jamais vus (ou jamais extraits).
+    Les textes nouveaux sont ajoutés à l'index plein texte.
+    """
+    from .search import index_answer
+
+    by_hash = {answer_hash(t): t for t in texts}
+    known = {
+        row.hash: row.entities
+        for row in db.execute(select(AnswerDB.hash, AnswerDB.entities).where(AnswerDB.hash.in_(by_hash)))
+    }
+
+    entities: Dict[str, List[Dict]] = {}
+    for h, text in by_hash.items():
+        if known.get(h) is not None:
+            entities[h] = jloads(known[h])
+            continue
+        entities[h] = extract(text)
+        row = {"hash": h, "body": text, "entities": jdumps(entities[h])}
+        if h in known:
+            db.execute(AnswerDB.__table__.update().where(AnswerDB.hash == h).values(entities=row["entities"]))
+        else:
+            # ON CONFLICT : un autre worker a pu insérer le même texte entre-temps (et l'indexer)
+            rowid = db.execute(
+                insert(AnswerDB).values(**row)
+                .on_conflict_do_nothing(index_elements=["hash"])
+                .returning(literal_column("rowid"))
+            ).scalar()
+            if rowid is not None:
+                index_answer(db, rowid, text)
+
+    return [(h, entities[h]) for h in (answer_hash(t) for t in texts)]
+
+
+def load_answers(db: Session, hashes: Iterable[str]) -> List:
+    """Lignes (hash, body, entities) dans l'ordre des hashes ; les hashes inconnus sont ignorés."""
+    hashes = list(hashes)
+    rows = {
+        a.hash: a
+        for a in db.execute(select(AnswerDB.hash, AnswerDB.body, AnswerDB.entities).where(AnswerDB.hash.in_(set(hashes))))
+    }
+    return [rows[h] for h in hashes if h in rows]
+
+
+def ref_answers(db: Session, run: TestRunDB) -> None:
+    """Enregistre les occurrences (run, requête) des réponses d'un run, pour les filtres de recherche."""
+    rows = [
+        {
+            "run_id": run.run_id, "query_index": qi, "answer_hash": h, "campaign_id": run.campaign_id,
+            "prospect_id": run.prospect_id, "model": run.model, "query": query, "ts": run.ts,
+        }
+        for qi, (query, h) in enumerate(zip(jloads(run.queries), jloads(run.answer_hashes)))
+    ]
+    if rows:
+        db.execute(insert(AnswerRefDB).on_conflict_do_nothing(index_elements=["run_id", "query_index"]), rows)
+
+
+# ─────────────────────────── POOL PAR CRÉNEAU ───────────────────────────
+
+def pooled_answers(db: Session, slot: str, model: str, queries: List[str]) -> Dict[str, str]:
+    """Réponses déjà obtenues pendant ce créneau {query: texte} ; chaque réemploi compte un hit."""
+    rows = db.execute(
+        select(SlotAnswerDB.query, AnswerDB.body)
+        .join(AnswerDB, AnswerDB.hash == SlotAnswerDB.answer_hash)
+        .where(SlotAnswerDB.slot == slot, SlotAnswerDB.model == model, SlotAnswerDB.query.in_(set(queries)))
+    ).all()
+    found = {row.query: row.body for row in rows}
+    if found:
+        db.execute(
+            SlotAnswerDB.__table__.update()
+            .where(SlotAnswerDB.slot == slot, SlotAnswerDB.model == model, SlotAnswerDB.query.in_(found))
+            .values(hits=SlotAnswerDB.hits + 1)
+        )
+    return found
+
+
+def pool_answers(db: Session, slot: str, model: str, answered: List[Tuple[str, str]]) -> None:
+    """Publie [(query, answer_hash)] obtenus par appel API pour les campagnes suivantes du créneau."""
+    for query, h in answered:
+        db.execute(
+            insert(SlotAnswerDB)
+            .values(slot=slot, model=model, query=query, answer_hash=h, hits=0)
+            .on_conflict_do_nothing(index_elements=["slot", "model", "query"])
+        )
+
+
+def slot_usage(db: Session, slot: Optional[str] = None, limit: int = 20) -> List[Dict]:
+    """Comptabilité par créneau et modèle : appels API effectués / évités."""
+    q = (
+        select(
+            SlotAnswerDB.slot, SlotAnswerDB.model,
+            func.count().label("api_calls"), func.sum(SlotAnswerDB.hits).label("calls_saved"),
+        )
+        .group_by(SlotAnswerDB.slot, SlotAnswerDB.model)
+        .order_by(SlotAnswerDB.slot.desc(), SlotAnswerDB.model)
+    )
+    if slot:
+        q = q.where(SlotAnswerDB.slot == slot)
+
+    by_slot: Dict[str, Dict] = {}
+    for row in db.execute(q):
+        entry = by_slot.get(row.slot)
+        if entry is None:
+            if len(by_slot) == limit:
+                break
+            entry = by_slot[row.slot] = {"slot": row.slot, "api_calls": 0, "calls_saved": 0, "by_model": {}}
+        entry["api_calls"]   += row.api_calls
+        entry["calls_saved"] += row.calls_saved or 0
+        entry["by_model"][row.model] = {"api_calls": row.api_calls, "calls_saved": row.calls_saved or 0}
+    return list(by_slot.values())
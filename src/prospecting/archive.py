@@ -0,0 +1,211 @@
+"""
+Module ARCHIVE — runs IA froids → Parquet
+
+data/archive/runs/campaign_id={id}/month={YYYY-MM}/part-*.parquet
+
+- archivés : runs plus vieux que RUN_RETENTION_DAYS, ou d'une campagne non active
+- agrégats conservés en base (run_stats) : résumés audit / landing inchangés
+- answer_hashes pointe toujours vers la table answers (partagée, non archivée)
+- lecture détaillée : archived_runs() (pyarrow.dataset, partitions hive)
+
+pyarrow n'est importé qu'à l'archivage / la lecture détaillée.
+Usage : python -m src.prospecting.archive [--older-than JOURS]
+"""
+import logging
+import os
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from ..utils.storage import atomic_write_bytes
+from .database import DATA_DIR, jdumps, jloads
+from .models import CampaignDB, RunStatsDB, TestRunDB
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR    = Path(os.getenv("RUN_ARCHIVE_DIR", str(DATA_DIR / "archive" / "runs")))
+RETENTION_DAYS = int(os.getenv("RUN_RETENTION_DAYS", "180"))
+ARCHIVE_BATCH  = int(os.getenv("RUN_ARCHIVE_BATCH", "5000"))
+
+# Colonnes écrites (campaign_id + month sont dans le chemin de partition)
+_COLUMNS = (
+    "run_id", "prospect_id", "ts", "model", "queries", "answer_hashes", "raw_answers",
+    "extracted_entities", "mentioned_target", "mention_per_query", "competitors_entities", "notes",
+)
+
+
+def _schema():
+    import pyarrow as pa
+
+    types = {"ts": pa.timestamp("us"), "mentioned_target": pa.bool_()}
+    return pa.schema([(c, types.get(c, pa.string())) for c in _COLUMNS])
+
+
+def _partitioning():
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    return ds.partitioning(pa.schema([("campaign_id", pa.string()), ("month", pa.string())]), flavor="hive")
+
+
+# ─────────────────────────── ARCHIVAGE ───────────────────────────
+
+def archive_runs(
+    db: Session,
+    older_than_days: Optional[int] = None,
+    now: Optional[datetime] = None,
+    batch_size: int = ARCHIVE_BATCH,
+) -> Dict:
+    """
+    Déplace les runs froids vers le Parquet, par lots : fichiers écrits d'abord,
+    puis agrégats + suppression dans une même transaction. Une passe interrompue
+    peut laisser des doublons dans le Parquet (dédoublonnés à la lecture), jamais de perte.
+    Retourne {archived, files, cutoff}.
+    """
+    days   = RETENTION_DAYS if older_than_days is None else older_than_days
+    cutoff = (now or datetime.utcnow()) - timedelta(days=days)
+    closed = select(CampaignDB.campaign_id).where(CampaignDB.status != "active")
+    stmt   = (
+        select(*(getattr(TestRunDB, c) for c in _COLUMNS), TestRunDB.campaign_id)
+        .where(or_(TestRunDB.ts < cutoff, TestRunDB.campaign_id.in_(closed)))
+        .order_by(TestRunDB.campaign_id, TestRunDB.ts)
+        .limit(batch_size)
+    )
+
+    totals = {"archived": 0, "files": 0, "cutoff": cutoff.isoformat()}
+    while True:
+        rows = db.execute(stmt).all()
+        if not rows:
+            break
+        totals["files"] += _write_parts(rows)
+        _merge_stats(db, rows)
+        run_ids = [r.run_id for r in rows]
+        db.execute(TestRunDB.__table__.delete().where(TestRunDB.run_id.in_(run_ids)))
+        db.commit()
+        totals["archived"] += len(rows)
+
+    if totals["archived"]:
+        logger.info(f"[ARCHIVE] {totals['archived']} run(s) archivés → {totals['files']} fichier(s) Parquet")
+    return totals
+
+
+def _write_parts(rows: list) -> int:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    groups: Dict[tuple, list] = defaultdict(list)
+    for r in rows:
+        groups[(r.campaign_id, r.ts.strftime("%Y-%m"))].append(r)
+
+    schema = _schema()
+    for (campaign_id, month), part in groups.items():
+        table = pa.Table.from_pylist([{c: getattr(r, c) for c in _COLUMNS} for r in part], schema=schema)
+        sink  = pa.BufferOutputStream()
+        pq.write_table(table, sink, compression="zstd")
+        name  = f"part-{part[0].ts:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}.parquet"
+        atomic_write_bytes(
+            ARCHIVE_DIR / f"campaign_id={campaign_id}" / f"month={month}" / name,
+            sink.getvalue().to_pybytes(),
+        )
+    return len(groups)
+
+
+def _merge_stats(db: Session, rows: list) -> None:
+    """Ajoute les runs du lot aux agrégats prospect × modèle × jour."""
+    existing = {
+        (s.prospect_id, s.model, s.day): s
+        for s in db.query(RunStatsDB).filter(RunStatsDB.prospect_id.in_({r.prospect_id for r in rows}))
+    }
+    for r in rows:
+        key   = (r.prospect_id, r.model, r.ts.date())
+        stats = existing.get(key)
+        if stats is None:
+            stats = existing[key] = RunStatsDB(
+                prospect_id=r.prospect_id, model=r.model, day=r.ts.date(), campaign_id=r.campaign_id,
+                runs=0, mentions=0, query_mentions="[]", query_labels="[]", first_ts=r.ts, last_ts=r.ts,
+            )
+            db.add(stats)
+
+        counts = jloads(stats.query_mentions)
+        labels = jloads(stats.query_labels)
+        mlist, qlist = jloads(r.mention_per_query), jloads(r.queries)
+        for qi in range(min(5, len(mlist))):
+            while len(counts) <= qi:
+                counts.append(0)
+            counts[qi] += 1 if mlist[qi] else 0
+        for qi in range(min(5, len(qlist))):
+            while len(labels) <= qi:
+                labels.append("")
+            labels[qi] = labels[qi] or qlist[qi]
+
+        stats.runs          += 1
+        stats.mentions      += 1 if r.mentioned_target else 0
+        stats.query_mentions = jdumps(counts)
+        stats.query_labels   = jdumps(labels)
+        stats.first_ts       = min(stats.first_ts, r.ts)
+        stats.last_ts        = max(stats.last_ts, r.ts)
+
+
+# ─────────────────────────── LECTURE ───────────────────────────
+
+def archived_stats(db: Session, prospect_ids: Iterable[str]) -> Dict[str, List[RunStatsDB]]:
+    """Agrégats archivés par prospect, triés par jour (lecture DB seule, sans pyarrow)."""
+    ids = list(prospect_ids)
+    by_prospect: Dict[str, List[RunStatsDB]] = {pid: [] for pid in ids}
+    if not ids:
+        return by_prospect
+    for s in db.query(RunStatsDB).filter(RunStatsDB.prospect_id.in_(ids)).order_by(RunStatsDB.day, RunStatsDB.first_ts):
+        by_prospect[s.prospect_id].append(s)
+    return by_prospect
+
+
+def archived_runs(
+    campaign_id: Optional[str] = None,
+    prospect_ids: Optional[Iterable[str]] = None,
+) -> List[SimpleNamespace]:
+    """Runs archivés (mêmes attributs que TestRunDB + campaign_id, month), triés par date."""
+    if not ARCHIVE_DIR.exists():
+        return []
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(str(ARCHIVE_DIR), format="parquet", partitioning=_partitioning())
+    expr = None
+    if campaign_id:
+        expr = ds.field("campaign_id") == campaign_id
+    if prospect_ids is not None:
+        by_prospect = ds.field("prospect_id").isin(list(prospect_ids))
+        expr = by_prospect if expr is None else expr & by_prospect
+
+    seen: set = set()
+    runs: List[SimpleNamespace] = []
+    for row in sorted(dataset.to_table(filter=expr).to_pylist(), key=lambda r: r["ts"]):
+        if row["run_id"] in seen:      # passe interrompue puis rejouée
+            continue
+        seen.add(row["run_id"])
+        runs.append(SimpleNamespace(**row))
+    return runs
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from .database import SessionLocal, init_db
+
+    parser = argparse.ArgumentParser(description="Archive les runs IA froids en Parquet")
+    parser.add_argument("--older-than", type=int, default=None, help=f"jours (défaut {RETENTION_DAYS})")
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    init_db()
+    session = SessionLocal()
+    try:
+        print(archive_runs(session, older_than_days=args.older_than, batch_size=args.batch_size))
+    finally:
+        session.close()
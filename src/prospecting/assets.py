@@ -5,12 +5,18 @@ POST /api/prospect/{prospect_id}/assets
 - Enregistre video_url + screenshot_url
 - BLOQUE READY_TO_SEND sans ces 2 champs
 - Transition SCORED → READY_ASSETS → READY_TO_SEND
+- READY_TO_SEND → publication des pages statiques (publish.py)
+- transitions ensemblistes (transitions.py) : un UPDATE pour tout un lot
 """
-from typing import Optional
+import logging
+from typing import Iterable, List, Optional
 from sqlalchemy.orm import Session
 
 from .database import db_get_prospect, db_save_prospect
 from .models import ProspectDB, ProspectStatus, AssetsInput
+from .transitions import bulk_transition, transition
+
+logger = logging.getLogger(__name__)
 
 
 def set_assets(db: Session, prospect_id: str, assets: AssetsInput) -> ProspectDB:
@@ -27,9 +33,9 @@ def set_assets(db: Session, prospect_id: str, assets: AssetsInput) -> ProspectDB
     prospect.video_url      = assets.video_url.strip()
     prospect.screenshot_url = assets.screenshot_url.strip()
 
-    # Transition SCORED → READY_ASSETS si possible
+    # Transition SCORED → READY_ASSETS si possible (même transaction que les assets)
     if prospect.status == ProspectStatus.SCORED.value:
-        prospect.status = ProspectStatus.READY_ASSETS.value
+        transition(db, prospect, ProspectStatus.READY_ASSETS, reason="assets", commit=False)
 
     db.commit()
     db.refresh(prospect)
@@ -58,7 +64,34 @@ def mark_ready_to_send(db: Session, prospect_id: str) -> ProspectDB:
     if errors:
         raise ValueError("Gate READY_TO_SEND bloquée : " + " | ".join(errors))
 
-    prospect.status = ProspectStatus.READY_TO_SEND.value
-    db.commit()
+    if not promote_ready(db, prospect_ids=[prospect_id], reason="manuel"):
+        raise ValueError("Gate READY_TO_SEND bloquée : prospect modifié entre-temps")
+
     db.refresh(prospect)
     return prospect
+
+
+def promote_ready(
+    db: Session,
+    campaign_id=None,
+    prospect_ids: Optional[Iterable[str]] = None,
+    reason: Optional[str] = None,
+) -> List[str]:
+    """
+    READY_ASSETS → READY_TO_SEND en un UPDATE (gates : assets + eligibility_flag),
+    puis publication des pages statiques des prospects promus.
+    """
+    promoted = bulk_transition(
+        db, ProspectStatus.READY_ASSETS, ProspectStatus.READY_TO_SEND,
+        campaign_id=campaign_id, prospect_ids=prospect_ids, reason=reason,
+    )
+
+    # Pages statiques : un échec ne bloque pas la transition (landing dynamique en secours)
+    from .publish import publish_prospect
+    for pid in promoted:
+        try:
+            publish_prospect(db, db_get_prospect(db, pid))
+        except Exception as e:
+            logger.warning(f"Publication statique échouée pour {pid}: {e}")
+
+    return promoted
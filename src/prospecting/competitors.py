@@ -0,0 +1,194 @@
+"""
+Module COMPETITORS — index inversé des concurrents cités, toutes campagnes
+
+competitor_index : nom normalisé → (prospect, modèle) avec nb de runs et dates.
+- tenu à jour à l'insertion des runs (listener after_flush, enregistré par
+  database.py) ; insertions Core en masse : appeler index_runs() explicitement
+- « dans quelles villes X est-il recommandé, par quels modèles, combien de
+  fois » : competitor_report(), lecture par clé primaire, sans parcourir les
+  JSON des runs
+- chaque nouvelle clé est rattachée à un concurrent canonique
+  (resolution.resolve_keys, MinHash / LSH) ; le rapport agrège tous ses alias
+- known_competitors() : clés normalisées demandées → nom canonique (lecture
+  par clé primaire), utilisé par extract_competitors pour unifier les
+  variantes d'un même nom
+"""
+import json
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+import sqlalchemy as sa
+from sqlalchemy import distinct, func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from .models import CompetitorAliasDB, CompetitorDB, CompetitorIndexDB, ProspectDB, TestRunDB
+from .resolution import entity_aliases, resolve_keys
+
+REPORT_PROSPECTS = 50       # prospects détaillés dans competitor_report
+
+
+def _upsert():
+    table = CompetitorIndexDB.__table__
+    stmt  = insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=["name_key", "prospect_id", "model"],
+        set_={
+            "runs":        table.c.runs + stmt.excluded.runs,
+            "campaign_id": stmt.excluded.campaign_id,
+            "first_seen":  func.min(table.c.first_seen, stmt.excluded.first_seen),
+            "last_seen":   func.max(table.c.last_seen, stmt.excluded.last_seen),
+        },
+    )
+
+
+def index_runs(conn, runs: Iterable, resolve: bool = True) -> int:
+    """
+    Ajoute des runs (objets ou lignes : prospect_id, campaign_id, model, ts,
+    competitors_entities) à l'index, sur la connexion / session donnée.
+    resolve : rattache les nouvelles graphies à un concurrent canonique.
+    Retourne le nombre d'entrées (concurrent × prospect × modèle) touchées.
+    """
+    from .ia_test import normalize_name   # ia_test importe ce module
+
+    postings: Dict[tuple, Dict] = {}
+    for run in runs:
+        ts = run.ts or datetime.utcnow()
+        names: Dict[str, str] = {}
+        for name in json.loads(run.competitors_entities or "[]"):
+            key = normalize_name(name)
+            if key:
+                names.setdefault(key, name)
+        for key, name in names.items():
+            entry = postings.get((key, run.prospect_id, run.model))
+            if entry is None:
+                postings[(key, run.prospect_id, run.model)] = {
+                    "name_key": key, "prospect_id": run.prospect_id, "model": run.model,
+                    "campaign_id": run.campaign_id, "name": name, "runs": 1, "first_seen": ts, "last_seen": ts,
+                }
+            else:
+                entry["runs"]      += 1
+                entry["first_seen"] = min(entry["first_seen"], ts)
+                entry["last_seen"]  = max(entry["last_seen"], ts)
+    if postings:
+        conn.execute(_upsert(), list(postings.values()))
+        if resolve:
+            resolve_keys(conn, {e["name_key"]: e["name"] for e in postings.values()})
+    return len(postings)
+
+
+def _index_flushed(session: Session, flush_context) -> None:
+    runs = [obj for obj in session.new if isinstance(obj, TestRunDB)]
+    if runs:
+        index_runs(session.connection(), runs)
+
+
+def register(session_factory: sessionmaker) -> None:
+    from sqlalchemy import event
+    event.listen(session_factory, "after_flush", _index_flushed)
+
+
+# ─────────────────────────── LECTURE ───────────────────────────
+
+def known_competitors(db: Session, keys: Iterable[str]) -> Dict[str, str]:
+    """Clé normalisée (alias) → nom du concurrent canonique, pour les seules clés déjà indexées parmi keys."""
+    keys = [k for k in set(keys) if k]
+    if not keys:
+        return {}
+    rows = db.execute(
+        select(CompetitorAliasDB.name_key, CompetitorDB.name)
+        .join(CompetitorDB, CompetitorDB.entity_id == CompetitorAliasDB.entity_id)
+        .where(CompetitorAliasDB.name_key.in_(keys))
+    )
+    return dict(rows.all())
+
+
+def competitor_report(db: Session, name: str, limit: int = REPORT_PROSPECTS) -> Optional[Dict]:
+    """
+    Où et par quels modèles un concurrent est cité : totaux, par modèle, par ville,
+    prospects les plus concernés. Agrégé en SQL sur les plages de clé primaire des
+    alias du concurrent canonique (la graphie seule si elle n'est pas résolue).
+    """
+    from .ia_test import normalize_name
+
+    CI     = CompetitorIndexDB
+    key    = normalize_name(name)
+    entity = entity_aliases(db, key)
+    keys   = entity[1] if entity else [key]
+    runs   = func.sum(CI.runs).label("runs")
+    totals = db.execute(
+        select(
+            runs, func.count(distinct(CI.prospect_id)).label("prospects"),
+            func.count(distinct(CI.campaign_id)).label("campaigns"), func.min(CI.name).label("name"),
+            func.min(CI.first_seen).label("first_seen"), func.max(CI.last_seen).label("last_seen"),
+        ).where(CI.name_key.in_(keys))
+    ).one()
+    if not totals.runs:
+        return None
+
+    by_city = (
+        select(ProspectDB.city, ProspectDB.profession)
+        .select_from(CI)
+        .outerjoin(ProspectDB, ProspectDB.prospect_id == CI.prospect_id)
+        .where(CI.name_key.in_(keys))
+    )
+    cities: Dict[tuple, Dict] = {
+        (row.city, row.profession): {
+            "city": row.city, "profession": row.profession, "runs": 0, "prospects": row.prospects, "models": {},
+        }
+        for row in db.execute(
+            by_city.add_columns(func.count(distinct(CI.prospect_id)).label("prospects"))
+            .group_by(ProspectDB.city, ProspectDB.profession)
+        )
+    }
+    models: Dict[str, int] = defaultdict(int)
+    for row in db.execute(by_city.add_columns(CI.model, runs).group_by(ProspectDB.city, ProspectDB.profession, CI.model)):
+        city = cities[(row.city, row.profession)]
+        city["runs"] += row.runs
+        city["models"][row.model] = row.runs
+        models[row.model] += row.runs
+
+    top = db.execute(
+        select(
+            CI.prospect_id, ProspectDB.name, ProspectDB.city, func.min(CI.campaign_id).label("campaign_id"), runs,
+            func.group_concat(CI.model + ":" + sa.cast(CI.runs, sa.String)).label("models"),
+            func.max(CI.last_seen).label("last_seen"),
+        )
+        .outerjoin(ProspectDB, ProspectDB.prospect_id == CI.prospect_id)
+        .where(CI.name_key.in_(keys))
+        .group_by(CI.prospect_id)
+        .order_by(runs.desc(), CI.prospect_id)
+        .limit(limit)
+    ).all()
+
+    return {
+        "name":       entity[0].name if entity else totals.name,
+        "entity_id":  entity[0].entity_id if entity else None,
+        "key":        key,
+        "aliases":    keys,
+        "runs":       totals.runs,
+        "prospects":  totals.prospects,
+        "campaigns":  totals.campaigns,
+        "first_seen": totals.first_seen.isoformat(),
+        "last_seen":  totals.last_seen.isoformat(),
+        "models":     dict(sorted(models.items(), key=lambda m: -m[1])),
+        "cities":     sorted(cities.values(), key=lambda c: -c["runs"]),
+        "top_prospects": [
+            {
+                "prospect_id": row.prospect_id, "name": row.name, "city": row.city, "campaign_id": row.campaign_id,
+                "runs": row.runs, "last_seen": row.last_seen.isoformat(),
+                "models": _model_runs(row.models),
+            }
+            for row in top
+        ],
+    }
+
+
+def _model_runs(concat: str) -> Dict[str, int]:
+    """« openai:2,gemini:1,openai:1 » (une part par alias) → {"openai": 3, "gemini": 1}."""
+    out: Dict[str, int] = defaultdict(int)
+    for part in concat.split(","):
+        model, n = part.rsplit(":", 1)
+        out[model] += int(n)
+    return dict(out)
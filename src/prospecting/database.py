@@ -1,15 +1,21 @@
 """
 SQLite — init + session + helpers CRUD
 """
+import base64
 import json
 import os
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Iterable, Optional, List, Tuple
 
-from sqlalchemy import create_engine
+from sqlalchemy import and_, case, create_engine, func, or_
 from sqlalchemy.orm import sessionmaker, Session
 
-from .models import Base, CampaignDB, ProspectDB, TestRunDB, ProspectStatus, can_transition
+from .competitors import register as register_competitors
+from .events import register as register_events
+from .landing_cache import register as register_landing_cache
+from .models import ANSWERS_FTS, CampaignDB, ProspectDB, TestRunDB, ProspectStatus
+from .trends import register as register_trends
 
 # ── Config ──
 DATA_DIR = Path(__file__).parent.parent.parent / "data"
@@ -18,10 +24,30 @@ DATA_DIR.mkdir(exist_ok=True)
 DB_PATH   = os.getenv("PROSPECTING_DB_PATH", str(DATA_DIR / "prospecting.db"))
 ENGINE    = create_engine(f"sqlite:///{DB_PATH}", connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=ENGINE)
+register_events(SessionLocal)   # journal prospect_events : créations + runs écrits au flush
+register_competitors(SessionLocal)   # index inversé competitor_index : runs insérés au flush
+register_trends(SessionLocal)   # série visibility_points (créneau / jour / semaine) : runs insérés au flush
+register_landing_cache(SessionLocal)   # cache /couvreur + pages publiées : invalidés au commit
 
 
-def init_db() -> None:
-    Base.metadata.create_all(bind=ENGINE)
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+
+
+def init_db(engine=None) -> None:
+    """Met le schéma à jour (alembic upgrade head) — idempotent, aussi sur une base créée par create_all."""
+    from alembic import command
+    from alembic.config import Config
+
+    cfg = Config()
+    cfg.set_main_option("script_location", str(MIGRATIONS_DIR))
+    with (engine or ENGINE).begin() as connection:
+        cfg.attributes["connection"] = connection
+        command.upgrade(cfg, "head")
+
+
+def include_name(name, type_, parent_names) -> bool:
+    """Filtre alembic (autogenerate / compare_metadata) : la table FTS5 et ses tables internes hors modèles."""
+    return not (type_ == "table" and name and name.startswith(ANSWERS_FTS))
 
 
 def get_db():
@@ -49,6 +75,75 @@ def db_list_campaigns(db: Session) -> List[CampaignDB]:
     return db.query(CampaignDB).order_by(CampaignDB.created_at.desc()).all()
 
 
+def db_list_campaigns_page(
+    db: Session,
+    limit: Optional[int] = 100,
+    cursor: Optional[str] = None,
+) -> Tuple[List[CampaignDB], Optional[str]]:
+    """
+    Page de campagnes (plus récentes d'abord), pagination keyset sur (created_at, campaign_id).
+    Retourne (campagnes, curseur suivant ou None). ValueError si le curseur est invalide.
+    limit=None : toutes les campagnes à partir du curseur (jamais de curseur suivant).
+    """
+    q = db.query(CampaignDB)
+    if cursor:
+        created_at, campaign_id = decode_cursor(cursor)
+        q = q.filter(or_(
+            CampaignDB.created_at < created_at,
+            and_(CampaignDB.created_at == created_at, CampaignDB.campaign_id < campaign_id),
+        ))
+    q = q.order_by(CampaignDB.created_at.desc(), CampaignDB.campaign_id.desc())
+    if limit is None:
+        return q.all(), None
+    campaigns = q.limit(limit + 1).all()
+
+    if len(campaigns) <= limit:
+        return campaigns, None
+    last = campaigns[limit - 1]
+    return campaigns[:limit], encode_cursor(last.created_at, last.campaign_id)
+
+
+def encode_cursor(created_at: datetime, key: str) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{key}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        ts, key = raw.split("|", 1)
+        return datetime.fromisoformat(ts), key
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Curseur invalide : {cursor}") from e
+
+
+def db_campaign_counts(db: Session, campaign_ids: Iterable[str]) -> Dict[str, Dict]:
+    """
+    Compteurs par campagne en un GROUP BY campaign_id, status (index ix_prospects_campaign_status) :
+    {campaign_id: {"total", "eligible", "by_status": {status: n}}}.
+    """
+    ids = list(campaign_ids)
+    counts = {cid: {"total": 0, "eligible": 0, "by_status": {}} for cid in ids}
+    if not ids:
+        return counts
+
+    rows = (
+        db.query(
+            ProspectDB.campaign_id,
+            ProspectDB.status,
+            func.count(),
+            func.sum(case((ProspectDB.eligibility_flag.is_(True), 1), else_=0)),
+        )
+        .filter(ProspectDB.campaign_id.in_(ids))
+        .group_by(ProspectDB.campaign_id, ProspectDB.status)
+    )
+    for campaign_id, status, n, eligible in rows:
+        c = counts[campaign_id]
+        c["by_status"][status] = n
+        c["total"]    += n
+        c["eligible"] += eligible or 0
+    return counts
+
+
 # ── CRUD Prospect ──
 
 def db_create_prospect(db: Session, obj: ProspectDB) -> ProspectDB:
@@ -74,11 +169,8 @@ def db_list_prospects(db: Session, campaign_id: str, status: Optional[str] = Non
 
 
 def db_update_prospect_status(db: Session, prospect: ProspectDB, new_status: str) -> bool:
-    if not can_transition(prospect.status, new_status):
-        return False
-    prospect.status = new_status
-    db.commit()
-    return True
+    from .transitions import transition
+    return transition(db, prospect, new_status)
 
 
 def db_save_prospect(db: Session, prospect: ProspectDB) -> ProspectDB:
@@ -100,6 +192,33 @@ def db_list_runs(db: Session, prospect_id: str) -> List[TestRunDB]:
     return db.query(TestRunDB).filter(TestRunDB.prospect_id == prospect_id).order_by(TestRunDB.ts).all()
 
 
+def db_run_answers(db: Session, run_id: str) -> Optional[Dict[str, list]]:
+    """Réponses brutes + entités d'un run (table answers, ou colonnes compressées des anciens runs)."""
+    from .answers import load_answers
+
+    row = (
+        db.query(TestRunDB.answer_hashes, TestRunDB.raw_answers, TestRunDB.extracted_entities)
+        .filter(TestRunDB.run_id == run_id)
+        .first()
+    )
+    if row is None:
+        return None
+    hashes = jloads(row.answer_hashes)
+    if not hashes:
+        return {"raw_answers": jloads(row.raw_answers), "extracted_entities": jloads(row.extracted_entities)}
+
+    answers = load_answers(db, hashes)
+    legacy  = jloads(row.extracted_entities)    # runs migrés : entités pas encore extraites dans answers
+    return {
+        "raw_answers":        [a.body for a in answers],
+        "extracted_entities": [
+            [{"type": e["type"], "value": e["value"]} for e in jloads(a.entities)]
+            if a.entities is not None else (legacy[i] if i < len(legacy) else [])
+            for i, a in enumerate(answers)
+        ],
+    }
+
+
 # ── JSON helpers (for JSON columns) ──
 
 def jloads(s: str) -> list:
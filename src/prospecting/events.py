@@ -0,0 +1,167 @@
+"""
+Module EVENTS — journal append-only des prospects (change feed)
+
+prospect_events : une ligne par création, changement de statut (transitions.py),
+mise à jour d'un champ suivi ou run IA inséré, dans la transaction qui produit
+le changement. Les consommateurs gardent le dernier seq lu et demandent
+events_since(seq) ; notifier évite de relire la table tant que rien n'a changé.
+
+- écritures ORM : listener after_flush (enregistré par database.py)
+- UPDATE / INSERT en masse (Core) : appeler record() explicitement
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import func, inspect, insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from .models import ProspectDB, ProspectEventDB, TestRunDB
+
+CREATED    = "created"
+TRANSITION = "transition"
+UPDATED    = "updated"
+RUN        = "run"
+KINDS      = (CREATED, TRANSITION, UPDATED, RUN)
+
+MAX_PAGE = 1000
+
+# Champs dont la modification (ORM) produit un événement "updated" (reason = champs modifiés)
+TRACKED_FIELDS = (
+    "name", "website", "video_url", "screenshot_url",
+    "ia_visibility_score", "eligibility_flag", "competitors_cited",
+)
+
+_WRITTEN_KEY = "prospect_events_written"
+
+
+def record(db: Session, events: Iterable[Dict]) -> int:
+    """Insère des événements (dicts de colonnes) dans la transaction courante."""
+    now  = datetime.utcnow()
+    rows = [{"ts": now, **e} for e in events]
+    if rows:
+        db.execute(insert(ProspectEventDB), rows)
+        db.info[_WRITTEN_KEY] = True
+    return len(rows)
+
+
+def events_since(
+    db: Session,
+    since: int = 0,
+    limit: int = 500,
+    campaign_id: Optional[str] = None,
+    kinds: Optional[Iterable[str]] = None,
+) -> List[ProspectEventDB]:
+    """Événements de seq > since, dans l'ordre. Reprendre avec le seq du dernier élément."""
+    q = db.query(ProspectEventDB).filter(ProspectEventDB.seq > since)
+    if campaign_id:
+        q = q.filter(ProspectEventDB.campaign_id == campaign_id)
+    if kinds:
+        q = q.filter(ProspectEventDB.kind.in_(list(kinds)))
+    return q.order_by(ProspectEventDB.seq).limit(min(limit, MAX_PAGE)).all()
+
+
+def latest_seq(db: Session) -> int:
+    return db.query(func.max(ProspectEventDB.seq)).scalar() or 0
+
+
+def event_dict(e: ProspectEventDB) -> Dict:
+    return {
+        "seq":         e.seq,
+        "ts":          e.ts.isoformat(),
+        "kind":        e.kind,
+        "prospect_id": e.prospect_id,
+        "campaign_id": e.campaign_id,
+        "from_status": e.from_status,
+        "to_status":   e.to_status,
+        "run_id":      e.run_id,
+        "reason":      e.reason,
+    }
+
+
+class ChangeNotifier:
+    """
+    Dernier seq connu, partagé par tous les lecteurs du process (flux SSE admin).
+    Relu en base seulement après un commit qui a écrit des événements, ou toutes
+    les `recheck` secondes (écritures d'un autre process).
+    """
+
+    def __init__(self, recheck: float = 5.0):
+        self.recheck  = recheck
+        self._seq     = 0
+        self._dirty   = True
+        self._checked = 0.0
+        self._lock    = threading.Lock()
+
+    def mark_dirty(self) -> None:
+        with self._lock:
+            self._dirty = True
+
+    def latest(self, session_factory: Callable[[], Session]) -> int:
+        with self._lock:
+            if self._dirty or time.monotonic() - self._checked >= self.recheck:
+                db = session_factory()
+                try:
+                    self._seq = latest_seq(db)
+                finally:
+                    db.close()
+                self._dirty   = False
+                self._checked = time.monotonic()
+            return self._seq
+
+
+notifier = ChangeNotifier()
+
+
+# ─────────────────────────── ÉCRITURE (ORM) ───────────────────────────
+
+def _prospect_events(obj: ProspectDB) -> List[Dict]:
+    state  = inspect(obj)
+    base   = {"prospect_id": obj.prospect_id, "campaign_id": obj.campaign_id}
+    events = []
+
+    status = state.attrs.status.history
+    if status.has_changes() and status.deleted:
+        events.append({**base, "kind": TRANSITION, "from_status": status.deleted[0], "to_status": obj.status})
+
+    changed = [f for f in TRACKED_FIELDS if state.attrs[f].history.has_changes()]
+    if changed:
+        events.append({**base, "kind": UPDATED, "to_status": obj.status, "reason": ",".join(changed)})
+    return events
+
+
+def _record_flushed(session: Session, flush_context) -> None:
+    events = []
+    for obj in session.new:
+        if isinstance(obj, ProspectDB):
+            events.append({"kind": CREATED, "prospect_id": obj.prospect_id,
+                           "campaign_id": obj.campaign_id, "to_status": obj.status})
+        elif isinstance(obj, TestRunDB):
+            events.append({"kind": RUN, "prospect_id": obj.prospect_id,
+                           "campaign_id": obj.campaign_id, "run_id": obj.run_id, "reason": obj.model})
+    for obj in session.dirty:
+        if isinstance(obj, ProspectDB):
+            events.extend(_prospect_events(obj))
+    if events:
+        # créations d'abord ; exécuté sur la connexion de la transaction en cours
+        events.sort(key=lambda e: e["kind"] != CREATED)
+        now = datetime.utcnow()
+        session.connection().execute(insert(ProspectEventDB), [{"ts": now, **e} for e in events])
+        session.info[_WRITTEN_KEY] = True
+
+
+def _notify_committed(session: Session) -> None:
+    if session.info.pop(_WRITTEN_KEY, False):
+        notifier.mark_dirty()
+
+
+def _discard_written(session: Session, previous_transaction) -> None:
+    session.info.pop(_WRITTEN_KEY, None)
+
+
+def register(session_factory: sessionmaker) -> None:
+    from sqlalchemy import event
+    event.listen(session_factory, "after_flush", _record_flushed)
+    event.listen(session_factory, "after_commit", _notify_committed)
+    event.listen(session_factory, "after_soft_rollback", _discard_written)
@@ -7,24 +7,41 @@ Module GENERATE — Livrables
 - delivery         : SendQueue CSV + fichiers emails — AUCUN ENVOI AUTO
 """
 import csv
+import hashlib
 import io
 import json
+import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from types import SimpleNamespace
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
 
-from .database import db_list_runs, jloads
-from .models import ProspectDB, ProspectStatus
+from ..utils.storage import atomic_write_bytes, content_digest
+from .archive import archived_stats
+from .database import jloads
+from .models import ProspectDB, ProspectStatus, TestRunDB
+from .templates import render, template_digest
+
+logger = logging.getLogger(__name__)
 
 SEND_QUEUE_DIR = Path(__file__).parent.parent.parent / "send_queue"
 SEND_QUEUE_DIR.mkdir(exist_ok=True)
 
+# Pages statiques pré-rendues (publish.py), servies sous /p/{landing_token}/
+PUBLISHED_DIR = Path(__file__).parent.parent.parent / "published"
+PUBLISHED_DIR.mkdir(exist_ok=True)
+
 SIGNATURE = os.getenv("SENDER_SIGNATURE", "L'équipe EURKAI")
 BASE_URL   = os.getenv("BASE_URL", "http://localhost:8000")
 
+GENERATE_WORKERS = int(os.getenv("GENERATE_WORKERS", "8"))   # threads écriture send_queue
+MANIFEST_NAME    = ".manifest.json"                          # hash par artefact (skip si inchangé)
+
 
 # ─────────────────────────── HELPERS ───────────────────────────
 
@@ -36,18 +53,57 @@ def _get_competitors(prospect: ProspectDB, max_n: int = 2) -> List[str]:
         return []
 
 
+def _runs_by_prospect(db: Session, prospect_ids: Iterable[str], chunk: int = 500) -> Dict[str, list]:
+    """Runs de plusieurs prospects en une requête par lot (colonnes du résumé uniquement)."""
+    ids = list(prospect_ids)
+    by_prospect: Dict[str, list] = {pid: [] for pid in ids}
+    for i in range(0, len(ids), chunk):
+        rows = (
+            db.query(
+                TestRunDB.prospect_id, TestRunDB.ts, TestRunDB.model, TestRunDB.mentioned_target,
+                TestRunDB.mention_per_query, TestRunDB.queries,
+            )
+            .filter(TestRunDB.prospect_id.in_(ids[i:i + chunk]))
+            .order_by(TestRunDB.ts)
+            .all()
+        )
+        for r in rows:
+            by_prospect[r.prospect_id].append(r)
+    return by_prospect
+
+
 def _runs_summary(db: Session, prospect: ProspectDB) -> Dict:
-    """Résumé des runs pour un prospect."""
-    runs = db_list_runs(db, prospect.prospect_id)
-    total_runs    = len(runs)
-    models_used   = list({r.model for r in runs})
-    mentioned_any = any(r.mentioned_target for r in runs)
-    mention_counts = sum(1 for r in runs if r.mentioned_target)
-    run_dates     = sorted({r.ts.strftime("%d/%m/%Y") for r in runs}) if runs else []
+    """Résumé des runs pour un prospect (runs archivés inclus)."""
+    return _runs_summaries(db, [prospect.prospect_id])[prospect.prospect_id]
+
+
+def _runs_summaries(db: Session, prospect_ids: Iterable[str]) -> Dict[str, Dict]:
+    """Résumés de plusieurs prospects : runs en base + agrégats des runs archivés (run_stats)."""
+    ids      = list(prospect_ids)
+    runs     = _runs_by_prospect(db, ids)
+    archived = archived_stats(db, ids)
+    return {pid: _summarize_runs(runs[pid], archived[pid]) for pid in ids}
+
+
+def _summarize_runs(runs: list, archived: Iterable = ()) -> Dict:
+    archived      = list(archived)     # RunStatsDB, plus anciens que les runs en base
+    total_runs    = len(runs) + sum(s.runs for s in archived)
+    models_used   = sorted({r.model for r in runs} | {s.model for s in archived})   # ordre stable (hash des entrées)
+    mentioned_any = any(r.mentioned_target for r in runs) or any(s.mentions for s in archived)
+    mention_counts = sum(1 for r in runs if r.mentioned_target) + sum(s.mentions for s in archived)
+    run_dates     = sorted(
+        {r.ts.strftime("%d/%m/%Y") for r in runs} | {s.day.strftime("%d/%m/%Y") for s in archived}
+    )
 
     # mention par requête (agrégé sur tous les runs)
     query_mentions = [0] * 5
     query_labels   = [""] * 5
+    for s in archived:
+        counts, labels = jloads(s.query_mentions), jloads(s.query_labels)
+        for qi in range(min(5, len(counts))):
+            query_mentions[qi] += counts[qi]
+        for qi in range(min(5, len(labels))):
+            query_labels[qi] = query_labels[qi] or labels[qi]
     for r in runs:
         mlist  = jloads(r.mention_per_query)
         qlist  = jloads(r.queries)
@@ -70,165 +126,89 @@ def _runs_summary(db: Session, prospect: ProspectDB) -> Dict:
 
 # ─────────────────────────── AUDIT HTML ───────────────────────────
 
-_AUDIT_TEMPLATE = """<!DOCTYPE html>
-<html lang="fr">
-<head>
-<meta charset="UTF-8">
-<title>Audit IA — {company_name}</title>
-<style>
-  body{{font-family:Arial,sans-serif;margin:0;padding:40px;color:#222;max-width:900px;margin:auto}}
-  h1{{color:#1a1a2e;border-bottom:3px solid #e94560;padding-bottom:10px}}
-  h2{{color:#16213e;margin-top:40px}}
-  .score-box{{background:#f0f4ff;border-left:5px solid #e94560;padding:20px 30px;margin:20px 0;border-radius:4px}}
-  .score-number{{font-size:56px;font-weight:bold;color:#e94560}}
-  table{{border-collapse:collapse;width:100%;margin:16px 0}}
-  th{{background:#16213e;color:#fff;padding:10px 14px;text-align:left}}
-  td{{padding:9px 14px;border-bottom:1px solid #e8e8e8}}
-  tr:nth-child(even){{background:#f9f9fb}}
-  .badge-ok{{background:#2ecc71;color:#fff;padding:3px 10px;border-radius:12px;font-size:12px}}
-  .badge-no{{background:#e74c3c;color:#fff;padding:3px 10px;border-radius:12px;font-size:12px}}
-  .plan-action{{background:#fffbea;border:1px solid #f1c40f;padding:20px 30px;border-radius:6px;margin-top:30px}}
-  .plan-action h2{{color:#b8860b;margin-top:0}}
-  .checklist li{{margin:8px 0}}
-  .checklist li::before{{content:"☑ ";color:#2ecc71}}
-  footer{{margin-top:60px;color:#888;font-size:12px;border-top:1px solid #ddd;padding-top:20px}}
-</style>
-</head>
-<body>
-<h1>🤖 Audit IA — Visibilité dans les réponses des intelligences artificielles</h1>
-<p><strong>Entreprise :</strong> {company_name}<br>
-<strong>Ville :</strong> {city}<br>
-<strong>Secteur :</strong> {profession}<br>
-<strong>Date du rapport :</strong> {report_date}</p>
-
-<div class="score-box">
-  <div>Score de visibilité IA</div>
-  <div class="score-number">{score}/10</div>
-  <div>{justification_short}</div>
-</div>
-
-<h2>📊 Résultats des tests</h2>
-<p>Tests réalisés : <strong>{total_runs} runs</strong> sur {models_str} | Dates : {dates_str}</p>
-
-<table>
-  <tr><th>Requête</th><th>Cité</th></tr>
-  {query_rows}
-</table>
-
-<h2>🏆 Concurrents identifiés</h2>
-<p>Les entreprises citées régulièrement par les IA :</p>
-<ul>
-  {competitor_items}
-</ul>
-
-<h2>📋 Synthèse</h2>
-<p>{synthesis}</p>
-
-<div class="plan-action">
-<h2>✅ BONUS — Plan d'action prioritaire</h2>
-<p>Pour améliorer votre visibilité IA dans les 90 prochains jours :</p>
-<ul class="checklist">
-  <li><strong>Google Business Profile</strong> — Compléter à 100% (description, catégories, photos, horaires)</li>
-  <li><strong>Avis Google</strong> — Viser 40+ avis avec réponses systématiques (les IA lisent les avis)</li>
-  <li><strong>Contenu FAQ</strong> — Publier 5-10 pages répondant aux questions exactes testées ci-dessus</li>
-  <li><strong>Citations locales</strong> — Inscription sur PagesJaunes, Yelp, Houzz, Habitissimo</li>
-  <li><strong>Structured Data</strong> — Ajouter JSON-LD LocalBusiness + AggregateRating sur votre site</li>
-  <li><strong>Mentions presse</strong> — 1 article de blog local ou interview = signal fort pour les LLMs</li>
-  <li><strong>Cohérence NAP</strong> — Nom / Adresse / Téléphone identiques partout (critère algorithmes IA)</li>
-  <li><strong>Site optimisé</strong> — Titre H1 incluant ville + profession (ex : « Couvreur à {city} »)</li>
-</ul>
-<p><em>Délai estimé pour apparaître dans les réponses IA : 2-4 mois selon l'action menée.</em></p>
-</div>
-
-<footer>
-Rapport généré le {report_date} — Tests réalisés sur {models_str}.<br>
-Les réponses IA peuvent varier ; résultats basés sur tests répétés horodatés.<br>
-© EURKAI — <a href="{base_url}">ai-seo-audit</a>
-</footer>
-</body>
-</html>
-"""
-
-def audit_generate(db: Session, prospect: ProspectDB) -> str:
-    """Génère le HTML d'audit. Retourne le contenu HTML."""
-    summary     = _runs_summary(db, prospect)
-    competitors = _get_competitors(prospect, 5)
-    score       = prospect.ia_visibility_score or 0
-    justif      = (prospect.score_justification or "").split("\n")[0]
-
-    query_rows = ""
-    for qi, (label, count) in enumerate(zip(summary["query_labels"], summary["query_mentions"])):
-        cited   = count > 0
-        badge   = f'<span class="badge-ok">Cité</span>' if cited else f'<span class="badge-no">Non cité</span>'
-        q_label = label or f"Requête {qi+1}"
-        query_rows += f"<tr><td>{q_label}</td><td>{badge}</td></tr>\n"
-
-    competitor_items = "\n".join(f"<li>{c}</li>" for c in competitors) if competitors else "<li>Aucun concurrent identifié</li>"
-
-    visibility_word = "très faible" if score < 3 else "faible" if score < 6 else "moyenne"
-    synthesis = (
-        f"{prospect.name} présente une visibilité IA {visibility_word} (score {score}/10). "
-        f"Sur {summary['total_runs']} tests réalisés, l'entreprise est {'mentionnée dans ' + str(summary['mention_count']) + ' run(s)' if summary['mentioned_any'] else 'jamais mentionnée'}. "
-        + (f"Les concurrents {', '.join(competitors[:2])} sont régulièrement cités à sa place." if competitors else "")
-    )
-
-    html = _AUDIT_TEMPLATE.format(
-        company_name=prospect.name,
-        city=prospect.city,
-        profession=prospect.profession,
+def audit_context(db: Session, prospect: ProspectDB, summary: Optional[Dict] = None) -> Dict:
+    """Variables du template audit.html."""
+    return dict(
+        prospect=prospect,
+        summary=summary or _runs_summary(db, prospect),
+        competitors=_get_competitors(prospect, 5),
+        score=prospect.ia_visibility_score or 0,
+        justification_short=(prospect.score_justification or "").split("\n")[0],
         report_date=datetime.utcnow().strftime("%d/%m/%Y"),
-        score=score,
-        justification_short=justif,
-        total_runs=summary["total_runs"],
-        models_str=", ".join(summary["models"]) or "—",
-        dates_str=", ".join(summary["dates"][:3]) or "—",
-        query_rows=query_rows,
-        competitor_items=competitor_items,
-        synthesis=synthesis,
         base_url=BASE_URL,
     )
 
+
+def audit_generate(db: Session, prospect: ProspectDB, lang: str = "fr") -> str:
+    """Génère le HTML d'audit. Retourne le contenu HTML."""
+    html = render("audit.html", lang, **audit_context(db, prospect))
+
     # Sauvegarder
-    out_dir = SEND_QUEUE_DIR / prospect.prospect_id
-    out_dir.mkdir(parents=True, exist_ok=True)
-    (out_dir / "audit.html").write_text(html, encoding="utf-8")
+    atomic_write_bytes(SEND_QUEUE_DIR / prospect.prospect_id / "audit.html", html.encode("utf-8"))
     return html
 
 
+def _audit_inputs_digest(prospect, summary: Dict, lang: str) -> str:
+    """Hash des entrées du rapport (hors date du rapport, qui change chaque jour)."""
+    return content_digest({
+        "template": template_digest(lang, "audit.html"),
+        "prospect": {f: getattr(prospect, f) for f in (
+            "name", "city", "profession", "competitors_cited", "ia_visibility_score", "score_justification",
+        )},
+        "summary":  summary,
+        "base_url": BASE_URL,
+    })
+
+
 # ─────────────────────────── LANDING TOKEN ───────────────────────────
 
+def landing_context(db: Session, prospect: ProspectDB, summary: Optional[Dict] = None) -> Dict:
+    """Variables du template landing.html."""
+    return dict(
+        company_name=prospect.name,
+        city=prospect.city,
+        screenshot_url=prospect.screenshot_url,
+        summary=summary or _runs_summary(db, prospect),
+        competitors=_get_competitors(prospect, 2),
+    )
+
+
 def landing_url(prospect: ProspectDB) -> str:
+    """Page statique si publiée (publish.py), sinon landing dynamique."""
+    if (PUBLISHED_DIR / prospect.landing_token / "index.html").exists():
+        return f"{BASE_URL}/p/{prospect.landing_token}/"
     return f"{BASE_URL}/couvreur?t={prospect.landing_token}"
 
 
 # ─────────────────────────── EMAIL ───────────────────────────
 
-def email_generate(db: Session, prospect: ProspectDB) -> Dict:
+def email_generate(db: Session, prospect: ProspectDB, lang: str = "fr") -> Dict:
     """Génère subject + body email. Retourne un dict."""
+    email_data = _email_data(prospect, lang)
+
+    # Sauvegarder
+    out_dir = SEND_QUEUE_DIR / prospect.prospect_id
+    for name, data in _email_files(email_data).items():
+        atomic_write_bytes(out_dir / name, data)
+
+    return email_data
+
+
+def _email_data(prospect, lang: str = "fr") -> Dict:
     competitors = _get_competitors(prospect, 2)
     comp1 = competitors[0] if len(competitors) > 0 else "vos concurrents"
     comp2 = competitors[1] if len(competitors) > 1 else ""
     l_url = landing_url(prospect)
     video = prospect.video_url or "[VIDÉO À AJOUTER]"
 
-    subject = f"À {prospect.city}, ChatGPT recommande {comp1}. Pas vous."
-
-    body = f"""Bonjour,
-
-J'ai testé ce que répondent plusieurs IA lorsqu'un client cherche un {prospect.profession} à {prospect.city}.
-
-Sur des tests répétés, {comp1}{' (et parfois ' + comp2 + ')' if comp2 else ''} est régulièrement cité. Votre entreprise n'apparaît pas.
-
-Vidéo (90s) : {video}
-Synthèse + options : {l_url}
-
-— {SIGNATURE}
-
----
-Vous recevez ce message car votre entreprise a été auditée dans le cadre d'une étude de marché locale.
-"""
+    context = dict(
+        prospect=prospect, competitors=competitors, comp1=comp1, comp2=comp2,
+        video=video, landing_url=l_url, signature=SIGNATURE,
+    )
+    subject = render("email_subject.txt", lang, **context).strip()
+    body    = render("email_body.txt", lang, **context)
 
-    email_data = {
+    return {
         "prospect_id":   prospect.prospect_id,
         "prospect_name": prospect.name,
         "city":          prospect.city,
@@ -241,19 +221,24 @@ Vous recevez ce message car votre entreprise a été auditée dans le cadre d'un
         "competitor_2":  comp2,
     }
 
-    # Sauvegarder
-    out_dir = SEND_QUEUE_DIR / prospect.prospect_id
-    out_dir.mkdir(parents=True, exist_ok=True)
-    (out_dir / "email.json").write_text(json.dumps(email_data, ensure_ascii=False, indent=2), encoding="utf-8")
-    (out_dir / "email_body.txt").write_text(f"SUBJECT: {subject}\n\n{body}", encoding="utf-8")
 
-    return email_data
+def _email_files(email_data: Dict) -> Dict[str, bytes]:
+    return {
+        "email.json":     json.dumps(email_data, ensure_ascii=False, indent=2).encode("utf-8"),
+        "email_body.txt": f"SUBJECT: {email_data['subject']}\n\n{email_data['body']}".encode("utf-8"),
+    }
 
 
 # ─────────────────────────── VIDEO SCRIPT ───────────────────────────
 
 def video_script_generate(prospect: ProspectDB) -> str:
     """Génère le script vidéo 90s (6 phrases imposées)."""
+    script = _video_script(prospect)
+    atomic_write_bytes(SEND_QUEUE_DIR / prospect.prospect_id / "video_script.txt", script.encode("utf-8"))
+    return script
+
+
+def _video_script(prospect) -> str:
     competitors = _get_competitors(prospect, 2)
     comp1 = competitors[0] if len(competitors) > 0 else "[concurrent principal]"
     comp2 = competitors[1] if len(competitors) > 1 else "[concurrent secondaire]"
@@ -269,53 +254,173 @@ Durée cible : 90 secondes
 5. « On a répété ces tests sur plusieurs créneaux et sur plusieurs IA : le constat est stable. »
 6. « Je vous ai préparé la synthèse + le plan d'action ici : {l_url} »
 """
-    out_dir = SEND_QUEUE_DIR / prospect.prospect_id
-    out_dir.mkdir(parents=True, exist_ok=True)
-    (out_dir / "video_script.txt").write_text(script, encoding="utf-8")
     return script
 
 
 # ─────────────────────────── SEND QUEUE (CSV) ───────────────────────────
 
-def delivery_generate(db: Session, prospects: List[ProspectDB]) -> str:
+def delivery_generate(db: Session, prospects: List[ProspectDB], lang: str = "fr") -> Dict:
     """
     Génère le CSV SendQueue + emails de tous les prospects éligibles.
     AUCUN ENVOI AUTO.
-    Retourne le chemin du CSV.
+
+    - runs de tous les prospects lus en une fois
+    - artefacts écrits en parallèle (threads), atomiquement
+    - artefact inchangé (hash dans send_queue/{id}/.manifest.json) → non réécrit
+    Retourne {send_queue_csv, generated, skipped, failed, errors}.
     """
     csv_path = SEND_QUEUE_DIR / f"send_queue_{datetime.utcnow().strftime('%Y%m%d_%H%M')}.csv"
-    rows: List[Dict] = []
+    eligible = [p for p in prospects if p.eligibility_flag]
+
+    # Lecture DB dans le thread appelant ; les workers ne reçoivent que des copies
+    summaries = _runs_summaries(db, [p.prospect_id for p in eligible])
+    jobs = [(_snapshot(p), summaries[p.prospect_id]) for p in eligible]
+
+    counts = {"generated": 0, "skipped": 0, "failed": 0}
+    errors: List[Dict] = []
+    rows:   List[Dict] = []
+
+    with ThreadPoolExecutor(max_workers=GENERATE_WORKERS) as pool:
+        futures = [pool.submit(_deliver_prospect, snap, summary, lang) for snap, summary in jobs]
+        for (snap, _), future in zip(jobs, futures):
+            try:
+                email_data, outcome = future.result()
+            except Exception as e:
+                counts["failed"] += 1
+                errors.append({"prospect_id": snap.prospect_id, "error": str(e)})
+                logger.warning(f"Génération échouée pour {snap.prospect_id}: {e}")
+                continue
+            counts[outcome] += 1
+            rows.append(send_queue_row(snap, email_data))
+
+    if rows:
+        atomic_write_bytes(csv_path, b"".join(send_queue_csv_chunks(rows)))
+
+    logger.info(
+        f"SendQueue : {counts['generated']} générés, {counts['skipped']} inchangés, {counts['failed']} en échec"
+    )
+    return {"send_queue_csv": str(csv_path), **counts, "errors": errors}
+
+
+SEND_QUEUE_FIELDS = (
+    "prospect_id", "name", "city", "profession", "email", "phone", "website", "score",
+    "competitor_1", "competitor_2", "subject", "landing_url", "video_url", "status",
+)
+
+
+def send_queue_row(prospect, email_data: Dict) -> Dict:
+    """Ligne SendQueue (colonnes SEND_QUEUE_FIELDS)."""
+    return {
+        "prospect_id":   prospect.prospect_id,
+        "name":          prospect.name,
+        "city":          prospect.city,
+        "profession":    prospect.profession,
+        "email":         "",  # à compléter manuellement
+        "phone":         prospect.phone or "",
+        "website":       prospect.website or "",
+        "score":         prospect.ia_visibility_score or 0,
+        "competitor_1":  email_data["competitor_1"],
+        "competitor_2":  email_data["competitor_2"],
+        "subject":       email_data["subject"],
+        "landing_url":   email_data["landing_url"],
+        "video_url":     email_data["video_url"],
+        "status":        prospect.status,
+    }
+
+
+def send_queue_csv_chunks(rows: Iterable[Dict], flush_every: int = 200) -> Iterator[bytes]:
+    """Encode les lignes en CSV par blocs (en-tête inclus) sans tout garder en mémoire."""
+    buf = io.StringIO(newline="")
+    writer = csv.DictWriter(buf, fieldnames=SEND_QUEUE_FIELDS)
+    writer.writeheader()
+    for i, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if i % flush_every == 0:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
 
-    for prospect in prospects:
-        if not prospect.eligibility_flag:
+
+def send_queue_ndjson_chunks(rows: Iterable[Dict]) -> Iterator[bytes]:
+    for row in rows:
+        yield (json.dumps(row, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def iter_send_queue(
+    db: Session,
+    campaign_id: str,
+    since: Optional[datetime] = None,
+    lang: str = "fr",
+    batch_size: int = 500,
+) -> Iterator[Dict]:
+    """
+    Lignes SendQueue des prospects éligibles (READY_ASSETS / READY_TO_SEND) d'une campagne,
+    lues par curseur (yield_per) : mémoire constante quelle que soit la taille.
+    since → uniquement les prospects modifiés après cette date (mode incrémental).
+    """
+    query = (
+        db.query(ProspectDB)
+        .filter(
+            ProspectDB.campaign_id == campaign_id,
+            ProspectDB.eligibility_flag.is_(True),
+            ProspectDB.status.in_((ProspectStatus.READY_ASSETS.value, ProspectStatus.READY_TO_SEND.value)),
+        )
+        .order_by(ProspectDB.updated_at, ProspectDB.prospect_id)
+    )
+    if since is not None:
+        query = query.filter(ProspectDB.updated_at > since)
+
+    for prospect in query.yield_per(batch_size):
+        yield send_queue_row(prospect, _email_data(prospect, lang))
+        db.expunge(prospect)
+
+
+def _snapshot(prospect: ProspectDB) -> SimpleNamespace:
+    """Copie des colonnes (les objets ORM ne sont pas partagés entre threads)."""
+    return SimpleNamespace(**{
+        attr.key: getattr(prospect, attr.key) for attr in inspect(prospect).mapper.column_attrs
+    })
+
+
+def _deliver_prospect(prospect: SimpleNamespace, summary: Dict, lang: str) -> Tuple[Dict, str]:
+    """Écrit les artefacts modifiés d'un prospect. Retourne (email_data, "generated" | "skipped")."""
+    out_dir  = SEND_QUEUE_DIR / prospect.prospect_id
+    manifest = _read_manifest(out_dir)
+
+    email_data = _email_data(prospect, lang)
+    artifacts: Dict[str, Tuple[str, Callable[[], bytes]]] = {}
+    for name, data in _email_files(email_data).items():
+        artifacts[name] = (hashlib.sha256(data).hexdigest(), lambda data=data: data)
+
+    script = _video_script(prospect).encode("utf-8")
+    artifacts["video_script.txt"] = (hashlib.sha256(script).hexdigest(), lambda: script)
+
+    # Le rapport contient la date du jour : hash des entrées, rendu seulement si nécessaire
+    artifacts["audit.html"] = (
+        _audit_inputs_digest(prospect, summary, lang),
+        lambda: render("audit.html", lang, **audit_context(None, prospect, summary)).encode("utf-8"),
+    )
+
+    written = 0
+    for name, (digest, build) in artifacts.items():
+        if manifest.get(name) == digest and (out_dir / name).exists():
             continue
-        email_data = email_generate(db, prospect)
-        audit_generate(db, prospect)
-        video_script_generate(prospect)
-        rows.append({
-            "prospect_id":   prospect.prospect_id,
-            "name":          prospect.name,
-            "city":          prospect.city,
-            "profession":    prospect.profession,
-            "email":         "",  # à compléter manuellement
-            "phone":         prospect.phone or "",
-            "website":       prospect.website or "",
-            "score":         prospect.ia_visibility_score or 0,
-            "competitor_1":  email_data["competitor_1"],
-            "competitor_2":  email_data["competitor_2"],
-            "subject":       email_data["subject"],
-            "landing_url":   email_data["landing_url"],
-            "video_url":     email_data["video_url"],
-            "status":        prospect.status,
-        })
+        atomic_write_bytes(out_dir / name, build())
+        written += 1
 
-    if rows:
-        with open(csv_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=rows[0].keys())
-            writer.writeheader()
-            writer.writerows(rows)
+    if written:
+        new_manifest = {name: digest for name, (digest, _) in artifacts.items()}
+        atomic_write_bytes(out_dir / MANIFEST_NAME, json.dumps(new_manifest, indent=2).encode("utf-8"))
+    return email_data, "generated" if written else "skipped"
 
-    return str(csv_path)
+
+def _read_manifest(out_dir: Path) -> Dict[str, str]:
+    try:
+        return json.loads((out_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
 
 
 def generate_for_campaign(
@@ -332,9 +437,8 @@ def generate_for_campaign(
         all_p = db_list_prospects(db, campaign_id)
         prospects = [p for p in all_p if p.status == ProspectStatus.READY_ASSETS.value and p.eligibility_flag]
 
-    csv_path = delivery_generate(db, prospects)
+    result = delivery_generate(db, prospects)
     return {
-        "generated": len(prospects),
-        "send_queue_csv": csv_path,
+        **result,
         "prospect_ids": [p.prospect_id for p in prospects],
     }
@@ -15,19 +15,24 @@ import os
 import re
 import unicodedata
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 from difflib import SequenceMatcher
 from typing import Dict, List, Optional, Tuple
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from .answers import pool_answers, pooled_answers, ref_answers, store_answers
+from .competitors import known_competitors
 from .database import db_create_run, db_list_runs, db_save_prospect, jdumps, jloads
 from .models import ProspectDB, ProspectStatus, TestRunDB
 from .prospect_scan import get_queries
+from .transitions import bulk_transition, transition
 
 logger = logging.getLogger(__name__)
 
 TEMPERATURE = 0.1  # ≤ 0.2
+TESTING_STALE_MINUTES = int(os.getenv("TESTING_STALE_MINUTES", "60"))   # TESTING plus ancien : processus interrompu
 
 # Suffixes légaux à ignorer dans le matching
 _LEGAL = re.compile(
@@ -147,8 +152,18 @@ def extract_entities(text: str) -> List[Dict]:
     return unique
 
 
-def extract_competitors(entities: List[Dict], target_name: str, target_website: Optional[str]) -> List[str]:
-    """Retourne les entités qui ne sont PAS le prospect cible."""
+def extract_competitors(
+    entities: List[Dict],
+    target_name: str,
+    target_website: Optional[str],
+    known: Optional[Dict[str, str]] = None,
+) -> List[str]:
+    """
+    Retourne les entités qui ne sont PAS le prospect cible.
+    known : noms déjà indexés {clé normalisée: graphie canonique} (competitors.known_competitors
+    sur les clés des entités) —
+    une variante d'un nom connu (casse, accents, forme juridique) est remplacée par sa graphie canonique.
+    """
     norm_target = normalize_name(target_name)
     target_domain = extract_domain(target_website or "")
     competitors: List[str] = []
@@ -160,7 +175,7 @@ def extract_competitors(entities: List[Dict], target_name: str, target_website:
             continue
         if target_domain and target_domain in val.lower():
             continue
-        competitors.append(val)
+        competitors.append(known.get(norm_val, val) if known else val)
     return competitors
 
 
@@ -215,60 +230,67 @@ def get_active_models() -> List[str]:
 
 # ─────────────────────────── RUN PRINCIPAL ───────────────────────────
 
-def run_ia_test_for_prospect(
+def _run_models(
     db: Session,
     prospect: ProspectDB,
-    dry_run: bool = False,
+    queries: List[str],
+    models: List[str],
+    dry_run: bool,
+    slot: Optional[str],
+    usage: Optional[Dict[str, int]],
 ) -> List[TestRunDB]:
-    """
-    Exécute 1 run (= 3 modèles × 5 requêtes) pour un prospect.
-    dry_run=True : génère les structures mais n'appelle pas les APIs.
-    Retourne la liste des TestRunDB créés.
-    """
-    queries = get_queries(prospect.profession, prospect.city)
-    models = get_active_models() if not dry_run else list(AI_CALLERS.keys())
-
-    if not models:
-        logger.warning("Aucun modèle IA configuré (vérifier les clés API)")
-        return []
-
-    # Passer TESTING
-    if prospect.status == ProspectStatus.SCHEDULED.value:
-        prospect.status = ProspectStatus.TESTING.value
-        db.commit()
-
+    """Runs des modèles pour un prospect (cf. run_ia_test_for_prospect)."""
     created_runs: List[TestRunDB] = []
+    usage = usage if usage is not None else {}
+    pool = slot is not None and not dry_run
 
+    answered = []
     for model_name in models:
         caller, key_name = AI_CALLERS[model_name]
+        pooled = pooled_answers(db, slot, model_name, queries) if pool else {}
+        fresh: List[int] = []       # index des requêtes réellement envoyées (et réussies)
         raw_answers: List[str] = []
-        entities_per_query: List[List[Dict]] = []
-        mention_per_query: List[bool] = []
-        all_competitors: List[str] = []
         notes_parts: List[str] = []
-        mentioned_in_any = False
 
         for qi, query in enumerate(queries):
             if dry_run:
                 answer = f"[DRY_RUN] Réponse simulée pour : {query}"
+            elif query in pooled:
+                answer = pooled[query]
+                usage["calls_saved"] = usage.get("calls_saved", 0) + 1
             else:
+                usage["api_calls"] = usage.get("api_calls", 0) + 1
                 try:
                     answer = caller(query)
+                    fresh.append(qi)
                 except Exception as exc:
                     logger.error(f"[{model_name}] Q{qi+1} erreur: {exc}")
                     answer = f"[ERREUR] {exc}"
                     notes_parts.append(f"Q{qi+1} erreur {model_name}: {exc}")
-
             raw_answers.append(answer)
-            entities = extract_entities(answer)
-            entities_per_query.append(entities)
 
+        # Réponses stockées une fois (sha256), entités extraites une fois par texte
+        stored = store_answers(db, raw_answers, extract_entities)
+        if pool:
+            pool_answers(db, slot, model_name, [(queries[qi], stored[qi][0]) for qi in fresh])
+        answered.append((model_name, raw_answers, stored, notes_parts))
+
+    known = known_competitors(db, {
+        normalize_name(e["value"]) for _, _, stored, _ in answered for _, entities in stored for e in entities
+    })
+
+    for model_name, raw_answers, stored, notes_parts in answered:
+        mention_per_query: List[bool] = []
+        all_competitors: List[str] = []
+        mentioned_in_any = False
+
+        for answer, (_, entities) in zip(raw_answers, stored):
             mentioned = is_mentioned(answer, prospect.name, prospect.website)
             mention_per_query.append(mentioned)
             if mentioned:
                 mentioned_in_any = True
 
-            competitors = extract_competitors(entities, prospect.name, prospect.website)
+            competitors = extract_competitors(entities, prospect.name, prospect.website, known)
             all_competitors.extend(competitors)
 
         # Dédupliquer concurrents
@@ -282,34 +304,92 @@ def run_ia_test_for_prospect(
             ts=datetime.utcnow(),
             model=model_name,
             queries=jdumps(queries),
-            raw_answers=jdumps(raw_answers),
-            extracted_entities=jdumps([
-                [{"type": e["type"], "value": e["value"]} for e in eq]
-                for eq in entities_per_query
-            ]),
+            answer_hashes=jdumps([h for h, _ in stored]),
             mentioned_target=mentioned_in_any,
             mention_per_query=jdumps(mention_per_query),
             competitors_entities=jdumps(unique_competitors[:20]),  # top 20
             notes="; ".join(notes_parts) if notes_parts else None,
         )
+        ref_answers(db, run)
         db_create_run(db, run)
         created_runs.append(run)
 
+    return created_runs
+
+
+def run_ia_test_for_prospect(
+    db: Session,
+    prospect: ProspectDB,
+    dry_run: bool = False,
+    slot: Optional[str] = None,
+    usage: Optional[Dict[str, int]] = None,
+) -> List[TestRunDB]:
+    """
+    Exécute 1 run (= 3 modèles × 5 requêtes) pour un prospect.
+    dry_run=True : génère les structures mais n'appelle pas les APIs.
+    slot : créneau planifié — les réponses déjà obtenues pendant ce créneau
+    (même requête, même modèle, toute campagne) sont réutilisées sans appel.
+    usage : compteurs {api_calls, calls_saved} incrémentés sur place.
+    Les graphies canoniques des concurrents sont lues en une requête par
+    prospect, sur les seules clés extraites de ses réponses.
+    Le prospect passe TESTING au début de son propre test ; une erreur le
+    ramène à SCHEDULED (avant de relever l'exception).
+    Retourne la liste des TestRunDB créés.
+    """
+    queries = get_queries(prospect.profession, prospect.city)
+    models = get_active_models() if not dry_run else list(AI_CALLERS.keys())
+
+    if not models:
+        logger.warning("Aucun modèle IA configuré (vérifier les clés API)")
+        return []
+
+    # Passer TESTING
+    if prospect.status == ProspectStatus.SCHEDULED.value:
+        transition(db, prospect, ProspectStatus.TESTING, reason="test IA")
+
+    try:
+        created_runs = _run_models(db, prospect, queries, models, dry_run, slot, usage)
+    except Exception as exc:
+        # Test interrompu : le prospect repasse SCHEDULED pour être repris au prochain créneau
+        db.rollback()
+        if prospect.status == ProspectStatus.TESTING.value:
+            transition(db, prospect, ProspectStatus.SCHEDULED, reason=f"test IA interrompu : {exc}")
+        raise
+
     # Passer TESTED
     if prospect.status == ProspectStatus.TESTING.value:
-        prospect.status = ProspectStatus.TESTED.value
-        db.commit()
+        transition(db, prospect, ProspectStatus.TESTED, reason=f"{len(created_runs)} run(s)")
 
     return created_runs
 
 
+def reset_stale_testing(db: Session, campaign_id: str, now: Optional[datetime] = None) -> List[str]:
+    """TESTING depuis plus de TESTING_STALE_MINUTES → SCHEDULED. Retourne les IDs repris."""
+    cutoff = (now or datetime.utcnow()) - timedelta(minutes=TESTING_STALE_MINUTES)
+    stale = db.scalars(
+        select(ProspectDB.prospect_id).where(
+            ProspectDB.campaign_id == campaign_id,
+            ProspectDB.status == ProspectStatus.TESTING.value,
+            ProspectDB.updated_at < cutoff,
+        )
+    ).all()
+    return bulk_transition(
+        db, ProspectStatus.TESTING, ProspectStatus.SCHEDULED,
+        prospect_ids=stale, reason="test IA interrompu (reprise)",
+    ) if stale else []
+
+
 def run_ia_test_campaign(
     db: Session,
     campaign_id: str,
     prospect_ids: Optional[List[str]] = None,
     dry_run: bool = False,
+    slot: Optional[str] = None,
 ) -> Dict:
-    """Lance les tests pour tous les prospects SCHEDULED d'une campagne."""
+    """
+    Lance les tests pour tous les prospects SCHEDULED d'une campagne.
+    slot : créneau planifié partagé (cf. run_ia_test_for_prospect).
+    """
     from .database import db_list_prospects, db_get_prospect
 
     if prospect_ids:
@@ -317,15 +397,23 @@ def run_ia_test_campaign(
     else:
         prospects = db_list_prospects(db, campaign_id, status=ProspectStatus.SCHEDULED.value)
 
+    if not prospect_ids:
+        # Prospects restés TESTING après l'arrêt d'un processus : repris comme SCHEDULED
+        requeued = reset_stale_testing(db, campaign_id)
+        prospects += [p for pid in requeued if (p := db_get_prospect(db, pid))]
+
     results = {"total": len(prospects), "processed": 0, "runs_created": 0, "errors": []}
+    usage = {"api_calls": 0, "calls_saved": 0}
 
+    # SCHEDULED → TESTING prospect par prospect : une erreur ne laisse aucun lot bloqué en TESTING
     for prospect in prospects:
         try:
-            runs = run_ia_test_for_prospect(db, prospect, dry_run=dry_run)
+            runs = run_ia_test_for_prospect(db, prospect, dry_run=dry_run, slot=slot, usage=usage)
             results["processed"] += 1
             results["runs_created"] += len(runs)
         except Exception as exc:
             logger.error(f"Prospect {prospect.prospect_id} erreur: {exc}")
             results["errors"].append({"prospect_id": prospect.prospect_id, "error": str(exc)})
 
+    results.update(slot=slot, **usage)
     return results
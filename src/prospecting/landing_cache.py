@@ -0,0 +1,220 @@
+"""
+Cache LANDING — pages /couvreur rendues, en mémoire, par landing_token
+
+- clé (landing_token, langue) → HTML encodé + ETag + Last-Modified
+- invalidé au commit d'une session qui insère un TestRunDB du prospect
+  ou modifie un champ affiché (assets, score, concurrents, nom, ville)
+- les UPDATE en masse (Core, hors ORM) doivent appeler invalidate_prospect()
+- les pages statiques déjà publiées (publish.py) sont republiées ensuite, par
+  un worker dédié (hors du commit) ; wait_republished() attend la file
+- hooks branchés sur SessionLocal par database.py (register)
+"""
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, sessionmaker
+
+from .models import ProspectDB, TestRunDB
+
+MAX_ENTRIES = int(os.getenv("LANDING_CACHE_SIZE", "2048"))
+
+# Champs prospect lus par la landing (un changement invalide la page)
+WATCHED_FIELDS = (
+    "name", "city", "landing_token", "video_url", "screenshot_url",
+    "competitors_cited", "ia_visibility_score",
+)
+
+_DIRTY_KEY = "landing_dirty_prospects"
+
+logger = logging.getLogger(__name__)
+
+
+class LandingPage:
+    __slots__ = ("prospect_id", "body", "etag", "last_modified")
+
+    def __init__(self, prospect_id: str, html: str, last_modified: datetime):
+        self.prospect_id   = prospect_id
+        self.body          = html.encode("utf-8")
+        self.etag          = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+        self.last_modified = last_modified
+
+
+class LandingCache:
+    """LRU thread-safe (routes sync exécutées dans le threadpool)."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._pages: "OrderedDict[Tuple[str, str], LandingPage]" = OrderedDict()
+        self._keys_by_prospect: Dict[str, Set[Tuple[str, str]]] = {}
+        self._generation: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str, lang: str) -> Optional[LandingPage]:
+        key = (token, lang)
+        with self._lock:
+            page = self._pages.get(key)
+            if page is not None:
+                self._pages.move_to_end(key)
+            return page
+
+    def generation(self, prospect_id: str) -> int:
+        """À lire AVANT de calculer la page, puis passer à put()."""
+        with self._lock:
+            return self._generation.get(prospect_id, 0)
+
+    def put(self, token: str, lang: str, page: LandingPage, generation: int) -> bool:
+        """Stocke la page sauf si le prospect a été invalidé pendant son rendu."""
+        key = (token, lang)
+        with self._lock:
+            if self._generation.get(page.prospect_id, 0) != generation:
+                return False
+            self._pages[key] = page
+            self._pages.move_to_end(key)
+            self._keys_by_prospect.setdefault(page.prospect_id, set()).add(key)
+            while len(self._pages) > self.max_entries:
+                old_key, old = self._pages.popitem(last=False)
+                keys = self._keys_by_prospect.get(old.prospect_id)
+                if keys:
+                    keys.discard(old_key)
+                    if not keys:
+                        del self._keys_by_prospect[old.prospect_id]
+            return True
+
+    def invalidate_prospect(self, prospect_id: str) -> None:
+        with self._lock:
+            self._generation[prospect_id] = self._generation.get(prospect_id, 0) + 1
+            for key in self._keys_by_prospect.pop(prospect_id, ()):
+                self._pages.pop(key, None)
+
+    def invalidate_many(self, prospect_ids: Iterable[str]) -> None:
+        for pid in prospect_ids:
+            self.invalidate_prospect(pid)
+
+    def clear(self) -> None:
+        with self._lock:
+            for pid in self._keys_by_prospect:
+                self._generation[pid] = self._generation.get(pid, 0) + 1
+            self._pages.clear()
+            self._keys_by_prospect.clear()
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+
+landing_cache = LandingCache()
+
+
+def invalidate_prospect(prospect_id: str) -> None:
+    landing_cache.invalidate_prospect(prospect_id)
+
+
+def page_last_modified(prospect: ProspectDB, last_run_ts: Optional[datetime]) -> datetime:
+    """Dernière modification du contenu : prospect ou run le plus récent (UTC)."""
+    candidates = [d for d in (prospect.updated_at, prospect.created_at, last_run_ts) if d]
+    latest = max(candidates) if candidates else datetime.utcnow()
+    return latest.replace(tzinfo=timezone.utc, microsecond=0)
+
+
+# ─────────────────────────── REPUBLICATION (différée) ───────────────────────────
+
+class _Republisher:
+    """
+    Republication des pages statiques hors du commit : les ids s'accumulent
+    par bind et un seul worker les republie par lots (plusieurs commits
+    rapprochés → une seule reconstruction par prospect).
+    """
+
+    def __init__(self, synchronous: bool = False):
+        self.synchronous = synchronous      # republie dans le thread du commit (base partagée, tests)
+        self._pending: Dict[object, Set[str]] = {}
+        self._running = False               # un drain est planifié ou en cours
+        self._future: Optional[Future] = None
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="republish")
+
+    def submit(self, bind, prospect_ids: Iterable[str]) -> None:
+        if self.synchronous:
+            self._republish(bind, set(prospect_ids))
+            return
+        with self._lock:
+            self._pending.setdefault(bind, set()).update(prospect_ids)
+            if not self._running:
+                self._running = True
+                self._future = self._pool.submit(self._drain)
+
+    def _drain(self) -> None:
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._running = False
+                    return
+                bind, ids = self._pending.popitem()
+            self._republish(bind, ids)
+
+    @staticmethod
+    def _republish(bind, ids: Set[str]) -> None:
+        from .publish import republish_prospects
+
+        # Un échec ne bloque rien : la version précédente reste servie
+        try:
+            republish_prospects(bind, ids)
+        except Exception as e:
+            logger.warning(f"Republication statique échouée pour {len(ids)} prospect(s): {e}")
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Attend la fin des republications en file (tests, arrêt du process)."""
+        with self._lock:
+            future = self._future
+        if future is not None:
+            wait([future], timeout)
+
+
+republisher = _Republisher(synchronous=os.getenv("REPUBLISH_SYNC", "0") == "1")
+
+
+def wait_republished(timeout: Optional[float] = None) -> None:
+    republisher.wait(timeout)
+
+
+# ─────────────────────────── INVALIDATION (ORM) ───────────────────────────
+
+def _prospect_changed(prospect: ProspectDB) -> bool:
+    state = inspect(prospect)
+    return any(state.attrs[f].history.has_changes() for f in WATCHED_FIELDS)
+
+
+def _collect_dirty(session: Session, flush_context) -> None:
+    dirty = session.info.setdefault(_DIRTY_KEY, set())
+    for obj in session.new:
+        if isinstance(obj, TestRunDB):
+            dirty.add(obj.prospect_id)
+    for obj in session.dirty:
+        if isinstance(obj, ProspectDB) and _prospect_changed(obj):
+            dirty.add(obj.prospect_id)
+    for obj in session.deleted:
+        if isinstance(obj, (ProspectDB, TestRunDB)):
+            dirty.add(obj.prospect_id)
+
+
+def _invalidate_committed(session: Session) -> None:
+    dirty = session.info.pop(_DIRTY_KEY, ())
+    landing_cache.invalidate_many(dirty)
+    if dirty:
+        republisher.submit(session.get_bind(), dirty)
+
+
+def _discard_dirty(session: Session, previous_transaction) -> None:
+    session.info.pop(_DIRTY_KEY, None)
+
+
+def register(session_factory: sessionmaker) -> None:
+    event.listen(session_factory, "after_flush", _collect_dirty)
+    event.listen(session_factory, "after_commit", _invalidate_committed)
+    event.listen(session_factory, "after_soft_rollback", _discard_dirty)
@@ -0,0 +1,67 @@
+"""Alembic environment — base SQLite du pipeline prospecting (séparée de la base B2C)."""
+import os
+import sys
+from logging.config import fileConfig
+
+from sqlalchemy import create_engine, pool
+
+from alembic import context
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from src.prospecting.database import DB_PATH, include_name  # noqa: E402
+from src.prospecting.models import Base  # noqa: E402
+
+config = context.config
+
+# fileConfig seulement en CLI (alembic -n prospecting ...), pas depuis init_db()
+if config.config_file_name is not None and config.attributes.get("connection") is None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def _url() -> str:
+    return config.get_main_option("sqlalchemy.url") or f"sqlite:///{DB_PATH}"
+
+
+def run_migrations_offline() -> None:
+    """Run migrations in 'offline' mode."""
+    context.configure(
+        url=_url(),
+        target_metadata=target_metadata,
+        include_name=include_name,
+        literal_binds=True,
+        render_as_batch=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def _run(connection) -> None:
+    # render_as_batch : SQLite ne sait pas faire la plupart des ALTER TABLE
+    context.configure(
+        connection=connection, target_metadata=target_metadata, include_name=include_name, render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations in 'online' mode (connexion fournie par init_db ou URL de la config)."""
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run(connection)
+        return
+
+    connectable = create_engine(_url(), poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        _run(connection)
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,120 @@
+"""Baseline prospecting schema
+
+Revision ID: a1c4e2f70b11
+Revises: 
+Create Date: 2026-10-19 10:00:00.000000
+
+Schéma tel que créé jusqu'ici par Base.metadata.create_all. Idempotent : sur
+une base existante, seuls les tables / index manquants sont créés.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c4e2f70b11'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _tables() -> set:
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _indexes(table: str) -> set:
+    return {ix['name'] for ix in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade() -> None:
+    tables = _tables()
+
+    if 'campaigns' not in tables:
+        op.create_table('campaigns',
+        sa.Column('campaign_id', sa.String(), nullable=False),
+        sa.Column('profession', sa.String(), nullable=False),
+        sa.Column('city', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('timezone', sa.String(), nullable=False),
+        sa.Column('schedule_days', sa.String(), nullable=False),
+        sa.Column('schedule_times', sa.String(), nullable=False),
+        sa.Column('mode', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('max_prospects', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('campaign_id')
+        )
+    if 'ix_campaigns_created' not in _indexes('campaigns'):
+        op.create_index('ix_campaigns_created', 'campaigns', ['created_at', 'campaign_id'], unique=False)
+
+    if 'prospects' not in tables:
+        op.create_table('prospects',
+        sa.Column('prospect_id', sa.String(), nullable=False),
+        sa.Column('campaign_id', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('city', sa.String(), nullable=False),
+        sa.Column('profession', sa.String(), nullable=False),
+        sa.Column('website', sa.String(), nullable=True),
+        sa.Column('phone', sa.String(), nullable=True),
+        sa.Column('reviews_count', sa.Integer(), nullable=True),
+        sa.Column('google_ads_active', sa.Boolean(), nullable=True),
+        sa.Column('competitors_cited', sa.Text(), nullable=False),
+        sa.Column('ia_visibility_score', sa.Float(), nullable=True),
+        sa.Column('eligibility_flag', sa.Boolean(), nullable=False),
+        sa.Column('landing_token', sa.String(), nullable=False),
+        sa.Column('video_url', sa.String(), nullable=True),
+        sa.Column('screenshot_url', sa.String(), nullable=True),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('score_justification', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.campaign_id'], ),
+        sa.PrimaryKeyConstraint('prospect_id')
+        )
+    if 'ix_prospects_campaign_status' not in _indexes('prospects'):
+        op.create_index('ix_prospects_campaign_status', 'prospects', ['campaign_id', 'status', 'eligibility_flag'], unique=False)
+
+    if 'test_runs' not in tables:
+        op.create_table('test_runs',
+        sa.Column('run_id', sa.String(), nullable=False),
+        sa.Column('campaign_id', sa.String(), nullable=False),
+        sa.Column('prospect_id', sa.String(), nullable=False),
+        sa.Column('ts', sa.DateTime(), nullable=False),
+        sa.Column('model', sa.String(), nullable=False),
+        sa.Column('queries', sa.Text(), nullable=False),
+        sa.Column('raw_answers', sa.Text(), nullable=False),
+        sa.Column('extracted_entities', sa.Text(), nullable=False),
+        sa.Column('mentioned_target', sa.Boolean(), nullable=False),
+        sa.Column('mention_per_query', sa.Text(), nullable=False),
+        sa.Column('competitors_entities', sa.Text(), nullable=False),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.campaign_id'], ),
+        sa.ForeignKeyConstraint(['prospect_id'], ['prospects.prospect_id'], ),
+        sa.PrimaryKeyConstraint('run_id')
+        )
+
+    if 'prospect_events' not in tables:
+        op.create_table('prospect_events',
+        sa.Column('seq', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('ts', sa.DateTime(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('prospect_id', sa.String(), nullable=False),
+        sa.Column('campaign_id', sa.String(), nullable=True),
+        sa.Column('from_status', sa.String(), nullable=True),
+        sa.Column('to_status', sa.String(), nullable=True),
+        sa.Column('run_id', sa.String(), nullable=True),
+        sa.Column('reason', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('seq'),
+        sqlite_autoincrement=True
+        )
+    existing = _indexes('prospect_events')
+    if 'ix_prospect_events_prospect_id' not in existing:
+        op.create_index('ix_prospect_events_prospect_id', 'prospect_events', ['prospect_id'], unique=False)
+    if 'ix_prospect_events_campaign_id' not in existing:
+        op.create_index('ix_prospect_events_campaign_id', 'prospect_events', ['campaign_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_table('prospect_events')
+    op.drop_table('test_runs')
+    op.drop_table('prospects')
+    op.drop_table('campaigns')
@@ -0,0 +1,27 @@
+"""Indexes for token lookup, prospect listing and run history
+
+Revision ID: b7d2f9a3c5e8
+Revises: a1c4e2f70b11
+Create Date: 2026-10-19 10:10:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2f9a3c5e8'
+down_revision = 'a1c4e2f70b11'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_prospects_landing_token'), 'prospects', ['landing_token'], unique=True)
+    op.create_index('ix_prospects_campaign_status_score', 'prospects', ['campaign_id', 'status', 'ia_visibility_score'], unique=False)
+    op.create_index('ix_test_runs_prospect_ts', 'test_runs', ['prospect_id', 'ts'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_test_runs_prospect_ts', table_name='test_runs')
+    op.drop_index('ix_prospects_campaign_status_score', table_name='prospects')
+    op.drop_index(op.f('ix_prospects_landing_token'), table_name='prospects')
@@ -0,0 +1,71 @@
+"""Compress test_runs raw_answers / extracted_entities
+
+Revision ID: c9e1a4b6d203
+Revises: b7d2f9a3c5e8
+Create Date: 2026-10-19 11:00:00.000000
+
+Les colonnes passent de TEXT (JSON brut) à BLOB (JSON compressé zlib, cf.
+models.CompressedText). Les lignes existantes sont recompressées par lots.
+"""
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9e1a4b6d203'
+down_revision = 'b7d2f9a3c5e8'
+branch_labels = None
+depends_on = None
+
+BATCH = 500
+COLUMNS = ('raw_answers', 'extracted_entities')
+
+runs = sa.table(
+    'test_runs',
+    sa.column('run_id', sa.String),
+    *(sa.column(c, sa.LargeBinary) for c in COLUMNS),
+)
+
+
+def _rewrite(convert) -> None:
+    """Réécrit les deux colonnes ligne à ligne, par lots de run_id."""
+    bind = op.get_bind()
+    last = ''
+    while True:
+        rows = bind.execute(
+            sa.select(runs).where(runs.c.run_id > last).order_by(runs.c.run_id).limit(BATCH)
+        ).all()
+        if not rows:
+            return
+        for row in rows:
+            values = {c: convert(getattr(row, c)) for c in COLUMNS}
+            bind.execute(runs.update().where(runs.c.run_id == row.run_id).values(**values))
+        last = rows[-1].run_id
+
+
+def _compress(value):
+    if value is None or isinstance(value, bytes):
+        return value
+    return zlib.compress(value.encode('utf-8'), 6)
+
+
+def _decompress(value):
+    if value is None or isinstance(value, str):
+        return value
+    return zlib.decompress(value).decode('utf-8')
+
+
+def upgrade() -> None:
+    _rewrite(_compress)
+    with op.batch_alter_table('test_runs') as batch_op:
+        for column in COLUMNS:
+            batch_op.alter_column(column, existing_type=sa.Text(), type_=sa.LargeBinary(), existing_nullable=False)
+
+
+def downgrade() -> None:
+    _rewrite(_decompress)
+    with op.batch_alter_table('test_runs') as batch_op:
+        for column in COLUMNS:
+            batch_op.alter_column(column, existing_type=sa.LargeBinary(), type_=sa.Text(), existing_nullable=False)
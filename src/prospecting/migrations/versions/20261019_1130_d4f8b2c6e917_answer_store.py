@@ -0,0 +1,121 @@
+"""Content-addressed answers table, test_runs.answer_hashes
+
+Revision ID: d4f8b2c6e917
+Revises: c9e1a4b6d203
+Create Date: 2026-10-19 11:30:00.000000
+
+Les réponses des runs existants sont déplacées dans answers (dédupliquées par
+sha256) ; leurs entités restent sur le run (extracted_entities) et seront
+extraites dans answers au premier réemploi du texte.
+"""
+import hashlib
+import json
+import zlib
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.sqlite import insert
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f8b2c6e917'
+down_revision = 'c9e1a4b6d203'
+branch_labels = None
+depends_on = None
+
+BATCH = 500
+
+runs = sa.table(
+    'test_runs',
+    sa.column('run_id', sa.String),
+    sa.column('answer_hashes', sa.Text),
+    sa.column('raw_answers', sa.LargeBinary),
+    sa.column('extracted_entities', sa.LargeBinary),
+)
+answers = sa.table(
+    'answers',
+    sa.column('hash', sa.String),
+    sa.column('body', sa.LargeBinary),
+    sa.column('entities', sa.LargeBinary),
+    sa.column('created_at', sa.DateTime),
+)
+
+
+def _z(text: str) -> bytes:
+    return zlib.compress(text.encode('utf-8'), 6)
+
+
+def _unz(value) -> str:
+    if value is None:
+        return '[]'
+    return value if isinstance(value, str) else zlib.decompress(value).decode('utf-8')
+
+
+def _batches(where):
+    bind = op.get_bind()
+    last = ''
+    while True:
+        rows = bind.execute(
+            sa.select(runs).where(runs.c.run_id > last, where).order_by(runs.c.run_id).limit(BATCH)
+        ).all()
+        if not rows:
+            return
+        yield rows
+        last = rows[-1].run_id
+
+
+def upgrade() -> None:
+    op.create_table('answers',
+    sa.Column('hash', sa.String(length=64), nullable=False),
+    sa.Column('body', sa.LargeBinary(), nullable=False),
+    sa.Column('entities', sa.LargeBinary(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('hash')
+    )
+    op.add_column('test_runs', sa.Column('answer_hashes', sa.Text(), nullable=False, server_default='[]'))
+
+    bind = op.get_bind()
+    seen = set()
+    empty = _z('[]')
+    for rows in _batches(runs.c.answer_hashes == '[]'):
+        for row in rows:
+            texts = json.loads(_unz(row.raw_answers) or '[]')
+            if not texts:
+                continue
+            hashes = [hashlib.sha256(t.encode('utf-8')).hexdigest() for t in texts]
+            for h, text in zip(hashes, texts):
+                if h in seen:
+                    continue
+                seen.add(h)
+                bind.execute(
+                    insert(answers)
+                    .values(hash=h, body=_z(text), entities=None, created_at=datetime.utcnow())
+                    .on_conflict_do_nothing(index_elements=['hash'])
+                )
+            bind.execute(
+                runs.update().where(runs.c.run_id == row.run_id)
+                .values(answer_hashes=json.dumps(hashes), raw_answers=empty)
+            )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    for rows in _batches(runs.c.answer_hashes != '[]'):
+        for row in rows:
+            hashes = json.loads(row.answer_hashes)
+            found = {
+                a.hash: a for a in bind.execute(sa.select(answers).where(answers.c.hash.in_(set(hashes))))
+            }
+            stored = [found[h] for h in hashes if h in found]
+            values = {'raw_answers': _z(json.dumps([_unz(a.body) for a in stored], ensure_ascii=False))}
+            if all(a.entities is not None for a in stored):
+                values['extracted_entities'] = _z(json.dumps([
+                    [{'type': e['type'], 'value': e['value']} for e in json.loads(_unz(a.entities))]
+                    for a in stored
+                ], ensure_ascii=False))
+            bind.execute(runs.update().where(runs.c.run_id == row.run_id).values(**values))
+
+    with op.batch_alter_table('test_runs') as batch_op:
+        batch_op.drop_column('answer_hashes')
+    op.drop_table('answers')
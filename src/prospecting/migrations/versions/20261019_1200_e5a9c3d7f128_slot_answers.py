@@ -0,0 +1,33 @@
+"""Slot-scoped shared answer pool
+
+Revision ID: e5a9c3d7f128
+Revises: d4f8b2c6e917
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a9c3d7f128'
+down_revision = 'd4f8b2c6e917'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('slot_answers',
+    sa.Column('slot', sa.String(), nullable=False),
+    sa.Column('model', sa.String(), nullable=False),
+    sa.Column('query', sa.Text(), nullable=False),
+    sa.Column('answer_hash', sa.String(length=64), nullable=False),
+    sa.Column('hits', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['answer_hash'], ['answers.hash'], ),
+    sa.PrimaryKeyConstraint('slot', 'model', 'query')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('slot_answers')
@@ -0,0 +1,38 @@
+"""Aggregates of archived test runs
+
+Revision ID: f6b0d4e8a239
+Revises: e5a9c3d7f128
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6b0d4e8a239'
+down_revision = 'e5a9c3d7f128'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('run_stats',
+    sa.Column('prospect_id', sa.String(), nullable=False),
+    sa.Column('model', sa.String(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('campaign_id', sa.String(), nullable=False),
+    sa.Column('runs', sa.Integer(), nullable=False),
+    sa.Column('mentions', sa.Integer(), nullable=False),
+    sa.Column('query_mentions', sa.Text(), nullable=False),
+    sa.Column('query_labels', sa.Text(), nullable=False),
+    sa.Column('first_ts', sa.DateTime(), nullable=False),
+    sa.Column('last_ts', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('prospect_id', 'model', 'day')
+    )
+    op.create_index('ix_run_stats_campaign', 'run_stats', ['campaign_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_run_stats_campaign', table_name='run_stats')
+    op.drop_table('run_stats')
@@ -0,0 +1,120 @@
+"""Full-text index over answers (FTS5) and answer_refs
+
+Revision ID: b8c2e6f0a451
+Revises: f6b0d4e8a239
+Create Date: 2026-10-19 14:00:00.000000
+
+answer_refs est rempli depuis les runs encore en base (answer_hashes) ; les runs
+déjà archivés en Parquet n'y figurent pas. Toutes les réponses existantes sont
+indexées, avec le pliage de l'application (copie figée de search.fold).
+"""
+import json
+import re
+import unicodedata
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8c2e6f0a451'
+down_revision = 'f6b0d4e8a239'
+branch_labels = None
+depends_on = None
+
+BATCH = 1000
+FTS = 'answers_fts'
+
+runs = sa.table(
+    'test_runs',
+    sa.column('run_id', sa.String),
+    sa.column('campaign_id', sa.String),
+    sa.column('prospect_id', sa.String),
+    sa.column('model', sa.String),
+    sa.column('ts', sa.DateTime),
+    sa.column('queries', sa.Text),
+    sa.column('answer_hashes', sa.Text),
+)
+refs = sa.table(
+    'answer_refs',
+    sa.column('run_id', sa.String),
+    sa.column('query_index', sa.Integer),
+    sa.column('answer_hash', sa.String),
+    sa.column('campaign_id', sa.String),
+    sa.column('prospect_id', sa.String),
+    sa.column('model', sa.String),
+    sa.column('query', sa.Text),
+    sa.column('ts', sa.DateTime),
+)
+fts = sa.table(FTS, sa.column('rowid'), sa.column('body'))
+
+
+def _unz(value) -> str:
+    return value if isinstance(value, str) else zlib.decompress(value).decode('utf-8')
+
+
+def _fold(text: str) -> str:
+    """search.fold figé : minuscules, sans accents, ponctuation → espaces."""
+    text = unicodedata.normalize('NFD', (text or '').lower())
+    text = ''.join(c for c in text if unicodedata.category(c) != 'Mn')
+    return ' '.join(re.sub(r'[^a-z0-9\s]', ' ', text).split())
+
+
+def upgrade() -> None:
+    op.create_table('answer_refs',
+    sa.Column('run_id', sa.String(), nullable=False),
+    sa.Column('query_index', sa.Integer(), nullable=False),
+    sa.Column('answer_hash', sa.String(length=64), nullable=False),
+    sa.Column('campaign_id', sa.String(), nullable=False),
+    sa.Column('prospect_id', sa.String(), nullable=False),
+    sa.Column('model', sa.String(), nullable=False),
+    sa.Column('query', sa.Text(), nullable=False),
+    sa.Column('ts', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['answer_hash'], ['answers.hash'], ),
+    sa.PrimaryKeyConstraint('run_id', 'query_index')
+    )
+    op.create_index('ix_answer_refs_hash_ts', 'answer_refs', ['answer_hash', 'ts'], unique=False)
+    op.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS} "
+        "USING fts5(body, content='', tokenize='unicode61 remove_diacritics 2')"
+    )
+
+    bind = op.get_bind()
+    last = ''
+    while True:
+        rows = bind.execute(
+            sa.select(runs).where(runs.c.run_id > last, runs.c.answer_hashes != '[]')
+            .order_by(runs.c.run_id).limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        values = [
+            {
+                'run_id': r.run_id, 'query_index': qi, 'answer_hash': h, 'campaign_id': r.campaign_id,
+                'prospect_id': r.prospect_id, 'model': r.model, 'query': query, 'ts': r.ts,
+            }
+            for r in rows
+            for qi, (query, h) in enumerate(zip(json.loads(r.queries or '[]'), json.loads(r.answer_hashes)))
+        ]
+        if values:
+            bind.execute(refs.insert(), values)
+        last = rows[-1].run_id
+
+    rowid = sa.literal_column('rowid')
+    last_rowid = 0
+    while True:
+        rows = bind.execute(
+            sa.select(rowid, sa.column('body')).select_from(sa.table('answers'))
+            .where(rowid > last_rowid).order_by(rowid).limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        bind.execute(fts.insert(), [{'rowid': r[0], 'body': _fold(_unz(r[1]))} for r in rows])
+        last_rowid = rows[-1][0]
+
+
+def downgrade() -> None:
+    op.execute(f"DROP TABLE IF EXISTS {FTS}")
+    op.drop_index('ix_answer_refs_hash_ts', table_name='answer_refs')
+    op.drop_table('answer_refs')
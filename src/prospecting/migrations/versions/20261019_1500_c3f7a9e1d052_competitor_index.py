@@ -0,0 +1,64 @@
+"""Inverted competitor index
+
+Revision ID: c3f7a9e1d052
+Revises: b8c2e6f0a451
+Create Date: 2026-10-19 15:00:00.000000
+
+Rempli depuis les runs encore en base (competitors_entities), avec la même
+normalisation que l'application (competitors.index_runs) ; les runs déjà
+archivés en Parquet n'y figurent pas.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f7a9e1d052'
+down_revision = 'b8c2e6f0a451'
+branch_labels = None
+depends_on = None
+
+BATCH = 1000
+
+runs = sa.table(
+    'test_runs',
+    sa.column('run_id', sa.String),
+    sa.column('campaign_id', sa.String),
+    sa.column('prospect_id', sa.String),
+    sa.column('model', sa.String),
+    sa.column('ts', sa.DateTime),
+    sa.column('competitors_entities', sa.Text),
+)
+
+
+def upgrade() -> None:
+    from src.prospecting.competitors import index_runs
+
+    op.create_table('competitor_index',
+    sa.Column('name_key', sa.String(), nullable=False),
+    sa.Column('prospect_id', sa.String(), nullable=False),
+    sa.Column('model', sa.String(), nullable=False),
+    sa.Column('campaign_id', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('runs', sa.Integer(), nullable=False),
+    sa.Column('first_seen', sa.DateTime(), nullable=False),
+    sa.Column('last_seen', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name_key', 'prospect_id', 'model')
+    )
+    op.create_index('ix_competitor_index_campaign', 'competitor_index', ['campaign_id'], unique=False)
+
+    bind = op.get_bind()
+    last = ''
+    while True:
+        rows = bind.execute(
+            sa.select(runs).where(runs.c.run_id > last).order_by(runs.c.run_id).limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        index_runs(bind, rows, resolve=False)   # competitors créés par d5a1b7c3e860
+        last = rows[-1].run_id
+
+
+def downgrade() -> None:
+    op.drop_index('ix_competitor_index_campaign', table_name='competitor_index')
+    op.drop_table('competitor_index')
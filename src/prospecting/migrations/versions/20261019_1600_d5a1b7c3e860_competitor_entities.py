@@ -0,0 +1,74 @@
+"""Canonical competitor entities (MinHash / LSH)
+
+Revision ID: d5a1b7c3e860
+Revises: c3f7a9e1d052
+Create Date: 2026-10-19 16:00:00.000000
+
+Chaque clé déjà présente dans competitor_index est rattachée à un concurrent
+canonique avec la même résolution que l'application (resolution.resolve_keys),
+dans l'ordre des clés. Les competitors_cited des prospects déjà scorés ne sont
+pas recalculés.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a1b7c3e860'
+down_revision = 'c3f7a9e1d052'
+branch_labels = None
+depends_on = None
+
+BATCH = 1000
+
+index = sa.table(
+    'competitor_index',
+    sa.column('name_key', sa.String),
+    sa.column('name', sa.String),
+)
+
+
+def upgrade() -> None:
+    from src.prospecting.resolution import resolve_keys
+
+    op.create_table('competitors',
+    sa.Column('entity_id', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('entity_id')
+    )
+    op.create_table('competitor_aliases',
+    sa.Column('name_key', sa.String(), nullable=False),
+    sa.Column('entity_id', sa.String(), nullable=False),
+    sa.Column('similarity', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['entity_id'], ['competitors.entity_id'], ),
+    sa.PrimaryKeyConstraint('name_key')
+    )
+    op.create_index(op.f('ix_competitor_aliases_entity_id'), 'competitor_aliases', ['entity_id'], unique=False)
+    op.create_table('competitor_lsh',
+    sa.Column('band', sa.Integer(), nullable=False),
+    sa.Column('bucket', sa.BigInteger(), nullable=False),
+    sa.Column('name_key', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('band', 'bucket', 'name_key')
+    )
+
+    bind = op.get_bind()
+    last = ''
+    while True:
+        rows = bind.execute(
+            sa.select(index.c.name_key, sa.func.min(index.c.name))
+            .where(index.c.name_key > last)
+            .group_by(index.c.name_key).order_by(index.c.name_key).limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        resolve_keys(bind, dict(rows))
+        last = rows[-1][0]
+
+
+def downgrade() -> None:
+    op.drop_table('competitor_lsh')
+    op.drop_index(op.f('ix_competitor_aliases_entity_id'), table_name='competitor_aliases')
+    op.drop_table('competitor_aliases')
+    op.drop_table('competitors')
@@ -0,0 +1,86 @@
+"""Visibility time series (slot / day / week rollups)
+
+Revision ID: e7b3c9d1f472
+Revises: d5a1b7c3e860
+Create Date: 2026-10-19 17:00:00.000000
+
+Remplie depuis les runs encore en base (trends.index_runs, créneaux, jours,
+semaines et concurrents) et depuis run_stats pour les runs déjà archivés
+(jours et semaines du prospect seulement).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7b3c9d1f472'
+down_revision = 'd5a1b7c3e860'
+branch_labels = None
+depends_on = None
+
+BATCH = 1000
+
+runs = sa.table(
+    'test_runs',
+    sa.column('run_id', sa.String),
+    sa.column('prospect_id', sa.String),
+    sa.column('model', sa.String),
+    sa.column('ts', sa.DateTime),
+    sa.column('mentioned_target', sa.Boolean),
+    sa.column('mention_per_query', sa.Text),
+    sa.column('competitors_entities', sa.Text),
+)
+
+run_stats = sa.table(
+    'run_stats',
+    sa.column('prospect_id', sa.String),
+    sa.column('model', sa.String),
+    sa.column('day', sa.Date),
+    sa.column('runs', sa.Integer),
+    sa.column('mentions', sa.Integer),
+    sa.column('query_mentions', sa.Text),
+)
+
+
+def upgrade() -> None:
+    from src.prospecting.trends import index_runs, index_stats
+
+    op.create_table('visibility_points',
+    sa.Column('prospect_id', sa.String(), nullable=False),
+    sa.Column('resolution', sa.String(), nullable=False),
+    sa.Column('series', sa.String(), nullable=False),
+    sa.Column('period', sa.String(), nullable=False),
+    sa.Column('model', sa.String(), nullable=False),
+    sa.Column('query_index', sa.Integer(), nullable=False),
+    sa.Column('samples', sa.Integer(), nullable=False),
+    sa.Column('hits', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('prospect_id', 'resolution', 'series', 'period', 'model', 'query_index'),
+    sqlite_with_rowid=False
+    )
+
+    bind = op.get_bind()
+    last = ''
+    while True:
+        rows = bind.execute(
+            sa.select(runs).where(runs.c.run_id > last).order_by(runs.c.run_id).limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        index_runs(bind, rows)
+        last = rows[-1].run_id
+
+    offset = 0
+    while True:
+        rows = bind.execute(
+            sa.select(run_stats)
+            .order_by(run_stats.c.prospect_id, run_stats.c.model, run_stats.c.day)
+            .limit(BATCH).offset(offset)
+        ).all()
+        if not rows:
+            break
+        index_stats(bind, rows)
+        offset += BATCH
+
+
+def downgrade() -> None:
+    op.drop_table('visibility_points')
@@ -0,0 +1,61 @@
+"""Reindex answers_fts without stripping legal forms
+
+Revision ID: f8c4d0e2a583
+Revises: e7b3c9d1f472
+Create Date: 2026-10-19 18:00:00.000000
+
+Les bases migrées avant la correction du pliage de b8c2e6f0a451 ont un index
+sans formes juridiques (SAS, SARL… introuvables) : l'index est vidé puis
+reconstruit depuis answers avec le pliage actuel (copie figée de search.fold).
+"""
+import re
+import unicodedata
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f8c4d0e2a583'
+down_revision = 'e7b3c9d1f472'
+branch_labels = None
+depends_on = None
+
+BATCH = 1000
+FTS = 'answers_fts'
+
+fts = sa.table(FTS, sa.column('rowid'), sa.column('body'))
+
+
+def _unz(value) -> str:
+    return value if isinstance(value, str) else zlib.decompress(value).decode('utf-8')
+
+
+def _fold(text: str) -> str:
+    """search.fold figé : minuscules, sans accents, ponctuation → espaces."""
+    text = unicodedata.normalize('NFD', (text or '').lower())
+    text = ''.join(c for c in text if unicodedata.category(c) != 'Mn')
+    return ' '.join(re.sub(r'[^a-z0-9\s]', ' ', text).split())
+
+
+def upgrade() -> None:
+    op.execute(f"INSERT INTO {FTS}({FTS}) VALUES('delete-all')")
+
+    bind = op.get_bind()
+    rowid = sa.literal_column('rowid')
+    last_rowid = 0
+    while True:
+        rows = bind.execute(
+            sa.select(rowid, sa.column('body')).select_from(sa.table('answers'))
+            .where(rowid > last_rowid).order_by(rowid).limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        bind.execute(fts.insert(), [{'rowid': r[0], 'body': _fold(_unz(r[1]))} for r in rows])
+        last_rowid = rows[-1][0]
+
+
+def downgrade() -> None:
+    # L'ancien pliage n'est pas restauré : l'index reste cherchable avec l'actuel
+    pass
@@ -3,7 +3,8 @@ Data models — Campaign, ProspectRecord, TestRun
 SQLAlchemy (SQLite) + Pydantic schemas + Enums statuts imposés
 """
 import uuid
-from datetime import datetime
+import zlib
+from datetime import date, datetime
 from enum import Enum
 from typing import Optional, List, Dict, Any
 
@@ -27,7 +28,7 @@ class ProspectStatus(str, Enum):
 VALID_TRANSITIONS: Dict[ProspectStatus, List[ProspectStatus]] = {
     ProspectStatus.SCANNED:       [ProspectStatus.SCHEDULED],
     ProspectStatus.SCHEDULED:     [ProspectStatus.TESTING],
-    ProspectStatus.TESTING:       [ProspectStatus.TESTED],
+    ProspectStatus.TESTING:       [ProspectStatus.TESTED, ProspectStatus.SCHEDULED],   # SCHEDULED : test interrompu
     ProspectStatus.TESTED:        [ProspectStatus.SCORED],
     ProspectStatus.SCORED:        [ProspectStatus.READY_ASSETS],
     ProspectStatus.READY_ASSETS:  [ProspectStatus.READY_TO_SEND],
@@ -54,6 +55,29 @@ class AIModel(str, Enum):
     GEMINI    = "gemini"
 
 
+# ─────────────────────────── TYPES ───────────────────────────
+
+class CompressedText(sa.types.TypeDecorator):
+    """
+    Texte stocké compressé (zlib) en BLOB — transparent côté Python (str).
+    Les lignes antérieures à la migration (TEXT brut) sont relues telles quelles.
+    """
+    impl = sa.LargeBinary
+    cache_ok = True
+
+    LEVEL = 6
+
+    def process_bind_param(self, value: Optional[str], dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        return zlib.compress(value.encode("utf-8"), self.LEVEL)
+
+    def process_result_value(self, value, dialect) -> Optional[str]:
+        if value is None or isinstance(value, str):
+            return value
+        return zlib.decompress(value).decode("utf-8")
+
+
 # ─────────────────────────── ORM ───────────────────────────
 
 class Base(DeclarativeBase):
@@ -62,6 +86,9 @@ class Base(DeclarativeBase):
 
 class CampaignDB(Base):
     __tablename__ = "campaigns"
+    __table_args__ = (
+        sa.Index("ix_campaigns_created", "created_at", "campaign_id"),   # pagination keyset
+    )
 
     campaign_id:     Mapped[str]      = mapped_column(sa.String, primary_key=True, default=lambda: str(uuid.uuid4()))
     profession:      Mapped[str]      = mapped_column(sa.String, nullable=False)
@@ -80,6 +107,12 @@ class CampaignDB(Base):
 
 class ProspectDB(Base):
     __tablename__ = "prospects"
+    __table_args__ = (
+        # compteurs par campagne : GROUP BY campaign_id, status couvert par l'index
+        sa.Index("ix_prospects_campaign_status", "campaign_id", "status", "eligibility_flag"),
+        # db_list_prospects : filtre campagne (+ statut), tri score décroissant
+        sa.Index("ix_prospects_campaign_status_score", "campaign_id", "status", "ia_visibility_score"),
+    )
 
     prospect_id:          Mapped[str]           = mapped_column(sa.String, primary_key=True, default=lambda: str(uuid.uuid4()))
     campaign_id:          Mapped[str]           = mapped_column(sa.String, sa.ForeignKey("campaigns.campaign_id"), nullable=False)
@@ -93,7 +126,7 @@ class ProspectDB(Base):
     competitors_cited:    Mapped[str]           = mapped_column(sa.Text, default="[]")     # JSON list[str]
     ia_visibility_score:  Mapped[Optional[float]]= mapped_column(sa.Float, nullable=True)
     eligibility_flag:     Mapped[bool]          = mapped_column(sa.Boolean, default=False)
-    landing_token:        Mapped[str]           = mapped_column(sa.String, default=lambda: str(uuid.uuid4()).replace("-","")[:24])
+    landing_token:        Mapped[str]           = mapped_column(sa.String, default=lambda: str(uuid.uuid4()).replace("-","")[:24], unique=True, index=True)
     video_url:            Mapped[Optional[str]] = mapped_column(sa.String, nullable=True)
     screenshot_url:       Mapped[Optional[str]] = mapped_column(sa.String, nullable=True)
     status:               Mapped[str]           = mapped_column(sa.String, default="SCANNED")
@@ -107,6 +140,9 @@ class ProspectDB(Base):
 
 class TestRunDB(Base):
     __tablename__ = "test_runs"
+    __table_args__ = (
+        sa.Index("ix_test_runs_prospect_ts", "prospect_id", "ts"),   # runs d'un prospect triés par date
+    )
 
     run_id:              Mapped[str]           = mapped_column(sa.String, primary_key=True, default=lambda: str(uuid.uuid4()))
     campaign_id:         Mapped[str]           = mapped_column(sa.String, sa.ForeignKey("campaigns.campaign_id"), nullable=False)
@@ -114,8 +150,10 @@ class TestRunDB(Base):
     ts:                  Mapped[datetime]      = mapped_column(sa.DateTime, default=datetime.utcnow)
     model:               Mapped[str]           = mapped_column(sa.String, nullable=False)   # openai/anthropic/gemini
     queries:             Mapped[str]           = mapped_column(sa.Text, default="[]")       # JSON list[str]
-    raw_answers:         Mapped[str]           = mapped_column(sa.Text, default="[]")       # JSON list[str]
-    extracted_entities:  Mapped[str]           = mapped_column(sa.Text, default="[]")       # JSON list[list[dict]]
+    answer_hashes:       Mapped[str]           = mapped_column(sa.Text, default="[]")       # JSON list[sha256] — 1 par query (table answers)
+    # runs antérieurs au stockage adressé par contenu : compressés, chargés à la demande (db_run_answers)
+    raw_answers:         Mapped[str]           = mapped_column(CompressedText, default="[]", deferred=True)   # JSON list[str]
+    extracted_entities:  Mapped[str]           = mapped_column(CompressedText, default="[]", deferred=True)   # JSON list[list[dict]]
     mentioned_target:    Mapped[bool]          = mapped_column(sa.Boolean, default=False)   # True si mentionné dans ≥1 réponse
     mention_per_query:   Mapped[str]           = mapped_column(sa.Text, default="[]")       # JSON list[bool] — 1 par query
     competitors_entities:Mapped[str]           = mapped_column(sa.Text, default="[]")       # JSON list[str]
@@ -125,6 +163,175 @@ class TestRunDB(Base):
     prospect: Mapped["ProspectDB"]  = relationship("ProspectDB",  back_populates="runs")
 
 
+class RunStatsDB(Base):
+    """
+    Agrégats des runs archivés (archive.py) par prospect × modèle × jour :
+    tout ce que le résumé audit / landing lit, sans relire le Parquet.
+    """
+    __tablename__ = "run_stats"
+    __table_args__ = (
+        sa.Index("ix_run_stats_campaign", "campaign_id"),
+    )
+
+    prospect_id:     Mapped[str]      = mapped_column(sa.String, primary_key=True)
+    model:           Mapped[str]      = mapped_column(sa.String, primary_key=True)
+    day:             Mapped[date]     = mapped_column(sa.Date, primary_key=True)
+    campaign_id:     Mapped[str]      = mapped_column(sa.String, nullable=False)
+    runs:            Mapped[int]      = mapped_column(sa.Integer, default=0)
+    mentions:        Mapped[int]      = mapped_column(sa.Integer, default=0)       # runs avec mentioned_target
+    query_mentions:  Mapped[str]      = mapped_column(sa.Text, default="[]")       # JSON list[int] — 1 par query
+    query_labels:    Mapped[str]      = mapped_column(sa.Text, default="[]")       # JSON list[str]
+    first_ts:        Mapped[datetime] = mapped_column(sa.DateTime, nullable=False)
+    last_ts:         Mapped[datetime] = mapped_column(sa.DateTime, nullable=False)
+
+
+class CompetitorIndexDB(Base):
+    """
+    Index inversé des concurrents cités (competitors.py) : nom normalisé → prospect × modèle.
+    runs = nb de runs qui le citent ; conservé quand les runs sont archivés.
+    """
+    __tablename__ = "competitor_index"
+    __table_args__ = (
+        sa.Index("ix_competitor_index_campaign", "campaign_id"),
+    )
+
+    name_key:     Mapped[str]      = mapped_column(sa.String, primary_key=True)     # normalize_name(name)
+    prospect_id:  Mapped[str]      = mapped_column(sa.String, primary_key=True)
+    model:        Mapped[str]      = mapped_column(sa.String, primary_key=True)
+    campaign_id:  Mapped[str]      = mapped_column(sa.String, nullable=False)
+    name:         Mapped[str]      = mapped_column(sa.String, nullable=False)       # graphie à la 1re citation
+    runs:         Mapped[int]      = mapped_column(sa.Integer, default=0)
+    first_seen:   Mapped[datetime] = mapped_column(sa.DateTime, nullable=False)
+    last_seen:    Mapped[datetime] = mapped_column(sa.DateTime, nullable=False)
+
+
+class CompetitorDB(Base):
+    """Concurrent canonique (resolution.py) : regroupe les graphies d'un même concurrent."""
+    __tablename__ = "competitors"
+
+    entity_id:   Mapped[str]      = mapped_column(sa.String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    name:        Mapped[str]      = mapped_column(sa.String, nullable=False)     # graphie de la 1re citation
+    created_at:  Mapped[datetime] = mapped_column(sa.DateTime, default=datetime.utcnow)
+
+
+class CompetitorAliasDB(Base):
+    """Graphie normalisée (normalize_name) → concurrent canonique. similarity : Jaccard avec l'alias rapproché."""
+    __tablename__ = "competitor_aliases"
+
+    name_key:    Mapped[str]      = mapped_column(sa.String, primary_key=True)
+    entity_id:   Mapped[str]      = mapped_column(sa.String, sa.ForeignKey("competitors.entity_id"), nullable=False, index=True)
+    similarity:  Mapped[float]    = mapped_column(sa.Float, default=1.0)
+    created_at:  Mapped[datetime] = mapped_column(sa.DateTime, default=datetime.utcnow)
+
+
+class CompetitorLshDB(Base):
+    """Seaux LSH des signatures MinHash des alias : 1 ligne par bande (recherche des candidats)."""
+    __tablename__ = "competitor_lsh"
+
+    band:        Mapped[int]      = mapped_column(sa.Integer, primary_key=True)
+    bucket:      Mapped[int]      = mapped_column(sa.BigInteger, primary_key=True)
+    name_key:    Mapped[str]      = mapped_column(sa.String, primary_key=True)
+
+
+class VisibilityPointDB(Base):
+    """
+    Série temporelle de visibilité (trends.py), cumulée à l'écriture des runs :
+    prospect × résolution (slot / day / week) × série × période × modèle × requête.
+    series = "" pour le prospect, entity_id d'un concurrent cité sinon : chaque série
+    est une plage contiguë de la clé primaire.
+    query_index = -1 : niveau run (mentioned_target / concurrent cité) ; 0-4 : par requête.
+    """
+    __tablename__ = "visibility_points"
+    __table_args__ = {"sqlite_with_rowid": False}     # lignes rangées dans l'ordre de la clé primaire
+
+    prospect_id:  Mapped[str]      = mapped_column(sa.String, primary_key=True)
+    resolution:   Mapped[str]      = mapped_column(sa.String, primary_key=True)
+    series:       Mapped[str]      = mapped_column(sa.String, primary_key=True)
+    period:       Mapped[str]      = mapped_column(sa.String, primary_key=True)   # 2026-10-21T09:00 / 2026-10-21 / lundi 2026-10-19
+    model:        Mapped[str]      = mapped_column(sa.String, primary_key=True)
+    query_index:  Mapped[int]      = mapped_column(sa.Integer, primary_key=True)
+    samples:      Mapped[int]      = mapped_column(sa.Integer, default=0)   # runs observés ; 0 pour un concurrent (runs du prospect)
+    hits:         Mapped[int]      = mapped_column(sa.Integer, default=0)   # dont : prospect mentionné / concurrent cité
+
+
+class AnswerDB(Base):
+    """
+    Réponse IA brute stockée une seule fois (clé = sha256 du texte).
+    entities : extraction mémoïsée (NULL = pas encore extraite).
+    """
+    __tablename__ = "answers"
+
+    hash:        Mapped[str]           = mapped_column(sa.String(64), primary_key=True)
+    body:        Mapped[str]           = mapped_column(CompressedText, nullable=False, deferred=True)
+    entities:    Mapped[Optional[str]] = mapped_column(CompressedText, nullable=True)   # JSON list[dict]
+    created_at:  Mapped[datetime]      = mapped_column(sa.DateTime, default=datetime.utcnow)
+
+
+# Index plein texte des réponses (FTS5 sans contenu : les corps restent compressés dans answers).
+# rowid = answers.rowid ; texte indexé = normalize_name(body), alimenté par answers.store_answers.
+ANSWERS_FTS = "answers_fts"
+
+sa.event.listen(AnswerDB.__table__, "after_create", sa.DDL(
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {ANSWERS_FTS} "
+    "USING fts5(body, content='', tokenize='unicode61 remove_diacritics 2')"
+).execute_if(dialect="sqlite"))
+sa.event.listen(AnswerDB.__table__, "before_drop", sa.DDL(
+    f"DROP TABLE IF EXISTS {ANSWERS_FTS}"
+).execute_if(dialect="sqlite"))
+
+
+class AnswerRefDB(Base):
+    """
+    Occurrence d'une réponse dans un run (1 ligne par requête) : filtres de la recherche
+    plein texte. Sans FK vers test_runs : survit à l'archivage du run.
+    """
+    __tablename__ = "answer_refs"
+    __table_args__ = (sa.Index("ix_answer_refs_hash_ts", "answer_hash", "ts"),)
+
+    run_id:       Mapped[str]      = mapped_column(sa.String, primary_key=True)
+    query_index:  Mapped[int]      = mapped_column(sa.Integer, primary_key=True)
+    answer_hash:  Mapped[str]      = mapped_column(sa.String(64), sa.ForeignKey("answers.hash"), nullable=False)
+    campaign_id:  Mapped[str]      = mapped_column(sa.String, nullable=False)
+    prospect_id:  Mapped[str]      = mapped_column(sa.String, nullable=False)
+    model:        Mapped[str]      = mapped_column(sa.String, nullable=False)
+    query:        Mapped[str]      = mapped_column(sa.Text, nullable=False)
+    ts:           Mapped[datetime] = mapped_column(sa.DateTime, nullable=False)
+
+
+class SlotAnswerDB(Base):
+    """
+    Pool de réponses partagé pendant un créneau planifié : (slot, modèle, requête) → réponse.
+    1 ligne = 1 appel API effectué ; hits = appels évités (réemplois par d'autres prospects/campagnes).
+    """
+    __tablename__ = "slot_answers"
+
+    slot:         Mapped[str]      = mapped_column(sa.String, primary_key=True)    # ex. "2026-10-21T09:00" (Europe/Rome)
+    model:        Mapped[str]      = mapped_column(sa.String, primary_key=True)
+    query:        Mapped[str]      = mapped_column(sa.Text, primary_key=True)
+    answer_hash:  Mapped[str]      = mapped_column(sa.String(64), sa.ForeignKey("answers.hash"), nullable=False)
+    hits:         Mapped[int]      = mapped_column(sa.Integer, default=0)
+    created_at:   Mapped[datetime] = mapped_column(sa.DateTime, default=datetime.utcnow)
+
+
+class ProspectEventDB(Base):
+    """
+    Journal append-only : création, changement de statut, run IA.
+    seq strictement croissant (AUTOINCREMENT : jamais réutilisé) → curseur des consommateurs.
+    """
+    __tablename__ = "prospect_events"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    seq:          Mapped[int]           = mapped_column(sa.Integer, primary_key=True, autoincrement=True)
+    ts:           Mapped[datetime]      = mapped_column(sa.DateTime, default=datetime.utcnow)
+    kind:         Mapped[str]           = mapped_column(sa.String, nullable=False)    # created / transition / run
+    prospect_id:  Mapped[str]           = mapped_column(sa.String, nullable=False, index=True)   # sans FK : survit au prospect
+    campaign_id:  Mapped[Optional[str]] = mapped_column(sa.String, nullable=True, index=True)
+    from_status:  Mapped[Optional[str]] = mapped_column(sa.String, nullable=True)
+    to_status:    Mapped[Optional[str]] = mapped_column(sa.String, nullable=True)
+    run_id:       Mapped[Optional[str]] = mapped_column(sa.String, nullable=True)
+    reason:       Mapped[Optional[str]] = mapped_column(sa.String, nullable=True)
+
+
 # ─────────────────────────── PYDANTIC SCHEMAS ───────────────────────────
 
 class CampaignCreate(BaseModel):
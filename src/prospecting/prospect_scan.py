@@ -6,16 +6,27 @@ Output: ProspectRecord[] stockés en DB
 
 MVP : accepte une liste manuelle OU un CSV/JSON fourni.
 Aucun paramètre libre hors (city, profession, max_prospects).
+
+Import CSV en streaming (import_csv) : lecture ligne à ligne, validation et
+INSERT par lots (une transaction par lot), doublons ignorés (nom + ville, domaine
+enregistrable). Fichier illisible en cours de route : lots commités et lot
+annulé sont rapportés.
 """
 import csv
 import io
 import json
+import os
+import re
 import uuid
-from typing import List, Optional
+from datetime import datetime
+from typing import IO, Dict, Iterator, List, Optional, Set, Tuple
 
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
-from .database import db_create_campaign, db_create_prospect, db_list_prospects, jdumps
+from . import events
+from .database import db_create_campaign, db_list_prospects, jdumps
 from .models import (
     CampaignDB, CampaignCreate, CampaignMode,
     ProspectDB, ProspectInput, ProspectScanInput, ProspectStatus
@@ -81,6 +92,24 @@ def create_campaign(db: Session, data: CampaignCreate) -> CampaignDB:
 
 # ── Scan prospects ──
 
+def get_or_create_campaign(db: Session, data: ProspectScanInput) -> CampaignDB:
+    """Campagne data.campaign_id (ValueError si absente), sinon nouvelle campagne."""
+    from .database import db_get_campaign
+    if data.campaign_id:
+        campaign = db_get_campaign(db, data.campaign_id)
+        if not campaign:
+            raise ValueError(f"Campaign {data.campaign_id} introuvable")
+        return campaign
+    return create_campaign(
+        db,
+        CampaignCreate(
+            profession=data.profession,
+            city=data.city,
+            max_prospects=data.max_prospects,
+        ),
+    )
+
+
 def scan_prospects(
     db: Session,
     data: ProspectScanInput,
@@ -91,21 +120,7 @@ def scan_prospects(
       1. data.manual_prospects (liste JSON dans le body)
       2. Placeholder auto-généré si rien n'est fourni
     """
-    # Récupérer ou créer la campagne
-    from .database import db_get_campaign
-    if data.campaign_id:
-        campaign = db_get_campaign(db, data.campaign_id)
-        if not campaign:
-            raise ValueError(f"Campaign {data.campaign_id} introuvable")
-    else:
-        campaign = create_campaign(
-            db,
-            CampaignCreate(
-                profession=data.profession,
-                city=data.city,
-                max_prospects=data.max_prospects,
-            ),
-        )
+    campaign = get_or_create_campaign(db, data)
 
     inputs: List[ProspectInput] = []
 
@@ -115,32 +130,33 @@ def scan_prospects(
         # Fallback : placeholder — signale que l'utilisateur doit fournir sa liste
         inputs = _placeholder_prospects(data.city, data.profession, min(data.max_prospects, 3))
 
-    created: List[ProspectDB] = []
-    for inp in inputs:
-        prospect = ProspectDB(
-            prospect_id=str(uuid.uuid4()),
-            campaign_id=campaign.campaign_id,
-            name=inp.name,
-            city=inp.city or data.city,
-            profession=inp.profession or data.profession,
-            website=inp.website,
-            phone=inp.phone,
-            reviews_count=inp.reviews_count,
-            google_ads_active=inp.google_ads_active,
-            competitors_cited=jdumps([]),
-            eligibility_flag=False,
-            status=ProspectStatus.SCANNED.value,
-        )
-        created.append(db_create_prospect(db, prospect))
-
-    # Passer SCHEDULED pour démarrer le scheduling
-    for p in created:
-        p.status = ProspectStatus.SCHEDULED.value
+    # Insérés directement SCHEDULED (démarrage du scheduling), une seule transaction
+    created = [
+        ProspectDB(campaign_id=campaign.campaign_id, **_prospect_values(inp, data.city, data.profession))
+        for inp in inputs
+    ]
+    db.add_all(created)
     db.commit()
 
     return created
 
 
+def _prospect_values(inp: ProspectInput, city: str, profession: str) -> Dict:
+    return dict(
+        prospect_id=str(uuid.uuid4()),
+        name=inp.name,
+        city=inp.city or city,
+        profession=inp.profession or profession,
+        website=inp.website,
+        phone=inp.phone,
+        reviews_count=inp.reviews_count,
+        google_ads_active=inp.google_ads_active,
+        competitors_cited=jdumps([]),
+        eligibility_flag=False,
+        status=ProspectStatus.SCHEDULED.value,
+    )
+
+
 def load_from_csv(csv_content: str, city: str, profession: str) -> List[ProspectInput]:
     """
     Parse un CSV avec colonnes : name, website, phone, reviews_count, google_ads_active
@@ -150,15 +166,7 @@ def load_from_csv(csv_content: str, city: str, profession: str) -> List[Prospect
     prospects = []
     for row in reader:
         try:
-            p = ProspectInput(
-                name=row.get("name", "").strip(),
-                city=row.get("city", city).strip() or city,
-                profession=row.get("profession", profession).strip() or profession,
-                website=row.get("website", "").strip() or None,
-                phone=row.get("phone", "").strip() or None,
-                reviews_count=int(row["reviews_count"]) if row.get("reviews_count", "").strip().isdigit() else None,
-                google_ads_active=row.get("google_ads_active", "").strip().lower() in ("true", "1", "oui"),
-            )
+            p = ProspectInput(**_csv_row_values(row, city, profession))
             if p.name:
                 prospects.append(p)
         except Exception:
@@ -166,6 +174,196 @@ def load_from_csv(csv_content: str, city: str, profession: str) -> List[Prospect
     return prospects
 
 
+def _csv_row_values(row: Dict[str, Optional[str]], city: str, profession: str) -> Dict:
+    def col(key: str) -> str:
+        return (row.get(key) or "").strip()
+
+    return dict(
+        name=col("name"),
+        city=col("city") or city,
+        profession=col("profession") or profession,
+        website=col("website") or None,
+        phone=col("phone") or None,
+        reviews_count=int(col("reviews_count")) if col("reviews_count").isdigit() else None,
+        google_ads_active=col("google_ads_active").lower() in ("true", "1", "oui"),
+    )
+
+
+# ── Import CSV (streaming) ──
+
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+
+# Réseaux sociaux / annuaires : le domaine n'identifie pas l'entreprise (quel que soit le TLD)
+_SHARED_DOMAINS = {"facebook", "fb", "instagram", "linkedin", "google", "goo", "pagesjaunes"}
+
+# Suffixes publics à deux labels (extrait de la Public Suffix List) : le domaine
+# enregistrable prend un label de plus (toitpro.co.uk ≠ martin.co.uk)
+_PUBLIC_SUFFIXES = {
+    "co.uk", "org.uk", "me.uk", "com.au", "co.nz", "co.za", "com.br", "com.es",
+    "asso.fr", "nom.fr", "tm.fr", "gouv.fr", "co.com",
+}
+# Hébergeurs de sites : chaque sous-domaine est un site distinct (suffixes « privés » de la PSL)
+_HOSTED_SUFFIXES = {
+    "wixsite.com", "wordpress.com", "jimdo.com", "jimdofree.com", "jimdosite.com", "business.site",
+    "blogspot.com", "blogspot.fr", "e-monsite.com", "webnode.fr", "over-blog.com", "site123.me",
+}
+
+
+def registrable_domain(url: str) -> str:
+    """
+    Domaine enregistrable d'une URL (label + suffixe public) : martin.fr ≠ martin.com,
+    martin.wixsite.com ≠ durand.wixsite.com. "" si vide, IP ou domaine partagé.
+    """
+    host = re.sub(r"^[a-z][a-z0-9+.-]*://", "", (url or "").strip().lower())
+    host = re.split(r"[/?#]", host, maxsplit=1)[0].rsplit("@", 1)[-1].split(":")[0].strip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    labels = host.split(".")
+    if len(labels) < 2 or labels[-1].isdigit():
+        return ""
+    suffix = ".".join(labels[-2:])
+    suffix_len = 2 if suffix in _PUBLIC_SUFFIXES or suffix in _HOSTED_SUFFIXES else 1
+    if len(labels) <= suffix_len or labels[-suffix_len - 1] in _SHARED_DOMAINS:
+        return ""                           # suffixe seul (wixsite.com) ou réseau social
+    return ".".join(labels[-suffix_len - 1:])
+
+
+_BATCH_ADAPTER = TypeAdapter(List[ProspectInput])
+
+
+class DedupIndex:
+    """Clés déjà présentes dans la campagne : nom normalisé + ville, domaine enregistrable du site."""
+
+    def __init__(self):
+        self.names:   Set[Tuple[str, str]] = set()
+        self.domains: Set[str] = set()
+        self._cities: Dict[str, str] = {}   # une poignée de villes par campagne
+
+    @classmethod
+    def for_campaign(cls, db: Session, campaign_id: str) -> "DedupIndex":
+        index = cls()
+        rows = (
+            db.query(ProspectDB.name, ProspectDB.city, ProspectDB.website)
+            .filter(ProspectDB.campaign_id == campaign_id)
+            .yield_per(5000)
+        )
+        for name, city, website in rows:
+            index.add(name, city, website)
+        return index
+
+    def keys(self, name: str, city: str, website: Optional[str]) -> Tuple[Tuple[str, str], str]:
+        from .ia_test import normalize_name   # ia_test importe ce module
+        city_key = self._cities.get(city)
+        if city_key is None:
+            city_key = self._cities[city] = normalize_name(city)
+        return (normalize_name(name), city_key), registrable_domain(website or "")
+
+    def add(self, name: str, city: str, website: Optional[str]) -> bool:
+        """Ajoute le prospect. False s'il est déjà connu (par nom ou par domaine)."""
+        name_key, domain = self.keys(name, city, website)
+        if name_key in self.names or (domain and domain in self.domains):
+            return False
+        self.names.add(name_key)
+        if domain:
+            self.domains.add(domain)
+        return True
+
+
+def iter_csv_rows(stream: IO[bytes]) -> Iterator[Dict[str, Optional[str]]]:
+    """Lignes d'un CSV binaire (UTF-8, BOM toléré), décodées au fil de l'eau."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        yield from csv.DictReader(text)
+    finally:
+        text.detach()   # ne pas fermer le fichier de l'appelant
+
+
+def _validate_batch(values: List[Dict]) -> Tuple[List[ProspectInput], int]:
+    """Valide un lot d'un coup ; en cas d'erreur, ligne à ligne. Retourne (valides, nb invalides)."""
+    try:
+        return _BATCH_ADAPTER.validate_python(values), 0
+    except ValidationError:
+        valid = []
+        for v in values:
+            try:
+                valid.append(ProspectInput(**v))
+            except ValidationError:
+                continue
+        return valid, len(values) - len(valid)
+
+
+def import_csv(
+    db: Session,
+    stream: IO[bytes],
+    campaign: CampaignDB,
+    city: str,
+    profession: str,
+    max_prospects: Optional[int] = None,
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> Dict:
+    """
+    Importe un CSV (colonnes de load_from_csv) dans la campagne, en streaming.
+    Un lot = une validation + un INSERT multi-lignes + un commit.
+    Retourne {campaign_id, created, duplicates, invalid, failed}.
+
+    Fichier illisible en cours de route (encodage, CSV malformé) : les lots déjà
+    commités restent (created), le lot en cours est annulé (failed) et la suite
+    du fichier n'est pas lue ; report["error"] décrit l'erreur.
+    """
+    index  = DedupIndex.for_campaign(db, campaign.campaign_id)
+    report = {"campaign_id": campaign.campaign_id, "created": 0, "duplicates": 0, "invalid": 0, "failed": 0}
+    batch: List[Dict] = []
+
+    def flush() -> None:
+        valid, invalid = _validate_batch(batch)
+        report["invalid"] += invalid
+        batch.clear()
+
+        now  = datetime.utcnow()
+        rows = []
+        for inp in valid:
+            if max_prospects is not None and report["created"] + len(rows) >= max_prospects:
+                break
+            if not index.add(inp.name, inp.city, inp.website):
+                report["duplicates"] += 1
+                continue
+            rows.append({
+                **_prospect_values(inp, city, profession),
+                "campaign_id": campaign.campaign_id,
+                "created_at":  now,
+                "updated_at":  now,
+            })
+        if rows:
+            db.execute(insert(ProspectDB), rows)
+            events.record(db, (
+                {"kind": events.CREATED, "prospect_id": r["prospect_id"],
+                 "campaign_id": r["campaign_id"], "to_status": r["status"]}
+                for r in rows
+            ))
+            db.commit()
+            report["created"] += len(rows)
+
+    try:
+        for row in iter_csv_rows(stream):
+            values = _csv_row_values(row, city, profession)
+            if not values["name"]:
+                report["invalid"] += 1
+                continue
+            batch.append(values)
+            if len(batch) >= batch_size:
+                flush()
+                if max_prospects is not None and report["created"] >= max_prospects:
+                    return report
+    except (UnicodeDecodeError, csv.Error) as e:
+        db.rollback()
+        report["failed"] = len(batch)
+        report["error"]  = str(e)
+        return report
+    if batch:
+        flush()
+    return report
+
+
 def _placeholder_prospects(city: str, profession: str, count: int) -> List[ProspectInput]:
     """Génère des prospects placeholder — à remplacer par une vraie liste."""
     return [
@@ -0,0 +1,130 @@
+"""
+Module PUBLISH — pages statiques (landing + audit) pour les prospects READY_TO_SEND
+
+published/{landing_token}/
+  {digest}/index.html, {digest}/audit.html  — version immuable (hash des données)
+  index.html, audit.html                    — copie de la version courante (lien stable /p/{token}/)
+  CURRENT                                   — digest de la version courante
+
+Servi par StaticFiles (/p) ou directement par le serveur web frontal : aucun
+code Python par vue. Reconstruit uniquement si le hash des données change :
+à la promotion READY_TO_SEND, sur l'endpoint de publication, et au commit
+d'une session qui modifie un prospect déjà publié (hook after_commit de
+landing_cache → worker de republication → republish_prospects).
+"""
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from ..utils.storage import atomic_write_bytes, content_digest
+from .generate import BASE_URL, PUBLISHED_DIR, _runs_summary, audit_context, landing_context, landing_url
+from .models import ProspectDB, ProspectStatus
+from .templates import render, template_digest
+
+logger = logging.getLogger(__name__)
+
+PUBLISH_KEEP = int(os.getenv("PUBLISH_KEEP_VERSIONS", "2"))   # versions immuables conservées par prospect
+PUBLISHED_PAGES = ("landing.html", "audit.html")
+
+# Champs prospect lus par les deux templates
+_PROSPECT_FIELDS = (
+    "name", "city", "profession", "screenshot_url", "competitors_cited",
+    "ia_visibility_score", "score_justification",
+)
+
+
+def publish_digest(prospect: ProspectDB, summary: Dict) -> str:
+    """Hash des données affichées (la date du rapport n'en fait pas partie)."""
+    return content_digest({
+        "templates": template_digest("fr", *PUBLISHED_PAGES),
+        "prospect":  {f: getattr(prospect, f) for f in _PROSPECT_FIELDS},
+        "summary":   summary,
+        "base_url":  BASE_URL,
+    })
+
+
+def current_digest(landing_token: str) -> Optional[str]:
+    try:
+        return (PUBLISHED_DIR / landing_token / "CURRENT").read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def publish_prospect(db: Session, prospect: ProspectDB, force: bool = False) -> Dict:
+    """Pré-rend landing + audit si les données ont changé. Retourne {digest, url, rebuilt}."""
+    summary   = _runs_summary(db, prospect)
+    digest    = publish_digest(prospect, summary)
+    token_dir = PUBLISHED_DIR / prospect.landing_token
+    result    = {"prospect_id": prospect.prospect_id, "digest": digest, "rebuilt": False}
+
+    if not force and current_digest(prospect.landing_token) == digest and (token_dir / "index.html").exists():
+        result["url"] = landing_url(prospect)
+        return result
+
+    pages = {
+        "index.html": render("landing.html", **landing_context(db, prospect, summary)).encode("utf-8"),
+        "audit.html": render("audit.html", **audit_context(db, prospect, summary)).encode("utf-8"),
+    }
+
+    # Version immuable d'abord, puis copies stables, puis pointeur
+    version_dir = token_dir / digest
+    for name, body in pages.items():
+        atomic_write_bytes(version_dir / name, body)
+    for name, body in pages.items():
+        atomic_write_bytes(token_dir / name, body)
+    atomic_write_bytes(token_dir / "CURRENT", digest.encode("ascii"))
+
+    _prune_versions(token_dir, keep=digest)
+    logger.info(f"Pages publiées {prospect.name} ({prospect.prospect_id}) → {digest[:12]}")
+
+    result.update(rebuilt=True, url=landing_url(prospect))
+    return result
+
+
+def publish_campaign(db: Session, campaign_id: str, force: bool = False) -> Dict:
+    """Publie tous les READY_TO_SEND d'une campagne (les pages inchangées sont ignorées)."""
+    from .database import db_list_prospects
+
+    published = skipped = 0
+    for prospect in db_list_prospects(db, campaign_id, ProspectStatus.READY_TO_SEND.value):
+        if publish_prospect(db, prospect, force)["rebuilt"]:
+            published += 1
+        else:
+            skipped += 1
+    return {"campaign_id": campaign_id, "published": published, "skipped": skipped}
+
+
+def republish_prospects(bind, prospect_ids: Iterable[str]) -> int:
+    """
+    Republie les prospects déjà publiés parmi prospect_ids (runs ajoutés,
+    rescore…), dans une session dédiée. Retourne le nombre de pages reconstruites.
+    """
+    from .database import SessionLocal
+
+    ids = list(prospect_ids)
+    if not ids:
+        return 0
+
+    db = SessionLocal(bind=bind)
+    try:
+        rebuilt = 0
+        for prospect in db.query(ProspectDB).filter(ProspectDB.prospect_id.in_(ids)):
+            if current_digest(prospect.landing_token) is not None:
+                rebuilt += publish_prospect(db, prospect)["rebuilt"]
+        return rebuilt
+    finally:
+        db.close()
+
+
+def _prune_versions(token_dir: Path, keep: str) -> None:
+    versions = sorted(
+        (d for d in token_dir.iterdir() if d.is_dir() and d.name != keep),
+        key=lambda d: d.stat().st_mtime,
+        reverse=True,
+    )
+    for old in versions[max(PUBLISH_KEEP - 1, 0):]:
+        shutil.rmtree(old, ignore_errors=True)
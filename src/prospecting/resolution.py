@@ -0,0 +1,163 @@
+"""
+Module RESOLUTION — regroupement des graphies de concurrents (MinHash / LSH)
+
+« Toitures Martin », « Martin Toiture », « Martin Toitures SARL » → un seul
+concurrent canonique (competitors), avec un alias par graphie normalisée.
+
+- shingles : trigrammes de caractères + mot entier, pour chaque mot de
+  normalize_name (pluriel en s/x retiré) — indépendants de l'ordre des mots ;
+  le mot entier sépare « Toitures 42 » de « Toitures 43 »
+- signature MinHash de NUM_PERM valeurs, découpée en BANDS bandes : deux alias
+  partageant un seau dans une bande sont candidats (competitor_lsh)
+- candidat retenu si Jaccard exact des shingles ≥ MATCH_THRESHOLD, sinon
+  nouveau concurrent ; un alias n'est jamais réaffecté (identifiants stables)
+- incrémental : seules les graphies jamais vues sont calculées (1 lecture par
+  clé primaire pour les autres), à l'indexation des runs (competitors.index_runs)
+"""
+import hashlib
+import random
+import uuid
+from functools import lru_cache
+from datetime import datetime
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import and_, bindparam, insert, or_, select
+
+from .models import CompetitorAliasDB, CompetitorDB, CompetitorLshDB
+
+NUM_PERM        = 60
+BANDS           = 12                  # 12 × 5 lignes : candidat à 96 % pour Jaccard 0.75, 12 % pour 0.4
+ROWS            = NUM_PERM // BANDS
+MATCH_THRESHOLD = 0.75
+
+_PRIME = (1 << 61) - 1
+_rng   = random.Random(20261019)      # permutations fixes : signatures stables entre process
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+
+class Competitor(NamedTuple):
+    entity_id: str
+    name:      str
+
+
+# ─────────────────────────── MINHASH ───────────────────────────
+
+def _stem(token: str) -> str:
+    return token[:-1] if len(token) > 3 and token[-1] in "sx" else token
+
+
+@lru_cache(maxsize=65536)
+def shingles(key: str) -> FrozenSet[str]:
+    """Trigrammes de caractères (bornés par ^ et $) et mot entier (#mot), pour chaque mot d'une clé normalize_name."""
+    out = set()
+    for token in key.split():
+        token  = _stem(token)
+        padded = f"^{token}$"
+        out.update(padded[i:i + 3] for i in range(len(padded) - 2))
+        out.add(f"#{token}")
+    return frozenset(out)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+def signature(grams: FrozenSet[str]) -> List[int]:
+    hashes = [int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "big") for g in grams]
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS]
+
+
+def buckets(sig: List[int]) -> List[tuple]:
+    """(bande, seau) ; seau = entier signé 64 bits (INTEGER SQLite)."""
+    out = []
+    for band in range(BANDS):
+        chunk = ",".join(map(str, sig[band * ROWS:(band + 1) * ROWS])).encode("ascii")
+        out.append((band, int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), "big", signed=True)))
+    return out
+
+
+# ─────────────────────────── RÉSOLUTION ───────────────────────────
+
+# OR de (band, bucket) plutôt que (band, bucket) IN (…) : SQLite parcourt alors la clé
+# primaire au lieu de toute la table ; requête construite une fois (cache de compilation)
+_CANDIDATES = select(CompetitorLshDB.name_key).distinct().where(or_(*(
+    and_(CompetitorLshDB.band == band, CompetitorLshDB.bucket == bindparam(f"h{band}")) for band in range(BANDS)
+)))
+
+
+def _match(conn, key: str, grams: FrozenSet[str], bands: List[tuple]) -> Optional[tuple]:
+    """Meilleur alias existant (name_key, jaccard) au-dessus du seuil, parmi les candidats LSH."""
+    candidates = conn.execute(_CANDIDATES, {f"h{band}": h for band, h in bands}).scalars().all()
+    best = None
+    for other in candidates:
+        score = jaccard(grams, shingles(other))
+        if score >= MATCH_THRESHOLD and (best is None or score > best[1] or (score == best[1] and other < best[0])):
+            best = (other, score)
+    return best
+
+
+def resolve_keys(conn, names: Dict[str, str]) -> Dict[str, str]:
+    """
+    {clé normalisée: graphie} → {clé: entity_id}, sur la connexion / session donnée.
+    Les clés inconnues sont rattachées à un concurrent existant ou en créent un.
+    """
+    if not names:
+        return {}
+    known = dict(conn.execute(
+        select(CompetitorAliasDB.name_key, CompetitorAliasDB.entity_id)
+        .where(CompetitorAliasDB.name_key.in_(list(names)))
+    ).all())
+
+    now = datetime.utcnow()
+    for key in sorted(set(names) - set(known)):       # ordre stable : résultat indépendant de l'ordre d'arrivée
+        grams = shingles(key)
+        bands = buckets(signature(grams))
+        match = _match(conn, key, grams, bands)
+        if match:
+            entity_id = conn.execute(
+                select(CompetitorAliasDB.entity_id).where(CompetitorAliasDB.name_key == match[0])
+            ).scalar_one()
+            similarity = match[1]
+        else:
+            entity_id, similarity = str(uuid.uuid4()), 1.0
+            conn.execute(insert(CompetitorDB), [{"entity_id": entity_id, "name": names[key], "created_at": now}])
+        conn.execute(insert(CompetitorAliasDB), [
+            {"name_key": key, "entity_id": entity_id, "similarity": similarity, "created_at": now},
+        ])
+        conn.execute(insert(CompetitorLshDB), [{"band": b, "bucket": h, "name_key": key} for b, h in bands])
+        known[key] = entity_id
+    return known
+
+
+def resolve_names(db, surfaces: Iterable[str]) -> Dict[str, Competitor]:
+    """Graphies brutes → Competitor(entity_id, nom canonique) ; les graphies vides sont ignorées."""
+    from .ia_test import normalize_name   # ia_test importe competitors → ce module
+
+    keys: Dict[str, str] = {}
+    by_surface: Dict[str, str] = {}
+    for surface in set(surfaces):
+        key = normalize_name(surface)
+        if key:
+            keys.setdefault(key, surface)
+            by_surface[surface] = key
+    ids   = resolve_keys(db, keys)
+    names = dict(db.execute(
+        select(CompetitorDB.entity_id, CompetitorDB.name).where(CompetitorDB.entity_id.in_(set(ids.values())))
+    ).all())
+    return {s: Competitor(ids[k], names[ids[k]]) for s, k in by_surface.items()}
+
+
+def entity_aliases(db, key: str) -> Optional[tuple]:
+    """(Competitor, [clés alias]) du concurrent auquel appartient la clé, ou None."""
+    row = db.execute(
+        select(CompetitorDB.entity_id, CompetitorDB.name)
+        .join(CompetitorAliasDB, CompetitorAliasDB.entity_id == CompetitorDB.entity_id)
+        .where(CompetitorAliasDB.name_key == key)
+    ).first()
+    if row is None:
+        return None
+    keys = db.execute(
+        select(CompetitorAliasDB.name_key).where(CompetitorAliasDB.entity_id == row.entity_id)
+        .order_by(CompetitorAliasDB.name_key)
+    ).scalars().all()
+    return Competitor(row.entity_id, row.name), keys
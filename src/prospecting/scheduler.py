@@ -2,12 +2,17 @@
 Module SCHEDULER — APScheduler imposé
 Europe/Rome — Mercredi, Vendredi, Dimanche : 09:00 / 13:00 / 20:30
 Lundi 09:00 : prépare READY_TO_SEND (si assets présents + éligible)
+Lundi 03:00 : archive les runs froids en Parquet (archive.py), purge les points
+de visibilité par créneau hors rétention (trends.py)
 
 Idempotent (replace_existing=True).
 Tout loggé.
+Un run planifié partage ses réponses IA entre campagnes pendant le créneau (current_slot).
 """
 import logging
+from datetime import datetime, timedelta
 from typing import Optional
+from zoneinfo import ZoneInfo
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
@@ -19,6 +24,21 @@ ROME_TZ = "Europe/Rome"
 
 SCHEDULE_DAYS  = ["wed", "fri", "sun"]   # day_of_week APScheduler format
 SCHEDULE_TIMES = [(9, 0), (13, 0), (20, 30)]
+_WEEKDAYS      = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+
+def current_slot(now: Optional[datetime] = None) -> str:
+    """Dernier créneau planifié commencé (heure de Rome), ex. "2026-10-21T09:00"."""
+    now = (now or datetime.now(ZoneInfo(ROME_TZ))).astimezone(ZoneInfo(ROME_TZ))
+    for back in range(8):
+        day = now - timedelta(days=back)
+        if _WEEKDAYS[day.weekday()] not in SCHEDULE_DAYS:
+            continue
+        for hour, minute in sorted(SCHEDULE_TIMES, reverse=True):
+            start = day.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if start <= now:
+                return start.strftime("%Y-%m-%dT%H:%M")
+    raise ValueError("SCHEDULE_DAYS vide")
 
 
 def _scheduled_test_run():
@@ -28,13 +48,14 @@ def _scheduled_test_run():
         from .database import SessionLocal, db_list_campaigns
         from .ia_test import run_ia_test_campaign
 
+        slot = current_slot()
         db = SessionLocal()
         try:
             campaigns = db_list_campaigns(db)
             for campaign in campaigns:
                 if campaign.status != "active":
                     continue
-                result = run_ia_test_campaign(db, campaign.campaign_id)
+                result = run_ia_test_campaign(db, campaign.campaign_id, slot=slot)
                 logger.info(f"[SCHEDULER] Campagne {campaign.campaign_id}: {result}")
         finally:
             db.close()
@@ -46,33 +67,39 @@ def _monday_prepare_ready():
     """Lundi : passage READY_TO_SEND pour les prospects READY_ASSETS éligibles."""
     logger.info("[SCHEDULER] Lundi — préparation READY_TO_SEND")
     try:
-        from .database import SessionLocal, db_list_campaigns, db_list_prospects
-        from .assets import mark_ready_to_send
-        from .models import ProspectStatus
+        from .database import SessionLocal
+        from .assets import promote_ready
+        from .transitions import active_campaign_ids
 
         db = SessionLocal()
         try:
-            campaigns = db_list_campaigns(db)
-            promoted = 0
-            for campaign in campaigns:
-                if campaign.status != "active":
-                    continue
-                prospects = db_list_prospects(db, campaign.campaign_id, status=ProspectStatus.READY_ASSETS.value)
-                for prospect in prospects:
-                    if prospect.eligibility_flag and prospect.video_url and prospect.screenshot_url:
-                        try:
-                            mark_ready_to_send(db, prospect.prospect_id)
-                            promoted += 1
-                            logger.info(f"[SCHEDULER] Prospect {prospect.prospect_id} → READY_TO_SEND")
-                        except Exception as e:
-                            logger.warning(f"[SCHEDULER] Prospect {prospect.prospect_id} non promu: {e}")
-            logger.info(f"[SCHEDULER] Lundi: {promoted} prospect(s) promus READY_TO_SEND")
+            promoted = promote_ready(db, campaign_id=active_campaign_ids(), reason="scheduler lundi")
+            logger.info(f"[SCHEDULER] Lundi: {len(promoted)} prospect(s) promus READY_TO_SEND")
         finally:
             db.close()
     except Exception as exc:
         logger.error(f"[SCHEDULER] Erreur lundi: {exc}", exc_info=True)
 
 
+def _archive_cold_runs():
+    """Lundi nuit : runs hors rétention ou de campagnes fermées → Parquet."""
+    logger.info("[SCHEDULER] Archivage des runs froids")
+    try:
+        from .database import SessionLocal
+        from .archive import archive_runs
+        from .trends import prune_slots
+
+        db = SessionLocal()
+        try:
+            result = archive_runs(db)
+            logger.info(f"[SCHEDULER] Archivage: {result}")
+            logger.info(f"[SCHEDULER] Points de créneau purgés: {prune_slots(db)}")
+        finally:
+            db.close()
+    except Exception as exc:
+        logger.error(f"[SCHEDULER] Erreur archivage: {exc}", exc_info=True)
+
+
 def get_scheduler() -> BackgroundScheduler:
     global _scheduler
     if _scheduler is None:
@@ -112,6 +139,17 @@ def start_scheduler():
     )
     logger.info("[SCHEDULER] Job lundi 09:00 ajouté")
 
+    # Job lundi 03:00 — archivage Parquet des runs froids
+    sched.add_job(
+        _archive_cold_runs,
+        CronTrigger(day_of_week="mon", hour=3, minute=0, timezone=ROME_TZ),
+        id="archive_cold_runs",
+        replace_existing=True,
+        misfire_grace_time=3600,
+        coalesce=True,
+    )
+    logger.info("[SCHEDULER] Job lundi 03:00 (archivage) ajouté")
+
     sched.start()
     logger.info(f"[SCHEDULER] Démarré — {len(sched.get_jobs())} jobs configurés")
 
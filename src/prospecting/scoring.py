@@ -25,6 +25,8 @@ from sqlalchemy.orm import Session
 
 from .database import db_list_prospects, db_list_runs, db_save_prospect, jloads
 from .models import ProspectDB, ProspectStatus
+from .resolution import Competitor, resolve_names
+from .transitions import bulk_transition
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +37,24 @@ QUERIES_REQUIRED    = 4   # sur au moins 4/5 requêtes
 
 # ─────────────────────────── RÈGLE EMAIL_OK ───────────────────────────
 
-def compute_email_ok(runs) -> Tuple[bool, str]:
+def competitor_runs(runs, entities: Optional[Dict[str, Competitor]] = None) -> Counter:
+    """
+    Nombre de runs citant chaque concurrent.
+    entities (resolution.resolve_names) : compté par concurrent canonique, une fois
+    par run quelle que soit la graphie ; sinon par graphie en minuscules.
+    """
+    counter: Counter = Counter()
+    for r in runs:
+        names = [c for c in jloads(r.competitors_entities) if isinstance(c, str)]
+        if entities is None:
+            counter.update(c.lower() for c in names)
+            continue
+        cited = {entities[c] for c in names if c in entities}
+        counter.update(entity.name for entity in cited)
+    return counter
+
+
+def compute_email_ok(runs, entities: Optional[Dict[str, Competitor]] = None) -> Tuple[bool, str]:
     """
     Évalue la règle EMAIL_OK sur la liste des TestRunDB d'un prospect.
     Retourne (eligible: bool, explication: str).
@@ -69,11 +88,7 @@ def compute_email_ok(runs) -> Tuple[bool, str]:
             invisible_queries.append(qi)
 
     # — Condition 3 : concurrents stables
-    competitor_counter: Counter = Counter()
-    for r in runs:
-        for c in jloads(r.competitors_entities):
-            if isinstance(c, str):
-                competitor_counter[c.lower()] += 1
+    competitor_counter = competitor_runs(runs, entities)
 
     stable_competitors = [name for name, count in competitor_counter.items() if count >= MIN_COMPETITOR_RUNS]
 
@@ -97,6 +112,7 @@ def compute_score(
     prospect: ProspectDB,
     runs,
     email_ok: bool,
+    entities: Optional[Dict[str, Competitor]] = None,
 ) -> Tuple[float, str, List[str]]:
     """
     Calcule le score /10 et retourne (score, justification, stable_competitors).
@@ -110,11 +126,7 @@ def compute_score(
         parts.append("+4 Invisibilité IA robuste confirmée")
 
     # Concurrents stables
-    competitor_counter: Counter = Counter()
-    for r in runs:
-        for c in jloads(r.competitors_entities):
-            if isinstance(c, str):
-                competitor_counter[c.lower()] += 1
+    competitor_counter = competitor_runs(runs, entities)
     stable = [name for name, cnt in competitor_counter.most_common(5) if cnt >= MIN_COMPETITOR_RUNS]
 
     if stable:
@@ -161,26 +173,35 @@ def run_scoring(
         prospects = db_list_prospects(db, campaign_id, status=ProspectStatus.TESTED.value)
 
     results = {"total": len(prospects), "scored": 0, "eligible": 0}
+    scored_ids: List[str] = []
+
+    runs_by_prospect = {p.prospect_id: db_list_runs(db, p.prospect_id) for p in prospects}
+    entities = resolve_names(db, (
+        c for runs in runs_by_prospect.values() for r in runs
+        for c in jloads(r.competitors_entities) if isinstance(c, str)
+    ))
 
     for prospect in prospects:
-        runs = db_list_runs(db, prospect.prospect_id)
+        runs = runs_by_prospect[prospect.prospect_id]
         if not runs:
             logger.warning(f"Prospect {prospect.prospect_id} — aucun run, scoring ignoré")
             continue
 
-        email_ok, email_justif = compute_email_ok(runs)
-        score, score_justif, stable_competitors = compute_score(prospect, runs, email_ok)
+        email_ok, email_justif = compute_email_ok(runs, entities)
+        score, score_justif, stable_competitors = compute_score(prospect, runs, email_ok, entities)
 
         # Mettre à jour le prospect
         prospect.eligibility_flag       = email_ok
         prospect.ia_visibility_score    = score
         prospect.score_justification    = f"{email_justif}\n\n{score_justif}"
         prospect.competitors_cited      = json.dumps(stable_competitors[:5], ensure_ascii=False)
-        prospect.status                 = ProspectStatus.SCORED.value
-        db.commit()
+        scored_ids.append(prospect.prospect_id)
 
         results["scored"] += 1
         if email_ok:
             results["eligible"] += 1
 
+    # Scores + passage SCORED dans une seule transaction
+    bulk_transition(db, ProspectStatus.TESTED, ProspectStatus.SCORED, prospect_ids=scored_ids, reason="scoring", commit=False)
+    db.commit()
     return results
@@ -0,0 +1,147 @@
+"""
+Module SEARCH — recherche plein texte dans les réponses IA (SQLite FTS5)
+
+- index : answers_fts, FTS5 sans contenu (rowid = answers.rowid), texte plié par
+  fold (minuscules, sans accents ni ponctuation), à l'indexation comme à la
+  requête ; les formes juridiques (SAS, SARL…) restent cherchables
+- alimenté à l'insertion d'une réponse (answers.store_answers), jamais réindexé :
+  une réponse est immuable (clé = sha256)
+- filtres campagne / modèle / dates via answer_refs (1 ligne par run × requête)
+- extraits surlignés calculés en Python sur les seules réponses retournées
+  (les corps restent compressés dans answers, l'index ne stocke pas le texte)
+"""
+import html
+import re
+import unicodedata
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import sqlalchemy as sa
+from sqlalchemy import distinct, func, select
+from sqlalchemy.orm import Session
+
+from .answers import load_answers
+from .models import ANSWERS_FTS, AnswerDB, AnswerRefDB
+
+SNIPPET_WORDS = 12      # mots de contexte autour de l'occurrence
+SEARCH_LIMIT  = 100
+
+_fts          = sa.table(ANSWERS_FTS, sa.column("rowid"), sa.column("body"), sa.column("rank"))
+_answer_rowid = sa.literal_column("answers.rowid")
+_WORD         = re.compile(r"\w+")
+_NON_ALNUM    = re.compile(r"[^a-z0-9\s]")
+
+
+def fold(text: str) -> str:
+    """
+    Texte tel qu'indexé : minuscules, sans accents, ponctuation → espaces (le
+    tokenizer unicode61 découpe ensuite sur les espaces). Contrairement à
+    normalize_name, les formes juridiques sont conservées.
+    Copie figée dans les migrations b8c2e6f0a451 / f8c4d0e2a583 : les garder alignées.
+    """
+    text = unicodedata.normalize("NFD", (text or "").lower())
+    text = "".join(c for c in text if unicodedata.category(c) != "Mn")
+    return " ".join(_NON_ALNUM.sub(" ", text).split())
+
+
+def index_answer(db: Session, rowid: int, body: str) -> None:
+    """Ajoute une réponse à l'index (à appeler une seule fois, à l'insertion dans answers)."""
+    db.execute(sa.insert(_fts).values(rowid=rowid, body=fold(body)))
+
+
+def match_expression(q: str) -> Optional[str]:
+    """Requête utilisateur → phrase FTS5 ("mot1 mot2") ; None si rien d'indexable."""
+    tokens = fold(q).split()
+    return '"' + " ".join(tokens) + '"' if tokens else None
+
+
+# ─────────────────────────── RECHERCHE ───────────────────────────
+
+def search_answers(
+    db: Session,
+    q: str,
+    campaign_id: Optional[str] = None,
+    model: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> List[Dict]:
+    """
+    Réponses contenant la phrase q, les plus pertinentes d'abord (bm25), agrégées
+    sur les runs qui les ont reçues (après filtres).
+    """
+    expr = match_expression(q)
+    if expr is None:
+        return []
+
+    stmt = (
+        select(
+            AnswerDB.hash,
+            func.count().label("runs"),
+            func.count(distinct(AnswerRefDB.campaign_id)).label("campaigns"),
+            func.group_concat(distinct(AnswerRefDB.model)).label("models"),
+            func.max(AnswerRefDB.ts).label("last_seen"),
+            AnswerRefDB.query,          # colonne nue SQLite : celle de la ligne du max(ts)
+        )
+        .select_from(_fts)
+        .join(AnswerDB, _answer_rowid == _fts.c.rowid)
+        .join(AnswerRefDB, AnswerRefDB.answer_hash == AnswerDB.hash)
+        .where(sa.literal_column(ANSWERS_FTS).op("MATCH")(expr))
+        .group_by(AnswerDB.hash)
+        .order_by(_fts.c.rank, sa.desc("last_seen"))
+        .limit(min(limit, SEARCH_LIMIT))
+        .offset(offset)
+    )
+    if campaign_id:
+        stmt = stmt.where(AnswerRefDB.campaign_id == campaign_id)
+    if model:
+        stmt = stmt.where(AnswerRefDB.model == model)
+    if since:
+        stmt = stmt.where(AnswerRefDB.ts >= since)
+    if until:
+        stmt = stmt.where(AnswerRefDB.ts < until)
+
+    rows = db.execute(stmt).all()
+    bodies = {a.hash: a.body for a in load_answers(db, [r.hash for r in rows])}
+    tokens = fold(q).split()
+    return [
+        {
+            "answer_hash": r.hash,
+            "snippet":     snippet(bodies.get(r.hash, ""), tokens),
+            "runs":        r.runs,
+            "campaigns":   r.campaigns,
+            "models":      sorted((r.models or "").split(",")),
+            "last_seen":   r.last_seen.isoformat() if r.last_seen else None,
+            "query":       r.query,
+        }
+        for r in rows
+    ]
+
+
+def snippet(body: str, tokens: List[str], words: int = SNIPPET_WORDS) -> str:
+    """
+    Extrait HTML (échappé) autour de la première occurrence de la phrase tokens,
+    surlignée par <mark>. Même pliage que l'index : accents et casse ignorés.
+    """
+    spans = [(t, m.start(), m.end()) for m in _WORD.finditer(body) for t in fold(m.group()).split()]
+    if not spans:
+        return html.escape(body[:200])
+
+    folded = [t for t, _, _ in spans]
+    n = len(tokens)
+    at = next((i for i in range(len(spans) - n + 1) if n and folded[i:i + n] == tokens), None)
+    if at is None:
+        at, n = 0, 0
+
+    lo = max(at - words // 2, 0)
+    hi = min(lo + n + words, len(spans))
+    start, end = spans[lo][1], spans[hi - 1][2]
+    parts = ["…" if lo > 0 else ""]
+    if n:
+        m0, m1 = spans[at][1], spans[at + n - 1][2]
+        parts += [html.escape(body[start:m0]), "<mark>", html.escape(body[m0:m1]), "</mark>", html.escape(body[m1:end])]
+    else:
+        parts.append(html.escape(body[start:end]))
+    parts.append("…" if hi < len(spans) else "")
+    return "".join(parts)
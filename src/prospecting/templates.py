@@ -0,0 +1,89 @@
+"""
+Templates — environnement Jinja2 précompilé (audit, landing, emails, admin)
+
+- autoescape HTML (.html), texte brut pour les emails (.txt)
+- bytecode compilé mis en cache disque (TEMPLATE_CACHE_DIR)
+- variantes par langue : src/templates/prospecting/{lang}/{name}, sinon {name} (fr)
+- chargés une fois (warm_templates au démarrage), jamais rechargés (auto_reload=False)
+"""
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, select_autoescape
+
+from ..core.config.translations import (
+    DEFAULT_LANGUAGE, SUPPORTED_LANGUAGES, get_gap_description, get_recommendation_title,
+)
+from .database import DATA_DIR, jloads
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "templates" / "prospecting"
+BYTECODE_DIR  = Path(os.getenv("TEMPLATE_CACHE_DIR", str(DATA_DIR / "template_cache")))
+BYTECODE_DIR.mkdir(parents=True, exist_ok=True)
+
+ENV = Environment(
+    loader=FileSystemLoader(str(TEMPLATES_DIR)),
+    autoescape=select_autoescape(["html"]),
+    bytecode_cache=FileSystemBytecodeCache(str(BYTECODE_DIR)),
+    auto_reload=False,
+    trim_blocks=True,
+    lstrip_blocks=True,
+    keep_trailing_newline=True,
+)
+ENV.globals.update(
+    jloads=jloads,
+    gap_description=get_gap_description,
+    recommendation_title=get_recommendation_title,
+)
+
+# (nom, langue) → template résolu (évite select_template à chaque rendu)
+_resolved: Dict[Tuple[str, str], Template] = {}
+_digests:  Dict[Tuple[str, Tuple[str, ...]], str] = {}
+
+
+def template_lang(lang: Optional[str]) -> str:
+    """Langue de template : une des langues de translations.py, sinon fr."""
+    lang = (lang or "").lower()
+    return lang if lang in SUPPORTED_LANGUAGES else DEFAULT_LANGUAGE
+
+
+def get_template(name: str, lang: str = DEFAULT_LANGUAGE) -> Template:
+    lang = template_lang(lang)
+    key  = (name, lang)
+    tpl  = _resolved.get(key)
+    if tpl is None:
+        tpl = ENV.select_template([f"{lang}/{name}", name])
+        _resolved[key] = tpl
+    return tpl
+
+
+def render(name: str, lang: str = DEFAULT_LANGUAGE, **context) -> str:
+    return get_template(name, lang).render(context)
+
+
+def template_digest(lang: str, *names: str) -> str:
+    """Hash des sources des templates résolus (un changement de template invalide les rendus stockés)."""
+    lang = template_lang(lang)
+    key  = (lang, names)
+    digest = _digests.get(key)
+    if digest is None:
+        h = hashlib.sha256()
+        for name in names:
+            tpl = get_template(name, lang)
+            h.update(ENV.loader.get_source(ENV, tpl.name)[0].encode("utf-8"))
+        digest = _digests[key] = h.hexdigest()
+    return digest
+
+
+def warm_templates() -> int:
+    """Compile tous les templates et résout chaque variante de langue. Retourne le nombre de variantes."""
+    names = ENV.list_templates()
+    for name in names:
+        ENV.get_template(name)
+
+    base_names = [n for n in names if n.split("/", 1)[0] not in SUPPORTED_LANGUAGES]
+    for name in base_names:
+        for lang in SUPPORTED_LANGUAGES:
+            get_template(name, lang)
+    return len(_resolved)
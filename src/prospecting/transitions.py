@@ -0,0 +1,108 @@
+"""
+Module TRANSITIONS — changements de statut ensemblistes
+
+- un seul UPDATE : WHERE status = :from AND <gates du statut cible> [AND campagne / ids]
+- transition validée contre VALID_TRANSITIONS (can_transition)
+- IDs modifiés renvoyés (RETURNING) + événements prospect_events, même transaction
+- une ligne qui ne remplit plus les conditions au moment de l'UPDATE est simplement ignorée
+"""
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, select, update
+from sqlalchemy.orm import Session
+
+from . import events
+from .models import CampaignDB, ProspectDB, ProspectStatus, can_transition
+
+logger = logging.getLogger(__name__)
+
+
+def _present(column):
+    return and_(column.is_not(None), column != "")
+
+
+# Conditions supplémentaires pour entrer dans un statut (en plus du statut source)
+GATES: Dict[ProspectStatus, list] = {
+    ProspectStatus.READY_ASSETS:  [_present(ProspectDB.video_url), _present(ProspectDB.screenshot_url)],
+    ProspectStatus.READY_TO_SEND: [
+        _present(ProspectDB.video_url),
+        _present(ProspectDB.screenshot_url),
+        ProspectDB.eligibility_flag.is_(True),
+    ],
+}
+
+
+def active_campaign_ids():
+    """Sous-requête : campagnes actives (pour les jobs planifiés)."""
+    return select(CampaignDB.campaign_id).where(CampaignDB.status == "active").scalar_subquery()
+
+
+def bulk_transition(
+    db: Session,
+    from_status: ProspectStatus,
+    to_status: ProspectStatus,
+    *,
+    campaign_id=None,
+    prospect_ids: Optional[Iterable[str]] = None,
+    reason: Optional[str] = None,
+    commit: bool = True,
+) -> List[str]:
+    """
+    Passe from_status → to_status tous les prospects qui remplissent les gates.
+    campaign_id : id ou sous-requête (active_campaign_ids()). Retourne les IDs modifiés.
+    """
+    from_status, to_status = ProspectStatus(from_status), ProspectStatus(to_status)
+    if not can_transition(from_status.value, to_status.value):
+        raise ValueError(f"Transition interdite {from_status.value} → {to_status.value}")
+
+    conditions = [ProspectDB.status == from_status.value, *GATES.get(to_status, [])]
+    if campaign_id is not None:
+        conditions.append(
+            ProspectDB.campaign_id.in_(campaign_id) if not isinstance(campaign_id, str)
+            else ProspectDB.campaign_id == campaign_id
+        )
+    if prospect_ids is not None:
+        prospect_ids = list(prospect_ids)
+        if not prospect_ids:
+            return []
+        conditions.append(ProspectDB.prospect_id.in_(prospect_ids))
+
+    db.flush()   # autoflush=False : les champs modifiés en session doivent être visibles des gates
+    stmt = (
+        update(ProspectDB)
+        .where(*conditions)
+        .values(status=to_status.value, updated_at=datetime.utcnow())
+        .returning(ProspectDB.prospect_id, ProspectDB.campaign_id)
+        .execution_options(synchronize_session="fetch")
+    )
+    rows    = db.execute(stmt).all()
+    changed = [r.prospect_id for r in rows]
+
+    events.record(db, (
+        {"kind": events.TRANSITION, "prospect_id": r.prospect_id, "campaign_id": r.campaign_id,
+         "from_status": from_status.value, "to_status": to_status.value, "reason": reason}
+        for r in rows
+    ))
+    if commit:
+        db.commit()
+
+    logger.info(f"Transition {from_status.value} → {to_status.value} : {len(changed)} prospect(s) ({reason or '-'})")
+    return changed
+
+
+def transition(
+    db: Session,
+    prospect: ProspectDB,
+    to_status: ProspectStatus,
+    reason: Optional[str] = None,
+    commit: bool = True,
+) -> bool:
+    """Transition d'un prospect depuis son statut courant. False si refusée par le statut ou les gates."""
+    if not can_transition(prospect.status, ProspectStatus(to_status).value):
+        return False
+    return bool(bulk_transition(
+        db, ProspectStatus(prospect.status), to_status,
+        prospect_ids=[prospect.prospect_id], reason=reason, commit=commit,
+    ))
@@ -0,0 +1,242 @@
+"""
+Module TRENDS — série temporelle de visibilité des prospects et de leurs concurrents
+
+visibility_points : hits / samples par modèle et par requête, cumulés à
+l'écriture des runs (listener after_flush, enregistré par database.py ;
+insertions Core en masse : appeler index_runs() explicitement), à trois
+résolutions :
+- slot : créneau planifié (scheduler.current_slot de l'horodatage du run),
+  conservé TREND_SLOT_DAYS jours (prune_slots, job du lundi)
+- day  : jour du créneau (heure de Rome)
+- week : lundi de la semaine du créneau
+Concurrents : une série par concurrent canonique (resolution.py), taux de
+citation rapporté aux runs du prospect.
+
+prospect_trend() lit une plage de clé primaire : O(points), sans relire les runs.
+Usage : GET /api/prospect/{id}/trend (suivi mensuel de l'offre).
+"""
+import json
+import os
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from .models import CompetitorDB, TestRunDB, VisibilityPointDB
+from .resolution import resolve_keys
+from .scheduler import current_slot
+
+RESOLUTIONS       = ("slot", "day", "week")
+TREND_SLOT_DAYS   = int(os.getenv("TREND_SLOT_DAYS", "90"))
+TREND_COMPETITORS = 5       # concurrents détaillés dans prospect_trend
+
+PROSPECT  = ""              # series du prospect lui-même
+RUN_LEVEL = -1              # query_index des points niveau run
+
+
+def _upsert():
+    table = VisibilityPointDB.__table__
+    stmt  = insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=["prospect_id", "resolution", "series", "period", "model", "query_index"],
+        set_={"samples": table.c.samples + stmt.excluded.samples, "hits": table.c.hits + stmt.excluded.hits},
+    )
+
+
+@lru_cache(maxsize=4096)
+def _periods(minute: datetime) -> Dict[str, str]:
+    slot = current_slot(minute.replace(tzinfo=timezone.utc))
+    day  = date.fromisoformat(slot[:10])
+    return {"slot": slot, "day": slot[:10], "week": (day - timedelta(days=day.weekday())).isoformat()}
+
+
+def periods(ts: datetime) -> Dict[str, str]:
+    """Horodatage UTC (naïf) d'un run → période de chaque résolution."""
+    return _periods(ts.replace(second=0, microsecond=0))
+
+
+# ─────────────────────────── ÉCRITURE ───────────────────────────
+
+class _Points(dict):
+    """(prospect, résolution, série, période, modèle, requête) → ligne à cumuler."""
+
+    def add(self, prospect_id: str, per: Dict[str, str], model: str, series: str, query_index: int,
+            samples: int, hits: int) -> None:
+        for resolution, period in per.items():
+            key   = (prospect_id, resolution, series, period, model, query_index)
+            point = self.get(key)
+            if point is None:
+                self[key] = {
+                    "prospect_id": prospect_id, "resolution": resolution, "period": period, "model": model,
+                    "series": series, "query_index": query_index, "samples": samples, "hits": hits,
+                }
+            else:
+                point["samples"] += samples
+                point["hits"]    += hits
+
+
+def index_runs(conn, runs: Iterable) -> int:
+    """
+    Cumule des runs (objets ou lignes : prospect_id, model, ts, mentioned_target,
+    mention_per_query, competitors_entities) dans visibility_points, sur la
+    connexion / session donnée. Retourne le nombre de points touchés.
+    """
+    from .ia_test import normalize_name   # ia_test importe competitors → resolution
+
+    points = _Points()
+    cited  = []
+    names: Dict[str, str] = {}
+    for run in runs:
+        per = periods(run.ts or datetime.utcnow())
+        points.add(run.prospect_id, per, run.model, PROSPECT, RUN_LEVEL, 1, int(bool(run.mentioned_target)))
+        for qi, mentioned in enumerate(json.loads(run.mention_per_query or "[]")):
+            points.add(run.prospect_id, per, run.model, PROSPECT, qi, 1, int(bool(mentioned)))
+        keys = set()
+        for name in json.loads(run.competitors_entities or "[]"):
+            key = normalize_name(name)
+            if key:
+                names.setdefault(key, name)
+                keys.add(key)
+        cited.append((run, per, keys))
+
+    ids = resolve_keys(conn, names)
+    for run, per, keys in cited:
+        for entity_id in {ids[k] for k in keys}:          # 1 citation par run, quelle que soit la graphie
+            points.add(run.prospect_id, per, run.model, entity_id, RUN_LEVEL, 0, 1)
+    if points:
+        conn.execute(_upsert(), list(points.values()))
+    return len(points)
+
+
+def index_stats(conn, stats: Iterable) -> int:
+    """
+    Agrégats run_stats (runs archivés avant la série) → points day / week du prospect.
+    Pas de créneau ni de concurrents : run_stats ne les conserve pas.
+    """
+    points = _Points()
+    for s in stats:
+        day = s.day if isinstance(s.day, date) else date.fromisoformat(str(s.day)[:10])
+        per = {"day": day.isoformat(), "week": (day - timedelta(days=day.weekday())).isoformat()}
+        points.add(s.prospect_id, per, s.model, PROSPECT, RUN_LEVEL, s.runs, s.mentions)
+        for qi, hits in enumerate(json.loads(s.query_mentions or "[]")):
+            points.add(s.prospect_id, per, s.model, PROSPECT, qi, s.runs, hits)
+    if points:
+        conn.execute(_upsert(), list(points.values()))
+    return len(points)
+
+
+def _index_flushed(session: Session, flush_context) -> None:
+    runs = [obj for obj in session.new if isinstance(obj, TestRunDB)]
+    if runs:
+        index_runs(session.connection(), runs)
+
+
+def register(session_factory: sessionmaker) -> None:
+    event.listen(session_factory, "after_flush", _index_flushed)
+
+
+def prune_slots(db: Session, older_than_days: int = TREND_SLOT_DAYS, now: Optional[datetime] = None) -> int:
+    """Supprime les points par créneau plus vieux que older_than_days (les cumuls day / week restent)."""
+    cutoff = ((now or datetime.utcnow()) - timedelta(days=older_than_days)).strftime("%Y-%m-%dT%H:%M")
+    result = db.execute(
+        delete(VisibilityPointDB).where(VisibilityPointDB.resolution == "slot", VisibilityPointDB.period < cutoff)
+    )
+    db.commit()
+    return result.rowcount
+
+
+# ─────────────────────────── LECTURE ───────────────────────────
+
+def _ratio(hits: int, samples: int) -> Optional[float]:
+    return round(hits / samples, 3) if samples else None
+
+
+def prospect_trend(
+    db: Session,
+    prospect_id: str,
+    resolution: str = "week",
+    since: Optional[date] = None,
+    competitors: int = TREND_COMPETITORS,
+) -> Dict:
+    """
+    Visibilité du prospect par période (ratio global, par modèle, par requête) et
+    taux de citation des concurrents les plus cités sur la même plage.
+    Série du prospect puis séries des concurrents retenus : plages de clé primaire ;
+    le classement des concurrents est agrégé en SQL.
+    """
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Résolution inconnue : {resolution}")
+    VP    = VisibilityPointDB
+    conn  = db.connection()                           # lignes Core, sans la couche de chargement ORM
+    where = [VP.prospect_id == prospect_id, VP.resolution == resolution]
+    if since:
+        if resolution == "week":
+            since -= timedelta(days=since.weekday())    # semaine entamée incluse
+        where.append(VP.period >= since.isoformat())
+
+    runs: Dict[str, Dict[str, int]] = defaultdict(dict)                 # période → modèle → runs
+    own:  Dict[str, Dict]           = {}
+    for period, model, query_index, samples, hits in conn.execute(
+        select(VP.period, VP.model, VP.query_index, VP.samples, VP.hits).where(*where, VP.series == PROSPECT)
+    ):
+        point = own.setdefault(period, {"samples": 0, "hits": 0, "models": {}, "queries": defaultdict(lambda: [0, 0])})
+        if query_index == RUN_LEVEL:
+            runs[period][model] = samples
+            point["samples"] += samples
+            point["hits"]    += hits
+            point["models"][model] = _ratio(hits, samples)
+        else:
+            counts = point["queries"][query_index]
+            counts[0] += samples
+            counts[1] += hits
+
+    total = func.sum(VP.hits)
+    top   = conn.execute(
+        select(VP.series, CompetitorDB.name, total)
+        .outerjoin(CompetitorDB, CompetitorDB.entity_id == VP.series)
+        .where(*where, VP.series != PROSPECT)
+        .group_by(VP.series)
+        .order_by(total.desc(), VP.series)
+        .limit(competitors)
+    ).all() if competitors else []
+    cited: Dict[str, Dict[str, Dict[str, int]]] = defaultdict(lambda: defaultdict(dict))
+    if top:
+        for series, period, model, hits in conn.execute(
+            select(VP.series, VP.period, VP.model, VP.hits).where(*where, VP.series.in_([t[0] for t in top]))
+        ):
+            cited[series][period][model] = hits
+
+    return {
+        "prospect_id": prospect_id,
+        "resolution":  resolution,
+        "points": [
+            {
+                "period":    period,
+                "runs":      p["samples"],
+                "mentioned": _ratio(p["hits"], p["samples"]),
+                "models":    p["models"],
+                "queries":   [_ratio(h, s) for _, (s, h) in sorted(p["queries"].items())],
+            }
+            for period, p in sorted(own.items())
+        ],
+        "competitors": [
+            {
+                "entity_id": entity_id,
+                "name":      name,
+                "runs":      runs_cited,
+                "points": [
+                    {
+                        "period": period,
+                        "cited":  _ratio(sum(by_model.values()), sum(runs[period].values())),
+                        "models": {m: _ratio(h, runs[period].get(m, 0)) for m, h in by_model.items()},
+                    }
+                    for period, by_model in sorted(cited[entity_id].items())
+                ],
+            }
+            for entity_id, name, runs_cited in top
+        ],
+    }
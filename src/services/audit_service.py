@@ -1,20 +1,66 @@
 """Audit service - Business logic for audits."""
 import asyncio
-from typing import Optional
+import hashlib
+import json
+import unicodedata
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
 from uuid import UUID
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database.models import Audit as AuditModel, User as UserModel, Query as QueryModel
+from ..database.models import (
+    Audit as AuditModel,
+    User as UserModel,
+    Query as QueryModel,
+    Recommendation as RecommendationModel,
+)
 from ..core.domain.audit_session import AuditSession
 from ..core.interface.ai_provider import AIProvider
 from ..core.config.sector_template import SectorTemplate
 from ..orchestrator.audit_orchestrator import AuditOrchestrator
+from ..utils.config import settings
+from ..utils.metrics import AUDIT_REUSE_TOTAL
+from .results_cache import results_cache
+from ..utils.singleflight import SingleFlight
+
+
+def _canonical(value: Optional[str]) -> str:
+    """Normalize a request field: unicode form, case and whitespace."""
+    value = unicodedata.normalize("NFKC", value or "")
+    return " ".join(value.casefold().split())
 
 
 class AuditService:
     """Service for managing audits."""
 
+    # Identical requests running at the same time share one orchestrator pass
+    _inflight = SingleFlight()
+
+    @staticmethod
+    def request_key(
+        company_name: str,
+        sector: str,
+        location: str = "",
+        language: str = "fr",
+        plan: str = "freemium",
+    ) -> str:
+        """
+        Canonical hash of the inputs that determine an audit's results.
+
+        Case, unicode form and whitespace differences map to the same key.
+        """
+        canonical = {
+            "company_name": _canonical(company_name),
+            "sector": _canonical(sector),
+            "location": _canonical(location),
+            "language": _canonical(language),
+            "plan": _canonical(plan),
+        }
+        payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
     @staticmethod
     async def create_audit(
         db: AsyncSession,
@@ -46,6 +92,7 @@ class AuditService:
             language=language,
             plan=plan,
             status="pending",
+            request_hash=AuditService.request_key(company_name, sector, location, language, plan),
         )
 
         db.add(audit)
@@ -68,7 +115,11 @@ class AuditService:
         Execute audit asynchronously.
 
         This should be called in background task (Celery/Redis queue in production).
-        For MVP, runs synchronously.
+
+        Identical requests are deduplicated:
+        - a completed audit younger than settings.audit_reuse_ttl is cloned
+          without any provider calls
+        - concurrent identical audits attach to the one in-flight execution
         """
         # Get audit from DB
         audit_model = await AuditService.get_audit(db, audit_id)
@@ -78,6 +129,21 @@ class AuditService:
         if audit_model.status != "pending":
             raise ValueError(f"Audit {audit_id} is not pending (status: {audit_model.status})")
 
+        key = audit_model.request_hash or AuditService.request_key(
+            audit_model.company_name,
+            audit_model.sector,
+            audit_model.location or "",
+            audit_model.language,
+            audit_model.plan,
+        )
+
+        # Reuse a recent completed audit (unless one is being recomputed right now)
+        if not AuditService._inflight.in_flight(key):
+            source = await AuditService._find_recent_completed(db, key, exclude_id=audit_model.id)
+            if source:
+                AUDIT_REUSE_TOTAL.labels(outcome="recent").inc()
+                return await AuditService._clone_audit(db, source, audit_model)
+
         # Create AuditSession object
         audit_session = AuditSession(
             ident=str(audit_model.id),
@@ -89,6 +155,16 @@ class AuditService:
             status="pending",
         )
 
+        completed_session, shared = await AuditService._inflight.do(
+            key, lambda: AuditService._execute(audit_session)
+        )
+        AUDIT_REUSE_TOTAL.labels(outcome="inflight" if shared else "executed").inc()
+
+        return await AuditService._persist_results(db, audit_model, completed_session)
+
+    @staticmethod
+    async def _execute(audit_session: AuditSession) -> AuditSession:
+        """Run the orchestrator for a pending session (off the event loop)."""
         # Setup orchestrator
         provider = AIProvider(
             name="chatgpt",
@@ -99,7 +175,7 @@ class AuditService:
         )
 
         # Get sector template
-        if audit_model.sector == "restaurant":
+        if audit_session.sector == "restaurant":
             template = SectorTemplate.get_restaurant_template()
         else:
             # Fallback to restaurant template for MVP
@@ -109,18 +185,55 @@ class AuditService:
             provider=provider,
             sector_template=template,
             strict_validation=False,
-            language=audit_model.language
+            language=audit_session.language
         )
 
-        # Execute orchestrator
-        completed_session = orchestrator.execute(audit_session)
+        # The orchestrator is blocking: run it in a thread so concurrent
+        # identical requests can attach to this execution meanwhile
+        return await asyncio.to_thread(orchestrator.execute, audit_session)
 
-        # Update database with results
-        audit_model.status = completed_session.status
-        audit_model.visibility_score = completed_session.visibility_score
+    @staticmethod
+    async def _find_recent_completed(
+        db: AsyncSession, request_hash: str, exclude_id: Optional[UUID] = None
+    ) -> Optional[AuditModel]:
+        """Most recent completed audit for request_hash within the reuse TTL."""
+        if settings.audit_reuse_ttl <= 0:
+            return None
 
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.audit_reuse_ttl)
+        stmt = (
+            select(AuditModel)
+            .where(
+                AuditModel.request_hash == request_hash,
+                AuditModel.status == "completed",
+                AuditModel.completed_at >= cutoff,
+            )
+            .order_by(AuditModel.completed_at.desc())
+            .limit(1)
+        )
+        if exclude_id is not None:
+            stmt = stmt.where(AuditModel.id != exclude_id)
+
+        result = await db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def _persist_results(
+        db: AsyncSession, audit_model: AuditModel, completed_session: AuditSession
+    ) -> AuditModel:
+        """
+        Write the audit update, its queries and its recommendations.
+
+        Everything goes in one transaction: queries and recommendations
+        are each written with a single multi-row INSERT.
+        """
         # Extract analysis data
         analysis = completed_session.metadata.get("analysis", {})
+        recommendations = completed_session.metadata.get("recommendations", [])
+
+        # Update database with results
+        audit_model.status = completed_session.status
+        audit_model.visibility_score = completed_session.visibility_score
 
         # Structure results for template
         audit_model.results = {
@@ -129,21 +242,116 @@ class AuditService:
             "avg_position": analysis.get("avg_position"),
             "competitors": analysis.get("competitors", []),
             "gaps": analysis.get("gaps", []),
-            "recommendations": completed_session.metadata.get("recommendations", []),
+            "recommendations": recommendations,
         }
 
         if completed_session.status == "completed":
-            from datetime import datetime
             audit_model.completed_at = datetime.utcnow()
 
+        await AuditService._bulk_insert(
+            db, QueryModel, AuditService._query_rows(audit_model.id, completed_session.results)
+        )
+        await AuditService._bulk_insert(
+            db, RecommendationModel, AuditService._recommendation_rows(audit_model.id, recommendations)
+        )
+
         await db.commit()
         await db.refresh(audit_model)
+        # Payloads cached by audit ID must not outlive the results they were built from
+        await results_cache.invalidate(audit_model.id)
+        return audit_model
 
-        # Save queries to database
-        if completed_session.results:
-            await AuditService._save_queries(db, audit_model.id, completed_session.results)
+    @staticmethod
+    async def _clone_audit(
+        db: AsyncSession, source: AuditModel, target: AuditModel
+    ) -> AuditModel:
+        """
+        Copy a completed audit's results, queries and recommendations into target.
 
-        return audit_model
+        The clone keeps the source's completed_at: the results are as old as
+        the execution that produced them, so reuse stops once that one ages
+        past the TTL instead of being renewed by every clone.
+        """
+        target.status = "completed"
+        target.visibility_score = source.visibility_score
+        target.results = source.results
+        target.completed_at = source.completed_at
+
+        now = datetime.utcnow()
+        result = await db.execute(
+            select(QueryModel).where(QueryModel.audit_id == source.id)
+        )
+        query_rows = [
+            {
+                "id": uuid.uuid4(),
+                "audit_id": target.id,
+                "query_text": q.query_text,
+                "ai_provider": q.ai_provider,
+                "ai_response": q.ai_response,
+                "company_mentioned": q.company_mentioned,
+                "position": q.position,
+                "competitors_found": q.competitors_found,
+                "created_at": now,
+            }
+            for q in result.scalars()
+        ]
+
+        await AuditService._bulk_insert(db, QueryModel, query_rows)
+        await AuditService._bulk_insert(
+            db,
+            RecommendationModel,
+            AuditService._recommendation_rows(target.id, (source.results or {}).get("recommendations", [])),
+        )
+
+        await db.commit()
+        await db.refresh(target)
+        await results_cache.invalidate(target.id)
+        return target
+
+    @staticmethod
+    async def _bulk_insert(db: AsyncSession, model, rows: List[Dict[str, Any]]) -> None:
+        """Insert rows with one multi-row INSERT ... VALUES statement."""
+        if rows:
+            await db.execute(insert(model).values(rows))
+
+    @staticmethod
+    def _query_rows(audit_id: UUID, results) -> List[Dict[str, Any]]:
+        """Query table rows for a list of AuditResult."""
+        now = datetime.utcnow()
+        return [
+            {
+                "id": uuid.uuid4(),
+                "audit_id": audit_id,
+                "query_text": result.query,
+                "ai_provider": result.ai_provider,
+                "ai_response": result.raw_response,
+                "company_mentioned": result.company_mentioned,
+                "position": result.position,
+                "competitors_found": result.competitors,
+                "created_at": now,
+            }
+            for result in results or []
+        ]
+
+    @staticmethod
+    def _recommendation_rows(audit_id: UUID, recommendations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Recommendation table rows for serialized OptimizationRecommendation dicts."""
+        now = datetime.utcnow()
+        return [
+            {
+                "id": uuid.uuid4(),
+                "audit_id": audit_id,
+                "type": rec["type"],
+                "priority": rec.get("priority", 5),
+                "title": rec["title"],
+                "description": rec.get("description", ""),
+                "content": rec.get("content", {}),
+                "integration_guide": rec.get("integration_guide", ""),
+                "estimated_impact": rec.get("estimated_impact", "medium"),
+                "created_at": now,
+            }
+            for rec in recommendations or []
+        ]
 
     @staticmethod
     async def _get_or_create_user(
@@ -162,20 +370,3 @@ class AuditService:
             await db.refresh(user)
 
         return user
-
-    @staticmethod
-    async def _save_queries(db: AsyncSession, audit_id: UUID, results):
-        """Save query results to database."""
-        for result in results:
-            query = QueryModel(
-                audit_id=audit_id,
-                query_text=result.query,
-                ai_provider=result.ai_provider,
-                ai_response=result.raw_response,
-                company_mentioned=result.company_mentioned,
-                position=result.position,
-                competitors_found=result.competitors,
-            )
-            db.add(query)
-
-        await db.commit()
@@ -0,0 +1,108 @@
+"""Pro mockups export: HTML members zipped on the fly, cached on disk per audit."""
+import json
+import logging
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+from ..core.domain.optimization_recommendation import OptimizationRecommendation
+from ..orchestrator.agents.generate_agent import GenerateAgent
+from ..utils.config import settings
+from ..utils.storage import ChunkSink, atomic_write_bytes, content_digest
+
+logger = logging.getLogger(__name__)
+
+# Bump when GenerateAgent.generate_mockups output changes: cached members are keyed by it
+MOCKUPS_VERSION = 2
+
+MANIFEST = "manifest.json"
+
+
+def stream_zip(members: Iterable[Tuple[str, bytes]], date_time=(1980, 1, 1, 0, 0, 0)) -> Iterator[bytes]:
+    """Zip (name, data) members, yielding archive bytes after each one."""
+    sink = ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members:
+            info = zipfile.ZipInfo(name, date_time=date_time)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(info, data)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    # Central directory
+    yield sink.drain()
+
+
+def mockups_context(audit) -> Dict[str, Any]:
+    """Everything the mockups are generated from."""
+    results = audit.results or {}
+    return {
+        "company_name": audit.company_name,
+        "language": audit.language or "fr",
+        "recommendations": results.get("recommendations", []),
+    }
+
+
+def mockups_digest(context: Dict[str, Any]) -> str:
+    return content_digest({"version": MOCKUPS_VERSION, "context": context})
+
+
+class MockupsExport:
+    """
+    Streams the mockups archive of an audit.
+
+    Members are generated one at a time by GenerateAgent and written to
+    cache_dir/<digest>/ as they are zipped; the manifest is written last,
+    so later downloads replay the members from disk.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+
+    def member_dir(self, digest: str) -> Path:
+        return self.cache_dir / digest
+
+    def stream(self, context: Dict[str, Any], digest: str, date_time=(1980, 1, 1, 0, 0, 0)) -> Iterator[bytes]:
+        """Archive bytes, generated lazily (iterate off the event loop)."""
+        return stream_zip(self._members(context, digest), date_time)
+
+    def _members(self, context: Dict[str, Any], digest: str) -> Iterator[Tuple[str, bytes]]:
+        directory = self.member_dir(digest)
+        manifest = directory / MANIFEST
+
+        if manifest.exists():
+            for name in json.loads(manifest.read_text()):
+                yield name, (directory / name).read_bytes()
+            return
+
+        names = []
+        for name, text in self._generate(context):
+            data = text.encode("utf-8")
+            atomic_write_bytes(directory / name, data)
+            names.append(name)
+            yield name, data
+
+        # Only reached when the whole archive was produced
+        atomic_write_bytes(manifest, json.dumps(names).encode("utf-8"))
+        logger.info(f"Mockups cached: {digest[:12]} ({len(names)} files)")
+
+    @staticmethod
+    def _generate(context: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+        recommendations = [
+            OptimizationRecommendation(
+                type=rec.get("type", "content"),
+                title=rec.get("title", ""),
+                description=rec.get("description", ""),
+                priority=rec.get("priority", 5),
+                content=rec.get("content", {}),
+                integration_guide=rec.get("integration_guide", ""),
+                estimated_impact=rec.get("estimated_impact", "medium"),
+            )
+            for rec in context["recommendations"]
+        ]
+        agent = GenerateAgent(language=context["language"])
+        return agent.generate_mockups(recommendations, context["company_name"])
+
+
+# Global mockups export instance
+mockups_export = MockupsExport(str(Path(settings.export_cache_dir) / "mockups"))
@@ -0,0 +1,118 @@
+"""Guide PDF rendering: process pool + content-addressed disk cache."""
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..utils.config import settings
+from ..utils.singleflight import SingleFlight
+from ..utils.storage import atomic_write_bytes, content_digest, digest_path
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
+GUIDE_TEMPLATE = "guide_pdf.html"
+
+# Bump when guide_pdf.html or rendering options change: cached PDFs are keyed by it
+TEMPLATE_VERSION = 2
+
+# Per-worker Jinja environment (created on first render in each process)
+_env = None
+
+
+def guide_context(audit) -> Dict[str, Any]:
+    """Everything the guide template reads from a completed audit."""
+    results = audit.results or {}
+    return {
+        "company_name": audit.company_name,
+        "sector": audit.sector,
+        "location": audit.location or "",
+        "visibility_score": float(audit.visibility_score or 0),
+        "completed_at": audit.completed_at.isoformat() if audit.completed_at else "",
+        "recommendations": results.get("recommendations", []),
+    }
+
+
+def guide_digest(context: Dict[str, Any]) -> str:
+    """Cache key of a guide: hash of its inputs and the template version."""
+    return content_digest({"template_version": TEMPLATE_VERSION, "context": context})
+
+
+def render_guide_html(context: Dict[str, Any]) -> str:
+    """Render the guide template to HTML."""
+    global _env
+    if _env is None:
+        from jinja2 import Environment, FileSystemLoader, select_autoescape
+        _env = Environment(
+            loader=FileSystemLoader(str(TEMPLATES_DIR)),
+            autoescape=select_autoescape(["html"]),
+            auto_reload=False,
+        )
+    return _env.get_template(GUIDE_TEMPLATE).render(**context)
+
+
+def render_guide_pdf(context: Dict[str, Any]) -> bytes:
+    """HTML → PDF with WeasyPrint (CPU-bound, runs in a worker process)."""
+    from weasyprint import HTML
+
+    html = render_guide_html(context)
+    return HTML(string=html, base_url=str(TEMPLATES_DIR)).write_pdf()
+
+
+def _render_to_file(context: Dict[str, Any], path: str) -> str:
+    """Worker entry point: render and write the PDF, return its path."""
+    atomic_write_bytes(path, render_guide_pdf(context))
+    return path
+
+
+class PDFRenderer:
+    """
+    Renders audit guides off the event loop.
+
+    PDFs are stored under cache_dir by content digest, so an unchanged
+    audit is rendered once and later downloads are served from disk.
+    Concurrent requests for the same digest share one render.
+    """
+
+    def __init__(self, cache_dir: str, workers: int = 2):
+        self.cache_dir = Path(cache_dir)
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._inflight = SingleFlight()
+
+    def path_for(self, digest: str) -> Path:
+        return digest_path(self.cache_dir, digest, ".pdf")
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    async def render(self, context: Dict[str, Any], digest: Optional[str] = None) -> Path:
+        """Path of the rendered guide, rendering it if not cached yet."""
+        digest = digest or guide_digest(context)
+        path = self.path_for(digest)
+        if path.exists():
+            return path
+
+        async def _render() -> Path:
+            if path.exists():
+                return path
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._pool(), _render_to_file, context, str(path))
+            logger.info(f"Guide PDF rendered: {digest[:12]}")
+            return path
+
+        result, _ = await self._inflight.do(digest, _render)
+        return result
+
+    def shutdown(self) -> None:
+        """Stop the worker pool (pending renders are cancelled)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global renderer instance
+pdf_renderer = PDFRenderer(settings.pdf_cache_dir, settings.pdf_workers)
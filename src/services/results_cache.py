@@ -0,0 +1,160 @@
+"""Read-through cache for serialized payloads of completed audits."""
+import base64
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+from ..utils.cache import cache
+from ..utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Payload kinds served from the cache
+RESULTS = "results"
+RECOMMENDATIONS_JSON = "recommendations.json"
+GUIDE_PDF = "guide.pdf"  # body: content digest of the rendered guide
+KINDS = (RESULTS, RECOMMENDATIONS_JSON, GUIDE_PDF)
+
+
+class CachedPayload:
+    """Serialized response body of a completed audit, with its strong ETag."""
+
+    __slots__ = ("etag", "body", "media_type", "plan", "completed_at", "headers")
+
+    def __init__(
+        self,
+        etag: str,
+        body: bytes,
+        media_type: str,
+        plan: str,
+        completed_at: str,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self.etag = etag
+        self.body = body
+        self.media_type = media_type
+        self.plan = plan
+        self.completed_at = completed_at
+        self.headers = headers or {}
+
+    def to_dict(self) -> Dict:
+        return {
+            "etag": self.etag,
+            "body": base64.b64encode(self.body).decode("ascii"),
+            "media_type": self.media_type,
+            "plan": self.plan,
+            "completed_at": self.completed_at,
+            "headers": self.headers,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CachedPayload":
+        return cls(
+            etag=data["etag"],
+            body=base64.b64decode(data["body"]),
+            media_type=data["media_type"],
+            plan=data["plan"],
+            completed_at=data["completed_at"],
+            headers=data.get("headers", {}),
+        )
+
+
+class ResultsCache:
+    """
+    Completed-audit payload cache: in-process LRU in front of Redis.
+
+    Completed audits never change, so a payload is keyed by audit ID and
+    stamped with completed_at; the ETag is the hash of the exact bytes.
+    Keys are looked up before the audit is loaded, so anything that
+    changes what a payload is built from must call invalidate(): results
+    being persisted (AuditService) and plan upgrades (payment). invalidate() only reaches this process's memory and
+    Redis, so the in-process layer keeps entries for local_ttl seconds at
+    most: other workers pick the upgrade up from Redis once it expires.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        prefix: str = "audit-payload",
+        local_ttl: Optional[float] = None,
+    ):
+        self.max_entries = max_entries
+        self.prefix = prefix
+        self.local_ttl = settings.results_cache_local_ttl if local_ttl is None else local_ttl
+        self._lru: "OrderedDict[str, Tuple[float, CachedPayload]]" = OrderedDict()
+
+    def _key(self, kind: str, audit_id) -> str:
+        return f"{self.prefix}:{kind}:{audit_id}"
+
+    async def get(self, kind: str, audit_id: UUID) -> Optional[CachedPayload]:
+        """Cached payload for audit_id, or None."""
+        key = self._key(kind, audit_id)
+        local = self._lru.get(key)
+        if local is not None:
+            expires_at, entry = local
+            if time.monotonic() < expires_at:
+                self._lru.move_to_end(key)
+                return entry
+            del self._lru[key]
+
+        try:
+            data = await cache.get(key)
+        except Exception as exc:  # Redis down: behave as a miss
+            logger.warning(f"Results cache: Redis get failed ({exc})")
+            return None
+        if not data:
+            return None
+
+        entry = CachedPayload.from_dict(data)
+        self._remember(key, entry)
+        return entry
+
+    async def put(
+        self,
+        kind: str,
+        audit,
+        body: bytes,
+        media_type: str,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> CachedPayload:
+        """Store the serialized payload of a completed audit."""
+        completed_at = audit.completed_at.isoformat() if audit.completed_at else ""
+        entry = CachedPayload(
+            etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+            body=body,
+            media_type=media_type,
+            plan=audit.plan,
+            completed_at=completed_at,
+            headers=headers,
+        )
+        key = self._key(kind, audit.id)
+        self._remember(key, entry)
+
+        try:
+            await cache.set(key, entry.to_dict())
+        except Exception as exc:
+            logger.warning(f"Results cache: Redis set failed ({exc})")
+        return entry
+
+    async def invalidate(self, audit_id: UUID) -> None:
+        """Drop every cached payload of an audit."""
+        for kind in KINDS:
+            key = self._key(kind, audit_id)
+            self._lru.pop(key, None)
+            try:
+                await cache.delete(key)
+            except Exception as exc:
+                logger.warning(f"Results cache: Redis delete failed ({exc})")
+
+    def _remember(self, key: str, entry: CachedPayload) -> None:
+        self._lru[key] = (time.monotonic() + self.local_ttl, entry)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+
+# Global results cache instance
+results_cache = ResultsCache()
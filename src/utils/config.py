@@ -17,6 +17,15 @@ class Settings(BaseSettings):
     # Redis
     redis_url: str = "redis://localhost:6379/0"
     redis_cache_ttl: int = 86400
+    results_cache_local_ttl: float = 5.0  # seconds a worker serves a payload from memory before asking Redis again
+
+    # Audits
+    audit_reuse_ttl: int = 900  # seconds a completed audit is reused for identical requests (0 = off)
+
+    # Exports
+    pdf_cache_dir: str = "data/pdf_cache"
+    pdf_workers: int = 2
+    export_cache_dir: str = "data/export_cache"
 
     # OpenAI
     openai_api_key: str = ""
@@ -0,0 +1,10 @@
+"""Prometheus metrics."""
+from prometheus_client import Counter
+
+
+# Audit execution reuse (single-flight + recent completed results)
+AUDIT_REUSE_TOTAL = Counter(
+    "audit_reuse_total",
+    "Audit executions by outcome (executed, inflight, recent)",
+    ["outcome"],
+)
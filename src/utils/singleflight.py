@@ -0,0 +1,50 @@
+"""Single-flight coalescing for concurrent async calls."""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls sharing a key into one execution.
+
+    The first caller for a key (the leader) runs the coroutine; callers
+    arriving while it is in flight await the same result instead of
+    starting their own. Nothing is kept once the call has finished.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    def in_flight(self, key: str) -> bool:
+        """Check if a call for key is currently running."""
+        return key in self._calls
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run fn() once per key among concurrent callers.
+
+        Returns:
+            (result, shared) — shared is True when the result came from
+            another caller's execution.
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            # shield: a cancelled follower must not cancel the leader
+            return await asyncio.shield(future), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # mark retrieved when nobody was waiting
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            self._calls.pop(key, None)
@@ -0,0 +1,74 @@
+"""Content-addressed file storage helpers."""
+import hashlib
+import io
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, List, Union
+
+
+def content_digest(payload: Any) -> str:
+    """SHA-256 of the canonical JSON form of payload (key order independent)."""
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def digest_path(root: Union[str, Path], digest: str, suffix: str = "") -> Path:
+    """Sharded path of a digest: root/ab/abcdef...suffix."""
+    return Path(root) / digest[:2] / f"{digest}{suffix}"
+
+
+def atomic_write_bytes(path: Union[str, Path], data: bytes) -> Path:
+    """
+    Write data to path atomically.
+
+    Writes to a temporary file in the same directory then renames it, so
+    concurrent readers never see a partial file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+    return path
+
+
+class ChunkSink(io.RawIOBase):
+    """
+    Write-only, unseekable file object collecting writer output.
+
+    Streamed responses drain it after each unit of work (zip member, Arrow
+    record batch). zipfile falls back to data descriptors when it cannot
+    seek, so members can be flushed as soon as they are written.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._offset = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # Writers record offsets from tell(); seek() stays unsupported
+        return self._offset
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
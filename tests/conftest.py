@@ -0,0 +1,134 @@
+"""
+Fixtures communes des tests prospecting
+
+- db : session sur une base SQLite en mémoire (create_all) ; les tests qui
+  ont besoin du schéma migré (FTS5, triggers) redéfinissent engine avec
+  memory_engine(migrate=True)
+- api_db : db servie aux routes (dependency override de get_db)
+- published_dir / archive_dir : sorties fichiers redirigées sous tmp_path
+- republication des pages publiées dans le thread du commit : la base mémoire
+  (StaticPool) n'a qu'une connexion, qu'un worker concurrent partagerait
+- add_campaign / add_prospect(s) / new_run / add_run : fabriques de lignes
+"""
+from datetime import datetime
+from typing import Iterable, List, Optional, Union
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+from src.prospecting import archive, generate, landing_cache, publish
+from src.prospecting.database import SessionLocal, get_db, init_db, jdumps
+from src.prospecting.models import Base, CampaignDB, ProspectDB, ProspectStatus, TestRunDB
+
+
+def memory_engine(migrate: bool = False):
+    """Base en mémoire partagée entre threads (routes sync) ; migrate : schéma par les migrations alembic."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    if migrate:
+        init_db(engine)
+    else:
+        Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture(autouse=True)
+def _inline_republish(monkeypatch):
+    monkeypatch.setattr(landing_cache.republisher, "synchronous", True)
+
+
+@pytest.fixture
+def engine():
+    return memory_engine()
+
+
+@pytest.fixture
+def db(engine):
+    session = SessionLocal(bind=engine)
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def api_db(db):
+    from src.api.main import app
+
+    app.dependency_overrides[get_db] = lambda: db
+    yield db
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture
+def published_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(generate, "PUBLISHED_DIR", tmp_path)
+    monkeypatch.setattr(publish, "PUBLISHED_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive, "ARCHIVE_DIR", tmp_path / "runs")
+    return tmp_path / "runs"
+
+
+# ─────────────────────────── FABRIQUES ───────────────────────────
+
+def add_campaign(db, city: str = "Lyon", **fields) -> CampaignDB:
+    campaign = CampaignDB(profession="couvreur", city=city, **fields)
+    db.add(campaign)
+    db.commit()
+    return campaign
+
+
+def add_prospect(
+    db,
+    city: str = "Lyon",
+    name: str = "Toit Pro",
+    status: Union[ProspectStatus, str, None] = None,
+    campaign: Optional[CampaignDB] = None,
+    **fields,
+) -> ProspectDB:
+    """Prospect couvreur, dans sa propre campagne si campaign n'est pas donnée."""
+    campaign = campaign or add_campaign(db, city)
+    if status is not None:
+        fields["status"] = status.value if isinstance(status, ProspectStatus) else status
+    p = ProspectDB(campaign_id=campaign.campaign_id, name=name, city=city, profession="couvreur", **fields)
+    db.add(p)
+    db.commit()
+    return p
+
+
+def add_prospects(db, n: int, campaign: Optional[CampaignDB] = None, **kwargs) -> List[ProspectDB]:
+    """n prospects « Toit {i} » dans une même campagne (créée si non donnée)."""
+    campaign = campaign or add_campaign(db, kwargs.get("city", "Lyon"))
+    return [add_prospect(db, name=f"Toit {i}", campaign=campaign, **kwargs) for i in range(n)]
+
+
+def new_run(
+    p: ProspectDB,
+    model: str = "openai",
+    mentions: Optional[Iterable[bool]] = None,
+    competitors: Optional[Iterable[str]] = None,
+    queries: Optional[Iterable[str]] = None,
+    ts: Optional[datetime] = None,
+    **fields,
+) -> TestRunDB:
+    """Run du prospect, non ajouté à la session ; les colonnes JSON non données gardent leur défaut."""
+    if mentions is not None:
+        mentions = list(mentions)
+        fields.setdefault("mention_per_query", jdumps(mentions))
+        fields.setdefault("mentioned_target", any(mentions))
+    if competitors is not None:
+        fields["competitors_entities"] = jdumps(list(competitors))
+    if queries is not None:
+        fields["queries"] = jdumps(list(queries))
+    if ts is not None:
+        fields["ts"] = ts
+    return TestRunDB(campaign_id=p.campaign_id, prospect_id=p.prospect_id, model=model, **fields)
+
+
+def add_run(db, p: ProspectDB, model: str = "openai", **kwargs) -> TestRunDB:
+    run = new_run(p, model, **kwargs)
+    db.add(run)
+    db.commit()
+    return run
@@ -0,0 +1,88 @@
+"""Admin — pagination, formulaires JSON, flux SSE alimenté par prospect_events."""
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from src.api.main import app
+from src.api.routes import admin
+from src.prospecting.database import jdumps
+from src.prospecting.events import latest_seq
+from src.prospecting.models import ProspectDB, ProspectStatus
+from tests.conftest import add_campaign, add_prospect
+
+pytestmark = pytest.mark.usefixtures("api_db")
+
+
+@pytest.fixture
+def campaign(db):
+    c = add_campaign(db)
+    for i in range(3):
+        add_prospect(
+            db, name=f"Toit {i}", status=ProspectStatus.SCORED, campaign=c,
+            competitors_cited=jdumps(["alpha"]), ia_visibility_score=float(i), eligibility_flag=True,
+        )
+    return c
+
+
+class _Client:
+    """Requête factice : se déconnecte après n tours de boucle."""
+
+    def __init__(self, rounds: int):
+        self.rounds = rounds
+
+    async def is_disconnected(self) -> bool:
+        self.rounds -= 1
+        return self.rounds < 0
+
+
+async def _collect(db, campaign_id, cursor, rounds=1):
+    return [chunk async for chunk in admin._campaign_stream(_Client(rounds), db.get_bind(), campaign_id, cursor)]
+
+
+def _events(chunks):
+    out = []
+    for chunk in chunks:
+        lines = dict(line.split(": ", 1) for line in chunk.strip().splitlines() if not line.startswith((":", "retry")))
+        if "event" in lines:
+            out.append((lines["event"], json.loads(lines["data"])))
+    return out
+
+
+@pytest.mark.asyncio
+async def test_page_is_paginated(db, campaign, monkeypatch):
+    monkeypatch.setattr(admin, "PAGE_SIZE", 2)
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        url = f"/admin/campaign/{campaign.campaign_id}?token={admin.ADMIN_TOKEN}"
+        first = (await client.get(url)).text
+        second = (await client.get(url + "&page=2")).text
+
+    assert first.count("<tr data-id=") == 2 and "Toit 2" in first     # tri par score décroissant
+    assert second.count("<tr data-id=") == 1 and "Page 2 / 2" in second
+    assert 'data-stat="total">3<' in first
+    assert first.count("new EventSource") == 1                          # un seul flux SSE
+    assert "<script>" not in first.split("</title>")[0]
+
+
+@pytest.mark.asyncio
+async def test_json_form_and_stream_deltas(db, campaign, monkeypatch):
+    monkeypatch.setattr(admin, "STREAM_POLL", 0)
+    cursor = latest_seq(db)
+    prospect = db.query(ProspectDB).filter(ProspectDB.name == "Toit 0").one()
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        resp = await client.post(
+            f"/admin/prospect/{prospect.prospect_id}/assets?token={admin.ADMIN_TOKEN}",
+            data={"video_url": "https://v", "screenshot_url": "https://s"},
+            headers={"Accept": "application/json"},
+        )
+    row = resp.json()["prospect"]
+    assert row["status"] == ProspectStatus.READY_ASSETS.value and row["can_mark_ready"]
+
+    events = _events(await _collect(db, campaign.campaign_id, cursor))
+    assert [name for name, _ in events] == ["prospect", "stats"]
+    assert events[0][1] == row
+    assert events[1][1]["total"] == 3
+
+    # rien de nouveau → aucun événement
+    assert _events(await _collect(db, campaign.campaign_id, latest_seq(db), rounds=3)) == []
@@ -0,0 +1,84 @@
+"""Export analytique colonnaire — aplatissement, table longue, runs archivés, flux HTTP."""
+import io
+from datetime import datetime, timedelta
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from httpx import AsyncClient
+
+from src.api.main import app
+from src.api.routes.admin import ADMIN_TOKEN
+from src.prospecting import analytics, archive
+from src.prospecting.database import get_db, jdumps
+from tests.conftest import add_prospect, add_run
+
+pytestmark = pytest.mark.usefixtures("archive_dir")
+
+NOW = datetime(2026, 10, 19, 12, 0)
+
+
+@pytest.fixture
+def campaigns(db):
+    ids = []
+    for city in ("Lyon", "Nice"):
+        p = add_prospect(db, city, f"Toit {city}", competitors_cited=jdumps(["alpha", "beta"]), ia_visibility_score=3.5)
+        for days_ago, competitors in ((300, ["alpha", "beta"]), (2, ["gamma"]), (1, [])):
+            add_run(db, p, mentions=[True, False, True], competitors=competitors, ts=NOW - timedelta(days=days_ago))
+        ids.append(p.campaign_id)
+    archive.archive_runs(db, older_than_days=180, now=NOW)     # 1 run archivé par campagne
+    return ids
+
+
+def test_export_all_parquet(db, campaigns, tmp_path):
+    result = analytics.export_all(db, tmp_path / "out", batch_size=2)
+    assert {t: r["rows"] for t, r in result.items()} == {"prospects": 2, "runs": 6, "competitors": 6}
+
+    runs = pq.read_table(tmp_path / "out" / "runs.parquet")
+    assert runs.schema == analytics.schema("runs")
+    assert runs.column("q1_mentioned").to_pylist() == [True] * 6
+    assert runs.column("q2_mentioned").to_pylist() == [False] * 6
+    assert runs.column("q4_mentioned").null_count == 6
+    assert runs.column("archived").to_pylist().count(True) == 2
+
+    competitors = pq.read_table(tmp_path / "out" / "competitors.parquet").to_pylist()
+    assert sorted((c["rank"], c["competitor"]) for c in competitors if c["campaign_id"] == campaigns[0]) == [
+        (1, "alpha"), (1, "gamma"), (2, "beta"),
+    ]
+    prospects = pq.read_table(tmp_path / "out" / "prospects.parquet")
+    assert prospects.column("competitors_cited").to_pylist() == [2, 2]
+
+
+def test_campaign_filter_and_arrow(db, campaigns, tmp_path):
+    path = tmp_path / "runs.arrow"
+    rows = analytics.write_table(db, "runs", path, "arrow", campaign_id=campaigns[1], include_archived=False)
+    assert rows == 2
+
+    with pa.ipc.open_stream(path.read_bytes()) as reader:
+        table = reader.read_all()
+    assert set(table.column("campaign_id").to_pylist()) == {campaigns[1]}
+    assert not any(table.column("archived").to_pylist())
+
+
+@pytest.mark.asyncio
+async def test_admin_export_stream(db, campaigns):
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            headers = {"X-Admin-Token": ADMIN_TOKEN}
+            resp = await client.get("/admin/export/runs.parquet", headers=headers,
+                                    params={"campaign_id": campaigns[0]})
+            assert resp.status_code == 200
+            assert resp.headers["content-type"] == analytics.FORMATS["parquet"]
+            table = pq.read_table(io.BytesIO(resp.content))
+            assert table.num_rows == 3
+
+            resp = await client.get("/admin/export/competitors.arrow", headers=headers)
+            with pa.ipc.open_stream(resp.content) as reader:
+                assert reader.read_all().num_rows == 6
+
+            assert (await client.get("/admin/export/runs.parquet")).status_code == 401
+            assert (await client.get("/admin/export/answers.parquet", headers=headers)).status_code == 404
+            assert (await client.get("/admin/export/runs.csv", headers=headers)).status_code == 404
+    finally:
+        app.dependency_overrides.pop(get_db, None)
@@ -0,0 +1,127 @@
+"""Réponses IA adressées par contenu — dédoublonnage, extraction mémoïsée, pool par créneau."""
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+from sqlalchemy import func, select
+
+from src.prospecting import ia_test
+from src.prospecting.answers import answer_hash, load_answers, slot_usage, store_answers
+from src.prospecting.database import db_run_answers, jloads
+from src.prospecting.models import AnswerDB, ProspectStatus, TestRunDB as RunDB
+from src.prospecting.scheduler import current_slot
+from tests.conftest import add_prospects, memory_engine
+
+
+@pytest.fixture
+def engine():
+    return memory_engine(migrate=True)     # FTS5 et triggers : schéma des migrations
+
+
+@pytest.fixture
+def extract(monkeypatch):
+    calls = []
+
+    def counting(text):
+        calls.append(text)
+        return [{"type": "company", "value": "Toit Alpha"}]
+
+    monkeypatch.setattr(ia_test, "extract_entities", counting)
+    return calls
+
+
+def _count(db) -> int:
+    return db.scalar(select(func.count()).select_from(AnswerDB))
+
+
+def test_store_once_extract_once(db, extract):
+    first = store_answers(db, ["Réponse A", "Réponse B", "Réponse A"], ia_test.extract_entities)
+    assert [h for h, _ in first] == [answer_hash("Réponse A"), answer_hash("Réponse B"), answer_hash("Réponse A")]
+    assert extract == ["Réponse A", "Réponse B"]
+
+    second = store_answers(db, ["Réponse B"], ia_test.extract_entities)
+    assert second == [(answer_hash("Réponse B"), [{"type": "company", "value": "Toit Alpha"}])]
+    assert len(extract) == 2
+    assert _count(db) == 2
+    assert [a.body for a in load_answers(db, [answer_hash("Réponse B"), "inconnu"])] == ["Réponse B"]
+
+
+def test_campaign_runs_share_answers(db, extract):
+    ia_test.run_ia_test_campaign(db, _campaign(db, 3), dry_run=True)
+
+    runs = db.query(RunDB).all()
+    queries = jloads(runs[0].queries)
+    assert len(runs) == 3 * len(ia_test.AI_CALLERS)
+    # mêmes requêtes → mêmes réponses simulées : un texte par requête, extrait une fois
+    assert _count(db) == len(queries)
+    assert len(extract) == len(queries)
+
+    answers = db_run_answers(db, runs[0].run_id)
+    assert answers["raw_answers"] == [f"[DRY_RUN] Réponse simulée pour : {q}" for q in queries]
+    assert answers["extracted_entities"][0] == [{"type": "company", "value": "Toit Alpha"}]
+    assert jloads(runs[0].competitors_entities) == ["Toit Alpha"]
+
+
+# ─────────────────────────── POOL PAR CRÉNEAU ───────────────────────────
+
+@pytest.fixture
+def api(monkeypatch):
+    calls = []
+
+    def fake_openai(query):
+        calls.append(query)
+        if "erreur" in query:
+            raise RuntimeError("timeout")
+        return f"Pour « {query} » : Toit Alpha"
+
+    monkeypatch.setitem(ia_test.AI_CALLERS, "openai", (fake_openai, "OPENAI_API_KEY"))
+    monkeypatch.setattr(ia_test, "get_active_models", lambda: ["openai"])
+    return calls
+
+
+def _campaign(db, n: int = 2) -> str:
+    return add_prospects(db, n, status=ProspectStatus.SCHEDULED)[0].campaign_id
+
+
+def test_slot_pool_shared_across_campaigns(db, api):
+    first, rerun, later = _campaign(db), _campaign(db), _campaign(db, 1)
+    n_queries = len(ia_test.get_queries("couvreur", "Lyon"))
+
+    result = ia_test.run_ia_test_campaign(db, first, slot="2026-10-21T09:00")
+    assert (result["api_calls"], result["calls_saved"]) == (n_queries, n_queries)
+
+    result = ia_test.run_ia_test_campaign(db, rerun, slot="2026-10-21T09:00")
+    assert (result["api_calls"], result["calls_saved"]) == (0, 2 * n_queries)
+    assert len(api) == n_queries
+
+    result = ia_test.run_ia_test_campaign(db, later, slot="2026-10-21T13:00")
+    assert result["api_calls"] == n_queries
+    assert len(api) == 2 * n_queries
+
+    assert slot_usage(db, "2026-10-21T09:00") == [{
+        "slot": "2026-10-21T09:00", "api_calls": n_queries, "calls_saved": 3 * n_queries,
+        "by_model": {"openai": {"api_calls": n_queries, "calls_saved": 3 * n_queries}},
+    }]
+    assert [u["slot"] for u in slot_usage(db)] == ["2026-10-21T13:00", "2026-10-21T09:00"]
+
+
+def test_failed_calls_not_pooled(db, api, monkeypatch):
+    monkeypatch.setattr(ia_test, "get_queries", lambda profession, city: ["couvreur Lyon erreur", "couvreur Lyon"])
+    ia_test.run_ia_test_campaign(db, _campaign(db), slot="2026-10-21T09:00")
+
+    # 2 prospects : la requête en erreur est renvoyée, l'autre vient du pool
+    assert api == ["couvreur Lyon erreur", "couvreur Lyon", "couvreur Lyon erreur"]
+
+
+def test_unscheduled_runs_do_not_share(db, api):
+    result = ia_test.run_ia_test_campaign(db, _campaign(db))
+    assert result["calls_saved"] == 0
+    assert slot_usage(db) == []
+
+
+def test_current_slot():
+    rome = ZoneInfo("Europe/Rome")
+    assert current_slot(datetime(2026, 10, 22, 10, 0, tzinfo=rome)) == "2026-10-21T20:30"      # jeudi
+    assert current_slot(datetime(2026, 10, 21, 9, 3, tzinfo=rome)) == "2026-10-21T09:00"       # mercredi
+    assert current_slot(datetime(2026, 10, 21, 8, 59, tzinfo=rome)) == "2026-10-18T20:30"      # → dimanche
+    assert current_slot(datetime(2026, 10, 21, 7, 5, tzinfo=ZoneInfo("UTC"))) == "2026-10-21T09:00"
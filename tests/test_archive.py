@@ -0,0 +1,100 @@
+"""Archivage Parquet des runs froids — agrégats en base, résumés inchangés, lecture détaillée."""
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func
+
+from src.api.main import app
+from src.prospecting import archive
+from src.prospecting.database import get_db, jdumps
+from src.prospecting.generate import _runs_summary
+from src.prospecting.models import ProspectDB, RunStatsDB, TestRunDB as RunDB
+from tests.conftest import add_campaign, add_prospect, new_run
+
+NOW = datetime(2026, 10, 19, 12, 0)
+
+
+def _run(p: ProspectDB, days_ago: int, model: str = "openai", mentions=(False, True)):
+    return new_run(
+        p, model, mentions=mentions, competitors=["alpha"], queries=["couvreur Lyon", "toiture Lyon"],
+        ts=NOW - timedelta(days=days_ago),
+    )
+
+
+@pytest.fixture
+def runs(db):
+    live, closed = add_prospect(db), add_prospect(db, campaign=add_campaign(db, status="closed"))
+    db.add_all([
+        _run(live, 400), _run(live, 400, "gemini", (False, False)), _run(live, 200),   # hors rétention
+        _run(live, 1, "anthropic"),                                                        # récent, conservé
+        _run(closed, 1),                                                                   # campagne fermée
+    ])
+    db.commit()
+    return live, closed
+
+
+def test_archive_keeps_summaries(db, runs, archive_dir):
+    live, closed = runs
+    before = {p.prospect_id: _runs_summary(db, p) for p in runs}
+
+    result = archive.archive_runs(db, older_than_days=180, now=NOW)
+
+    assert result["archived"] == 4
+    assert result["files"] == 3         # (live, 2025-09) (live, 2026-04) (closed, 2026-10)
+    assert db.query(RunDB).count() == 1
+    assert {p.prospect_id: _runs_summary(db, p) for p in runs} == before
+    assert before[live.prospect_id]["total_runs"] == 4
+    assert len(list(archive_dir.glob(f"campaign_id={live.campaign_id}/month=*/part-*.parquet"))) == 2
+
+    assert archive.archive_runs(db, older_than_days=180, now=NOW)["archived"] == 0
+
+
+def test_archived_runs_read_path(db, runs, archive_dir):
+    live, _ = runs
+    assert archive.archived_runs(live.campaign_id) == []
+
+    archive.archive_runs(db, older_than_days=180, now=NOW)
+
+    archived = archive.archived_runs(live.campaign_id, [live.prospect_id])
+    assert [r.ts for r in archived] == [NOW - timedelta(days=d) for d in (400, 400, 200)]
+    assert sorted(r.model for r in archived[:2]) == ["gemini", "openai"]
+    assert {r.month for r in archived} == {"2025-09", "2026-04"}
+    assert archived[0].mention_per_query == jdumps([False, True])
+    assert len(archive.archived_runs()) == 4
+
+
+def test_interrupted_pass_is_replayed_without_duplicates(db, runs, archive_dir, monkeypatch):
+    live, _ = runs
+    merge = archive._merge_stats
+
+    def crash(*args):
+        raise RuntimeError("coupure")
+
+    monkeypatch.setattr(archive, "_merge_stats", crash)
+    with pytest.raises(RuntimeError):
+        archive.archive_runs(db, older_than_days=180, now=NOW)
+    db.rollback()
+    monkeypatch.setattr(archive, "_merge_stats", merge)
+
+    archive.archive_runs(db, older_than_days=180, now=NOW)
+
+    assert len(archive.archived_runs(live.campaign_id)) == 3
+    assert db.query(func.sum(RunStatsDB.runs)).scalar() == 4
+
+
+@pytest.mark.asyncio
+async def test_runs_endpoint_includes_archived(db, runs, archive_dir):
+    live, _ = runs
+    archive.archive_runs(db, older_than_days=180, now=NOW)
+
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            url = f"/api/prospect/{live.prospect_id}/runs"
+            assert (await client.get(url)).json()["total_runs"] == 1
+            data = (await client.get(url, params={"include_archived": "true"})).json()
+            assert data["total_runs"] == 4
+            assert [r["archived"] for r in data["runs"]] == [True, True, True, False]
+    finally:
+        app.dependency_overrides.pop(get_db, None)
@@ -0,0 +1,246 @@
+"""Audit service deduplication tests."""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from src.services.audit_service import AuditService
+from src.utils.singleflight import SingleFlight
+
+
+def test_request_key_canonicalization():
+    """Case, whitespace and unicode form do not change the key."""
+    key = AuditService.request_key("Le Bon Goût", "restaurant", "Paris", "fr", "pro")
+
+    assert AuditService.request_key("  le bon  GOÛT ", "Restaurant", "paris ", "FR", "pro") == key
+    assert AuditService.request_key("Le Bon Goût", "restaurant", "Paris", "fr", "pro") == key
+    assert len(key) == 64
+
+
+def test_request_key_distinguishes_inputs():
+    """Any result-determining field changes the key."""
+    base = AuditService.request_key("Le Bon Goût", "restaurant", "Paris", "fr", "pro")
+
+    assert AuditService.request_key("Le Bon Goût", "restaurant", "Paris", "fr", "starter") != base
+    assert AuditService.request_key("Le Bon Goût", "restaurant", "Lyon", "fr", "pro") != base
+    assert AuditService.request_key("Le Bon Goût", "restaurant", "Paris", "en", "pro") != base
+
+
+@pytest.mark.asyncio
+async def test_singleflight_coalesces_concurrent_calls():
+    """Concurrent calls for one key run the function once."""
+    flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    outcomes = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+
+    assert calls == 1
+    assert [result for result, _ in outcomes] == ["result"] * 5
+    assert sum(1 for _, shared in outcomes if not shared) == 1
+    assert not flight.in_flight("key")
+
+
+@pytest.mark.asyncio
+async def test_singleflight_propagates_errors_and_resets():
+    """Followers see the leader's error; the next call runs again."""
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("provider down")
+
+    outcomes = await asyncio.gather(
+        flight.do("key", fail), flight.do("key", fail), return_exceptions=True
+    )
+    assert all(isinstance(o, RuntimeError) for o in outcomes)
+
+    async def ok():
+        return 42
+
+    assert await flight.do("key", ok) == (42, False)
+
+
+def _completed_pro_session(n_queries=20):
+    from src.core.domain.audit_session import AuditResult
+
+    results = [
+        AuditResult(f"query {i}", "chatgpt", i % 3 == 0, position=1 if i % 3 == 0 else None,
+                    competitors=["Comp A", "Comp B"], raw_response=f"answer {i}")
+        for i in range(n_queries)
+    ]
+    recommendations = [
+        {"type": "content", "title": "Optimiser le contenu", "priority": 1,
+         "content": {"format": "HTML"}, "integration_guide": "# Guide"},
+        {"type": "structured_data", "title": "Schema.org", "priority": 2},
+    ]
+    return results, recommendations
+
+
+def test_bulk_rows_for_pro_audit():
+    """Rows carry ids and audit_id for every query and recommendation."""
+    import uuid
+
+    audit_id = uuid.uuid4()
+    results, recommendations = _completed_pro_session()
+
+    query_rows = AuditService._query_rows(audit_id, results)
+    rec_rows = AuditService._recommendation_rows(audit_id, recommendations)
+
+    assert len(query_rows) == 20
+    assert len({row["id"] for row in query_rows}) == 20
+    assert all(row["audit_id"] == audit_id for row in query_rows + rec_rows)
+    assert query_rows[0]["ai_response"] == "answer 0"
+    assert rec_rows[1]["estimated_impact"] == "medium"
+    assert rec_rows[1]["content"] == {}
+
+
+def test_bulk_insert_is_single_multirow_statement():
+    """The Postgres statement is one INSERT with one VALUES group per row."""
+    import uuid
+    from sqlalchemy import insert
+    from sqlalchemy.dialects import postgresql
+    from src.database.models import Query as QueryModel
+
+    results, _ = _completed_pro_session()
+    rows = AuditService._query_rows(uuid.uuid4(), results)
+
+    sql = str(insert(QueryModel).values(rows).compile(dialect=postgresql.dialect()))
+
+    assert sql.count("INSERT INTO queries") == 1
+    assert sql.count("), (") == len(rows) - 1
+
+
+# ─────────────────────────── run_audit (reuse) ───────────────────────────
+
+class _AsyncSession:
+    """Async facade over a sync SQLite session (no async driver in the test env)."""
+
+    def __init__(self, session):
+        self._session = session
+
+    def add(self, instance):
+        self._session.add(instance)
+
+    async def execute(self, stmt):
+        return self._session.execute(stmt)
+
+    async def commit(self):
+        self._session.commit()
+
+    async def refresh(self, instance):
+        self._session.refresh(instance)
+
+
+@pytest.fixture
+def audit_db():
+    from sqlalchemy import create_engine
+    from sqlalchemy.dialects.postgresql import JSONB
+    from sqlalchemy.ext.compiler import compiles
+    from sqlalchemy.orm import Session
+    from src.database.session import Base
+
+    @compiles(JSONB, "sqlite")
+    def _jsonb_sqlite(type_, compiler, **kw):
+        return "JSON"
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield _AsyncSession(session)
+
+
+@pytest.fixture
+def executions(monkeypatch):
+    """Stub orchestrator pass: returns a completed session and counts calls."""
+    from src.core.domain.audit_session import AuditSession
+
+    calls = []
+
+    async def execute(audit_session):
+        calls.append(audit_session.ident)
+        results, recommendations = _completed_pro_session(3)
+        completed = AuditSession(ident=audit_session.ident, company_name=audit_session.company_name,
+                                 sector=audit_session.sector, status="completed")
+        completed.results = results
+        completed.visibility_score = 42.0
+        completed.metadata = {"analysis": {"total_mentions": 1}, "recommendations": recommendations}
+        return completed
+
+    monkeypatch.setattr(AuditService, "_execute", staticmethod(execute))
+    return calls
+
+
+def _reuse_count(outcome):
+    from src.utils.metrics import AUDIT_REUSE_TOTAL
+
+    return AUDIT_REUSE_TOTAL.labels(outcome=outcome)._value.get()
+
+
+async def _new_audit(db):
+    audit = await AuditService.create_audit(db, "Le Bon Goût", "restaurant", "Paris", plan="pro")
+    return await AuditService.run_audit(db, audit.id)
+
+
+@pytest.mark.asyncio
+async def test_run_audit_reuses_recent_completed(audit_db, executions):
+    """An identical request within the TTL is cloned without a provider call."""
+    from src.database.models import Query as QueryModel
+
+    recent = _reuse_count("recent")
+    first = await _new_audit(audit_db)
+    second = await _new_audit(audit_db)
+
+    assert len(executions) == 1
+    assert _reuse_count("recent") == recent + 1
+    assert second.id != first.id and second.status == "completed"
+    assert second.results == first.results
+    assert second.completed_at == first.completed_at
+    queries = (await audit_db.execute(select(QueryModel).where(QueryModel.audit_id == second.id))).scalars().all()
+    assert len(queries) == 3
+
+
+@pytest.mark.asyncio
+async def test_run_audit_reuse_expires_with_source(audit_db, executions, monkeypatch):
+    """Clones do not renew the TTL: once the executed audit is stale, the next one runs."""
+    from src.utils.config import settings
+
+    monkeypatch.setattr(settings, "audit_reuse_ttl", 900)
+    first = await _new_audit(audit_db)
+    first.completed_at = datetime.utcnow() - timedelta(seconds=600)
+    await audit_db.commit()
+
+    clone = await _new_audit(audit_db)
+    assert len(executions) == 1
+    assert clone.completed_at == first.completed_at
+
+    first.completed_at = clone.completed_at = datetime.utcnow() - timedelta(seconds=1000)
+    await audit_db.commit()
+    executed = _reuse_count("executed")
+
+    fresh = await _new_audit(audit_db)
+    assert len(executions) == 2
+    assert _reuse_count("executed") == executed + 1
+    assert fresh.completed_at > first.completed_at
+
+
+@pytest.mark.asyncio
+async def test_run_audit_invalidates_cached_payloads(audit_db, executions, monkeypatch):
+    """Persisting results drops payloads cached under the audit ID."""
+    from src.services import audit_service
+    from src.services.results_cache import RESULTS, ResultsCache
+
+    cache = ResultsCache(local_ttl=60)
+    monkeypatch.setattr(audit_service, "results_cache", cache)
+    audit = await AuditService.create_audit(audit_db, "Le Bon Goût", "restaurant", "Paris", plan="pro")
+    await cache.put(RESULTS, audit, b"{}", "application/json")
+
+    await AuditService.run_audit(audit_db, audit.id)
+
+    assert await cache.get(RESULTS, audit.id) is None
@@ -0,0 +1,64 @@
+"""Statut / liste des campagnes — agrégats GROUP BY, pagination keyset."""
+from datetime import datetime
+
+import pytest
+from httpx import AsyncClient
+
+from src.api.main import app
+from src.prospecting.database import db_campaign_counts, db_list_campaigns_page
+from src.prospecting.models import CampaignDB, ProspectDB, ProspectStatus
+
+pytestmark = pytest.mark.usefixtures("api_db")
+
+
+@pytest.fixture
+def campaigns(db):
+    same_ts = datetime(2026, 1, 1, 9, 0, 0, 123456)   # égalité de created_at : départage par id
+    items = [CampaignDB(campaign_id=f"c{i}", profession="couvreur", city="Lyon", created_at=same_ts) for i in range(5)]
+    db.add_all(items)
+    db.commit()
+    statuses = [ProspectStatus.SCHEDULED, ProspectStatus.SCORED, ProspectStatus.SCORED]
+    for i, status in enumerate(statuses):
+        db.add(ProspectDB(
+            campaign_id="c0", name=f"P{i}", city="Lyon", profession="couvreur",
+            status=status.value, eligibility_flag=(i > 0),
+        ))
+    db.commit()
+    return items
+
+
+def test_counts_are_grouped(db, campaigns):
+    counts = db_campaign_counts(db, ["c0", "c1"])
+    assert counts["c0"] == {"total": 3, "eligible": 2, "by_status": {"SCHEDULED": 1, "SCORED": 2}}
+    assert counts["c1"] == {"total": 0, "eligible": 0, "by_status": {}}
+
+
+def test_keyset_pages_cover_every_campaign_once(db, campaigns):
+    seen, cursor = [], None
+    while True:
+        page, cursor = db_list_campaigns_page(db, limit=2, cursor=cursor)
+        seen.extend(c.campaign_id for c in page)
+        if cursor is None:
+            break
+    assert seen == ["c4", "c3", "c2", "c1", "c0"]
+
+    with pytest.raises(ValueError):
+        db_list_campaigns_page(db, cursor="pas-un-curseur")
+
+
+@pytest.mark.asyncio
+async def test_endpoints_do_not_load_prospects(db, campaigns):
+    db.expunge_all()
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        status = (await client.get("/api/campaign/c0/status")).json()
+        everything = await client.get("/api/campaigns")
+        first = await client.get("/api/campaigns", params={"limit": 4})
+        rest = await client.get("/api/campaigns", params={"cursor": first.headers["x-next-cursor"]})
+        bad = await client.get("/api/campaigns", params={"cursor": "%%%"})
+
+    assert (status["total_prospects"], status["eligible"], status["by_status"]) == (3, 2, {"SCHEDULED": 1, "SCORED": 2})
+    assert len(everything.json()) == 5 and "x-next-cursor" not in everything.headers
+    assert [c["campaign_id"] for c in first.json()] == ["c4", "c3", "c2", "c1"]
+    assert rest.json()[0]["prospect_count"] == 3 and "x-next-cursor" not in rest.headers
+    assert bad.status_code == 400
+    assert not any(isinstance(obj, ProspectDB) for obj in db.identity_map.values())
@@ -0,0 +1,98 @@
+"""Index inversé des concurrents — mise à jour à l'insertion des runs, rapport, noms canoniques."""
+from datetime import datetime
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import create_engine, insert
+
+from src.api.main import app
+from src.prospecting import database, ia_test
+from src.prospecting.competitors import competitor_report, known_competitors
+from src.prospecting.database import SessionLocal, get_db, init_db, jdumps, jloads
+from src.prospecting.models import CampaignDB, CompetitorIndexDB, ProspectDB, ProspectStatus, TestRunDB as RunDB
+from tests.conftest import add_prospect, add_run
+
+
+def test_runs_update_index_incrementally(db):
+    lyon, lyon_2, paris = add_prospect(db, "Lyon"), add_prospect(db, "Lyon", "Zinc & Co"), add_prospect(db, "Paris")
+    add_run(db, lyon, "openai", competitors=["Toitures Dupont", "Alpha Couverture"], ts=datetime(2026, 3, 1))
+    add_run(db, lyon, "openai", competitors=["TOITURES DUPONT SARL"], ts=datetime(2026, 5, 1))
+    add_run(db, lyon, "gemini", competitors=["Toitures Dupont"], ts=datetime(2026, 4, 1))
+    add_run(db, lyon_2, "openai", competitors=["Toitures Dupont"], ts=datetime(2026, 4, 2))
+    add_run(db, paris, "anthropic", competitors=["Toitures Dupont", "toitures dupont"], ts=datetime(2026, 2, 1))
+
+    assert db.query(CompetitorIndexDB).count() == 5
+    report = competitor_report(db, "toitures dupont")
+    assert (report["name"], report["runs"], report["prospects"], report["campaigns"]) == ("Toitures Dupont", 5, 3, 3)
+    assert (report["first_seen"], report["last_seen"]) == ("2026-02-01T00:00:00", "2026-05-01T00:00:00")
+    assert report["models"] == {"openai": 3, "gemini": 1, "anthropic": 1}
+    assert [(c["city"], c["runs"], c["prospects"], c["models"]) for c in report["cities"]] == [
+        ("Lyon", 4, 2, {"openai": 3, "gemini": 1}),
+        ("Paris", 1, 1, {"anthropic": 1}),
+    ]
+    top = report["top_prospects"][0]
+    assert (top["prospect_id"], top["runs"], top["models"]) == (lyon.prospect_id, 3, {"openai": 2, "gemini": 1})
+
+    assert competitor_report(db, "Beta") is None
+    assert known_competitors(db, ["toitures dupont", "alpha couverture", "beta", ""]) == {
+        "toitures dupont": "Toitures Dupont", "alpha couverture": "Alpha Couverture",
+    }
+    assert known_competitors(db, []) == {}
+
+
+def test_known_names_canonicalize_competitors(db, monkeypatch):
+    p = add_prospect(db, "Lyon", status=ProspectStatus.SCHEDULED)
+    add_run(db, add_prospect(db, "Lyon"), "openai", competitors=["Toitures Dupont"])
+
+    monkeypatch.setattr(ia_test, "get_queries", lambda profession, city: ["couvreur Lyon"])
+    monkeypatch.setattr(ia_test, "extract_entities", lambda text: [
+        {"type": "company", "value": "TOITURES DUPONT SARL"}, {"type": "company", "value": "Élagage Martin"},
+    ])
+    ia_test.run_ia_test_campaign(db, p.campaign_id, dry_run=True)
+
+    run = db.query(RunDB).filter(RunDB.prospect_id == p.prospect_id).first()
+    assert jloads(run.competitors_entities) == ["Toitures Dupont", "Élagage Martin"]
+    assert competitor_report(db, "Toitures Dupont")["runs"] == 1 + len(ia_test.AI_CALLERS)
+    assert competitor_report(db, "elagage martin")["name"] == "Élagage Martin"
+
+
+def test_migration_backfills_existing_runs(tmp_path):
+    from alembic import command
+    from alembic.config import Config
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    cfg = Config()
+    cfg.set_main_option("script_location", str(database.MIGRATIONS_DIR))
+    with engine.begin() as conn:
+        cfg.attributes["connection"] = conn
+        command.upgrade(cfg, "b8c2e6f0a451")
+        conn.execute(insert(CampaignDB), [{"campaign_id": "c1", "profession": "couvreur", "city": "Lyon"}])
+        conn.execute(insert(ProspectDB), [{"prospect_id": "p1", "campaign_id": "c1", "name": "Toit Pro",
+                                           "city": "Lyon", "profession": "couvreur"}])
+        conn.execute(insert(RunDB), [
+            {"run_id": f"r{i}", "campaign_id": "c1", "prospect_id": "p1", "model": "openai",
+             "competitors_entities": jdumps(["Toitures Dupont"])}
+            for i in range(3)
+        ])
+
+    init_db(engine)
+    session = SessionLocal(bind=engine)
+    try:
+        assert competitor_report(session, "toitures dupont")["runs"] == 3
+    finally:
+        session.close()
+
+
+@pytest.mark.asyncio
+async def test_competitor_endpoint(db):
+    add_run(db, add_prospect(db, "Lyon"), "openai", competitors=["Toitures Dupont"])
+
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            resp = await client.get("/api/competitors/Toitures Dupont SARL")
+            assert resp.status_code == 200
+            assert resp.json()["cities"][0]["city"] == "Lyon"
+            assert (await client.get("/api/competitors/inconnu")).status_code == 404
+    finally:
+        app.dependency_overrides.pop(get_db, None)
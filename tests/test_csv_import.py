@@ -0,0 +1,96 @@
+"""Import CSV prospects — streaming, lots, dédoublonnage."""
+import io
+
+import pytest
+from httpx import AsyncClient
+
+from src.api.main import app
+from src.prospecting.database import get_db
+from src.prospecting.models import ProspectDB, ProspectStatus
+from src.prospecting.prospect_scan import DedupIndex, import_csv, registrable_domain
+from tests.conftest import add_campaign
+
+
+@pytest.fixture
+def campaign(db):
+    return add_campaign(db)
+
+
+CSV = (
+    "\ufeffname,website,phone,reviews_count,google_ads_active\n"
+    "Toit Pro SARL,https://www.toitpro.fr,0400,12,oui\n"
+    "Toit Pro,,,,\n"                                  # même nom normalisé
+    "Autre Nom,http://toitpro.fr/contact,,,\n"        # même domaine
+    "Couverture Martin,https://facebook.com/martin,,,\n"
+    "Zinguerie Durand,https://facebook.com/durand,,x,\n"   # domaine partagé : pas un doublon
+    ",https://vide.fr,,,\n"
+)
+
+
+def test_import_dedupes_in_file_and_against_campaign(db, campaign):
+    db.add(ProspectDB(campaign_id=campaign.campaign_id, name="Zinguerie Durand", city="Lyon", profession="couvreur"))
+    db.commit()
+
+    report = import_csv(db, io.BytesIO(CSV.encode("utf-8")), campaign, "Lyon", "couvreur", batch_size=2)
+
+    assert report == {"campaign_id": campaign.campaign_id, "created": 2, "duplicates": 3, "invalid": 1, "failed": 0}
+    rows = {p.name: p for p in db.query(ProspectDB).filter(ProspectDB.status == ProspectStatus.SCHEDULED.value)}
+    assert set(rows) == {"Toit Pro SARL", "Couverture Martin"}
+    assert rows["Toit Pro SARL"].reviews_count == 12 and rows["Toit Pro SARL"].google_ads_active
+    assert rows["Toit Pro SARL"].landing_token != rows["Couverture Martin"].landing_token
+
+
+def test_domains_compare_registrable_part():
+    assert [registrable_domain(u) for u in (
+        "https://www.martin.fr/contact", "martin.com", "https://martin.wixsite.com/toit",
+        "https://wixsite.com", "https://www.facebook.com/martin", "toit.co.uk", "192.168.0.1",
+    )] == ["martin.fr", "martin.com", "martin.wixsite.com", "", "", "toit.co.uk", ""]
+
+    index = DedupIndex()
+    assert index.add("Couverture Martin", "Lyon", "https://martin.fr")
+    assert index.add("Martin Toitures", "Lyon", "https://martin.com")          # autre TLD : autre site
+    assert index.add("Toit Durand", "Lyon", "https://durand.wixsite.com")
+    assert index.add("Zinc Dupont", "Lyon", "https://dupont.wixsite.com")       # même hébergeur, autre site
+    assert not index.add("Martin Couverture", "Lyon", "http://www.martin.fr/devis")
+
+
+def test_unreadable_file_reports_committed_and_failed(db, campaign):
+    rows = [f"Entreprise {i}\n".encode() for i in range(3000)]
+    body = b"name\n" + b"".join(rows) + b"Caf\xe9 Toit\n" + b"".join(rows)    # décodé par blocs de 8 Ko
+
+    report = import_csv(db, io.BytesIO(body), campaign, "Lyon", "couvreur", batch_size=500)
+
+    assert report["created"] and report["created"] % 500 == 0
+    assert 0 < report["failed"] < 500
+    assert report["created"] + report["failed"] < 3000
+    assert "utf-8" in report["error"]
+    assert db.query(ProspectDB).count() == report["created"]
+
+
+def test_import_stops_at_max_prospects(db, campaign):
+    body = "name\n" + "".join(f"Entreprise {i}\n" for i in range(25))
+
+    report = import_csv(db, io.BytesIO(body.encode()), campaign, "Lyon", "couvreur", max_prospects=12, batch_size=5)
+
+    assert report["created"] == 12
+    assert db.query(ProspectDB).count() == 12
+
+
+@pytest.mark.asyncio
+async def test_csv_upload_route(db, campaign):
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            params = {"city": "Lyon", "profession": "couvreur", "campaign_id": campaign.campaign_id}
+            resp = await client.post("/api/prospect-scan/csv", params=params, files={"file": ("p.csv", CSV.encode())})
+            assert resp.status_code == 200
+            assert resp.json()["created"] == 3
+
+            empty = await client.post("/api/prospect-scan/csv", params=params, files={"file": ("p.csv", b"name\n")})
+            assert empty.status_code == 400
+
+            bad = await client.post("/api/prospect-scan/csv", params=params, files={"file": ("p.csv", b"name\n\xff\xfe\n")})
+            assert bad.status_code == 400
+            assert (bad.json()["detail"]["created"], bad.json()["detail"]["failed"]) == (0, 0)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
@@ -0,0 +1,104 @@
+"""SendQueue — génération parallèle, incrémentale (hash par artefact), export streamé."""
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+from httpx import AsyncClient
+
+from src.api.main import app
+from src.prospecting import generate
+from src.prospecting.database import get_db, jdumps
+from src.prospecting.models import ProspectStatus
+from tests.conftest import add_prospects, add_run
+
+
+@pytest.fixture
+def send_queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(generate, "SEND_QUEUE_DIR", tmp_path)
+    monkeypatch.setattr(generate, "PUBLISHED_DIR", tmp_path / "published")
+    return tmp_path
+
+
+@pytest.fixture
+def prospects(db):
+    items = add_prospects(
+        db, 3, status=ProspectStatus.READY_ASSETS,
+        competitors_cited=jdumps(["alpha", "beta"]), ia_visibility_score=2.0, eligibility_flag=True,
+    )
+    for p in items:
+        add_run(db, p, queries=["couvreur Lyon"], mentions=[False])
+    return items
+
+
+def test_second_pass_skips_unchanged(db, prospects, send_queue):
+    first = generate.delivery_generate(db, prospects)
+    assert (first["generated"], first["skipped"], first["failed"]) == (3, 0, 0)
+    for p in prospects:
+        out_dir = send_queue / p.prospect_id
+        assert {f.name for f in out_dir.iterdir()} == {
+            "email.json", "email_body.txt", "video_script.txt", "audit.html", generate.MANIFEST_NAME,
+        }
+        assert "Toit" in (out_dir / "audit.html").read_text(encoding="utf-8")
+
+    audit = send_queue / prospects[0].prospect_id / "audit.html"
+    mtime = audit.stat().st_mtime_ns
+
+    second = generate.delivery_generate(db, prospects)
+    assert (second["generated"], second["skipped"], second["failed"]) == (0, 3, 0)
+    assert audit.stat().st_mtime_ns == mtime
+    assert second["send_queue_csv"].endswith(".csv")
+
+
+def test_changed_or_missing_artifacts_regenerate(db, prospects, send_queue):
+    generate.delivery_generate(db, prospects)
+
+    prospects[0].ia_visibility_score = 7.0
+    db.commit()
+    (send_queue / prospects[1].prospect_id / "email.json").unlink()
+
+    result = generate.delivery_generate(db, prospects)
+    assert (result["generated"], result["skipped"]) == (2, 1)
+    assert (send_queue / prospects[1].prospect_id / "email.json").exists()
+
+
+def test_failure_is_counted_not_raised(db, prospects, send_queue):
+    (send_queue / prospects[0].prospect_id).write_text("pas un dossier")
+
+    result = generate.delivery_generate(db, prospects)
+
+    assert (result["generated"], result["failed"]) == (2, 1)
+    assert result["errors"][0]["prospect_id"] == prospects[0].prospect_id
+
+
+@pytest.mark.asyncio
+async def test_send_queue_streaming_export(db, prospects, send_queue):
+    prospects[2].eligibility_flag = False
+    db.commit()
+
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            url = f"/api/campaign/{prospects[0].campaign_id}"
+            resp = await client.get(f"{url}/send-queue.csv")
+            assert resp.status_code == 200
+            assert resp.headers["content-type"].startswith("text/csv")
+            rows = list(csv.DictReader(io.StringIO(resp.text)))
+            assert [r["name"] for r in rows] == ["Toit 0", "Toit 1"]
+            assert rows[0]["competitor_1"] == "Alpha"
+            sync_since = resp.headers["x-sync-since"]
+
+            prospects[1].video_url = "https://v.example.com/1"
+            db.commit()
+
+            resp = await client.get(f"{url}/send-queue.ndjson", params={"since": sync_since})
+            lines = [json.loads(line) for line in resp.text.splitlines()]
+            assert [line["prospect_id"] for line in lines] == [prospects[1].prospect_id]
+
+            future = datetime.utcnow().replace(year=2100).isoformat()
+            assert (await client.get(f"{url}/send-queue.ndjson", params={"since": future})).text == ""
+            assert (await client.get(f"{url}/send-queue.xml")).status_code == 404
+            assert (await client.get("/api/campaign/unknown/send-queue.csv")).status_code == 404
+    finally:
+        app.dependency_overrides.pop(get_db, None)
@@ -0,0 +1,53 @@
+"""Journal prospect_events — écriture (ORM, Core, transitions) et lecture par curseur."""
+import pytest
+from httpx import AsyncClient
+
+from src.api.main import app
+from src.prospecting.database import get_db
+from src.prospecting.events import events_since, latest_seq
+from src.prospecting.ia_test import run_ia_test_campaign
+from src.prospecting.models import ProspectInput, ProspectScanInput
+from src.prospecting.prospect_scan import scan_prospects
+
+
+@pytest.fixture
+def prospects(db):
+    return scan_prospects(db, ProspectScanInput(
+        city="Lyon", profession="couvreur",
+        manual_prospects=[ProspectInput(name=f"Toit {i}", city="Lyon", profession="couvreur") for i in range(2)],
+    ))
+
+
+def test_pipeline_writes_ordered_events(db, prospects):
+    created = events_since(db)
+    assert [(e.kind, e.to_status) for e in created] == [("created", "SCHEDULED")] * 2
+    cursor = created[-1].seq
+
+    run_ia_test_campaign(db, prospects[0].campaign_id, dry_run=True)
+
+    new = events_since(db, cursor)
+    kinds = [e.kind for e in new]
+    assert kinds[0] == "transition"                             # SCHEDULED → TESTING au début de chaque test
+    assert kinds.count("run") == 2 * len({e.reason for e in new if e.kind == "run"})
+    assert [e.to_status for e in new if e.kind == "transition"] == ["TESTING", "TESTED"] * 2
+    assert [e.seq for e in new] == sorted(e.seq for e in new)
+    assert latest_seq(db) == new[-1].seq
+    assert events_since(db, latest_seq(db)) == []
+
+
+@pytest.mark.asyncio
+async def test_events_api_pages_with_cursor(db, prospects):
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            first = (await client.get("/api/events", params={"limit": 1})).json()
+            assert len(first["events"]) == 1 and first["latest"] == 2
+
+            rest = (await client.get("/api/events", params={"since": first["next"]})).json()
+            assert [e["prospect_id"] for e in rest["events"]] == [prospects[1].prospect_id]
+            assert rest["next"] == rest["latest"]
+
+            other = (await client.get("/api/events", params={"campaign_id": "x", "kind": "run"})).json()
+            assert other == {"events": [], "next": 0, "latest": 2}
+    finally:
+        app.dependency_overrides.pop(get_db, None)
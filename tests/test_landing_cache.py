@@ -0,0 +1,116 @@
+"""Cache landing /couvreur — LRU, invalidation ORM, ETag/304."""
+import threading
+from datetime import datetime
+
+import pytest
+from httpx import AsyncClient
+
+from src.api.main import app
+from src.prospecting.database import get_db, jdumps
+from src.prospecting import publish
+from src.prospecting.landing_cache import LandingCache, LandingPage, landing_cache, republisher, wait_republished
+from src.prospecting.models import ProspectDB
+from tests.conftest import add_prospect, new_run
+
+
+@pytest.fixture(autouse=True)
+def _clear_landing_cache():
+    landing_cache.clear()
+    yield
+    landing_cache.clear()
+
+
+@pytest.fixture
+def prospect(db):
+    return add_prospect(db, competitors_cited=jdumps(["alpha"]), ia_visibility_score=2.0)
+
+
+def _cache_page(p: ProspectDB, lang: str = "fr") -> None:
+    generation = landing_cache.generation(p.prospect_id)
+    assert landing_cache.put(p.landing_token, lang, LandingPage(p.prospect_id, "<p>x</p>", datetime.utcnow()), generation)
+
+
+def test_lru_eviction_and_generation_guard():
+    cache = LandingCache(max_entries=2)
+    for i in range(3):
+        cache.put(f"t{i}", "fr", LandingPage(f"p{i}", "x", datetime.utcnow()), 0)
+
+    assert cache.get("t0", "fr") is None
+    assert cache.get("t2", "fr") is not None
+
+    # invalidé pendant le rendu → la page calculée n'est pas stockée
+    generation = cache.generation("p9")
+    cache.invalidate_prospect("p9")
+    assert not cache.put("t9", "fr", LandingPage("p9", "x", datetime.utcnow()), generation)
+
+
+def test_run_insert_invalidates(db, prospect):
+    _cache_page(prospect)
+    _cache_page(prospect, "en")
+
+    db.add(new_run(prospect, queries=["couvreur Lyon"], mentions=[False]))
+    db.commit()
+
+    assert landing_cache.get(prospect.landing_token, "fr") is None
+    assert landing_cache.get(prospect.landing_token, "en") is None
+
+
+def test_only_displayed_fields_invalidate(db, prospect):
+    _cache_page(prospect)
+
+    prospect.status = "SCHEDULED"
+    db.commit()
+    assert landing_cache.get(prospect.landing_token, "fr") is not None
+
+    prospect.screenshot_url = "https://cdn.example.com/a.png"
+    db.commit()
+    assert landing_cache.get(prospect.landing_token, "fr") is None
+
+
+def test_commit_defers_republication(db, prospect, monkeypatch):
+    calls = []
+    monkeypatch.setattr(republisher, "synchronous", False)
+    monkeypatch.setattr(publish, "republish_prospects", lambda bind, ids: calls.append((threading.current_thread().name, set(ids))))
+
+    db.add(new_run(prospect, queries=["couvreur Lyon"], mentions=[False]))
+    db.commit()
+    wait_republished()
+
+    assert [(name.startswith("republish"), ids) for name, ids in calls] == [(True, {prospect.prospect_id})]
+
+
+def test_rollback_keeps_cache(db, prospect):
+    _cache_page(prospect)
+
+    prospect.ia_visibility_score = 9.0
+    db.flush()
+    db.rollback()
+
+    assert landing_cache.get(prospect.landing_token, "fr") is not None
+
+
+@pytest.mark.asyncio
+async def test_landing_etag_roundtrip(db, prospect):
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            url = f"/couvreur?t={prospect.landing_token}"
+            first = await client.get(url)
+            assert first.status_code == 200
+            etag = first.headers["etag"]
+            assert first.headers["last-modified"]
+
+            cached = await client.get(url, headers={"If-None-Match": etag})
+            assert cached.status_code == 304
+
+            db.add(new_run(prospect, queries=["couvreur Lyon"], mentions=[False]))
+            db.commit()
+
+            fresh = await client.get(url, headers={"If-None-Match": etag})
+            assert fresh.status_code == 200
+            assert fresh.headers["etag"] != etag
+
+            missing = await client.get("/couvreur?t=unknown")
+            assert missing.status_code == 404
+    finally:
+        app.dependency_overrides.pop(get_db, None)
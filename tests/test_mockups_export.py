@@ -0,0 +1,125 @@
+"""Mockups generation and streaming zip export tests."""
+import io
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.domain.competitor_analysis import CompetitorAnalysis, Gap
+from src.orchestrator.agents.generate_agent import GenerateAgent
+from src.services.mockups_export import MockupsExport, mockups_context, mockups_digest, stream_zip
+
+
+def _recommendations():
+    analysis = CompetitorAnalysis(target_company="Le <Bon> Goût")
+    analysis.visibility_gaps = [
+        Gap("structured_data", "Schema.org manquant", "high"),
+        Gap("content", "Contenu non optimisé", "medium"),
+        Gap("editorial", "Pas de FAQ", "low"),
+    ]
+    return GenerateAgent().execute(analysis)
+
+
+def _audit():
+    return SimpleNamespace(
+        company_name="Le <Bon> Goût",
+        language="fr",
+        results={"recommendations": [rec.to_dict() for rec in _recommendations()]},
+    )
+
+
+def test_generate_mockups_members():
+    """Index, one escaped page per recommendation, then the guide."""
+    members = list(GenerateAgent().generate_mockups(_recommendations(), "Le <Bon> Goût"))
+    names = [name for name, _ in members]
+
+    assert names[0] == "index.html"
+    assert names[-1] == "guide.md"
+    assert len(names) == 5
+    assert names[1].startswith("01-")
+
+    pages = dict(members)
+    assert "Le &lt;Bon&gt; Goût" in pages["index.html"]
+    json_ld_page = next(text for name, text in members if 'application/ld+json' in text)
+    assert '"@type": "Organization"' in json_ld_page
+
+
+def test_generate_mockups_follow_audit_language():
+    """Page chrome and lang attribute use the agent's language."""
+    pages = dict(GenerateAgent(language="en").generate_mockups(_recommendations(), "Le <Bon> Goût"))
+
+    assert '<html lang="en">' in pages["index.html"]
+    assert "AI optimization mockups — Le &lt;Bon&gt; Goût" in pages["index.html"]
+    assert "Complete integration guide" in pages["index.html"]
+    page = next(text for name, text in pages.items() if name.startswith("01-"))
+    assert "Priority P" in page and "Priorité" not in page
+
+
+@pytest.mark.asyncio
+async def test_export_route_encodes_filename(monkeypatch):
+    """Non-ASCII company names use the RFC 6266 filename* form."""
+    from uuid import uuid4
+
+    from starlette.requests import Request
+
+    from src.api.routes import export
+
+    audit = SimpleNamespace(**vars(_audit()), id=uuid4(), plan="pro", status="completed", completed_at=None)
+
+    async def get_audit(db, audit_id):
+        return audit
+
+    monkeypatch.setattr(export.AuditService, "get_audit", get_audit)
+    request = Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+
+    response = await export.export_mockups_zip(audit.id, request, db=None)
+
+    assert response.headers["content-disposition"] == (
+        f"attachment; filename*=utf-8''mockups_Le%20%3CBon%3E%20Go%C3%BBt_{audit.id}.zip"
+    )
+
+
+def test_stream_zip_yields_per_member():
+    """Each member is flushed before the next one is produced."""
+    produced = []
+
+    def members():
+        for i in range(3):
+            produced.append(i)
+            yield f"{i}.html", b"x" * 1000
+
+    chunks = []
+    for chunk in stream_zip(members()):
+        chunks.append((len(produced), chunk))
+
+    assert [count for count, _ in chunks[:3]] == [1, 2, 3]
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunk for _, chunk in chunks)))
+    assert archive.namelist() == ["0.html", "1.html", "2.html"]
+    assert archive.testzip() is None
+
+
+def test_mockups_cached_on_disk(tmp_path):
+    """Second download replays cached members: identical archive bytes."""
+    export = MockupsExport(str(tmp_path))
+    context = mockups_context(_audit())
+    digest = mockups_digest(context)
+
+    first = b"".join(export.stream(context, digest))
+    assert (export.member_dir(digest) / "manifest.json").exists()
+
+    second = b"".join(export.stream(context, digest))
+    assert second == first
+    assert zipfile.ZipFile(io.BytesIO(second)).read("index.html").startswith(b"<!DOCTYPE html>")
+
+
+def test_interrupted_stream_is_not_cached(tmp_path):
+    """A download aborted mid-archive leaves no manifest."""
+    export = MockupsExport(str(tmp_path))
+    context = mockups_context(_audit())
+    digest = mockups_digest(context)
+
+    stream = export.stream(context, digest)
+    next(stream)
+    stream.close()
+
+    assert not (export.member_dir(digest) / "manifest.json").exists()
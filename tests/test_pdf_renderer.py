@@ -0,0 +1,132 @@
+"""Guide PDF rendering and disk cache tests."""
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from src.services.pdf_renderer import PDFRenderer, guide_context, guide_digest, render_guide_html, render_guide_pdf
+from src.utils.storage import atomic_write_bytes, content_digest
+
+
+def _audit(**overrides):
+    fields = dict(
+        id=uuid4(),
+        company_name="Le Bon Goût",
+        sector="restaurant",
+        location="Paris",
+        visibility_score=42.5,
+        completed_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        results={
+            "recommendations": [
+                {
+                    "type": "content",
+                    "title": "Page À propos <optimisée>",
+                    "description": "Décrire l'établissement",
+                    "priority": 1,
+                    "estimated_impact": "high",
+                    "content": {"format": "HTML", "sections": [{"heading": "À propos", "content": "Cuisine du marché"}]},
+                    "integration_guide": "# Guide\n1. Copier la section",
+                }
+            ]
+        },
+    )
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+def test_content_digest_is_canonical():
+    """Key order does not change the digest, values do."""
+    assert content_digest({"a": 1, "b": [1, 2]}) == content_digest({"b": [1, 2], "a": 1})
+    assert content_digest({"a": 1}) != content_digest({"a": 2})
+
+
+def test_guide_digest_tracks_rendered_inputs():
+    """Same audit content → same PDF key, regardless of audit identity."""
+    audit = _audit()
+    digest = guide_digest(guide_context(audit))
+
+    assert guide_digest(guide_context(_audit())) == digest
+    assert guide_digest(guide_context(_audit(visibility_score=50))) != digest
+    assert guide_digest(guide_context(_audit(results={"recommendations": []}))) != digest
+
+
+def test_render_guide_html_escapes_content():
+    """Recommendation text is HTML-escaped in the guide."""
+    html = render_guide_html(guide_context(_audit()))
+
+    assert "Le Bon Goût" in html
+    assert "Page À propos &lt;optimisée&gt;" in html
+    assert "Cuisine du marché" in html
+
+
+def test_atomic_write_bytes(tmp_path):
+    """Writes create parent directories and leave no temporary files."""
+    path = atomic_write_bytes(tmp_path / "ab" / "abc.pdf", b"%PDF-1.7")
+    atomic_write_bytes(path, b"%PDF-1.7 v2")
+
+    assert path.read_bytes() == b"%PDF-1.7 v2"
+    assert [p.name for p in path.parent.iterdir()] == ["abc.pdf"]
+
+
+@pytest.mark.asyncio
+async def test_render_serves_cached_file_without_workers(tmp_path):
+    """A PDF already on disk for the digest is returned as is."""
+    renderer = PDFRenderer(str(tmp_path), workers=1)
+    context = guide_context(_audit())
+    digest = guide_digest(context)
+    atomic_write_bytes(renderer.path_for(digest), b"%PDF cached")
+
+    path = await renderer.render(context)
+
+    assert path.read_bytes() == b"%PDF cached"
+    assert path.parent.name == digest[:2]
+    assert renderer._executor is None
+
+
+def test_render_guide_pdf():
+    """WeasyPrint renders the guide (needs pango, as in the Docker image)."""
+    try:
+        import weasyprint  # noqa: F401
+    except (ImportError, OSError) as exc:
+        pytest.skip(f"WeasyPrint unavailable: {exc}")
+
+    pdf = render_guide_pdf(guide_context(_audit()))
+
+    assert pdf.startswith(b"%PDF")
+
+
+@pytest.mark.asyncio
+async def test_export_route_caches_digest_per_audit(tmp_path, monkeypatch):
+    """Once the digest is cached, 304s and downloads skip the database."""
+    from starlette.requests import Request
+
+    from src.api.routes import export
+    from src.services.results_cache import ResultsCache
+
+    audit = _audit(plan="pro", status="completed")
+    renderer = PDFRenderer(str(tmp_path), workers=1)
+    atomic_write_bytes(renderer.path_for(guide_digest(guide_context(audit))), b"%PDF cached")
+    loads = []
+
+    async def get_audit(db, audit_id):
+        loads.append(audit_id)
+        return audit
+
+    monkeypatch.setattr(export.AuditService, "get_audit", get_audit)
+    monkeypatch.setattr(export, "results_cache", ResultsCache(local_ttl=60))
+    monkeypatch.setattr(export, "pdf_renderer", renderer)
+
+    def request(**headers):
+        raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+        return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+    first = await export.export_guide_pdf(audit.id, request(), db=None)
+    assert first.status_code == 200
+    assert "filename*=utf-8''audit_Le%20Bon%20Go%C3%BBt_" in first.headers["content-disposition"]
+
+    again = await export.export_guide_pdf(audit.id, request(), db=None)
+    cached = await export.export_guide_pdf(audit.id, request(if_none_match=first.headers["etag"]), db=None)
+    assert again.status_code == 200
+    assert cached.status_code == 304
+    assert loads == [audit.id]
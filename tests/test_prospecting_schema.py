@@ -0,0 +1,163 @@
+"""Schéma prospecting — migrations alembic, index des requêtes chaudes (EXPLAIN QUERY PLAN)."""
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.exc import IntegrityError
+
+from src.prospecting import database
+from src.prospecting.database import SessionLocal, init_db, jdumps
+from src.prospecting.models import Base, ProspectDB, ProspectStatus
+from tests.conftest import add_campaign, add_prospect, add_run, memory_engine
+
+
+def _engine(path):
+    return create_engine(f"sqlite:///{path}")
+
+
+def _upgrade(engine, revision: str) -> None:
+    from alembic import command
+    from alembic.config import Config
+
+    cfg = Config()
+    cfg.set_main_option("script_location", str(database.MIGRATIONS_DIR))
+    with engine.begin() as connection:
+        cfg.attributes["connection"] = connection
+        command.upgrade(cfg, revision)
+
+
+def _diffs(engine):
+    with engine.connect() as conn:
+        context = MigrationContext.configure(conn, opts={"include_name": database.include_name})
+        return compare_metadata(context, Base.metadata)
+
+
+def test_upgrade_fresh_db_matches_models(tmp_path):
+    engine = _engine(tmp_path / "fresh.db")
+    init_db(engine)
+    init_db(engine)     # idempotent
+
+    assert _diffs(engine) == []
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+
+def test_upgrade_existing_create_all_db(tmp_path):
+    # base créée par create_all avant les migrations : schéma baseline, sans alembic_version
+    engine = _engine(tmp_path / "legacy.db")
+    _upgrade(engine, "a1c4e2f70b11")
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE alembic_version"))
+
+    init_db(engine)
+
+    assert _diffs(engine) == []
+    unique = {ix["name"]: ix["unique"] for ix in inspect(engine).get_indexes("prospects")}
+    assert unique["ix_prospects_landing_token"]
+
+
+@pytest.fixture
+def engine():
+    return memory_engine(migrate=True)     # index et colonnes tels que créés par les migrations
+
+
+def _plans(db, call) -> list:
+    """EXPLAIN QUERY PLAN des SELECT émis par un helper CRUD."""
+    engine, seen = db.get_bind(), []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            seen.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        call(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    with engine.connect() as conn:
+        return [
+            " | ".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params))
+            for sql, params in seen
+        ]
+
+
+def test_hot_queries_use_indexes(db):
+    campaign_id = add_campaign(db).campaign_id
+
+    checks = {
+        "ix_prospects_landing_token": lambda s: database.db_get_prospect_by_token(s, "tok"),
+        "ix_prospects_campaign_status_score": lambda s: database.db_list_prospects(
+            s, campaign_id, ProspectStatus.SCORED.value),
+        "ix_test_runs_prospect_ts": lambda s: database.db_list_runs(s, "p1"),
+    }
+    for index, call in checks.items():
+        [plan] = _plans(db, call)
+        assert index in plan, plan
+        assert "TEMP B-TREE" not in plan, plan
+
+
+def test_landing_token_is_unique(db):
+    campaign = add_campaign(db)
+    for name in ("A", "B"):
+        db.add(ProspectDB(campaign_id=campaign.campaign_id, name=name, city="Lyon",
+                          profession="couvreur", landing_token="same"))
+    with pytest.raises(IntegrityError):
+        db.commit()
+
+
+# ─────────────────────────── RÉPONSES COMPRESSÉES ───────────────────────────
+
+def _answers(n: int = 5) -> list:
+    return [f"Voici les meilleurs couvreurs à Lyon, réponse {i} : " + "Toit Alpha, Beta Couverture. " * 40 for i in range(n)]
+
+
+def test_raw_answers_compressed_and_deferred(db):
+    p = add_prospect(db)
+    payload = jdumps(_answers())
+    run = add_run(db, p, raw_answers=payload)
+    run_id, prospect_id = run.run_id, p.prospect_id
+
+    kind, size = db.execute(text("SELECT typeof(raw_answers), length(raw_answers) FROM test_runs")).one()
+    assert kind == "blob"
+    assert size * 5 < len(payload.encode("utf-8"))
+
+    db.expunge_all()
+    seen = []
+    capture = lambda conn, cursor, statement, *args: seen.append(statement)
+    event.listen(db.get_bind(), "before_cursor_execute", capture)
+    try:
+        [loaded] = database.db_list_runs(db, prospect_id)
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", capture)
+    assert "raw_answers" not in seen[0]
+    assert loaded.raw_answers == payload          # chargé à la demande, décodé
+
+    assert database.db_run_answers(db, run_id)["raw_answers"] == _answers()
+    assert database.db_run_answers(db, "inconnu") is None
+
+
+def test_upgrade_compresses_existing_answers(tmp_path):
+    engine = _engine(tmp_path / "runs.db")
+    _upgrade(engine, "b7d2f9a3c5e8")
+    payload = jdumps(_answers())
+    entities = [[{"type": "company", "value": "Toit Alpha"}]] * 5
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO campaigns VALUES ('c1', 'couvreur', 'Lyon', '2026-01-01 00:00:00', "
+                          "'Europe/Rome', '[]', '[]', 'AUTO_TEST', 'active', 30)"))
+        conn.execute(text("INSERT INTO prospects (prospect_id, campaign_id, name, city, profession, competitors_cited, "
+                          "eligibility_flag, landing_token, status, created_at, updated_at) VALUES ('p1', 'c1', 'Toit', "
+                          "'Lyon', 'couvreur', '[]', 0, 't1', 'TESTED', '2026-01-01 00:00:00', '2026-01-01 00:00:00')"))
+        for run_id in ("r1", "r2"):     # même texte sur deux runs → stocké une fois
+            conn.execute(text("INSERT INTO test_runs VALUES (:run_id, 'c1', 'p1', '2026-01-01 00:00:00', 'openai', "
+                              "'[]', :raw, :entities, 0, '[]', '[]', NULL)"),
+                         {"run_id": run_id, "raw": payload, "entities": jdumps(entities)})
+
+    init_db(engine)
+
+    assert _diffs(engine) == []
+    session = SessionLocal(bind=engine)
+    try:
+        assert database.db_run_answers(session, "r2") == {"raw_answers": _answers(), "extracted_entities": entities}
+        assert session.execute(text("SELECT count(*) FROM answers")).scalar() == 5
+    finally:
+        session.close()
@@ -0,0 +1,63 @@
+"""Templates prospecting (Jinja2) — échappement, variantes de langue, warm-up."""
+from types import SimpleNamespace
+
+from src.prospecting.templates import get_template, render, template_lang, warm_templates
+
+
+SUMMARY = {
+    "total_runs": 3,
+    "models": ["openai", "anthropic"],
+    "dates": ["03/01/2026"],
+    "mentioned_any": False,
+    "mention_count": 0,
+    "query_labels": ["couvreur <b>Lyon</b>", "", "", "", ""],
+    "query_mentions": [1, 0, 0, 0, 0],
+}
+
+
+def _landing(lang: str) -> str:
+    return get_template("landing.html", lang).render(
+        company_name="Toit & <Fils>",
+        city="Lyon",
+        screenshot_url='https://cdn.example.com/a.png"onerror="x',
+        summary=SUMMARY,
+        competitors=["Alpha"],
+    )
+
+
+def test_landing_is_escaped():
+    html = _landing("fr")
+
+    assert "Toit &amp; &lt;Fils&gt;" in html
+    assert "couvreur &lt;b&gt;Lyon&lt;/b&gt;" in html
+    assert 'a.png&#34;onerror=&#34;x"' in html
+    # requêtes vides ignorées
+    assert html.count("<tr><td>") == 1
+
+
+def test_language_variants():
+    assert 'lang="en"' in _landing("en")
+    assert "Concurrents cités à votre place" in _landing("fr")
+    # pas de variante es → template fr
+    assert get_template("landing.html", "es") is get_template("landing.html", "fr")
+    assert template_lang("xx") == "fr"
+    assert template_lang("EN") == "en"
+
+
+def test_email_templates():
+    prospect = SimpleNamespace(city="Lyon", profession="couvreur")
+    context = dict(
+        prospect=prospect, competitors=["Alpha"], comp1="Alpha", comp2="",
+        video="https://v", landing_url="https://l", signature="EURKAI",
+    )
+
+    assert render("email_subject.txt", "fr", **context) == "À Lyon, ChatGPT recommande Alpha. Pas vous."
+    body = render("email_body.txt", "fr", **context)
+    assert "Alpha est régulièrement cité" in body
+    assert "(et parfois" not in body
+    # texte brut : pas d'échappement HTML
+    assert render("email_subject.txt", "fr", **{**context, "comp1": "A & B"}).endswith("A & B. Pas vous.")
+
+
+def test_warm_templates_resolves_every_language():
+    assert warm_templates() >= 5 * len(["audit.html", "landing.html", "email_subject.txt", "email_body.txt"])
@@ -0,0 +1,73 @@
+"""Publication statique landing + audit (READY_TO_SEND)."""
+import pytest
+
+from src.prospecting import generate, publish
+from src.prospecting.assets import mark_ready_to_send
+from src.prospecting.database import jdumps
+from src.prospecting.models import ProspectStatus
+from tests.conftest import add_prospect, add_run
+
+
+@pytest.fixture
+def prospect(db):
+    p = add_prospect(
+        db, status=ProspectStatus.READY_ASSETS,
+        competitors_cited=jdumps(["alpha"]), ia_visibility_score=2.0, eligibility_flag=True,
+        video_url="https://v.example.com/1", screenshot_url="https://cdn.example.com/1.png",
+    )
+    add_run(db, p, queries=["couvreur Lyon"], mentions=[False])
+    return p
+
+
+def test_mark_ready_publishes_static_pages(db, prospect, published_dir):
+    assert "/couvreur?t=" in generate.landing_url(prospect)
+
+    mark_ready_to_send(db, prospect.prospect_id)
+
+    token_dir = published_dir / prospect.landing_token
+    digest = publish.current_digest(prospect.landing_token)
+    assert (token_dir / "index.html").read_text(encoding="utf-8") == (token_dir / digest / "index.html").read_text(encoding="utf-8")
+    assert "Toit Pro" in (token_dir / "audit.html").read_text(encoding="utf-8")
+    assert generate.landing_url(prospect).endswith(f"/p/{prospect.landing_token}/")
+
+
+def test_rebuild_only_when_data_changes(db, prospect, published_dir, monkeypatch):
+    monkeypatch.setattr(publish, "PUBLISH_KEEP", 1)
+
+    first = publish.publish_prospect(db, prospect)
+    assert first["rebuilt"]
+    assert not publish.publish_prospect(db, prospect)["rebuilt"]
+
+    prospect.status = ProspectStatus.READY_TO_SEND.value    # non affiché
+    db.commit()
+    assert not publish.publish_prospect(db, prospect)["rebuilt"]
+
+    prospect.screenshot_url = "https://cdn.example.com/2.png"
+    db.commit()                                             # republié par le hook after_commit
+    second = publish.publish_prospect(db, prospect)
+    assert not second["rebuilt"]
+    assert second["digest"] != first["digest"]
+    assert publish.current_digest(prospect.landing_token) == second["digest"]
+
+    versions = [d.name for d in (published_dir / prospect.landing_token).iterdir() if d.is_dir()]
+    assert versions == [second["digest"]]
+
+    assert publish.publish_campaign(db, prospect.campaign_id) == {
+        "campaign_id": prospect.campaign_id, "published": 0, "skipped": 1,
+    }
+
+
+def test_commit_republishes_published_pages(db, prospect, published_dir):
+    mark_ready_to_send(db, prospect.prospect_id)
+    first = publish.current_digest(prospect.landing_token)
+
+    add_run(db, prospect, "anthropic", queries=["couvreur Lyon"], mentions=[True])
+    second = publish.current_digest(prospect.landing_token)
+    assert second != first
+
+    prospect.ia_visibility_score = 7.5      # rescore
+    db.commit()
+    assert publish.current_digest(prospect.landing_token) not in (first, second)
+    assert (published_dir / prospect.landing_token / "index.html").read_text(encoding="utf-8") == (
+        published_dir / prospect.landing_token / publish.current_digest(prospect.landing_token) / "index.html"
+    ).read_text(encoding="utf-8")
@@ -0,0 +1,88 @@
+"""Résolution des concurrents — regroupement MinHash / LSH, incrémental, scoring et rapport par concurrent canonique."""
+from sqlalchemy import create_engine, insert
+
+from src.prospecting import database
+from src.prospecting.competitors import competitor_report, known_competitors
+from src.prospecting.database import SessionLocal, init_db, jdumps, jloads
+from src.prospecting.models import (
+    CampaignDB, CompetitorAliasDB, CompetitorDB, ProspectDB, ProspectStatus, TestRunDB as RunDB,
+)
+from src.prospecting.resolution import resolve_names
+from src.prospecting.scoring import run_scoring
+from tests.conftest import add_prospect, add_run
+
+
+def test_variants_cluster_into_one_entity(db):
+    entities = resolve_names(db, [
+        "Toitures Martin", "Martin Toiture", "MARTIN TOITURES SARL", "Toitures Dupont", "Toitures 42", "Toitures 43",
+    ])
+    martin = entities["Toitures Martin"]
+    assert entities["Martin Toiture"] == entities["MARTIN TOITURES SARL"] == martin
+    assert len({e.entity_id for e in entities.values()}) == 4
+    assert entities["Toitures 42"] != entities["Toitures 43"]
+
+
+def test_resolution_is_incremental_and_stable(db):
+    first = resolve_names(db, ["Couvreurs Réunis"])["Couvreurs Réunis"]
+    db.commit()
+    again = resolve_names(db, ["Couvreur Reuni", "Couvreurs Réunis", ""])
+    assert set(again) == {"Couvreur Reuni", "Couvreurs Réunis"}
+    assert again["Couvreur Reuni"] == again["Couvreurs Réunis"] == first
+    assert first.name == "Couvreurs Réunis"
+    assert db.query(CompetitorDB).count() == 1
+    assert db.query(CompetitorAliasDB).count() == 2
+
+
+def test_report_and_known_names_merge_aliases(db):
+    lyon, paris = add_prospect(db, "Lyon", status=ProspectStatus.TESTED), add_prospect(db, "Paris", status=ProspectStatus.TESTED)
+    add_run(db, lyon, "openai", mentions=[False] * 5, competitors=["Toitures Martin"])
+    add_run(db, lyon, "openai", mentions=[False] * 5, competitors=["Martin Toiture"])
+    add_run(db, paris, "gemini", mentions=[False] * 5, competitors=["Martin Toitures SARL", "Toitures Dupont"])
+
+    report = competitor_report(db, "martin toiture")
+    assert (report["name"], report["runs"], report["prospects"]) == ("Toitures Martin", 3, 2)
+    assert report["aliases"] == ["martin toiture", "martin toitures", "toitures martin"]
+    assert report["top_prospects"][0]["models"] == {"openai": 2}
+    assert known_competitors(db, ["martin toiture"])["martin toiture"] == "Toitures Martin"
+
+
+def test_scoring_counts_runs_per_entity(db):
+    p = add_prospect(db, status=ProspectStatus.TESTED)
+    add_run(db, p, "openai", mentions=[False] * 5, competitors=["Toitures Martin", "Martin Toiture"])
+    add_run(db, p, "anthropic", mentions=[False] * 5, competitors=["Martin Toitures", "Toitures Dupont"])
+    add_run(db, p, "gemini", mentions=[False] * 5, competitors=["Toitures Dupont"])
+
+    run_scoring(db, p.campaign_id)
+    db.refresh(p)
+    # 1 run par modèle pour chaque concurrent ; nom canonique = 1re clé du lot dans l'ordre trié
+    assert jloads(p.competitors_cited) == ["Martin Toiture", "Toitures Dupont"]
+    assert p.eligibility_flag is True
+
+
+def test_migration_resolves_indexed_names(tmp_path):
+    from alembic import command
+    from alembic.config import Config
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    cfg = Config()
+    cfg.set_main_option("script_location", str(database.MIGRATIONS_DIR))
+    with engine.begin() as conn:
+        cfg.attributes["connection"] = conn
+        command.upgrade(cfg, "b8c2e6f0a451")
+        conn.execute(insert(CampaignDB), [{"campaign_id": "c1", "profession": "couvreur", "city": "Lyon"}])
+        conn.execute(insert(ProspectDB), [{"prospect_id": "p1", "campaign_id": "c1", "name": "Toit Pro",
+                                           "city": "Lyon", "profession": "couvreur"}])
+        conn.execute(insert(RunDB), [
+            {"run_id": "r1", "campaign_id": "c1", "prospect_id": "p1", "model": "openai",
+             "competitors_entities": jdumps(["Toitures Martin"])},
+            {"run_id": "r2", "campaign_id": "c1", "prospect_id": "p1", "model": "openai",
+             "competitors_entities": jdumps(["Martin Toiture SARL"])},
+        ])
+
+    init_db(engine)
+    session = SessionLocal(bind=engine)
+    try:
+        report = competitor_report(session, "Toitures Martin")
+        assert (report["runs"], len(report["aliases"])) == (2, 2)
+    finally:
+        session.close()
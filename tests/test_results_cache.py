@@ -0,0 +1,138 @@
+"""Completed-audit payload cache and conditional response tests."""
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from src.api.http_cache import conditional_response
+from src.services.results_cache import ResultsCache, CachedPayload, RESULTS, RECOMMENDATIONS_JSON
+
+
+def _request(**headers) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+def _audit(plan: str = "pro"):
+    return SimpleNamespace(
+        id=uuid4(), plan=plan, status="completed", completed_at=datetime(2026, 1, 1, tzinfo=timezone.utc)
+    )
+
+
+def test_conditional_response_etag():
+    """Matching If-None-Match yields an empty 304 with validators."""
+    etag = '"abc"'
+
+    full = conditional_response(_request(), b"{}", "application/json", etag)
+    assert full.status_code == 200
+    assert full.headers["etag"] == etag
+
+    for header in ('"abc"', 'W/"abc"', '"zzz", "abc"', "*"):
+        cached = conditional_response(_request(if_none_match=header), b"{}", "application/json", etag)
+        assert cached.status_code == 304
+        assert cached.body == b""
+        assert cached.headers["etag"] == etag
+
+    stale = conditional_response(_request(if_none_match='"zzz"'), b"{}", "application/json", etag)
+    assert stale.status_code == 200
+
+
+def test_conditional_response_last_modified():
+    """If-Modified-Since applies only without If-None-Match."""
+    modified = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+    since = "Thu, 01 Jan 2026 12:00:00 GMT"
+
+    response = conditional_response(_request(if_modified_since=since), b"x", "text/html", '"a"', modified)
+    assert response.status_code == 304
+
+    response = conditional_response(
+        _request(if_modified_since=since, if_none_match='"b"'), b"x", "text/html", '"a"', modified
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_results_cache_roundtrip_and_invalidate():
+    """Payloads are served from memory until the audit is invalidated."""
+    cache = ResultsCache(max_entries=4)
+    audit = _audit()
+
+    assert await cache.get(RESULTS, audit.id) is None
+
+    entry = await cache.put(RESULTS, audit, b'{"score":42}', "application/json")
+    await cache.put(RECOMMENDATIONS_JSON, audit, b"{}", "application/json", headers={"X-Export": "1"})
+
+    hit = await cache.get(RESULTS, audit.id)
+    assert hit is entry
+    assert hit.plan == "pro"
+    assert hit.etag.startswith('"') and hit.etag.endswith('"')
+
+    await cache.invalidate(audit.id)
+    assert await cache.get(RESULTS, audit.id) is None
+    assert await cache.get(RECOMMENDATIONS_JSON, audit.id) is None
+
+
+@pytest.mark.asyncio
+async def test_results_cache_lru_bound():
+    """The in-process layer evicts least recently used payloads."""
+    cache = ResultsCache(max_entries=2)
+    audits = [_audit() for _ in range(3)]
+
+    for audit in audits:
+        await cache.put(RESULTS, audit, str(audit.id).encode(), "application/json")
+
+    assert await cache.get(RESULTS, audits[0].id) is None
+    assert await cache.get(RESULTS, audits[2].id) is not None
+
+
+@pytest.mark.asyncio
+async def test_results_cache_local_ttl():
+    """Another worker's invalidate() is picked up once the in-process entry expires."""
+    audit = _audit("freemium")
+    worker = ResultsCache(local_ttl=60)
+    expired = ResultsCache(local_ttl=0)
+
+    await worker.put(RESULTS, audit, b"{}", "application/json")
+    await expired.put(RESULTS, audit, b"{}", "application/json")
+
+    assert await worker.get(RESULTS, audit.id) is not None
+    assert await expired.get(RESULTS, audit.id) is None
+
+
+@pytest.mark.asyncio
+async def test_paywall_rechecks_cached_freemium_plan(monkeypatch):
+    """A stale freemium payload does not block an audit paid on another worker."""
+    from src.api.routes import export
+
+    audit = _audit("freemium")
+    cache = ResultsCache(local_ttl=60)
+    monkeypatch.setattr(export, "results_cache", cache)
+
+    async def get_audit(db, audit_id):
+        return audit
+
+    monkeypatch.setattr(export.AuditService, "get_audit", get_audit)
+    await cache.put(RECOMMENDATIONS_JSON, audit, b"{}", "application/json")
+
+    with pytest.raises(HTTPException) as refused:
+        await export.export_recommendations_json(audit.id, _request(), db=None)
+    assert refused.value.status_code == 403
+
+    audit.plan = "starter"  # payment handled by another worker
+    response = await export.export_recommendations_json(audit.id, _request(), db=None)
+    assert response.status_code == 200
+    assert (await cache.get(RECOMMENDATIONS_JSON, audit.id)).plan == "starter"
+
+
+def test_cached_payload_serialization():
+    """Redis form round-trips binary bodies."""
+    entry = CachedPayload('"e"', b"\x00%PDF\xff", "application/pdf", "starter", "", {"X": "1"})
+
+    restored = CachedPayload.from_dict(entry.to_dict())
+
+    assert restored.body == entry.body
+    assert restored.headers == {"X": "1"}
+    assert restored.plan == "starter"
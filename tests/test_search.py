@@ -0,0 +1,101 @@
+"""Recherche plein texte dans les réponses IA — index FTS5, filtres, extraits surlignés."""
+from datetime import datetime
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+
+from src.api.main import app
+from src.prospecting import ia_test
+from src.prospecting.database import SessionLocal, get_db
+from src.prospecting.models import AnswerRefDB, ProspectStatus
+from src.prospecting.search import search_answers, snippet
+from tests.conftest import add_prospects, memory_engine
+
+ANSWERS = {
+    "couvreur Lyon":      "Pour un toit à Lyon, l'entreprise Toitures Dupont SARL est très bien notée.",
+    "meilleur couvreur":  "Je recommande Élagage & Toiture Sàrl ou les Couvreurs Réunis.",
+}
+
+
+@pytest.fixture
+def engine():
+    return memory_engine(migrate=True)     # FTS5 et triggers : schéma des migrations
+
+
+@pytest.fixture
+def api(monkeypatch):
+    monkeypatch.setattr(ia_test, "get_queries", lambda profession, city: list(ANSWERS))
+    monkeypatch.setattr(ia_test, "extract_entities", lambda text: [])
+    for model in ("openai", "gemini"):
+        monkeypatch.setitem(ia_test.AI_CALLERS, model, (lambda query: ANSWERS[query], "KEY"))
+    monkeypatch.setattr(ia_test, "get_active_models", lambda: ["openai", "gemini"])
+
+
+def _campaign(db, n: int = 1) -> str:
+    """Campagne de n prospects testée (réponses de ANSWERS)."""
+    campaign_id = add_prospects(db, n, status=ProspectStatus.SCHEDULED)[0].campaign_id
+    ia_test.run_ia_test_campaign(db, campaign_id)
+    return campaign_id
+
+
+def test_accent_folded_phrase_search(db, api):
+    first, second = _campaign(db, 2), _campaign(db)
+
+    [hit] = search_answers(db, "toitures dupont")
+    assert hit["runs"] == 6                 # 3 prospects × 2 modèles
+    assert (hit["campaigns"], hit["models"], hit["query"]) == (2, ["gemini", "openai"], "couvreur Lyon")
+    assert "<mark>Toitures Dupont</mark>" in hit["snippet"]
+
+    # accents et casse ignorés des deux côtés ; formes juridiques cherchables
+    assert len(search_answers(db, "ELAGAGE")) == 1
+    assert "<mark>Couvreurs Réunis</mark>" in search_answers(db, "couvreurs reunis")[0]["snippet"]
+    assert len(search_answers(db, "Dupont SARL")) == 1
+    assert search_answers(db, "dupont lyon") == []          # phrase, pas mots épars
+    assert len(search_answers(db, "SARL")) == 2              # « SARL » et « Sàrl »
+    assert "<mark>Toiture Sàrl</mark>" in search_answers(db, "toiture sarl")[0]["snippet"]
+
+    assert search_answers(db, "dupont", campaign_id=second)[0]["runs"] == 2
+    assert search_answers(db, "dupont", model="gemini")[0]["runs"] == 3
+    db.execute(update(AnswerRefDB).where(AnswerRefDB.campaign_id == first).values(ts=datetime(2026, 1, 5)))
+    db.commit()
+    assert search_answers(db, "dupont", until=datetime(2026, 2, 1))[0]["runs"] == 4
+    assert search_answers(db, "dupont", since=datetime(2026, 2, 1))[0]["runs"] == 2
+
+
+def test_create_all_builds_index(api):
+    session = SessionLocal(bind=memory_engine())
+    try:
+        _campaign(session)
+        assert search_answers(session, "couvreurs")[0]["runs"] == 2
+    finally:
+        session.close()
+
+
+def test_snippet_window():
+    body = " ".join(f"mot{i}" for i in range(40)) + " Toitures <b>Dupont</b> " + " ".join(f"fin{i}" for i in range(40))
+    text = snippet(body, ["dupont"], words=4)
+    assert text == "…Toitures &lt;b&gt;<mark>Dupont</mark>&lt;/b&gt; fin0…"      # « b » compte pour un mot
+    assert snippet("Aucun rapport ici", ["dupont"], words=2) == "Aucun rapport…"
+
+
+@pytest.mark.asyncio
+async def test_search_endpoint(db, api):
+    campaign_id = _campaign(db)
+
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            resp = await client.get("/api/search/answers", params={"q": "Toitures Dupont", "campaign_id": campaign_id})
+            assert resp.status_code == 200
+            body = resp.json()
+            assert body["count"] == 1
+            assert body["results"][0]["runs"] == 2
+
+            resp = await client.get("/api/search/answers", params={"q": "dupont", "since": "2100-01-01"})
+            assert resp.json()["count"] == 0
+            resp = await client.get("/api/search/answers", params={"q": "dupont", "until": datetime.utcnow().date().isoformat()})
+            assert resp.json()["count"] == 1
+            assert (await client.get("/api/search/answers", params={"q": "d"})).status_code == 422
+    finally:
+        app.dependency_overrides.pop(get_db, None)
@@ -0,0 +1,104 @@
+"""Transitions de statut ensemblistes — gates, journal, jobs."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.prospecting import ia_test, publish
+from src.prospecting.assets import promote_ready
+from src.prospecting.database import jdumps
+from src.prospecting.ia_test import run_ia_test_campaign
+from src.prospecting.models import ProspectDB, ProspectEventDB, ProspectStatus
+from src.prospecting.transitions import active_campaign_ids, bulk_transition
+from tests.conftest import add_campaign, add_prospect
+
+pytestmark = pytest.mark.usefixtures("published_dir")
+
+
+def _prospect(db, campaign, name, status=ProspectStatus.READY_ASSETS, **fields) -> ProspectDB:
+    """Prospect aux assets prêts (vidéo, capture, éligible) sauf mention contraire."""
+    values = dict(video_url="https://v", screenshot_url="https://s", eligibility_flag=True, competitors_cited=jdumps([]))
+    values.update(fields)
+    return add_prospect(db, name=name, status=status, campaign=campaign, **values)
+
+
+def test_gates_filter_rows_and_trail_is_written(db):
+    campaign = add_campaign(db)
+    ok        = _prospect(db, campaign, "OK")
+    no_video  = _prospect(db, campaign, "Sans vidéo", video_url="")
+    ineligible = _prospect(db, campaign, "Non éligible", eligibility_flag=False)
+    scored    = _prospect(db, campaign, "Scoré", status=ProspectStatus.SCORED)
+
+    changed = bulk_transition(
+        db, ProspectStatus.READY_ASSETS, ProspectStatus.READY_TO_SEND, campaign_id=campaign.campaign_id, reason="test",
+    )
+
+    assert changed == [ok.prospect_id]
+    assert ok.status == ProspectStatus.READY_TO_SEND.value   # session synchronisée
+    assert {p.status for p in (no_video, ineligible)} == {ProspectStatus.READY_ASSETS.value}
+    assert scored.status == ProspectStatus.SCORED.value
+
+    trail = db.query(ProspectEventDB).filter(ProspectEventDB.kind == "transition").all()
+    assert [(t.prospect_id, t.from_status, t.to_status, t.reason) for t in trail] == [
+        (ok.prospect_id, "READY_ASSETS", "READY_TO_SEND", "test"),
+    ]
+
+    with pytest.raises(ValueError):
+        bulk_transition(db, ProspectStatus.SCANNED, ProspectStatus.SCORED)
+
+
+def test_monday_promotion_only_touches_active_campaigns(db):
+    active, paused = add_campaign(db), add_campaign(db, status="paused")
+    a = _prospect(db, active, "Actif")
+    p = _prospect(db, paused, "En pause")
+
+    assert promote_ready(db, campaign_id=active_campaign_ids()) == [a.prospect_id]
+    db.refresh(p)
+    assert p.status == ProspectStatus.READY_ASSETS.value
+    assert publish.current_digest(a.landing_token)
+
+
+def test_ia_test_campaign_transitions_through_testing(db):
+    campaign = add_campaign(db)
+    prospects = [_prospect(db, campaign, f"P{i}", status=ProspectStatus.SCHEDULED) for i in range(2)]
+
+    result = run_ia_test_campaign(db, campaign.campaign_id, dry_run=True)
+
+    assert result["processed"] == 2
+    assert {p.status for p in prospects} == {ProspectStatus.TESTED.value}
+    steps = sorted(
+        (t.from_status, t.to_status) for t in db.query(ProspectEventDB).filter(ProspectEventDB.kind == "transition")
+    )
+    assert steps == [("SCHEDULED", "TESTING")] * 2 + [("TESTING", "TESTED")] * 2
+
+
+def test_failed_test_returns_prospect_to_scheduled(db, monkeypatch):
+    campaign = add_campaign(db)
+    ok, broken, later = [_prospect(db, campaign, name, status=ProspectStatus.SCHEDULED) for name in ("OK", "KO", "Après")]
+
+    real = ia_test.store_answers
+
+    def store_answers(session, answers, extract):
+        if broken.status == ProspectStatus.TESTING.value:
+            raise RuntimeError("API indisponible")
+        return real(session, answers, extract)
+
+    monkeypatch.setattr(ia_test, "store_answers", store_answers)
+    result = run_ia_test_campaign(db, campaign.campaign_id, dry_run=True)
+
+    assert (result["processed"], [e["prospect_id"] for e in result["errors"]]) == (2, [broken.prospect_id])
+    assert [p.status for p in (ok, broken, later)] == ["TESTED", "SCHEDULED", "TESTED"]
+    reverted = db.query(ProspectEventDB).filter_by(prospect_id=broken.prospect_id, kind="transition", to_status="SCHEDULED").one()
+    assert "API indisponible" in reverted.reason
+
+
+def test_stale_testing_is_picked_up_again(db):
+    campaign = add_campaign(db)
+    stuck = _prospect(db, campaign, "Bloqué", status=ProspectStatus.TESTING)
+    stuck.updated_at = datetime.utcnow() - timedelta(hours=3)
+    db.commit()
+    recent = _prospect(db, campaign, "En cours", status=ProspectStatus.TESTING)
+
+    result = run_ia_test_campaign(db, campaign.campaign_id, dry_run=True)
+
+    assert result["processed"] == 1
+    assert (stuck.status, recent.status) == ("TESTED", "TESTING")
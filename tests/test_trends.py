@@ -0,0 +1,119 @@
+"""Série de visibilité — cumuls créneau / jour / semaine à l'écriture des runs, concurrents, purge, endpoint."""
+from datetime import date, datetime
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import create_engine, insert
+
+from src.api.main import app
+from src.prospecting import database
+from src.prospecting.database import SessionLocal, get_db, init_db, jdumps
+from src.prospecting.models import (
+    CampaignDB, ProspectDB, ProspectStatus, RunStatsDB, TestRunDB as RunDB, VisibilityPointDB,
+)
+from src.prospecting.trends import periods, prospect_trend, prune_slots
+from tests.conftest import add_prospect, add_run
+
+
+def _history(db) -> ProspectDB:
+    p = add_prospect(db, status=ProspectStatus.TESTED)
+    add_run(db, p, "openai", ts=datetime(2026, 10, 21, 7, 30), mentions=[True] + [False] * 4,
+            competitors=["Toitures Martin", "Martin Toiture"])
+    add_run(db, p, "gemini", ts=datetime(2026, 10, 21, 7, 35), mentions=[False] * 5, competitors=["Toitures Martin"])
+    add_run(db, p, "openai", ts=datetime(2026, 10, 21, 11, 5), mentions=[False] * 5, competitors=["Toitures Dupont"])
+    add_run(db, p, "openai", ts=datetime(2026, 10, 30, 8, 0), mentions=[True, True] + [False] * 3, competitors=[])
+    return p
+
+
+def test_periods_follow_rome_slots():
+    assert periods(datetime(2026, 10, 21, 7, 30)) == {"slot": "2026-10-21T09:00", "day": "2026-10-21", "week": "2026-10-19"}
+    # heure d'hiver : 08:00 UTC = 09:00 Rome
+    assert periods(datetime(2026, 10, 30, 8, 0))["slot"] == "2026-10-30T09:00"
+
+
+def test_weekly_rollup_and_competitors(db):
+    p = _history(db)
+
+    trend = prospect_trend(db, p.prospect_id, "week")
+    assert [(pt["period"], pt["runs"], pt["mentioned"]) for pt in trend["points"]] == [
+        ("2026-10-19", 3, 0.333), ("2026-10-26", 1, 1.0),
+    ]
+    first = trend["points"][0]
+    assert first["models"] == {"gemini": 0.0, "openai": 0.5}
+    assert first["queries"] == [0.333, 0.0, 0.0, 0.0, 0.0]
+
+    martin, dupont = trend["competitors"]
+    assert (martin["name"], martin["runs"], dupont["name"], dupont["runs"]) == ("Martin Toiture", 2, "Toitures Dupont", 1)
+    assert martin["points"] == [{"period": "2026-10-19", "cited": 0.667, "models": {"gemini": 1.0, "openai": 0.5}}]
+
+    slots = prospect_trend(db, p.prospect_id, "slot", competitors=0)
+    assert [(pt["period"], pt["runs"]) for pt in slots["points"]] == [
+        ("2026-10-21T09:00", 2), ("2026-10-21T13:00", 1), ("2026-10-30T09:00", 1),
+    ]
+    assert slots["competitors"] == []
+    assert [pt["period"] for pt in prospect_trend(db, p.prospect_id, "week", since=date(2026, 10, 28))["points"]] == [
+        "2026-10-26",
+    ]
+
+
+def test_prune_slots_keeps_rollups(db):
+    p = _history(db)
+    assert prune_slots(db, older_than_days=30, now=datetime(2026, 11, 25)) > 0
+
+    assert [pt["period"] for pt in prospect_trend(db, p.prospect_id, "slot")["points"]] == ["2026-10-30T09:00"]
+    assert len(prospect_trend(db, p.prospect_id, "day")["points"]) == 2
+    assert prospect_trend(db, p.prospect_id, "week")["points"][0]["runs"] == 3
+
+
+def test_migration_backfills_runs_and_archived_stats(tmp_path):
+    from alembic import command
+    from alembic.config import Config
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    cfg = Config()
+    cfg.set_main_option("script_location", str(database.MIGRATIONS_DIR))
+    with engine.begin() as conn:
+        cfg.attributes["connection"] = conn
+        command.upgrade(cfg, "d5a1b7c3e860")
+        conn.execute(insert(CampaignDB), [{"campaign_id": "c1", "profession": "couvreur", "city": "Lyon"}])
+        conn.execute(insert(ProspectDB), [{"prospect_id": "p1", "campaign_id": "c1", "name": "Toit Pro",
+                                           "city": "Lyon", "profession": "couvreur"}])
+        conn.execute(insert(RunDB), [
+            {"run_id": "r1", "campaign_id": "c1", "prospect_id": "p1", "model": "openai",
+             "ts": datetime(2026, 10, 21, 7, 30), "mentioned_target": False,
+             "mention_per_query": jdumps([False] * 5), "competitors_entities": jdumps(["Toitures Dupont"])},
+        ])
+        conn.execute(insert(RunStatsDB), [
+            {"prospect_id": "p1", "model": "openai", "day": date(2026, 4, 1), "campaign_id": "c1", "runs": 4,
+             "mentions": 1, "query_mentions": jdumps([1, 0, 0, 0, 0]), "query_labels": jdumps([]),
+             "first_ts": datetime(2026, 4, 1, 7), "last_ts": datetime(2026, 4, 1, 18)},
+        ])
+
+    init_db(engine)
+    session = SessionLocal(bind=engine)
+    try:
+        trend = prospect_trend(session, "p1", "week")
+        assert [(pt["period"], pt["runs"], pt["mentioned"]) for pt in trend["points"]] == [
+            ("2026-03-30", 4, 0.25), ("2026-10-19", 1, 0.0),
+        ]
+        assert trend["points"][0]["queries"][0] == 0.25
+        assert trend["competitors"][0]["name"] == "Toitures Dupont"
+        assert session.query(VisibilityPointDB).filter_by(resolution="slot").count() > 0
+    finally:
+        session.close()
+
+
+@pytest.mark.asyncio
+async def test_trend_endpoint(db):
+    p = _history(db)
+
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            resp = await client.get(f"/api/prospect/{p.prospect_id}/trend", params={"resolution": "day"})
+            assert resp.status_code == 200
+            assert [pt["period"] for pt in resp.json()["points"]] == ["2026-10-21", "2026-10-30"]
+            assert (await client.get(f"/api/prospect/{p.prospect_id}/trend?resolution=month")).status_code == 422
+            assert (await client.get("/api/prospect/inconnu/trend")).status_code == 404
+    finally:
+        app.dependency_overrides.pop(get_db, None)